@@ -16,6 +16,7 @@ from kgx.cli.cli_utils import (
     summary_report_types,
     get_report_format_types,
 )
+from kgx.utils.sort_utils import sort_file, SORT_FORMATS, SORT_KEYS, DEFAULT_MAX_MEMORY
 
 log = get_logger()
 config = get_config()
@@ -38,7 +39,7 @@ def cli():
 
 
 @cli.command(name='graph-summary')
-@click.argument('inputs', required=True, type=click.Path(exists=True), nargs=-1)
+@click.argument('inputs', required=False, type=click.Path(exists=True), nargs=-1)
 @click.option(
     '--input-format',
     '-i',
@@ -86,6 +87,32 @@ def cli():
     type=click.Path(exists=False),
     help='File within which to report graph data parsing errors (default: "stderr")'
 )
+@click.option(
+    '--processes', '-p', required=False, type=int, default=1, help='Number of processes to use'
+)
+@click.option(
+    '--columnar', is_flag=True, help='Summarize TSV/CSV inputs column-wise, chunk by chunk'
+)
+@click.option(
+    '--approximate',
+    is_flag=True,
+    help='Summarize facet properties approximately, with bounded memory (kgx-map report type only)',
+)
+@click.option(
+    '--state-directory',
+    required=False,
+    type=click.Path(exists=False),
+    help='The directory where the summaries of the sources of the graph are kept, for incremental updates',
+)
+@click.option(
+    '--source-name', required=False, help='The name of the source whose records are the inputs'
+)
+@click.option(
+    '--retract',
+    required=False,
+    multiple=True,
+    help='The name of a source to remove from the summaries in the state directory',
+)
 def graph_summary_wrapper(
     inputs: List[str],
     input_format: str,
@@ -97,7 +124,13 @@ def graph_summary_wrapper(
     graph_name: str,
     node_facet_properties: Optional[Set],
     edge_facet_properties: Optional[Set],
-    error_log: str = ''
+    error_log: str = '',
+    processes: int = 1,
+    columnar: bool = False,
+    approximate: bool = False,
+    state_directory: Optional[str] = None,
+    source_name: Optional[str] = None,
+    retract: Optional[Set] = None,
 ):
     """
     Loads and summarizes a knowledge graph from a set of input files.
@@ -129,6 +162,18 @@ def graph_summary_wrapper(
         For example, ``['knowledge_source']``d
     error_log: str
         Where to write any graph processing error message (stderr, by default, for empty argument)
+    processes: int
+        Number of processes to use
+    columnar: bool
+        Whether to summarize TSV/CSV inputs column-wise, chunk by chunk
+    approximate: bool
+        Whether to summarize facet properties approximately (kgx-map report type only)
+    state_directory: Optional[str]
+        The directory where the summaries of the sources of the graph are kept
+    source_name: Optional[str]
+        The name of the source whose records are the inputs
+    retract: Optional[Set]
+        The names of the sources to remove from the summaries in the state directory
     """
     graph_summary(
         inputs,
@@ -141,7 +186,13 @@ def graph_summary_wrapper(
         graph_name,
         node_facet_properties=list(node_facet_properties),
         edge_facet_properties=list(edge_facet_properties),
-        error_log=error_log
+        error_log=error_log,
+        processes=processes,
+        columnar=columnar,
+        approximate=approximate,
+        state_directory=state_directory,
+        source_name=source_name,
+        retract=list(retract or []),
     )
 
 
@@ -167,13 +218,40 @@ def graph_summary_wrapper(
               required=False,
               help='Biolink Model Release (SemVer) used for validation (default: latest Biolink Model Toolkit version)'
 )
+@click.option(
+    '--processes', '-p', required=False, type=int, default=1, help='Number of processes to use'
+)
+@click.option(
+    '--aggregate', '-a', is_flag=True, help='Aggregate errors by type, message and level in the report'
+)
+@click.option(
+    '--max-examples',
+    required=False,
+    type=int,
+    default=10,
+    help='Maximum number of example entities per aggregated error',
+)
+@click.option(
+    '--error-jsonl',
+    required=False,
+    type=click.Path(exists=False),
+    help='File to write every error to, as JSON lines (implies --aggregate)',
+)
+@click.option(
+    '--columnar', is_flag=True, help='Validate TSV/CSV inputs column-wise, chunk by chunk'
+)
 def validate_wrapper(
         inputs: List[str],
         input_format: str,
         input_compression: str,
         output: str,
         stream: bool,
-        biolink_release: str = None
+        biolink_release: str = None,
+        processes: int = 1,
+        aggregate: bool = False,
+        max_examples: int = 10,
+        error_jsonl: str = None,
+        columnar: bool = False,
 ):
     """
     Run KGX validator on an input file to check for Biolink Model compliance.
@@ -193,8 +271,30 @@ def validate_wrapper(
         Whether to parse input as a stream
     biolink_release: Optional[str]
         SemVer version of Biolink Model Release used for validation (default: latest Biolink Model Toolkit version)
+    processes: int
+        Number of processes to use (records are streamed when more than one)
+    aggregate: bool
+        Whether to aggregate errors in the report
+    max_examples: int
+        Maximum number of example entities per aggregated error
+    error_jsonl: str
+        File to write every error to, as JSON lines
+    columnar: bool
+        Whether to validate TSV/CSV inputs column-wise
     """
-    validate(inputs, input_format, input_compression, output, stream, biolink_release)
+    validate(
+        inputs,
+        input_format,
+        input_compression,
+        output,
+        stream,
+        biolink_release,
+        processes,
+        aggregate,
+        max_examples,
+        error_jsonl,
+        columnar,
+    )
 
 
 @cli.command(name='neo4j-download')
@@ -492,6 +592,98 @@ def transform_wrapper(
     )
 
 
+@cli.command(name='sort')
+@click.argument('input', required=True, type=click.Path(exists=True))
+@click.option(
+    '--input-format',
+    '-i',
+    required=True,
+    type=click.Choice(SORT_FORMATS),
+    help=f'The input format. Can be one of {SORT_FORMATS}',
+)
+@click.option('--input-compression', '-c', required=False, help='The input compression type')
+@click.option('--output', '-o', required=True, type=click.Path(exists=False), help='Output')
+@click.option('--output-compression', '-d', required=False, help='The output compression type')
+@click.option(
+    '--key',
+    '-k',
+    required=False,
+    type=click.Choice(SORT_KEYS),
+    default='subject',
+    help='The key to sort records by (subject, id or the edge key)',
+)
+@click.option(
+    '--max-memory',
+    '-m',
+    required=False,
+    type=float,
+    default=DEFAULT_MAX_MEMORY,
+    help='The memory budget of each sorted run, in megabytes',
+)
+@click.option('--processes', '-p', required=False, type=int, default=1, help='Number of processes to use')
+@click.option('--compress-runs', is_flag=True, help='Compress the sorted runs written to temporary files')
+@click.option(
+    '--temporary-directory',
+    '-T',
+    required=False,
+    type=click.Path(exists=True),
+    help='The directory where the sorted runs are written',
+)
+def sort_wrapper(
+    input: str,
+    input_format: str,
+    input_compression: Optional[str],
+    output: str,
+    output_compression: Optional[str],
+    key: str,
+    max_memory: float,
+    processes: int,
+    compress_runs: bool,
+    temporary_directory: Optional[str],
+):
+    """
+    Sort the records of an N-Triples, TSV, CSV or JSON lines file by a key,
+    with an external merge sort, for files that do not fit in memory.
+    \f
+
+    Parameters
+    ----------
+    input: str
+        The file to sort
+    input_format: str
+        The input format
+    input_compression: Optional[str]
+        The input compression type
+    output: str
+        Output file
+    output_compression: Optional[str]
+        The output compression type
+    key: str
+        The key to sort by (``subject``, ``id`` or ``edge``)
+    max_memory: float
+        The memory budget of each sorted run, in megabytes
+    processes: int
+        Number of processes to use
+    compress_runs: bool
+        Whether to compress the sorted runs written to temporary files
+    temporary_directory: Optional[str]
+        The directory where the sorted runs are written
+
+    """
+    sort_file(
+        input,
+        output,
+        input_format,
+        key,
+        max_memory,
+        processes,
+        input_compression,
+        output_compression,
+        compress_runs,
+        temporary_directory,
+    )
+
+
 @cli.command(name='merge')
 @click.option('--merge-config', required=True, type=str)
 @click.option(
@@ -505,7 +697,26 @@ def transform_wrapper(
     help='Destination(s) from the YAML to process',
 )
 @click.option('--processes', '-p', required=False, type=int, default=1, help='Number of processes to use')
-def merge_wrapper(merge_config: str, source: List, destination: List, processes: int):
+@click.option(
+    '--stream',
+    '-s',
+    is_flag=True,
+    help='Merge sources as a stream, without loading the sources or the merged graph into memory',
+)
+@click.option(
+    '--incremental',
+    '-i',
+    is_flag=True,
+    help='Only parse the sources that have changed since the previous incremental merge',
+)
+def merge_wrapper(
+    merge_config: str,
+    source: List,
+    destination: List,
+    processes: int,
+    stream: bool,
+    incremental: bool,
+):
     """
     Load nodes and edges from files and KGs, as defined in a config YAML, and merge them into a single graph.
     The merged graph can then be written to a local/remote Neo4j instance OR be serialized into a file.
@@ -524,6 +735,10 @@ def merge_wrapper(merge_config: str, source: List, destination: List, processes:
         A list of destination to write to, as defined in the YAML
     processes: int
         Number of processes to use
+    stream: bool
+        Whether to merge sources as a stream
+    incremental: bool
+        Whether to only parse the sources that have changed since the previous incremental merge
 
     """
-    merge(merge_config, source, destination, processes)
+    merge(merge_config, source, destination, processes, stream, incremental)
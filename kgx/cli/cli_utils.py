@@ -1,21 +1,51 @@
+import hashlib
 import importlib
+import json
 
 import os
+import re
 from os.path import dirname, abspath
 
+import shutil
 import sys
+import tempfile
+from itertools import islice
 from multiprocessing import Pool
-from typing import List, Tuple, Optional, Dict, Set, Any, Union
+from typing import List, Tuple, Optional, Dict, Set, Any, Union, Generator, Iterable
+import numpy as np
+import pandas as pd
 import yaml
 
-from kgx.validator import Validator
-from kgx.sink import Sink
+from kgx.validator import Validator, ErrorCollector
+from kgx.sink import Sink, SnapshotSink, RdfSink, NullSink
+from kgx.source import TsvSource
 from kgx.transformer import Transformer, SOURCE_MAP, SINK_MAP
 from kgx.config import get_logger
 from kgx.graph.base_graph import BaseGraph
-from kgx.graph_operations.graph_merge import merge_all_graphs
+from kgx.graph_operations.graph_merge import (
+    merge_all_graphs,
+    merge_sorted_records,
+    node_sort_key,
+    edge_sort_key,
+    get_partition,
+)
 from kgx.graph_operations import summarize_graph, meta_knowledge_graph
-from kgx.utils.kgx_utils import apply_graph_operations, knowledge_provenance_properties
+from kgx.graph_operations.stream_operations import compile_stream_operations
+from kgx.graph_operations.node_catalog import NodeCatalog
+from kgx.utils.kgx_utils import (
+    apply_graph_operations,
+    knowledge_provenance_properties,
+    GraphEntityType,
+)
+from kgx.utils.snapshot_utils import (
+    SNAPSHOT_EXTENSION,
+    SNAPSHOT_VERSION,
+    SUMMARY_STATE_VERSION,
+    NODE_FRAME,
+    EDGE_FRAME,
+    read_records,
+)
+from kgx.utils.sort_utils import SortedRuns, DEFAULT_MAX_MEMORY, record_size
 
 
 summary_report_types = {
@@ -25,6 +55,14 @@ summary_report_types = {
 
 log = get_logger()
 
+MERGE_CACHE_DIRECTORY = 'merge_cache'
+MERGE_MANIFEST = 'manifest.json'
+
+VALIDATION_CHUNK_SIZE = 10000
+# formats where each file holds self-contained node and edge records,
+# so that files can be parsed independently of each other
+SELF_CONTAINED_FORMATS = {'tsv', 'csv', 'json', 'jsonl', 'obojson', 'obo-json', 'trapi-json'}
+
 
 def get_input_file_types() -> Tuple:
     """
@@ -76,11 +114,31 @@ def graph_summary(
     graph_name: Optional[str] = None,
     node_facet_properties: Optional[List] = None,
     edge_facet_properties: Optional[List] = None,
-    error_log: str = ''
+    error_log: str = '',
+    processes: int = 1,
+    columnar: bool = False,
+    approximate: bool = False,
+    state_directory: Optional[str] = None,
+    source_name: Optional[str] = None,
+    retract: Optional[List[str]] = None,
 ) -> Dict:
     """
     Loads and summarizes a knowledge graph from a set of input files.
 
+    When more than one process is used and the input format allows it, each
+    input file is summarized by a worker process and the partial summaries
+    are merged (see ``parallel_graph_summary``).
+
+    With ``columnar``, TSV/CSV inputs are summarized chunk by chunk, rows being
+    grouped and counted together (see ``columnar_graph_summary``).
+
+    With ``approximate``, facet properties of a kgx-map report are summarized with
+    sketches, using a bounded amount of memory (see ``GraphSummary``).
+
+    With a ``state_directory``, the summary of each source of the graph is kept
+    in the directory, and the report is updated from the summaries of the sources,
+    without reading the sources that did not change (see ``update_summary_state``).
+
     Parameters
     ----------
     inputs: List[str]
@@ -105,6 +163,18 @@ def graph_summary(
         A list of edge properties from which to generate counts per value for those properties. For example, ``['provided_by']``
     error_log: str
         Where to write any graph processing error message (stderr, by default)
+    processes: int
+        Number of processes to use
+    columnar: bool
+        Whether to summarize TSV/CSV inputs column-wise, chunk by chunk
+    approximate: bool
+        Whether to summarize facet properties approximately (only for the kgx-map report type)
+    state_directory: Optional[str]
+        The directory where the summaries of the sources of the graph are kept
+    source_name: Optional[str]
+        The name of the source whose records are the inputs, with a ``state_directory``
+    retract: Optional[List[str]]
+        The names of the sources to remove from the summary, with a ``state_directory``
 
     Returns
     -------
@@ -118,51 +188,431 @@ def graph_summary(
     if report_format and report_format not in get_report_format_types():
         raise ValueError(f"report_format must be one of {get_report_format_types()}")
 
-    if report_type in summary_report_types:
-        # New design pattern enabling 'stream' processing of statistics on a small memory footprint
-        # by injecting an inspector in the Transformer.process() source-to-sink data flow.
-        #
-        # First, we instantiate the Inspector (generally, a Callable class)...
-        #
-        inspector = summary_report_types[report_type](
-            # ...thus, there is no need to hand the Inspector the graph;
-            # rather, the inspector will see the graph data after
-            # being injected into the Transformer.transform() workflow
-            # graph=transformer.store.graph,
-            name=graph_name,
-            node_facet_properties=node_facet_properties,
-            edge_facet_properties=edge_facet_properties,
-            error_log=error_log
-        )
-    else:
-        raise ValueError(f"report_type must be one of {summary_report_types.keys()}")
-    
-    if stream:
-        output_args = {'format': 'null'}  # streaming processing throws the graph data away
-    else:
-        output_args = None
-    
-    transformer = Transformer(stream=stream)
-    transformer.transform(
-        input_args={
+    if approximate and report_type != 'kgx-map':
+        raise ValueError("An approximate summary is only supported for the 'kgx-map' report type")
+
+    if not inputs and not state_directory:
+        raise ValueError("No input files to summarize")
+
+    # the node catalog of the summary is spilled to a temporary directory, if needed
+    with tempfile.TemporaryDirectory(prefix='graph-summary-') as spill_directory:
+        if report_type in summary_report_types:
+            # New design pattern enabling 'stream' processing of statistics on a small memory footprint
+            # by injecting an inspector in the Transformer.process() source-to-sink data flow.
+            #
+            # First, we instantiate the Inspector (generally, a Callable class)...
+            #
+            inspector = summary_report_types[report_type](
+                # ...thus, there is no need to hand the Inspector the graph;
+                # rather, the inspector will see the graph data after
+                # being injected into the Transformer.transform() workflow
+                # graph=transformer.store.graph,
+                name=graph_name,
+                node_facet_properties=node_facet_properties,
+                edge_facet_properties=edge_facet_properties,
+                error_log=error_log,
+                spill_directory=spill_directory,
+                approximate=approximate,
+            )
+        else:
+            raise ValueError(f"report_type must be one of {summary_report_types.keys()}")
+
+        input_args = {
             'filename': inputs,
             'format': input_format,
             'compression': input_compression
-        },
-        output_args=output_args,
-        # ... Second, we inject the Inspector into the transform() call,
-        # for the underlying Transformer.process() to use...
-        inspector=inspector
-    )
+        }
 
-    if output:
-        with open(output, 'w') as gsr:
-            inspector.save(gsr, file_format=report_format)
+        if state_directory:
+            update_summary_state(inspector, state_directory, input_args, source_name, retract, columnar)
+        elif processes > 1 and len(inputs) > 1 and input_format in SELF_CONTAINED_FORMATS:
+            parallel_graph_summary(inspector, input_args, processes, columnar)
+        elif columnar:
+            columnar_graph_summary(inspector, inputs, input_format, input_compression)
+        else:
+            if processes > 1:
+                log.info(f"Input of format '{input_format}' is summarized in a single process")
+
+            if stream:
+                output_args = {'format': 'null'}  # streaming processing throws the graph data away
+            else:
+                output_args = None
+
+            transformer = Transformer(stream=stream)
+            transformer.transform(
+                input_args=input_args,
+                output_args=output_args,
+                # ... Second, we inject the Inspector into the transform() call,
+                # for the underlying Transformer.process() to use...
+                inspector=inspector
+            )
+
+        if output:
+            with open(output, 'w') as gsr:
+                inspector.save(gsr, file_format=report_format)
+        else:
+            inspector.save(sys.stdout, file_format=report_format)
+
+        # ... Third, we directly return the graph statistics to the caller.
+        stats = inspector.get_graph_summary()
+        inspector.node_catalog.close()
+        return stats
+
+
+def parallel_graph_summary(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph],
+    input_args: Dict,
+    processes: int = 1,
+    columnar: bool = False,
+) -> None:
+    """
+    Summarize each of the files of an input in a worker process.
+
+    The nodes of the files are summarized first, and their partial summaries
+    are merged into ``inspector``, in the order of the files. The edges of the
+    files are then summarized, each worker joining them with the categories of
+    their nodes in the node catalog of ``inspector``, and their partial summaries
+    are merged into ``inspector`` as well. A file holding both nodes and edges
+    (as a JSON file does) is thus read twice.
+
+    Parameters
+    ----------
+    inspector: Union[kgx.graph_operations.summarize_graph.GraphSummary, kgx.graph_operations.meta_knowledge_graph.MetaKnowledgeGraph]
+        The summary to merge the partial summaries into
+    input_args: Dict
+        Arguments relevant to your input source
+    processes: int
+        Number of processes to use
+    columnar: bool
+        Whether to summarize TSV/CSV files column-wise (see ``columnar_graph_summary``)
+
+    """
+    filenames = input_args['filename']
+    log.info(f"Summarizing {len(filenames)} files with {processes} processes")
+    summary_args = _get_partial_summary_args(inspector)
+    entity_types = [
+        _get_file_entity_types(f, input_args['format'], input_args.get('compression')) for f in filenames
+    ]
+
+    node_shards = [
+        (type(inspector), summary_args, {**input_args, 'filename': [f]}, columnar, GraphEntityType.NODE)
+        for f, types in zip(filenames, entity_types)
+        if GraphEntityType.NODE in types
+    ]
+    pool = Pool(processes=processes)
+    try:
+        for summary in pool.imap(_summarize_input, node_shards):
+            inspector.merge(summary)
+    finally:
+        pool.close()
+        pool.join()
+
+    # all the nodes being known, the edges are not partial summaries anymore
+    edge_args = {**summary_args, 'partial': False}
+    edge_shards = [
+        (type(inspector), edge_args, {**input_args, 'filename': [f]}, columnar, GraphEntityType.EDGE)
+        for f, types in zip(filenames, entity_types)
+        if GraphEntityType.EDGE in types
+    ]
+    # the node catalog is sent once to each worker (a spilled catalog by reference to its database)
+    pool = Pool(processes=processes, initializer=_set_shared_node_catalog, initargs=(inspector.node_catalog,))
+    try:
+        for summary in pool.imap(_summarize_input, edge_shards):
+            inspector.merge(summary)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _get_file_entity_types(filename: str, format: str, compression: Optional[str] = None) -> Set[GraphEntityType]:
+    # the types of the records of a file, as the sources reading either nodes
+    # or edges from a file tell them from its name, or both types otherwise
+    if format in {'tsv', 'csv', 'jsonl'} and compression not in {'tar', 'tar.gz'}:
+        if re.search(f'nodes.{format}', filename):
+            return {GraphEntityType.NODE}
+        if re.search(f'edges.{format}', filename):
+            return {GraphEntityType.EDGE}
+    return {GraphEntityType.NODE, GraphEntityType.EDGE}
+
+
+# the node catalog of the summary whose edges are summarized by a worker process
+_shared_node_catalog: Optional[NodeCatalog] = None
+
+
+def _set_shared_node_catalog(node_catalog: NodeCatalog) -> None:
+    global _shared_node_catalog
+    _shared_node_catalog = node_catalog
+
+
+def _get_partial_summary_args(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph]
+) -> Dict:
+    # the arguments of partial summaries to be merged into the inspector
+    summary_args = {
+        'name': inspector.name,
+        'node_facet_properties': inspector.node_facet_properties,
+        'edge_facet_properties': inspector.edge_facet_properties,
+        'partial': True,
+        'spill_directory': inspector.node_catalog.directory,
+    }
+    if isinstance(inspector, summarize_graph.GraphSummary):
+        summary_args['approximate'] = inspector.approximate
+        summary_args['max_facet_values'] = inspector.max_facet_values
+    return summary_args
+
+
+SUMMARY_STATE_MANIFEST = 'manifest.yaml'
+
+
+def update_summary_state(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph],
+    state_directory: str,
+    input_args: Optional[Dict] = None,
+    source_name: Optional[str] = None,
+    retract: Optional[List[str]] = None,
+    columnar: bool = False,
+) -> None:
+    """
+    Update the summaries of the sources of a graph kept in a directory,
+    and merge them into ``inspector``.
+
+    The directory holds the state of the partial summary of each source (see
+    ``GraphSummary.save_state``) and a manifest of the sources, in the order in
+    which their summaries are merged, along with the summary settings and the version
+    of the format of the states (a directory in another version is refused). The summary
+    of the source whose records are given is computed (replacing any previous one),
+    the summaries of the retracted sources are deleted, and the summaries of the
+    other sources are merged as they are, without reading their records again.
+
+    Parameters
+    ----------
+    inspector: Union[kgx.graph_operations.summarize_graph.GraphSummary, kgx.graph_operations.meta_knowledge_graph.MetaKnowledgeGraph]
+        The summary to merge the summaries of the sources into
+    state_directory: str
+        The directory where the summaries of the sources are kept
+    input_args: Optional[Dict]
+        Arguments relevant to the input source of the records of ``source_name``, if any
+    source_name: Optional[str]
+        The name of the source whose records are given
+    retract: Optional[List[str]]
+        The names of the sources to remove
+    columnar: bool
+        Whether to summarize TSV/CSV inputs column-wise (see ``columnar_graph_summary``)
+
+    """
+    summary_args = _get_partial_summary_args(inspector)
+    settings = {
+        'summary': type(inspector).__name__,
+        **{k: v for k, v in summary_args.items() if k not in {'name', 'partial', 'spill_directory'}},
+    }
+    os.makedirs(state_directory, exist_ok=True)
+    manifest_filename = os.path.join(state_directory, SUMMARY_STATE_MANIFEST)
+    if os.path.exists(manifest_filename):
+        with open(manifest_filename) as manifest_file:
+            manifest = yaml.safe_load(manifest_file)
+        if manifest.get('version') != SUMMARY_STATE_VERSION:
+            raise ValueError(
+                f"The summaries in {state_directory} are in state version {manifest.get('version', 1)}, "
+                f"not {SUMMARY_STATE_VERSION}: the directory should be removed and its sources summarized again"
+            )
+        if manifest['settings'] != settings:
+            raise ValueError(
+                f"The summaries in {state_directory} have other settings: {manifest['settings']}"
+            )
+    else:
+        manifest = {'version': SUMMARY_STATE_VERSION, 'settings': settings, 'sources': []}
+
+    for name in retract or []:
+        if name in manifest['sources']:
+            log.info(f"Removing the summary of source '{name}'")
+            manifest['sources'].remove(name)
+            _remove_summary_state(state_directory, name)
+        else:
+            log.warning(f"No summary of source '{name}' to remove in {state_directory}")
+
+    if input_args and input_args['filename']:
+        if not source_name or os.sep in source_name or source_name == SUMMARY_STATE_MANIFEST:
+            raise ValueError(f"A valid source name is required to keep the summary of the inputs: {source_name}")
+        log.info(f"Summarizing source '{source_name}'")
+        partial = _summarize_input((type(inspector), summary_args, input_args, columnar, None))
+        _remove_summary_state(state_directory, source_name)
+        partial.save_state(os.path.join(state_directory, source_name))
+        partial.node_catalog.close()
+        if source_name not in manifest['sources']:
+            manifest['sources'].append(source_name)
+
+    with open(manifest_filename, 'w') as manifest_file:
+        yaml.safe_dump(manifest, manifest_file)
+
+    for name in manifest['sources']:
+        partial = type(inspector).load_state(os.path.join(state_directory, name))
+        inspector.merge(partial)
+        partial.node_catalog.close()
+
+
+def _remove_summary_state(state_directory: str, source_name: str) -> None:
+    for filename in [source_name, source_name + '.nodes.db']:
+        filename = os.path.join(state_directory, filename)
+        if os.path.exists(filename):
+            os.remove(filename)
+
+
+def _summarize_input(
+    shard: Tuple[type, Dict, Dict, bool, Optional[GraphEntityType]]
+) -> Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph]:
+    # summarize the records of an input, or only those of a given type
+    summary_class, summary_args, input_args, columnar, entity_type = shard
+    inspector = summary_class(**summary_args)
+    if entity_type == GraphEntityType.EDGE:
+        inspector.node_catalog = _shared_node_catalog
+    if columnar:
+        columnar_graph_summary(
+            inspector, input_args['filename'], input_args['format'], input_args['compression'], entity_type
+        )
     else:
-        inspector.save(sys.stdout, file_format=report_format)
 
-    # ... Third, we directly return the graph statistics to the caller.
-    return inspector.get_graph_summary()
+        def inspect(record_type: GraphEntityType, rec: List) -> None:
+            if entity_type is None or record_type == entity_type:
+                inspector(record_type, rec)
+
+        Transformer(stream=True).transform(
+            input_args=input_args, output_args={'format': 'null'}, inspector=inspect
+        )
+    if entity_type == GraphEntityType.EDGE:
+        # the shared node catalog is not sent back
+        inspector.node_catalog = NodeCatalog()
+    return inspector
+
+
+def columnar_graph_summary(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph],
+    inputs: List[str],
+    input_format: str,
+    input_compression: Optional[str] = None,
+    entity_type: Optional[GraphEntityType] = None,
+) -> None:
+    """
+    Summarize TSV/CSV inputs chunk by chunk, using
+    ``analyse_nodes`` and ``analyse_edges`` of the summary.
+
+    The rows of each chunk are grouped by the values of the columns that the
+    summary depends on and, for edges, by the categories of their subject and
+    object in the node catalog of the summary. Only the first row of each group
+    is turned into a record, and all the rows of the group are counted at once.
+    The summary is the same as with a streaming summary of the same inputs,
+    though the warnings on the error log may be in a different order.
+
+    Parameters
+    ----------
+    inspector: Union[kgx.graph_operations.summarize_graph.GraphSummary, kgx.graph_operations.meta_knowledge_graph.MetaKnowledgeGraph]
+        The summary
+    inputs: List[str]
+        Input files
+    input_format: str
+        The input format (``tsv``, ``csv``)
+    input_compression: Optional[str]
+        The input compression type
+    entity_type: Optional[GraphEntityType]
+        The type of the records to summarize (both nodes and edges, by default)
+
+    """
+    if input_format not in {'tsv', 'csv'}:
+        raise ValueError(f"Columnar graph summary is not supported for input format '{input_format}'")
+    provenance_columns = sorted(knowledge_provenance_properties)
+    node_columns = ['category'] + provenance_columns + list(inspector.node_facet_properties or [])
+    edge_columns = ['predicate', 'relation'] + provenance_columns + list(inspector.edge_facet_properties or [])
+    for filename in inputs:
+        source = TsvSource()
+        frames = source.read_frames(
+            filename,
+            format=input_format,
+            compression=input_compression,
+            default_provenance=os.path.basename(filename),
+        )
+        for frame_type, chunk in frames:
+            if entity_type is not None and frame_type != entity_type:
+                continue
+            if frame_type == GraphEntityType.NODE:
+                _summarize_node_frame(inspector, source, chunk, node_columns)
+            else:
+                _summarize_edge_frame(inspector, source, chunk, edge_columns)
+
+
+# the null values of the identifiers of records (see kgx.utils.kgx_utils.is_null)
+_NULL_IDS = ['', ' ']
+
+# the prefix of a CURIE, as in PrefixManager.get_prefix
+_CURIE_PREFIX_PATTERN = r'^([^ <()>:]*):[^/ :]+$'
+
+
+def _summarize_node_frame(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph],
+    source: TsvSource,
+    chunk: pd.DataFrame,
+    columns: List[str],
+) -> None:
+    if 'id' not in chunk.columns:
+        # fail as a streaming summary would
+        for row in chunk.to_dict('records'):
+            source.read_node(row)
+        return
+    null_ids = chunk['id'].isin(_NULL_IDS)
+    for row in chunk[null_ids].to_dict('records'):
+        # nodes without an id are ignored
+        source.read_node(row)
+    chunk = chunk[~null_ids].reset_index(drop=True)
+
+    # the first record with a given id is the one that is analysed
+    duplicated = chunk['id'].duplicated()
+    first = chunk[~duplicated].reset_index(drop=True)
+    ids = first['id'].tolist()
+    keys = [first['id'].str.extract(_CURIE_PREFIX_PATTERN, expand=False).fillna('')]
+    keys.extend(first[c] for c in dict.fromkeys(columns) if c in first.columns)
+    for group in _group_rows(keys):
+        rec = source.read_node(first.iloc[group[0]].to_dict())
+        if rec:
+            inspector.analyse_nodes([ids[i] for i in group], rec[1])
+    if duplicated.any():
+        # already in the node catalog, thus only reported as duplicates
+        inspector.analyse_nodes(chunk['id'][duplicated].tolist(), {})
+
+
+def _summarize_edge_frame(
+    inspector: Union[summarize_graph.GraphSummary, meta_knowledge_graph.MetaKnowledgeGraph],
+    source: TsvSource,
+    chunk: pd.DataFrame,
+    columns: List[str],
+) -> None:
+    if 'subject' not in chunk.columns or 'object' not in chunk.columns:
+        invalid = chunk
+    else:
+        invalid = chunk[chunk['subject'].isin(_NULL_IDS) | chunk['object'].isin(_NULL_IDS)]
+    for row in invalid.to_dict('records'):
+        # fail as a streaming summary would
+        source.read_edge(row)
+
+    subjects = chunk['subject'].tolist()
+    objects = chunk['object'].tolist()
+    keys = [
+        pd.Series(inspector.node_catalog.get_indices(subjects)),
+        pd.Series(inspector.node_catalog.get_indices(objects)),
+    ]
+    keys.extend(chunk[c].reset_index(drop=True) for c in dict.fromkeys(columns) if c in chunk.columns)
+    for group in _group_rows(keys):
+        rec = source.read_edge(chunk.iloc[group[0]].to_dict())
+        if rec:
+            inspector.analyse_edges([(subjects[i], objects[i]) for i in group], rec[3])
+
+
+def _group_rows(keys: List[pd.Series]) -> List[np.ndarray]:
+    # the positions of the rows with the same keys, by order of first appearance,
+    # null keys being grouped together rather than left out of the groups
+    frame = pd.DataFrame({i: key.to_numpy() for i, key in enumerate(keys)})
+    if frame.empty:
+        return []
+    codes = frame.groupby(list(frame.columns), sort=False, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    return np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
 
 
 def validate(
@@ -171,11 +621,30 @@ def validate(
     input_compression: Optional[str],
     output: Optional[str],
     stream: bool,
-    biolink_release: Optional[str] = None
+    biolink_release: Optional[str] = None,
+    processes: int = 1,
+    aggregate: bool = False,
+    max_examples: int = 10,
+    error_jsonl: Optional[str] = None,
+    columnar: bool = False,
 ) -> List:
     """
     Run KGX validator on an input file to check for Biolink Model compliance.
 
+    With ``columnar``, TSV/CSV inputs are validated chunk by chunk, with the checks
+    that only depend on one column done over whole columns (see ``columnar_validate``).
+
+    With ``aggregate``, errors are counted by type, message template and level
+    instead of being kept one by one, so that memory stays bounded however
+    many errors there are. The full errors can be written to a JSON lines file
+    with ``error_jsonl``, which implies ``aggregate``.
+
+    When more than one process is used, the input records are streamed and
+    validated in chunks by worker processes, each with its own Validator.
+    If there is more than one input file and the format allows it, each worker
+    also parses its own file. The errors of all workers are merged in the order
+    of the input records, so that the report is the same as with one process.
+
     Parameters
     ----------
     inputs: List[str]
@@ -190,10 +659,20 @@ def validate(
          Whether to parse input as a stream.
     biolink_release: Optional[str] = None
         SemVer version of Biolink Model Release used for validation (default: latest Biolink Model Toolkit version)
+    processes: int
+        Number of processes to use
+    aggregate: bool
+        Whether to aggregate errors in the report
+    max_examples: int
+        The maximum number of example entities per aggregated error
+    error_jsonl: Optional[str]
+        Path to a JSON lines file to write every error to
+    columnar: bool
+        Whether to validate TSV/CSV inputs column-wise
     Returns
     -------
     List
-        Returns a list of errors, if any
+        Returns a list of errors, if any (a list of aggregated errors, if aggregating)
 
     """
     # New design pattern enabling 'stream' processing of statistics on a small memory footprint
@@ -204,10 +683,30 @@ def validate(
     #
     Validator.set_biolink_model(biolink_release)
 
+    error_collector = None
+    error_stream = None
+    if aggregate or error_jsonl:
+        if error_jsonl:
+            error_stream = open(error_jsonl, 'w')
+        error_collector = ErrorCollector(max_examples, error_stream)
+
     # Validator assumes the currently set Biolink Release
-    validator = Validator()
+    validator = Validator(error_collector=error_collector)
 
-    if stream:
+    if columnar:
+        if processes > 1:
+            raise ValueError("Columnar validation cannot be combined with more than one process")
+        columnar_validate(validator, inputs, input_format, input_compression)
+    elif processes > 1:
+        input_args = {
+            'filename': inputs,
+            'format': input_format,
+            'compression': input_compression,
+        }
+        validator.add_errors(
+            parallel_validate(input_args, biolink_release, processes, error_collector)
+        )
+    elif stream:
         transformer = Transformer(stream=stream)
         
         transformer.transform(
@@ -243,11 +742,176 @@ def validate(
         validator.write_report(open(output, 'w'))
     else:
         validator.write_report(sys.stdout)
+    if error_stream:
+        error_stream.close()
 
     # ... Third, we return directly any validation errors to the caller
+    if error_collector is not None:
+        return error_collector.get_summary()
     return validator.get_errors()
 
 
+def columnar_validate(
+    validator: Validator,
+    inputs: List[str],
+    input_format: str,
+    input_compression: Optional[str] = None,
+) -> None:
+    """
+    Validate TSV/CSV inputs chunk by chunk, using
+    ``Validator.analyse_node_frame`` and ``Validator.analyse_edge_frame``.
+
+    The errors are added to the validator, in the same order as
+    with a streaming validation of the same inputs.
+
+    Parameters
+    ----------
+    validator: kgx.validator.Validator
+        The validator
+    inputs: List[str]
+        Input files
+    input_format: str
+        The input format (``tsv``, ``csv``)
+    input_compression: Optional[str]
+        The input compression type
+
+    """
+    if input_format not in {'tsv', 'csv'}:
+        raise ValueError(f"Columnar validation is not supported for input format '{input_format}'")
+    for filename in inputs:
+        source = TsvSource()
+        frames = source.read_frames(
+            filename,
+            format=input_format,
+            compression=input_compression,
+            default_provenance=os.path.basename(filename),
+        )
+        for entity_type, chunk in frames:
+            rows = chunk.to_dict('records')
+            if entity_type == GraphEntityType.NODE:
+                records = [source.read_node(x) for x in rows]
+                validator.add_errors(validator.analyse_node_frame(chunk, records))
+            else:
+                records = [source.read_edge(x) for x in rows]
+                validator.add_errors(validator.analyse_edge_frame(chunk, records))
+
+
+def parallel_validate(
+    input_args: Dict,
+    biolink_release: Optional[str] = None,
+    processes: int = 1,
+    error_collector: Optional[ErrorCollector] = None,
+) -> List:
+    """
+    Validate the records from an input in parallel.
+
+    With an ``error_collector``, each worker aggregates its own errors
+    and the workers' collectors are merged into ``error_collector``,
+    in the order of the input records.
+
+    Parameters
+    ----------
+    input_args: Dict
+        Arguments relevant to your input source
+    biolink_release: Optional[str]
+        SemVer version of Biolink Model Release used for validation
+    processes: int
+        Number of processes to use
+    error_collector: Optional[kgx.validator.ErrorCollector]
+        The collector to aggregate errors into
+
+    Returns
+    -------
+    List
+        A list of errors, in the order of the input records (empty with an ``error_collector``)
+
+    """
+    errors: List = []
+    max_examples = None
+    directory = None
+    if error_collector is not None:
+        max_examples = error_collector.max_examples
+        if error_collector.error_stream:
+            directory = tempfile.mkdtemp(prefix='validation-')
+    pool = Pool(
+        processes=processes,
+        initializer=_init_validation_worker,
+        initargs=(biolink_release, max_examples, directory),
+    )
+    try:
+        filenames = input_args.get('filename', [])
+        if len(filenames) > 1 and input_args['format'] in SELF_CONTAINED_FORMATS:
+            log.info(f"Validating {len(filenames)} files with {processes} processes")
+            shards = ({**input_args, 'filename': [f]} for f in filenames)
+            results = pool.imap(_validate_input, shards)
+        else:
+            log.info(f"Validating records with {processes} processes")
+            _, source_generator = Transformer(stream=True).get_source_generator(dict(input_args))
+            records = (rec for rec in source_generator if rec)
+            chunks = iter(lambda: list(islice(records, VALIDATION_CHUNK_SIZE)), [])
+            results = pool.imap(_validate_records, chunks)
+        for result in results:
+            if error_collector is None:
+                errors.extend(result)
+                continue
+            shard_collector, filename = result
+            error_collector.merge(shard_collector)
+            if filename:
+                with open(filename) as fh:
+                    shutil.copyfileobj(fh, error_collector.error_stream)
+                os.remove(filename)
+    finally:
+        pool.close()
+        pool.join()
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+    return errors
+
+
+_worker_validator: Optional[Validator] = None
+_worker_max_examples: Optional[int] = None
+_worker_directory: Optional[str] = None
+
+
+def _init_validation_worker(
+    biolink_release: Optional[str], max_examples: Optional[int] = None, directory: Optional[str] = None
+) -> None:
+    global _worker_validator, _worker_max_examples, _worker_directory
+    Validator.set_biolink_model(biolink_release)
+    _worker_validator = Validator()
+    _worker_max_examples = max_examples
+    _worker_directory = directory
+
+
+def _validate_records(records: List[Tuple]) -> Union[List, Tuple[ErrorCollector, Optional[str]]]:
+    if _worker_max_examples is None:
+        errors = []
+        for rec in records:
+            errors += _analyse_record(rec)
+        return errors
+    collector = ErrorCollector(_worker_max_examples)
+    filename = None
+    if _worker_directory:
+        fd, filename = tempfile.mkstemp(suffix='.jsonl', dir=_worker_directory)
+        collector.error_stream = os.fdopen(fd, 'w')
+    for rec in records:
+        collector.add_all(_analyse_record(rec))
+    if collector.error_stream:
+        collector.error_stream.close()
+    return collector, filename
+
+
+def _analyse_record(rec: Tuple) -> List:
+    if len(rec) == 4:
+        return _worker_validator.analyse_edge(*rec)
+    return _worker_validator.analyse_node(*rec)
+
+
+def _validate_input(input_args: Dict) -> Union[List, Tuple[ErrorCollector, Optional[str]]]:
+    _, source_generator = Transformer(stream=True).get_source_generator(input_args)
+    return _validate_records(rec for rec in source_generator if rec)
+
+
 def neo4j_download(
     uri: str,
     username: str,
@@ -458,7 +1122,8 @@ def transform(
     knowledge_sources: Optional[List[Tuple[str, str]]]
         A list of named knowledge sources with (string, boolean or tuple rewrite) specification
     processes: int
-        Number of processes to use
+        Number of processes to use (to transform the sources of a transform config,
+        or to tokenize N-Triples inputs)
     infores_catalog: Optional[str]
         Optional dump of a TSV file of InfoRes CURIE to
         Knowledge Source mappings (not yet available in transform_config calling mode)
@@ -568,6 +1233,10 @@ def transform(
                 else:
                     source_dict['input'][ksf] = ksf_spec
 
+        if input_format == 'nt' and processes > 1:
+            # N-Triples are tokenized by worker processes
+            source_dict['input']['processes'] = processes
+
         name = os.path.basename(inputs[0])
         transform_source(
             key=name,
@@ -583,11 +1252,24 @@ def merge(
     source: Optional[List] = None,
     destination: Optional[List] = None,
     processes: int = 1,
-) -> BaseGraph:
+    stream: bool = False,
+    incremental: bool = False,
+) -> Optional[BaseGraph]:
     """
     Load nodes and edges from files and KGs, as defined in a config YAML, and merge them into a single graph.
     The merged graph can then be written to a local/remote Neo4j instance OR be serialized into a file.
 
+    When ``stream`` is ``True``, the merged graph is never held in memory. Instead, each
+    source is written to an id-sorted shard and the shards are merged record by record,
+    directly into the destination(s). Graph operations are not supported in this mode.
+    With more than one process, the nodes and edges are hash-partitioned and
+    each partition is merged in parallel.
+
+    When ``incremental`` is ``True``, the sources are merged as a stream and the
+    shards of each source are kept in a ``merge_cache`` folder in the output directory.
+    On subsequent runs, only the sources whose input files or configuration have
+    changed are parsed again, before all the shards are merged into the destination(s).
+
     Parameters
     ----------
     merge_config: str
@@ -598,11 +1280,16 @@ def merge(
         A list of destination to write to, as defined in the YAML
     processes: int
         Number of processes to use
+    stream: bool
+        Whether to merge the sources as a stream
+    incremental: bool
+        Whether to only parse the sources that have changed since the previous
+        incremental merge (implies ``stream``)
 
     Returns
     -------
-    kgx.graph.base_graph.BaseGraph
-        The merged graph
+    Optional[kgx.graph.base_graph.BaseGraph]
+        The merged graph, or ``None`` when merging as a stream
 
     """
     # Use the directory within which the 'merge_config' file
@@ -648,6 +1335,33 @@ def merge(
         if key in source:
             sources_to_parse[key] = cfg['merged_graph']['source'][key]
 
+    destination_to_write: Dict[str, Dict] = {}
+    for d in destination:
+        if d in cfg['merged_graph']['destination']:
+            destination_to_write[d] = cfg['merged_graph']['destination'][d]
+        else:
+            raise KeyError(f"Cannot find destination '{d}' in YAML")
+
+    if stream or incremental:
+        if 'operations' in cfg['merged_graph']:
+            raise ValueError("Graph operations cannot be applied when merging as a stream")
+        _stream_merge(
+            sources_to_parse,
+            destination_to_write,
+            output_directory,
+            top_level_args,
+            processes,
+            os.path.abspath(os.path.join(output_directory, MERGE_CACHE_DIRECTORY))
+            if incremental
+            else None,
+            list(cfg['merged_graph']['source']),
+        )
+        if not destination_to_write:
+            log.warning(
+                f"No destination provided in {merge_config}. The merged graph will not be persisted."
+            )
+        return None
+
     results = []
     pool = Pool(processes=processes)
     for k, v in sources_to_parse.items():
@@ -662,6 +1376,7 @@ def merge(
                 top_level_args['node_property_predicates'],
                 top_level_args['predicate_mappings'],
                 top_level_args['checkpoint'],
+                top_level_args['checkpoint_format'],
             ),
         )
         results.append(result)
@@ -677,13 +1392,6 @@ def merge(
     if 'operations' in cfg['merged_graph']:
         apply_graph_operations(merged_graph, cfg['merged_graph']['operations'])
 
-    destination_to_write: Dict[str, Dict] = {}
-    for d in destination:
-        if d in cfg['merged_graph']['destination']:
-            destination_to_write[d] = cfg['merged_graph']['destination'][d]
-        else:
-            raise KeyError(f"Cannot find destination '{d}' in YAML")
-
     # write the merged graph
     node_properties = set()
     edge_properties = set()
@@ -695,41 +1403,13 @@ def merge(
     if destination_to_write:
         for key, destination_info in destination_to_write.items():
             log.info(f"Writing merged graph to {key}")
-            output_args = {
-                'format': destination_info['format'],
-                'reverse_prefix_map': top_level_args['reverse_prefix_map'],
-                'reverse_predicate_mappings': top_level_args['reverse_predicate_mappings'],
-            }
-            if 'reverse_prefix_map' in destination_info:
-                output_args['reverse_prefix_map'].update(destination_info['reverse_prefix_map'])
-            if 'reverse_predicate_mappings' in destination_info:
-                output_args['reverse_predicate_mappings'].update(
-                    destination_info['reverse_predicate_mappings']
-                )
-            if destination_info['format'] == 'neo4j':
-                output_args['uri'] = destination_info['uri']
-                output_args['username'] = destination_info['username']
-                output_args['password'] = destination_info['password']
-            elif destination_info['format'] in get_input_file_types():
-                filename = destination_info['filename']
-                if isinstance(filename, list):
-                    filename = filename[0]
-                destination_filename = f"{output_directory}/{filename}"
-                output_args['filename'] = destination_filename
-                output_args['compression'] = (
-                    destination_info['compression'] if 'compression' in destination_info else None
-                )
-                if destination_info['format'] == 'nt':
-                    output_args['property_types'] = top_level_args['property_types']
-                    if 'property_types' in top_level_args:
-                        output_args['property_types'].update(destination_info['property_types'])
-                if destination_info['format'] in {'csv', 'tsv'}:
-                    output_args['node_properties'] = node_properties
-                    output_args['edge_properties'] = edge_properties
-            else:
-                raise TypeError(
-                    f"type {destination_info['format']} not yet supported for KGX merge operation."
-                )
+            output_args = prepare_merge_output_args(
+                destination_info,
+                output_directory,
+                top_level_args,
+                node_properties,
+                edge_properties,
+            )
             transformer = Transformer()
             transformer.transform(input_args, output_args)
     else:
@@ -747,6 +1427,7 @@ def parse_source(
     node_property_predicates: Set[str] = None,
     predicate_mappings: Dict[str, str] = None,
     checkpoint: bool = False,
+    checkpoint_format: str = 'tsv',
 ) -> Sink:
     """
     Parse a source from a merge config YAML.
@@ -766,7 +1447,10 @@ def parse_source(
     predicate_mappings: Dict[str, str]
         A mapping of predicate IRIs to property names (This is applicable for RDF)
     checkpoint: bool
-        Whether to serialize each individual source to a TSV
+        Whether to serialize each individual source
+    checkpoint_format: str
+        The format for the checkpoint (``tsv``, by default). Use ``snapshot``
+        for a KGX snapshot that can be reloaded without reparsing the source.
 
     Returns
     -------
@@ -791,7 +1475,9 @@ def parse_source(
     if checkpoint:
         log.info(f"Writing checkpoint for source '{key}'")
         checkpoint_output = f"{output_directory}/{key}" if output_directory else key
-        transformer.save({'filename': checkpoint_output, 'format': 'tsv'})
+        if checkpoint_format == 'snapshot':
+            checkpoint_output = f"{checkpoint_output}.{SNAPSHOT_EXTENSION}"
+        transformer.save({'filename': checkpoint_output, 'format': checkpoint_format})
 
     # Current "Callable" metadata not needed at this  point
     # but causes peculiar problems downstream, so we clear it.
@@ -800,6 +1486,456 @@ def parse_source(
     return transformer.store
 
 
+def parse_source_to_shard(
+    key: str,
+    source: dict,
+    output_directory: str,
+    shard_directory: str,
+    prefix_map: Dict[str, str] = None,
+    node_property_predicates: Set[str] = None,
+    predicate_mappings: Dict[str, str] = None,
+    checkpoint: bool = False,
+    checkpoint_format: str = 'tsv',
+    partitions: int = 1,
+) -> Tuple[List[str], Set[str], Set[str]]:
+    """
+    Parse a source from a merge config YAML as a stream and write it to one shard
+    per partition, where nodes are sorted by ``node_sort_key`` and edges are sorted
+    by ``edge_sort_key``. Each node and edge is routed to a partition by
+    ``kgx.graph_operations.graph_merge.get_partition``.
+
+    The records of the source are sorted in runs written to temporary files (see
+    ``kgx.utils.sort_utils.SortedRuns``), which are merged into the shards, so that
+    the source is never held in memory. Records of the same node or edge are folded
+    into one, as when they are added to a graph. The graph operations of the source
+    are applied to each record, and should not need the whole graph.
+
+    Only the names of the shards are returned to the caller, instead of
+    the entire graph for the source.
+
+    Parameters
+    ----------
+    key: str
+        Source key
+    source: Dict
+        Source configuration
+    output_directory: str
+        Location to write output to
+    shard_directory: str
+        Location to write the shard to
+    prefix_map: Dict[str, str]
+        Non-canonical CURIE mappings
+    node_property_predicates: Set[str]
+        A set of predicates that ought to be treated as node properties (This is applicable for RDF)
+    predicate_mappings: Dict[str, str]
+        A mapping of predicate IRIs to property names (This is applicable for RDF)
+    checkpoint: bool
+        Whether to serialize each individual source
+    checkpoint_format: str
+        The format for the checkpoint (``tsv``, by default)
+    partitions: int
+        The number of partitions to split the source into
+
+    Returns
+    -------
+    Tuple[List[str], Set[str], Set[str]]
+        The shard filename for each partition, along with the node properties
+        and edge properties of the source
+
+    """
+    log.info(f"Processing source '{key}'")
+    if not key:
+        key = os.path.basename(source['input']['filename'][0])
+    input_args = prepare_input_args(
+        key,
+        source,
+        output_directory,
+        prefix_map,
+        node_property_predicates,
+        predicate_mappings
+    )
+    record_operation = compile_stream_operations(input_args.pop('operations', []))
+    shards = [
+        os.path.join(shard_directory, f"{key}-{p}.{SNAPSHOT_EXTENSION}")
+        for p in range(partitions)
+    ]
+    run_directory = tempfile.mkdtemp(prefix='runs-', dir=shard_directory)
+    try:
+        # the memory budget is shared by the runs of nodes and the runs of edges
+        node_runs = SortedRuns(node_sort_key, DEFAULT_MAX_MEMORY / 2, run_directory, record_size=record_size)
+        edge_runs = SortedRuns(edge_sort_key, DEFAULT_MAX_MEMORY / 2, run_directory, record_size=record_size)
+
+        def add(entity_type: GraphEntityType, rec: Tuple) -> None:
+            for r in record_operation(rec) if record_operation else [rec]:
+                if len(r) == 4:
+                    edge_runs.add(r[-1])
+                else:
+                    node_runs.add(r[-1])
+
+        transformer = Transformer(stream=True)
+        sources, source_generator = transformer.get_source_generator(input_args)
+        transformer.inspector = add
+        transformer.process(source_generator, NullSink())
+
+        log.info(f"Writing {partitions} shard(s) for source '{key}'")
+        sinks = [SnapshotSink(x) for x in shards]
+        for k, record in fold_sorted_records(node_runs.merge()):
+            sinks[get_partition(k, partitions)].write_node(record)
+        for k, record in fold_sorted_records(edge_runs.merge()):
+            sinks[get_partition(k, partitions)].write_edge(record)
+        for sink in sinks:
+            sink.finalize()
+    finally:
+        shutil.rmtree(run_directory, ignore_errors=True)
+
+    node_properties: Set[str] = set()
+    edge_properties: Set[str] = set()
+    for s in sources:
+        node_properties.update(s.node_properties)
+        edge_properties.update(s.edge_properties)
+    if checkpoint:
+        log.info(f"Writing checkpoint for source '{key}'")
+        checkpoint_output = f"{output_directory}/{key}" if output_directory else key
+        if checkpoint_format == 'snapshot':
+            checkpoint_output = f"{checkpoint_output}.{SNAPSHOT_EXTENSION}"
+        sink = transformer.get_stream_sink(
+            {'filename': checkpoint_output, 'format': checkpoint_format},
+            node_properties,
+            edge_properties,
+        )
+        transformer.process(read_partitions(shards), sink)
+        sink.finalize()
+    return shards, node_properties, edge_properties
+
+
+def fold_sorted_records(records: Iterable[Tuple[Any, Dict]]) -> Generator:
+    """
+    Fold the consecutive records with the same key into one, each updating
+    the properties of the previous ones, as when a node or an edge is added
+    to a graph more than once.
+
+    Parameters
+    ----------
+    records: Iterable[Tuple[Any, Dict]]
+        The key and the record of each record, sorted by key
+
+    Returns
+    -------
+    Generator
+        A generator for the key and the folded record of each key
+
+    """
+    current = None
+    current_key = None
+    for k, record in records:
+        if current is not None and k == current_key:
+            current.update(record)
+        else:
+            if current is not None:
+                yield current_key, current
+            current = record
+            current_key = k
+    if current is not None:
+        yield current_key, current
+
+
+def merge_shards(shards: List[str], preserve: bool = True) -> Generator:
+    """
+    Merge one or more shards of the same partition, as written by
+    ``parse_source_to_shard``, into a single stream of node and edge records.
+
+    Parameters
+    ----------
+    shards: List[str]
+        A list of shard filenames
+    preserve: bool
+        Whether or not to preserve conflicting properties
+
+    Returns
+    -------
+    Generator
+        A generator for merged node and edge records
+
+    """
+    node_streams = [read_records(x, NODE_FRAME) for x in shards]
+    for record in merge_sorted_records(node_streams, node_sort_key, preserve):
+        yield record['id'], record
+    edge_streams = [read_records(x, EDGE_FRAME) for x in shards]
+    for record in merge_sorted_records(edge_streams, edge_sort_key, preserve):
+        s, o, key = edge_sort_key(record)
+        yield s, o, key, record
+
+
+def merge_partition(shards: List[str], filename: str, preserve: bool = True) -> str:
+    """
+    Merge all the shards of a partition and write the merged records to a KGX snapshot.
+
+    Parameters
+    ----------
+    shards: List[str]
+        The shard filenames of the partition, one per source
+    filename: str
+        The filename to write the merged partition to
+    preserve: bool
+        Whether or not to preserve conflicting properties
+
+    Returns
+    -------
+    str
+        The filename of the merged partition
+
+    """
+    sink = SnapshotSink(filename)
+    for rec in merge_shards(shards, preserve):
+        if len(rec) == 4:
+            sink.write_edge(rec[-1])
+        else:
+            sink.write_node(rec[-1])
+    sink.finalize()
+    return filename
+
+
+def read_partitions(partitions: List[str]) -> Generator:
+    """
+    Read the merged partitions, as written by ``merge_partition``,
+    as a single stream of node records followed by edge records.
+
+    Parameters
+    ----------
+    partitions: List[str]
+        The filenames of the merged partitions
+
+    Returns
+    -------
+    Generator
+        A generator for node and edge records
+
+    """
+    for filename in partitions:
+        for record in read_records(filename, NODE_FRAME):
+            yield record['id'], record
+    for filename in partitions:
+        for record in read_records(filename, EDGE_FRAME):
+            s, o, key = edge_sort_key(record)
+            yield s, o, key, record
+
+
+def fingerprint_source(
+    key: str, source: Dict, top_level_args: Dict, partitions: int = 1
+) -> Optional[str]:
+    """
+    Compute a fingerprint for a source from a merge config YAML.
+
+    The fingerprint covers the source configuration, the top-level configuration
+    that affects parsing, the number of partitions, and the path, size and
+    modification time of each input file. Sources that are not read from files
+    (like ``neo4j``) cannot be fingerprinted.
+
+    Parameters
+    ----------
+    key: str
+        Source key
+    source: Dict
+        Source configuration
+    top_level_args: Dict
+        Parsed top-level configuration, as returned by ``prepare_top_level_args``
+    partitions: int
+        The number of partitions the source is split into
+
+    Returns
+    -------
+    Optional[str]
+        The fingerprint, or ``None`` if the source cannot be fingerprinted
+
+    """
+    if source['input']['format'] not in get_input_file_types():
+        return None
+    files = []
+    for filename in source['input']['filename']:
+        if not os.path.exists(filename):
+            return None
+        stat = os.stat(filename)
+        files.append([os.path.abspath(filename), stat.st_size, stat.st_mtime_ns])
+    content = {
+        'key': key,
+        'source': source,
+        'files': files,
+        'prefix_map': top_level_args['prefix_map'],
+        'node_property_predicates': sorted(top_level_args['node_property_predicates']),
+        'predicate_mappings': top_level_args['predicate_mappings'],
+        'partitions': partitions,
+        'snapshot_version': SNAPSHOT_VERSION,
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def _stream_merge(
+    sources_to_parse: Dict[str, Dict],
+    destination_to_write: Dict[str, Dict],
+    output_directory: str,
+    top_level_args: Dict,
+    processes: int = 1,
+    cache_directory: Optional[str] = None,
+    configured_sources: Optional[List[str]] = None,
+) -> None:
+    """
+    Parse each source to shards and merge the shards directly into each destination.
+
+    When more than one process is available, the nodes and edges are hash-partitioned
+    into one partition per process and each partition is merged in its own process.
+
+    When a ``cache_directory`` is given, the shards of each source are kept there,
+    along with a manifest of source fingerprints. Only the sources whose fingerprint
+    has changed since the previous run are parsed again, and the shards of sources
+    that are no longer in ``configured_sources`` are removed. The shards of configured
+    sources that are not merged in this run are kept for later runs.
+    """
+    manifest: Dict[str, Dict] = {}
+    if cache_directory:
+        os.makedirs(cache_directory, exist_ok=True)
+        shard_directory = cache_directory
+        manifest_filename = os.path.join(cache_directory, MERGE_MANIFEST)
+        if os.path.exists(manifest_filename):
+            with open(manifest_filename) as fh:
+                manifest = json.load(fh)
+    else:
+        shard_directory = tempfile.mkdtemp(prefix='shards-', dir=output_directory)
+    merge_directory = tempfile.mkdtemp(prefix='merged-', dir=output_directory)
+    try:
+        contributions: Dict[str, Dict] = {}
+        fingerprints: Dict[str, Optional[str]] = {}
+        results = {}
+        pool = Pool(processes=processes)
+        for k, v in sources_to_parse.items():
+            if cache_directory:
+                fingerprints[k] = fingerprint_source(k, v, top_level_args, processes)
+                cached = manifest.get(k)
+                if (
+                    fingerprints[k]
+                    and cached
+                    and cached['fingerprint'] == fingerprints[k]
+                    and all(os.path.exists(x) for x in cached['shards'])
+                ):
+                    log.info(f"Source '{k}' is unchanged; reusing its shards")
+                    contributions[k] = cached
+                    continue
+            log.info(f"Spawning process for '{k}'")
+            results[k] = pool.apply_async(
+                parse_source_to_shard,
+                (
+                    k,
+                    v,
+                    output_directory,
+                    shard_directory,
+                    top_level_args['prefix_map'],
+                    top_level_args['node_property_predicates'],
+                    top_level_args['predicate_mappings'],
+                    top_level_args['checkpoint'],
+                    top_level_args['checkpoint_format'],
+                    processes,
+                ),
+            )
+        pool.close()
+        pool.join()
+        for k, r in results.items():
+            source_shards, shard_node_properties, shard_edge_properties = r.get()
+            contributions[k] = {
+                'fingerprint': fingerprints.get(k),
+                'shards': source_shards,
+                'node_properties': sorted(shard_node_properties),
+                'edge_properties': sorted(shard_edge_properties),
+            }
+
+        if cache_directory:
+            # carry forward the shards of the configured sources that were not selected
+            configured = set(configured_sources or []) | set(sources_to_parse)
+            kept = dict(contributions)
+            for k, cached in manifest.items():
+                if k not in kept and k in configured:
+                    kept[k] = cached
+            with open(os.path.join(cache_directory, MERGE_MANIFEST), 'w') as fh:
+                json.dump(kept, fh, indent=2)
+            current = {x for c in kept.values() for x in c['shards']}
+            for filename in os.listdir(cache_directory):
+                path = os.path.join(cache_directory, filename)
+                if filename.endswith(f".{SNAPSHOT_EXTENSION}") and path not in current:
+                    log.info(f"Removing stale shard {path}")
+                    os.remove(path)
+
+        # shards are merged in the order the sources appear in the configuration
+        shards: List[List[str]] = [[] for _ in range(processes)]
+        node_properties = set()
+        edge_properties = set()
+        for k in sources_to_parse:
+            for p, shard in enumerate(contributions[k]['shards']):
+                shards[p].append(shard)
+            node_properties.update(contributions[k]['node_properties'])
+            edge_properties.update(contributions[k]['edge_properties'])
+
+        if processes > 1:
+            results = []
+            pool = Pool(processes=processes)
+            for p, partition_shards in enumerate(shards):
+                log.info(f"Spawning process for partition {p}")
+                result = pool.apply_async(
+                    merge_partition,
+                    (
+                        partition_shards,
+                        os.path.join(merge_directory, f"merged-{p}.{SNAPSHOT_EXTENSION}"),
+                    ),
+                )
+                results.append(result)
+            pool.close()
+            pool.join()
+            records = read_partitions([r.get() for r in results])
+        else:
+            records = merge_shards(shards[0])
+
+        transformer = Transformer()
+        sinks = []
+        for key, destination_info in destination_to_write.items():
+            log.info(f"Writing merged graph to {key}")
+            output_args = prepare_merge_output_args(
+                destination_info,
+                output_directory,
+                top_level_args,
+                node_properties,
+                edge_properties,
+            )
+            sink = transformer.get_sink(**output_args)
+            sink.node_properties.update(node_properties)
+            sink.edge_properties.update(edge_properties)
+            if 'reverse_prefix_map' in output_args:
+                sink.set_reverse_prefix_map(output_args['reverse_prefix_map'])
+            if isinstance(sink, RdfSink):
+                if 'reverse_predicate_mappings' in output_args:
+                    sink.set_reverse_predicate_mapping(output_args['reverse_predicate_mappings'])
+                if 'property_types' in output_args:
+                    sink.set_property_types(output_args['property_types'])
+            sinks.append(sink)
+
+        node_count = 0
+        edge_count = 0
+        for rec in records:
+            if len(rec) == 4:
+                edge_count += 1
+                for sink in sinks:
+                    sink.write_edge(rec[-1])
+            else:
+                node_count += 1
+                for sink in sinks:
+                    sink.write_node(rec[-1])
+        for sink in sinks:
+            sink.finalize()
+        log.info(f"Merged graph has {node_count} nodes and {edge_count} edges")
+    finally:
+        shutil.rmtree(merge_directory, ignore_errors=True)
+        if not cache_directory:
+            shutil.rmtree(shard_directory, ignore_errors=True)
+
+
 def transform_source(
     key: str,
     source: Dict,
@@ -961,6 +2097,9 @@ def prepare_input_args(
             'predicate_mappings': source_predicate_mappings,
             'node_property_predicates': source_node_property_predicates,
         }
+        for option in ['processes', 'max_in_memory', 'spill_directory']:
+            if option in source['input']:
+                input_args[option] = source['input'][option]
     elif input_format in get_input_file_types():
         input_args = {
             'filename': inputs,
@@ -1083,6 +2222,73 @@ def prepare_output_args(
     return output_args
 
 
+def prepare_merge_output_args(
+    destination_info: Dict,
+    output_directory: str,
+    top_level_args: Dict,
+    node_properties: Set[str],
+    edge_properties: Set[str],
+) -> Dict:
+    """
+    Prepare output arguments for writing a merged graph to a destination.
+
+    Parameters
+    ----------
+    destination_info: Dict
+        Destination configuration from the merge config YAML
+    output_directory: str
+        Location to write output to
+    top_level_args: Dict
+        Parsed top-level configuration, as returned by ``prepare_top_level_args``
+    node_properties: Set[str]
+        All the node properties of the merged graph
+    edge_properties: Set[str]
+        All the edge properties of the merged graph
+
+    Returns
+    -------
+    Dict
+        Output arguments as dictionary
+
+    """
+    output_args = {
+        'format': destination_info['format'],
+        'reverse_prefix_map': top_level_args['reverse_prefix_map'],
+        'reverse_predicate_mappings': top_level_args['reverse_predicate_mappings'],
+    }
+    if 'reverse_prefix_map' in destination_info:
+        output_args['reverse_prefix_map'].update(destination_info['reverse_prefix_map'])
+    if 'reverse_predicate_mappings' in destination_info:
+        output_args['reverse_predicate_mappings'].update(
+            destination_info['reverse_predicate_mappings']
+        )
+    if destination_info['format'] == 'neo4j':
+        output_args['uri'] = destination_info['uri']
+        output_args['username'] = destination_info['username']
+        output_args['password'] = destination_info['password']
+    elif destination_info['format'] in get_input_file_types():
+        filename = destination_info['filename']
+        if isinstance(filename, list):
+            filename = filename[0]
+        destination_filename = f"{output_directory}/{filename}"
+        output_args['filename'] = destination_filename
+        output_args['compression'] = (
+            destination_info['compression'] if 'compression' in destination_info else None
+        )
+        if destination_info['format'] == 'nt':
+            output_args['property_types'] = top_level_args['property_types']
+            if 'property_types' in top_level_args:
+                output_args['property_types'].update(destination_info['property_types'])
+        if destination_info['format'] in {'csv', 'tsv'}:
+            output_args['node_properties'] = node_properties
+            output_args['edge_properties'] = edge_properties
+    else:
+        raise TypeError(
+            f"type {destination_info['format']} not yet supported for KGX merge operation."
+        )
+    return output_args
+
+
 def apply_operations(source: dict, graph: BaseGraph) -> BaseGraph:
     """
     Apply operations as defined in the YAML.
@@ -1132,6 +2338,14 @@ def prepare_top_level_args(d: Dict) -> Dict:
         args['checkpoint'] = d['checkpoint']
     else:
         args['checkpoint'] = False
+    if 'checkpoint_format' in d and d['checkpoint_format']:
+        if d['checkpoint_format'] not in {'tsv', 'snapshot'}:
+            raise ValueError(
+                f"checkpoint_format must be one of ('tsv', 'snapshot'), not '{d['checkpoint_format']}'"
+            )
+        args['checkpoint_format'] = d['checkpoint_format']
+    else:
+        args['checkpoint_format'] = 'tsv'
     if 'node_property_predicates' in d and d['node_property_predicates']:
         args['node_property_predicates'] = set(d['node_property_predicates'])
     else:
@@ -38,33 +38,9 @@ def remap_node_identifier(
     """
     mapping: Dict = {}
     for nid, data in graph.nodes(data=True):
-        node_data = data.copy()
-        if 'category' in node_data and category not in node_data['category']:
-            continue
-
-        if alternative_property in node_data:
-            alternative_values = node_data[alternative_property]
-            if isinstance(alternative_values, (list, set, tuple)):
-                if prefix:
-                    for v in alternative_values:
-                        if prefix in v:
-                            # take the first occurring value that contains the given prefix
-                            mapping[nid] = {'id': v}
-                            break
-                else:
-                    # no prefix defined; pick the 1st one from list
-                    mapping[nid] = {'id': next(iter(alternative_values))}
-            elif isinstance(alternative_values, str):
-                if prefix:
-                    if alternative_values.startswith(prefix):
-                        mapping[nid] = {'id': alternative_values}
-                else:
-                    # no prefix defined
-                    mapping[nid] = {'id': alternative_values}
-            else:
-                log.error(
-                    f"Cannot use {alternative_values} from alternative_property {alternative_property}"
-                )
+        alternative_id = get_alternative_identifier(data, category, alternative_property, prefix)
+        if alternative_id:
+            mapping[nid] = {'id': alternative_id}
 
     graph.set_node_attributes(graph, attributes=mapping)
     graph.relabel_nodes(graph, {k: list(v.values())[0] for k, v in mapping.items()})
@@ -91,6 +67,59 @@ def remap_node_identifier(
     return graph
 
 
+def get_alternative_identifier(
+    node_data: Dict, category: str, alternative_property: str, prefix=None
+) -> Optional[str]:
+    """
+    Get the value from a node's ``alternative_property`` attribute that
+    should replace its 'id', as done by ``remap_node_identifier``.
+
+    Parameters
+    ----------
+    node_data: Dict
+        The node properties
+    category: string
+        category referring to nodes whose 'id' needs to be remapped
+    alternative_property: string
+        property name from which the new value is pulled from
+    prefix: string
+        signifies that the value for ``alternative_property`` is a list
+        and the ``prefix`` indicates which value to pick from the list
+
+    Returns
+    -------
+    Optional[str]
+        The new identifier, or None if the node is not remapped
+
+    """
+    if 'category' in node_data and category not in node_data['category']:
+        return None
+
+    if alternative_property in node_data:
+        alternative_values = node_data[alternative_property]
+        if isinstance(alternative_values, (list, set, tuple)):
+            if prefix:
+                for v in alternative_values:
+                    if prefix in v:
+                        # take the first occurring value that contains the given prefix
+                        return v
+            else:
+                # no prefix defined; pick the 1st one from list
+                return next(iter(alternative_values))
+        elif isinstance(alternative_values, str):
+            if prefix:
+                if alternative_values.startswith(prefix):
+                    return alternative_values
+            else:
+                # no prefix defined
+                return alternative_values
+        else:
+            log.error(
+                f"Cannot use {alternative_values} from alternative_property {alternative_property}"
+            )
+    return None
+
+
 def remap_node_property(
     graph: BaseGraph, category: str, old_property: str, new_property: str
 ) -> None:
@@ -118,7 +147,7 @@ def remap_node_property(
 
     for nid, data in graph.nodes(data=True):
         node_data = data.copy()
-        if category in node_data and category not in node_data['category']:
+        if 'category' in node_data and category not in node_data['category']:
             continue
         if new_property in node_data:
             mapping[nid] = {old_property: node_data[new_property]}
@@ -151,7 +180,7 @@ def remap_edge_property(
         )
     for u, v, k, data in graph.edges(data=True, keys=True):
         edge_data = data.copy()
-        if edge_predicate is not edge_data['predicate']:
+        if edge_predicate != edge_data['predicate']:
             continue
         if new_property in edge_data:
             mapping[(u, v, k)] = {old_property: edge_data[new_property]}
@@ -1,20 +1,27 @@
 import copy
-from typing import Tuple, Optional, Dict, List, Any, Set, Union
+import os
+import tempfile
+from multiprocessing import Pool
+from typing import Tuple, Optional, Dict, List, Any, Set, Union, Generator
 
 import networkx as nx
 from ordered_set import OrderedSet
 
 from kgx.config import get_logger
 from kgx.graph.base_graph import BaseGraph
+from kgx.sink import NullSink, SnapshotSink
+from kgx.transformer import Transformer
 from kgx.utils.kgx_utils import (
+    GraphEntityType,
     get_prefix_prioritization_map,
-    get_biolink_element,
     get_biolink_ancestors,
+    get_biolink_index,
     current_time_in_millis,
     format_biolink_category,
     generate_edge_key,
     get_toolkit
 )
+from kgx.utils.snapshot_utils import read_records, NODE_FRAME, SNAPSHOT_EXTENSION
 
 log = get_logger()
 toolkit = get_toolkit()
@@ -23,6 +30,289 @@ SUBCLASS_OF = 'biolink:subclass_of'
 LEADER_ANNOTATION = 'clique_leader'
 ORIGINAL_SUBJECT_PROPERTY = '_original_subject'
 ORIGINAL_OBJECT_PROPERTY = '_original_object'
+ELECTION_BATCH_SIZE = 10000
+
+
+class Cliques(object):
+    """
+    A disjoint set (union-find) over node identifiers, where each set is a
+    clique of nodes that are equivalent by way of ``same_as``.
+
+    Instead of copying every node into a separate graph, only the node
+    identifiers, the ``same_as`` pairs and a reference to the data of each
+    node in the target graph are kept. The cliques are computed once and are
+    shared between leader election and edge consolidation.
+    """
+
+    def __init__(self):
+        self.parent: Dict[str, str] = {}
+        self.size: Dict[str, int] = {}
+        self.node_data: Dict[str, Optional[Dict]] = {}
+        self.pairs: List[Tuple[str, str]] = []
+        self.cliques: Optional[List[List[str]]] = None
+        self.clique_pairs: List[List[Tuple[str, str]]] = []
+        # (leader, leader attributes, nodes to consolidate, equivalent identifiers of the leader)
+        self.consolidation: List[Tuple[str, Dict, List[str], Set[str]]] = []
+        # nodes removed from their clique during leader election
+        self.excluded: List[str] = []
+
+    @classmethod
+    def from_networkx(cls, clique_graph: nx.MultiDiGraph) -> 'Cliques':
+        """
+        Get the cliques of a clique graph, as returned by ``build_cliques``,
+        referencing the data of its nodes.
+
+        Parameters
+        ----------
+        clique_graph: networkx.MultiDiGraph
+            The clique graph
+
+        Returns
+        -------
+        kgx.graph_operations.clique_merge.Cliques
+            The cliques
+
+        """
+        cliques = cls()
+        for n, data in clique_graph.nodes(data=True):
+            cliques.add_node(n, data)
+        for u, v in clique_graph.edges():
+            # same_as edges come in both directions
+            if u <= v or not clique_graph.has_edge(v, u):
+                cliques.add_equivalence(u, v)
+        return cliques
+
+    def add_node(self, n: str, data: Optional[Dict] = None) -> None:
+        """
+        Add a node, along with a reference to its data in the target graph.
+
+        Parameters
+        ----------
+        n: str
+            Node identifier
+        data: Optional[Dict]
+            The node data in the target graph
+
+        """
+        if self.cliques is not None:
+            raise ValueError("Cannot add nodes once the cliques have been computed")
+        if n not in self.parent:
+            self.parent[n] = n
+            self.size[n] = 1
+            self.node_data[n] = None
+        if data is not None:
+            self.node_data[n] = data
+
+    def add_equivalence(self, u: str, v: str) -> None:
+        """
+        Record that node ``u`` is equivalent to node ``v``.
+
+        Parameters
+        ----------
+        u: str
+            Node identifier
+        v: str
+            Node identifier
+
+        """
+        self.add_node(u)
+        self.add_node(v)
+        self.pairs.append((u, v))
+        self.union(u, v)
+
+    def find(self, n: str) -> str:
+        """
+        Find the representative of the set that contains node ``n``.
+
+        Parameters
+        ----------
+        n: str
+            Node identifier
+
+        Returns
+        -------
+        str
+            The representative node identifier
+
+        """
+        parent = self.parent
+        while parent[n] != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
+    def union(self, u: str, v: str) -> None:
+        """
+        Merge the sets that contain node ``u`` and node ``v``.
+
+        Parameters
+        ----------
+        u: str
+            Node identifier
+        v: str
+            Node identifier
+
+        """
+        ru = self.find(u)
+        rv = self.find(v)
+        if ru == rv:
+            return
+        if self.size[ru] < self.size[rv]:
+            ru, rv = rv, ru
+        self.parent[rv] = ru
+        self.size[ru] += self.size.pop(rv)
+
+    def get_cliques(self) -> List[List[str]]:
+        """
+        Get all the cliques, with nodes in the order in which they were added.
+
+        The cliques are computed once, after which no more nodes or
+        equivalences can be added.
+
+        Returns
+        -------
+        List[List[str]]
+            A list of cliques
+
+        """
+        if self.cliques is None:
+            index: Dict[str, int] = {}
+            cliques: List[List[str]] = []
+            for n in self.parent:
+                root = self.find(n)
+                if root not in index:
+                    index[root] = len(cliques)
+                    cliques.append([])
+                cliques[index[root]].append(n)
+            clique_pairs: List[List[Tuple[str, str]]] = [[] for _ in cliques]
+            for u, v in self.pairs:
+                clique_pairs[index[self.find(u)]].append((u, v))
+            self.cliques = cliques
+            self.clique_pairs = clique_pairs
+            self.pairs = []
+            self.size = {}
+        return self.cliques
+
+    def get_clique_data(
+        self, i: int, properties: Optional[Set[str]] = None
+    ) -> Tuple[List[str], List[Tuple[str, str]], Dict[str, Optional[Dict]]]:
+        """
+        Get a snapshot of a single clique: its nodes, its ``same_as`` pairs
+        and a copy of the data of each node in the target graph.
+
+        Parameters
+        ----------
+        i: int
+            The index of the clique, as returned by ``get_cliques``
+        properties: Optional[Set[str]]
+            The node properties to copy (all properties, by default)
+
+        Returns
+        -------
+        Tuple[List[str], List[Tuple[str, str]], Dict[str, Optional[Dict]]]
+            A tuple containing the nodes, the ``same_as`` pairs and the node data
+
+        """
+        clique = self.get_cliques()[i]
+        node_data: Dict[str, Optional[Dict]] = {}
+        for n in clique:
+            data = self.node_data[n]
+            if data is not None:
+                data = {
+                    k: v
+                    for k, v in data.items()
+                    if k != 'same_as' and (properties is None or k in properties)
+                }
+            node_data[n] = data
+        return clique, self.clique_pairs[i], node_data
+
+    def get_clique_graph(self, i: int) -> nx.MultiDiGraph:
+        """
+        Get a clique graph for a single clique.
+
+        Parameters
+        ----------
+        i: int
+            The index of the clique, as returned by ``get_cliques``
+
+        Returns
+        -------
+        networkx.MultiDiGraph
+            The clique graph
+
+        """
+        return make_clique_graph(*self.get_clique_data(i))
+
+    def get_leader_map(self) -> Dict[str, str]:
+        """
+        Get a map from each node in a clique to its clique leader,
+        for all the cliques with a leader elected by ``elect_clique_leaders``.
+
+        Returns
+        -------
+        Dict[str, str]
+            A map from node identifier to the identifier of its clique leader
+
+        """
+        leader_map: Dict[str, str] = {}
+        for leader, _, clique, _ in self.consolidation:
+            for n in clique:
+                if n != leader:
+                    leader_map[n] = leader
+        return leader_map
+
+    def to_networkx(self) -> nx.MultiDiGraph:
+        """
+        Get all the cliques as a single clique graph, where each
+        elected leader carries its leader annotation.
+
+        Returns
+        -------
+        networkx.MultiDiGraph
+            The clique graph
+
+        """
+        clique_graph = nx.MultiDiGraph()
+        for i in range(len(self.get_cliques())):
+            clique_graph.update(self.get_clique_graph(i))
+        for leader, attributes, _, _ in self.consolidation:
+            clique_graph.nodes[leader].update(attributes)
+        return clique_graph
+
+
+def make_clique_graph(
+    clique: List[str], pairs: List[Tuple[str, str]], node_data: Dict[str, Optional[Dict]]
+) -> nx.MultiDiGraph:
+    """
+    Make a clique graph, where nodes carry a copy of their data
+    and equivalent nodes are connected via ``same_as`` edges in both directions.
+
+    Parameters
+    ----------
+    clique: List[str]
+        A list of nodes in a clique
+    pairs: List[Tuple[str, str]]
+        A list of ``same_as`` pairs
+    node_data: Dict[str, Optional[Dict]]
+        The data for each node, if any
+
+    Returns
+    -------
+    networkx.MultiDiGraph
+        The clique graph
+
+    """
+    clique_graph = nx.MultiDiGraph()
+    for n in clique:
+        data = node_data.get(n)
+        if data is None:
+            clique_graph.add_node(n)
+        else:
+            clique_graph.add_node(n, **data)
+    for u, v in pairs:
+        clique_graph.add_edge(u, v, subject=u, predicate=SAME_AS, object=v)
+        clique_graph.add_edge(v, u, subject=v, predicate=SAME_AS, object=u)
+    return clique_graph
 
 
 def clique_merge(
@@ -31,6 +321,7 @@ def clique_merge(
     prefix_prioritization_map: Optional[Dict[str, List[str]]] = None,
     category_mapping: Optional[Dict[str, str]] = None,
     strict: bool = True,
+    processes: int = 1,
 ) -> Tuple[BaseGraph, nx.MultiDiGraph]:
     """
 
@@ -46,6 +337,8 @@ def clique_merge(
         Mapping for non-Biolink Model categories to Biolink Model categories
     strict: bool
         Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use for leader election
 
     Returns
     -------
@@ -74,6 +367,7 @@ def clique_merge(
         prefix_prioritization_map,
         category_mapping,
         strict,
+        processes,
     )
     end = current_time_in_millis()
     log.info(f"Total time taken to elect leaders for all cliques: {end - start} ms")
@@ -85,6 +379,72 @@ def clique_merge(
     return graph, clique_graph
 
 
+def merge_cliques(
+    target_graph: BaseGraph,
+    leader_annotation: str = None,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]] = None,
+    category_mapping: Optional[Dict[str, str]] = None,
+    strict: bool = True,
+    processes: int = 1,
+) -> Tuple[BaseGraph, Cliques]:
+    """
+    Clique merge a graph as ``clique_merge`` does, but with cliques built by
+    ``find_cliques`` rather than a clique graph, so that nodes are not copied.
+
+    Parameters
+    ----------
+    target_graph: kgx.graph.base_graph.BaseGraph
+        The original graph
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use for leader election
+
+    Returns
+    -------
+    Tuple[kgx.graph.base_graph.BaseGraph, kgx.graph_operations.clique_merge.Cliques]
+        A tuple containing the updated target graph, and the cliques
+
+    """
+    ppm = get_prefix_prioritization_map()
+    if prefix_prioritization_map:
+        ppm.update(prefix_prioritization_map)
+    prefix_prioritization_map = ppm
+
+    if not leader_annotation:
+        leader_annotation = LEADER_ANNOTATION
+
+    start = current_time_in_millis()
+    cliques = find_cliques(target_graph)
+    end = current_time_in_millis()
+    log.info(f"Total time taken to build cliques: {end - start} ms")
+
+    start = current_time_in_millis()
+    elect_clique_leaders(
+        target_graph,
+        cliques,
+        leader_annotation,
+        prefix_prioritization_map,
+        category_mapping,
+        strict,
+        processes,
+    )
+    end = current_time_in_millis()
+    log.info(f"Total time taken to elect leaders for all cliques: {end - start} ms")
+
+    start = current_time_in_millis()
+    graph = consolidate_clique_edges(target_graph, cliques, leader_annotation)
+    end = current_time_in_millis()
+    log.info(f"Total time taken to consolidate edges in target graph: {end - start} ms")
+    return graph, cliques
+
+
 def build_cliques(target_graph: BaseGraph) -> nx.MultiDiGraph:
     """
     Builds a clique graph from ``same_as`` edges in ``target_graph``.
@@ -130,6 +490,37 @@ def build_cliques(target_graph: BaseGraph) -> nx.MultiDiGraph:
     return clique_graph
 
 
+def find_cliques(target_graph: BaseGraph) -> Cliques:
+    """
+    Builds cliques from ``same_as`` node properties and ``same_as`` edges in ``target_graph``,
+    without copying nodes into a clique graph as ``build_cliques`` does.
+
+    Parameters
+    ----------
+    target_graph: kgx.graph.base_graph.BaseGraph
+        An instance of BaseGraph that contains nodes and edges
+
+    Returns
+    -------
+    kgx.graph_operations.clique_merge.Cliques
+        The cliques
+
+    """
+    cliques = Cliques()
+    for n, data in target_graph.nodes(data=True):
+        if 'same_as' in data:
+            cliques.add_node(n, data)
+            for s in data['same_as']:
+                cliques.add_equivalence(n, s)
+    for u, v, data in target_graph.edges(data=True):
+        if 'predicate' in data and data['predicate'] == SAME_AS:
+            # load all biolink:same_as edges to cliques
+            cliques.add_node(u, target_graph.nodes()[u])
+            cliques.add_node(v, target_graph.nodes()[v])
+            cliques.add_equivalence(u, v)
+    return cliques
+
+
 def elect_leader(
     target_graph: BaseGraph,
     clique_graph: nx.MultiDiGraph,
@@ -137,10 +528,15 @@ def elect_leader(
     prefix_prioritization_map: Optional[Dict[str, List[str]]],
     category_mapping: Optional[Dict[str, str]],
     strict: bool = True,
+    processes: int = 1,
 ) -> BaseGraph:
     """
     Elect leader for each clique in a graph.
 
+    The leaders are elected as with ``elect_clique_leaders``, and the clique graph
+    is updated with the outcome: invalid nodes are removed from it, and its nodes
+    get the same updates as the target graph.
+
     Parameters
     ----------
     target_graph: kgx.graph.base_graph.BaseGraph
@@ -155,6 +551,8 @@ def elect_leader(
         Mapping for non-Biolink Model categories to Biolink Model categories
     strict: bool
         Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use
 
     Returns
     -------
@@ -162,88 +560,328 @@ def elect_leader(
         The updated target graph
 
     """
-    cliques = list(nx.strongly_connected_components(clique_graph))
-    log.info(f"Total cliques in clique graph: {len(cliques)}")
+    cliques = Cliques.from_networkx(clique_graph)
+    node_updates = get_leader_updates(
+        cliques,
+        leader_annotation,
+        prefix_prioritization_map,
+        category_mapping,
+        strict,
+        processes,
+    )
+    clique_graph.remove_nodes_from(cliques.excluded)
+    nx.set_node_attributes(clique_graph, node_updates)
+    target_graph.set_node_attributes(target_graph, node_updates)
+    return target_graph
+
+
+def elect_clique_leaders(
+    target_graph: BaseGraph,
+    cliques: Cliques,
+    leader_annotation: str,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]],
+    category_mapping: Optional[Dict[str, str]],
+    strict: bool = True,
+    processes: int = 1,
+) -> BaseGraph:
+    """
+    Elect leader for each clique in ``cliques``.
+
+    Cliques are independent of each other, so they are processed in batches,
+    each with a snapshot of only the node properties that election needs.
+    With more than one process, the batches are distributed across a pool of
+    worker processes and their results are applied to the target graph in bulk.
+
+    Parameters
+    ----------
+    target_graph: kgx.graph.base_graph.BaseGraph
+        The original graph
+    cliques: kgx.graph_operations.clique_merge.Cliques
+        The cliques
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use
+
+    Returns
+    -------
+    kgx.graph.base_graph.BaseGraph
+        The updated target graph
+
+    """
+    node_updates = get_leader_updates(
+        cliques,
+        leader_annotation,
+        prefix_prioritization_map,
+        category_mapping,
+        strict,
+        processes,
+    )
+    target_graph.set_node_attributes(target_graph, node_updates)
+    return target_graph
+
+
+def get_leader_updates(
+    cliques: Cliques,
+    leader_annotation: str,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]],
+    category_mapping: Optional[Dict[str, str]],
+    strict: bool = True,
+    processes: int = 1,
+) -> Dict[str, Dict]:
+    """
+    Elect leader for each clique and get the resulting updates for nodes in the target graph.
+
+    The parts of each clique to consolidate, and the nodes removed
+from their clique, are recorded in ``cliques``.
+
+    Parameters
+    ----------
+    cliques: kgx.graph_operations.clique_merge.Cliques
+        The cliques
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use
+
+    Returns
+    -------
+    Dict[str, Dict]
+        The node properties to update for each node in the target graph
+
+    """
+    log.info(f"Total cliques: {len(cliques.get_cliques())}")
+    properties = {'category', '_excluded_from_clique', leader_annotation}
+    args = (leader_annotation, prefix_prioritization_map, category_mapping, strict)
+    batches = (
+        [
+            cliques.get_clique_data(i, properties)
+            for i in range(start, min(start + ELECTION_BATCH_SIZE, len(cliques.get_cliques())))
+        ]
+        for start in range(0, len(cliques.get_cliques()), ELECTION_BATCH_SIZE)
+    )
+    if processes > 1:
+        pool = Pool(processes=processes)
+        results = [pool.apply_async(elect_leaders, (batch, *args)) for batch in batches]
+        pool.close()
+        results = (r.get() for r in results)
+    else:
+        pool = None
+        results = (elect_leaders(batch, *args) for batch in batches)
+
     count = 0
-    update_dict = {}
-    for clique in cliques:
-        log.info(
-            f"Processing clique: {clique} with {[clique_graph.nodes()[x]['category'] if 'category' in clique_graph.nodes()[x] else None for x in clique]}"
-        )
-        update_node_categories(target_graph, clique_graph, clique, category_mapping, strict)
-        clique_category, clique_category_ancestors = get_clique_category(clique_graph, clique)
-        log.debug(f"Clique category: {clique_category}")
-        invalid_nodes = set()
-        for n in clique:
-            data = clique_graph.nodes()[n]
-            if '_excluded_from_clique' in data and data['_excluded_from_clique']:
-                log.info(f"Removing invalid node {n} from clique graph; node marked to be excluded")
-                clique_graph.remove_node(n)
-                invalid_nodes.add(n)
-            if data['category'][0] not in clique_category_ancestors:
-                log.info(
-                    f"Removing invalid node {n} from the clique graph; node category {data['category'][0]} not in CCA: {clique_category_ancestors}"
+    node_updates: Dict[str, Dict] = {}
+    cliques.consolidation = []
+    cliques.excluded = []
+    for elected in results:
+        for leader, election_strategy, category_updates, consolidation, excluded in elected:
+            for n, update in category_updates.items():
+                if update:
+                    node_updates[n] = update
+            if leader:
+                node_updates.setdefault(leader, {}).update(
+                    {
+                        LEADER_ANNOTATION: True,
+                        'election_strategy': election_strategy,
+                    }
                 )
-                clique_graph.remove_node(n)
-                invalid_nodes.add(n)
-
-        filtered_clique = [x for x in clique if x not in invalid_nodes]
-        if filtered_clique:
-            if clique_category:
-                # First check for LEADER_ANNOTATION property
-                leader, election_strategy = get_leader_by_annotation(
-                    target_graph, clique_graph, filtered_clique, leader_annotation
+                count += 1
+            cliques.consolidation.extend(consolidation)
+            cliques.excluded.extend(excluded)
+    if pool:
+        pool.join()
+
+    log.info(f"Total merged cliques: {count}")
+    return node_updates
+
+
+def elect_leaders(
+    batch: List[Tuple[List[str], List[Tuple[str, str]], Dict[str, Optional[Dict]]]],
+    leader_annotation: str,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]],
+    category_mapping: Optional[Dict[str, str]],
+    strict: bool = True,
+) -> List[Tuple[Optional[str], Optional[str], Dict, List, List]]:
+    """
+    Elect leader for each clique in a batch of cliques.
+
+    Parameters
+    ----------
+    batch: List[Tuple[List[str], List[Tuple[str, str]], Dict[str, Optional[Dict]]]]
+        A list of cliques, as returned by ``Cliques.get_clique_data``
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+
+    Returns
+    -------
+    List[Tuple[Optional[str], Optional[str], Dict, List, List]]
+        The election result for each clique, as returned by ``elect_clique_leader``
+
+    """
+    return [
+        elect_clique_leader(
+            clique,
+            make_clique_graph(clique, pairs, node_data),
+            leader_annotation,
+            prefix_prioritization_map,
+            category_mapping,
+            strict,
+        )
+        for clique, pairs, node_data in batch
+    ]
+
+
+def elect_clique_leader(
+    clique: List[str],
+    clique_graph: nx.MultiDiGraph,
+    leader_annotation: str,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]],
+    category_mapping: Optional[Dict[str, str]],
+    strict: bool = True,
+) -> Tuple[Optional[str], Optional[str], Dict, List, List]:
+    """
+    Elect leader for a single clique.
+
+    Parameters
+    ----------
+    clique: List[str]
+        A list of nodes in a clique
+    clique_graph: networkx.MultiDiGraph
+        The clique graph for the clique
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+
+    Returns
+    -------
+    Tuple[Optional[str], Optional[str], Dict, List, List]
+        A tuple containing the elected leader, the election strategy, the category updates
+        for nodes in the target graph, the parts of the clique to consolidate, and the
+        nodes removed from the clique
+
+    """
+    log.debug(
+        f"Processing clique: {clique} with {[clique_graph.nodes()[x]['category'] if 'category' in clique_graph.nodes()[x] else None for x in clique]}"
+    )
+    index = get_biolink_index()
+    category_updates = get_node_category_updates(clique_graph, clique, category_mapping, strict)
+    clique_category, clique_category_ancestors = get_clique_category(clique_graph, clique)
+    log.debug(f"Clique category: {clique_category}")
+    invalid_nodes = set()
+    for n in clique:
+        data = clique_graph.nodes()[n]
+        if '_excluded_from_clique' in data and data['_excluded_from_clique']:
+            log.info(f"Removing invalid node {n} from clique graph; node marked to be excluded")
+            clique_graph.remove_node(n)
+            invalid_nodes.add(n)
+        if not index.is_ancestor(data['category'][0], clique_category):
+            log.info(
+                f"Removing invalid node {n} from the clique graph; node category {data['category'][0]} not in CCA: {clique_category_ancestors}"
+            )
+            clique_graph.remove_node(n)
+            invalid_nodes.add(n)
+
+    leader = None
+    election_strategy = None
+    filtered_clique = [x for x in clique if x not in invalid_nodes]
+    if filtered_clique:
+        if clique_category:
+            # First check for LEADER_ANNOTATION property
+            leader, election_strategy = get_leader_by_annotation(
+                None, clique_graph, filtered_clique, leader_annotation
+            )
+            if not leader:
+                # Leader is None; use prefix prioritization strategy
+                log.debug(
+                    "Could not elect clique leader by looking for LEADER_ANNOTATION property; "
+                    "Using prefix prioritization instead"
                 )
-                if not leader:
-                    # Leader is None; use prefix prioritization strategy
-                    log.debug(
-                        "Could not elect clique leader by looking for LEADER_ANNOTATION property; "
-                        "Using prefix prioritization instead"
+                if (
+                    prefix_prioritization_map
+                    and clique_category in prefix_prioritization_map.keys()
+                ):
+                    leader, election_strategy = get_leader_by_prefix_priority(
+                        None,
+                        clique_graph,
+                        filtered_clique,
+                        prefix_prioritization_map[clique_category],
                     )
-                    if (
-                        prefix_prioritization_map
-                        and clique_category in prefix_prioritization_map.keys()
-                    ):
-                        leader, election_strategy = get_leader_by_prefix_priority(
-                            target_graph,
-                            clique_graph,
-                            filtered_clique,
-                            prefix_prioritization_map[clique_category],
-                        )
-                    else:
-                        log.debug(
-                            f"No prefix order found for category '{clique_category}' in PREFIX_PRIORITIZATION_MAP"
-                        )
-
-                if not leader:
-                    # Leader is None; fall back to alphabetical sort on prefixes
+                else:
                     log.debug(
-                        "Could not elect clique leader by PREFIX_PRIORITIZATION; Using alphabetical sort on prefixes"
-                    )
-                    leader, election_strategy = get_leader_by_sort(
-                        target_graph, clique_graph, filtered_clique
+                        f"No prefix order found for category '{clique_category}' in PREFIX_PRIORITIZATION_MAP"
                     )
 
+            if not leader:
+                # Leader is None; fall back to alphabetical sort on prefixes
                 log.debug(
-                    f"Elected {leader} as leader via {election_strategy} for clique {filtered_clique}"
+                    "Could not elect clique leader by PREFIX_PRIORITIZATION; Using alphabetical sort on prefixes"
                 )
-                update_dict[leader] = {
-                    LEADER_ANNOTATION: True,
-                    'election_strategy': election_strategy,
-                }
-                count += 1
-
-    nx.set_node_attributes(clique_graph, update_dict)
-    target_graph.set_node_attributes(target_graph, update_dict)
-    log.info(f"Total merged cliques: {count}")
-    return target_graph
+                leader, election_strategy = get_leader_by_sort(None, clique_graph, filtered_clique)
+
+            log.debug(
+                f"Elected {leader} as leader via {election_strategy} for clique {filtered_clique}"
+            )
+            clique_graph.nodes[leader].update(
+                {LEADER_ANNOTATION: True, 'election_strategy': election_strategy}
+            )
+
+    # removing invalid nodes can split a clique; each part
+    # is consolidated into the leader it contains, if any
+    if invalid_nodes:
+        components = [
+            [x for x in filtered_clique if x in c]
+            for c in nx.strongly_connected_components(clique_graph)
+        ]
+    else:
+        components = [clique]
+    consolidation = []
+    for component in components:
+        leaders = [
+            x
+            for x in component
+            if leader_annotation in clique_graph.nodes()[x]
+            and clique_graph.nodes()[x][leader_annotation]
+        ]
+        if leaders:
+            attributes = {
+                leader_annotation: clique_graph.nodes()[leaders[0]].get(leader_annotation),
+                'election_strategy': clique_graph.nodes()[leaders[0]].get('election_strategy'),
+            }
+            consolidation.append(
+                (leaders[0], attributes, component, set(clique_graph.neighbors(leaders[0])))
+            )
+    return leader, election_strategy, category_updates, consolidation, list(invalid_nodes)
 
 
 def consolidate_edges(
     target_graph: BaseGraph, clique_graph: nx.MultiDiGraph, leader_annotation: str
 ) -> BaseGraph:
     """
-    Move all edges from nodes in a clique to the clique leader.
+    Move all edges from nodes in a clique to the clique leader, as
+    with ``consolidate_clique_edges``, for the leaders in a clique graph.
 
     Original subject and object of a node are preserved via ``ORIGINAL_SUBJECT_PROPERTY`` and ``ORIGINAL_OBJECT_PROPERTY``
 
@@ -262,10 +900,8 @@ def consolidate_edges(
         The target graph where all edges from nodes in a clique are moved to clique leader
 
     """
-    cliques = list(nx.strongly_connected_components(clique_graph))
-    log.info(f"Consolidating edges in {len(cliques)} cliques")
-    for clique in cliques:
-        log.debug(f"Processing clique: {clique}")
+    cliques = Cliques()
+    for clique in nx.strongly_connected_components(clique_graph):
         leaders: List = [
             x
             for x in clique
@@ -276,89 +912,312 @@ def consolidate_edges(
             log.debug("No leader elected for clique {}; skipping".format(clique))
             continue
         leader: str = leaders[0]
-        # update nodes in target graph
-        target_graph.set_node_attributes(
-            target_graph,
-            {
-                leader: {
-                    leader_annotation: clique_graph.nodes()[leader].get(leader_annotation),
-                    'election_strategy': clique_graph.nodes()[leader].get('election_strategy'),
-                }
-            },
+        attributes = {
+            leader_annotation: clique_graph.nodes()[leader].get(leader_annotation),
+            'election_strategy': clique_graph.nodes()[leader].get('election_strategy'),
+        }
+        cliques.consolidation.append(
+            (leader, attributes, list(clique), set(clique_graph.neighbors(leader)))
         )
-        leader_equivalent_identifiers = set([x for x in clique_graph.neighbors(leader)])
-        for node in clique:
-            if node == leader:
-                continue
-            log.debug(f"Looking for in_edges for {node}")
-            in_edges = target_graph.in_edges(node, keys=False, data=True)
-            filtered_in_edges = [x for x in in_edges if x[2]['predicate'] != SAME_AS]
-            equiv_in_edges = [x for x in in_edges if x[2]['predicate'] == SAME_AS]
-            log.debug(f"Moving {len(in_edges)} in-edges from {node} to {leader}")
-            for u, v, edge_data in filtered_in_edges:
-                key = generate_edge_key(u, edge_data['predicate'], v)
-                target_graph.remove_edge(u, v, edge_key=key)
-                edge_data[ORIGINAL_SUBJECT_PROPERTY] = edge_data['subject']
-                edge_data[ORIGINAL_OBJECT_PROPERTY] = edge_data['object']
-                edge_data['object'] = leader
-                key = generate_edge_key(u, edge_data['predicate'], leader)
-                if (
-                    edge_data['subject'] == edge_data['object']
-                    and edge_data['predicate'] == SUBCLASS_OF
-                ):
-                    continue
-                target_graph.add_edge(edge_data['subject'], edge_data['object'], key, **edge_data)
-
-            log.debug(f"Looking for out_edges for {node}")
-            out_edges = target_graph.out_edges(node, keys=False, data=True)
-            filtered_out_edges = [x for x in out_edges if x[2]['predicate'] != SAME_AS]
-            equiv_out_edges = [x for x in out_edges if x[2]['predicate'] == SAME_AS]
-            log.debug(f"Moving {len(out_edges)} out-edges from {node} to {leader}")
-            for u, v, edge_data in filtered_out_edges:
-                key = generate_edge_key(u, edge_data['predicate'], v)
-                target_graph.remove_edge(u, v, edge_key=key)
-                edge_data[ORIGINAL_SUBJECT_PROPERTY] = edge_data['subject']
-                edge_data[ORIGINAL_OBJECT_PROPERTY] = edge_data['object']
-                edge_data['subject'] = leader
-                key = generate_edge_key(leader, edge_data['predicate'], v)
-                if (
-                    edge_data['subject'] == edge_data['object']
-                    and edge_data['predicate'] == SUBCLASS_OF
-                ):
-                    continue
-                target_graph.add_edge(edge_data['subject'], edge_data['object'], key, **edge_data)
-
-            log.debug(f"equiv out edges: {equiv_out_edges}")
-            equivalent_identifiers = set()
-            for u, v, edge_data in equiv_in_edges:
-                if u != leader:
-                    equivalent_identifiers.add(u)
-                if v != leader:
-                    equivalent_identifiers.add(v)
-                target_graph.remove_edge(u, v, edge_key=generate_edge_key(u, SAME_AS, v))
-
-            log.debug(f"equiv out edges: {equiv_out_edges}")
-            for u, v, edge_data in equiv_out_edges:
-                if u != leader:
-                    log.debug(f"{u} is an equivalent identifier of leader {leader}")
-                    equivalent_identifiers.add(u)
-                if v != leader:
-                    log.debug(f"{v} is an equivalent identifier of leader {leader}")
-                    equivalent_identifiers.add(v)
-                target_graph.remove_edge(u, v, edge_key=generate_edge_key(u, SAME_AS, v))
-
-            leader_equivalent_identifiers.update(equivalent_identifiers)
-
-        log.debug(f"setting same_as property to leader node with {leader_equivalent_identifiers}")
-        target_graph.set_node_attributes(
-            target_graph, {leader: {'same_as': list(leader_equivalent_identifiers)}}
-        )
-        log.debug(f"removing equivalent nodes of leader: {leader_equivalent_identifiers}")
-        for n in leader_equivalent_identifiers:
+    return consolidate_clique_edges(target_graph, cliques, leader_annotation)
+
+
+def consolidate_clique_edges(
+    target_graph: BaseGraph, cliques: Cliques, leader_annotation: str
+) -> BaseGraph:
+    """
+    Move all edges from nodes in a clique to the clique leader.
+
+    A mapping from each node to its clique leader is built once, and
+    all the affected edges are then rewritten in a single pass over the
+    edges of the target graph.
+
+    Original subject and object of a node are preserved via ``ORIGINAL_SUBJECT_PROPERTY`` and ``ORIGINAL_OBJECT_PROPERTY``
+
+    Parameters
+    ----------
+    target_graph: kgx.graph.base_graph.BaseGraph
+        The original graph
+    cliques: kgx.graph_operations.clique_merge.Cliques
+        The cliques, with leaders elected by ``elect_clique_leaders``
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+
+    Returns
+    -------
+    kgx.graph.base_graph.BaseGraph
+        The target graph where all edges from nodes in a clique are moved to clique leader
+
+    """
+    log.info(f"Consolidating edges in {len(cliques.consolidation)} cliques")
+    leader_map = cliques.get_leader_map()
+    leader_equivalent_identifiers: Dict[str, Set[str]] = {}
+    for leader, attributes, _, equivalents in cliques.consolidation:
+        # update nodes in target graph
+        target_graph.set_node_attributes(target_graph, {leader: attributes})
+        leader_equivalent_identifiers[leader] = set(equivalents)
+
+    removed_edges = []
+    moved_edges: Dict[str, Tuple[str, str, Dict]] = {}
+    for u, v, key, edge_data in target_graph.edges(keys=True, data=True):
+        if u not in leader_map and v not in leader_map:
+            continue
+        removed_edges.append((u, v, key))
+        if edge_data['predicate'] == SAME_AS:
+            # equivalent identifiers of the leader are removed along with their same_as edges
+            leader = leader_map[u] if u in leader_map else leader_map[v]
+            leader_equivalent_identifiers[leader].update(x for x in (u, v) if x != leader)
+            continue
+        edge_data = remap_edge(edge_data, leader_map)
+        if edge_data is None:
+            continue
+        key = generate_edge_key(edge_data['subject'], edge_data['predicate'], edge_data['object'])
+        if key in moved_edges:
+            # later edges update earlier edges with the same key, as with add_edge
+            moved_edges[key][2].update(edge_data)
+        else:
+            moved_edges[key] = (edge_data['subject'], edge_data['object'], edge_data)
+    log.debug(f"Moving {len(moved_edges)} edges to clique leaders")
+    for u, v, key in removed_edges:
+        target_graph.remove_edge(u, v, key)
+    for key, (u, v, edge_data) in moved_edges.items():
+        target_graph.add_edge(u, v, key, **edge_data)
+
+    for leader, equivalents in leader_equivalent_identifiers.items():
+        log.debug(f"setting same_as property to leader node with {equivalents}")
+        target_graph.set_node_attributes(target_graph, {leader: {'same_as': list(equivalents)}})
+        log.debug(f"removing equivalent nodes of leader: {equivalents}")
+        for n in equivalents:
             target_graph.remove_node(n)
     return target_graph
 
 
+def remap_edge(edge_data: Dict, leader_map: Dict[str, str]) -> Optional[Dict]:
+    """
+    Move an edge to the clique leaders of its subject and object.
+
+    Parameters
+    ----------
+    edge_data: Dict
+        The edge data, which is updated in place
+    leader_map: Dict[str, str]
+        A map from each node in a clique to its clique leader
+
+    Returns
+    -------
+    Optional[Dict]
+        The edge data, or ``None`` if the edge becomes a ``subclass_of`` self-loop
+
+    """
+    s = leader_map.get(edge_data['subject'], edge_data['subject'])
+    o = leader_map.get(edge_data['object'], edge_data['object'])
+    edge_data[ORIGINAL_SUBJECT_PROPERTY] = edge_data['subject']
+    edge_data[ORIGINAL_OBJECT_PROPERTY] = edge_data['object']
+    edge_data['subject'] = s
+    edge_data['object'] = o
+    if s == o and edge_data['predicate'] == SUBCLASS_OF:
+        return None
+    return edge_data
+
+
+def stream_clique_merge(
+    input_args: Dict,
+    output_args: Dict,
+    leader_annotation: str = None,
+    prefix_prioritization_map: Optional[Dict[str, List[str]]] = None,
+    category_mapping: Optional[Dict[str, str]] = None,
+    strict: bool = True,
+    processes: int = 1,
+    spill_directory: Optional[str] = None,
+) -> Cliques:
+    """
+    Clique merge a graph in two streaming passes over its source,
+    without loading the graph into memory.
+
+    The first pass reads only the nodes and the ``same_as`` edges to build
+    the cliques. The properties that leader election needs are kept for
+    nodes with a ``same_as`` property and spilled to a temporary snapshot
+    for all other nodes, since a node may only turn out to be part of a
+    clique when a later ``same_as`` edge is read. Once the leaders are elected,
+    the second pass streams all nodes and edges to the sink, moving edges to
+    clique leaders and dropping the equivalent nodes of each leader.
+
+    Memory is bounded by the cliques rather than by the whole graph. Unlike
+    ``clique_merge``, edges that end up with the same key once moved to a
+    leader are written as separate records.
+
+    Parameters
+    ----------
+    input_args: Dict
+        Arguments relevant to your input source
+    output_args: Dict
+        Arguments relevant to your output sink
+    leader_annotation: str
+        The field on a node that signifies that the node is the leader of a clique
+    prefix_prioritization_map: Optional[Dict[str, List[str]]]
+        A map that gives a prefix priority for one or more categories
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+    processes: int
+        Number of processes to use for leader election
+    spill_directory: Optional[str]
+        The directory for temporary files (system default, if not defined)
+
+    Returns
+    -------
+    kgx.graph_operations.clique_merge.Cliques
+        The cliques
+
+    """
+    if input_args.get('operations'):
+        raise ValueError("Graph operations cannot be applied while streaming a clique merge")
+    ppm = get_prefix_prioritization_map()
+    if prefix_prioritization_map:
+        ppm.update(prefix_prioritization_map)
+    prefix_prioritization_map = ppm
+
+    if not leader_annotation:
+        leader_annotation = LEADER_ANNOTATION
+    properties = {'category', '_excluded_from_clique', leader_annotation}
+
+    start = current_time_in_millis()
+    cliques = Cliques()
+    same_as_edges: List[Tuple[str, str]] = []
+    with tempfile.TemporaryDirectory(dir=spill_directory) as directory:
+        spill_filename = os.path.join(directory, f"nodes.{SNAPSHOT_EXTENSION}")
+        spill = SnapshotSink(spill_filename)
+
+        def build(entity_type: GraphEntityType, rec: List) -> None:
+            if entity_type == GraphEntityType.EDGE:
+                if rec[-1].get('predicate') == SAME_AS:
+                    cliques.add_equivalence(rec[0], rec[1])
+                    same_as_edges.append((rec[0], rec[1]))
+            else:
+                n, data = rec
+                record = {k: data[k] for k in properties if k in data}
+                if 'same_as' in data:
+                    cliques.add_node(n, record)
+                    for s in data['same_as']:
+                        cliques.add_equivalence(n, s)
+                else:
+                    record['id'] = n
+                    spill.write_node(record)
+
+        transformer = Transformer(stream=True)
+        sources, source_generator = transformer.get_source_generator(copy.deepcopy(input_args))
+        transformer.inspector = build
+        transformer.process(source_generator, NullSink())
+        spill.finalize()
+
+        # load all the endpoints of biolink:same_as edges
+        endpoints = {x for pair in same_as_edges for x in pair}
+        for record in read_records(spill_filename, NODE_FRAME):
+            n = record.pop('id')
+            if n in endpoints:
+                cliques.add_node(n, record)
+    end = current_time_in_millis()
+    log.info(f"Total time taken to build cliques: {end - start} ms")
+
+    start = current_time_in_millis()
+    node_updates = get_leader_updates(
+        cliques,
+        leader_annotation,
+        prefix_prioritization_map,
+        category_mapping,
+        strict,
+        processes,
+    )
+    leader_map = cliques.get_leader_map()
+    leader_equivalent_identifiers: Dict[str, Set[str]] = {}
+    for leader, attributes, _, equivalents in cliques.consolidation:
+        node_updates.setdefault(leader, {}).update(attributes)
+        leader_equivalent_identifiers[leader] = set(equivalents)
+    for u, v in same_as_edges:
+        if u in leader_map or v in leader_map:
+            leader = leader_map[u] if u in leader_map else leader_map[v]
+            leader_equivalent_identifiers[leader].update(x for x in (u, v) if x != leader)
+    removed_nodes: Set[str] = set()
+    for leader, equivalents in leader_equivalent_identifiers.items():
+        node_updates[leader]['same_as'] = list(equivalents)
+        removed_nodes.update(equivalents)
+    end = current_time_in_millis()
+    log.info(f"Total time taken to elect leaders for all cliques: {end - start} ms")
+
+    start = current_time_in_millis()
+    node_properties = set(properties)
+    node_properties.update(
+        ['same_as', LEADER_ANNOTATION, 'election_strategy', 'invalid_biolink_category', '_invalid_category']
+    )
+    edge_properties = {ORIGINAL_SUBJECT_PROPERTY, ORIGINAL_OBJECT_PROPERTY}
+    for s in sources:
+        node_properties.update(s.node_properties)
+        edge_properties.update(s.edge_properties)
+    transformer = Transformer(stream=True)
+    sink = transformer.get_stream_sink(output_args, node_properties, edge_properties)
+    _, source_generator = transformer.get_source_generator(copy.deepcopy(input_args))
+    transformer.process(
+        merge_clique_records(source_generator, leader_map, node_updates, removed_nodes), sink
+    )
+    sink.finalize()
+    end = current_time_in_millis()
+    log.info(f"Total time taken to consolidate edges: {end - start} ms")
+    return cliques
+
+
+def merge_clique_records(
+    records: Generator,
+    leader_map: Dict[str, str],
+    node_updates: Dict[str, Dict],
+    removed_nodes: Set[str],
+) -> Generator:
+    """
+    Apply the outcome of a clique merge to a stream of node and edge records.
+
+    Parameters
+    ----------
+    records: Generator
+        A generator for node and edge records
+    leader_map: Dict[str, str]
+        A map from each node in a clique to its clique leader
+    node_updates: Dict[str, Dict]
+        The node properties to update for each node
+    removed_nodes: Set[str]
+        The equivalent nodes of all clique leaders, which are dropped
+
+    Returns
+    -------
+    Generator
+        A generator for node and edge records
+
+    """
+    for rec in records:
+        if not rec:
+            continue
+        if len(rec) == 4:
+            u, v, key, edge_data = rec
+            if u in leader_map or v in leader_map:
+                if edge_data['predicate'] == SAME_AS:
+                    continue
+                edge_data = remap_edge(dict(edge_data), leader_map)
+                if edge_data is None:
+                    continue
+                u = edge_data['subject']
+                v = edge_data['object']
+                key = generate_edge_key(u, edge_data['predicate'], v)
+            if u in removed_nodes or v in removed_nodes:
+                continue
+            yield u, v, key, edge_data
+        else:
+            n, node_data = rec
+            if n in removed_nodes:
+                continue
+            if n in node_updates:
+                node_data = {**node_data, **node_updates[n]}
+            yield n, node_data
+
+
 def update_node_categories(
     target_graph: BaseGraph,
     clique_graph: nx.MultiDiGraph,
@@ -391,6 +1250,42 @@ def update_node_categories(
         The clique
 
     """
+    updated_target_graph_properties = get_node_category_updates(
+        clique_graph, clique, category_mapping, strict
+    )
+    target_graph.set_node_attributes(target_graph, updated_target_graph_properties)
+    return clique
+
+
+def get_node_category_updates(
+    clique_graph: nx.MultiDiGraph,
+    clique: List,
+    category_mapping: Optional[Dict[str, str]],
+    strict: bool = True,
+) -> Dict:
+    """
+    For a given clique, get category for each node in clique and validate against Biolink Model,
+    updating the nodes in the clique graph and returning the corresponding updates for the
+    target graph.
+
+    Parameters
+    ----------
+    clique_graph: networkx.Graph
+        The clique graph
+    clique: List
+        A list of nodes from a clique
+    category_mapping: Optional[Dict[str, str]]
+        Mapping for non-Biolink Model categories to Biolink Model categories
+    strict: bool
+        Whether or not to merge nodes in a clique that have conflicting node categories
+
+    Returns
+    -------
+    Dict
+        The node properties to update in the target graph
+
+    """
+    index = get_biolink_index()
     updated_clique_graph_properties = {}
     updated_target_graph_properties = {}
     for node in clique:
@@ -399,7 +1294,7 @@ def update_node_categories(
         if 'category' in data:
             categories = data['category']
         else:
-            categories = get_category_from_equivalence(target_graph, clique_graph, node, data)
+            categories = get_category_from_equivalence(None, clique_graph, node, data)
 
         # differentiate between valid and invalid categories
         (
@@ -413,7 +1308,7 @@ def update_node_categories(
         # extend categories to have the longest list of ancestors
         extended_categories: List = []
         for x in valid_biolink_categories:
-            ancestors = get_biolink_ancestors(x)
+            ancestors = index.get_ancestors(x)
             if len(ancestors) > len(extended_categories):
                 extended_categories.extend(ancestors)
         log.debug(f"Extended categories: {extended_categories}")
@@ -435,8 +1330,7 @@ def update_node_categories(
         updated_target_graph_properties[node] = target_graph_update_dict
 
     nx.set_node_attributes(clique_graph, updated_clique_graph_properties)
-    target_graph.set_node_attributes(target_graph, updated_target_graph_properties)
-    return clique
+    return updated_target_graph_properties
 
 
 def get_clique_category(clique_graph: nx.MultiDiGraph, clique: List) -> Tuple[str, List]:
@@ -491,14 +1385,14 @@ def check_categories(
     valid_biolink_categories = []
     invalid_biolink_categories = []
     invalid_categories = []
-    tk = get_toolkit()
+    index = get_biolink_index()
     for x in categories:
         # use the toolkit to check if the declared category is actually a mixin.
-        if tk.is_mixin(x):
+        if index.is_mixin(x):
             invalid_categories.append(x)
             continue
         # get biolink element corresponding to category
-        element = get_biolink_element(x)
+        element = index.get_element(x)
         if element:
             mapped_category = format_biolink_category(element['name'])
             if mapped_category in closure:
@@ -542,12 +1436,13 @@ def check_all_categories(categories) -> Tuple[List, List, List]:
     valid_biolink_categories: List = []
     invalid_biolink_categories: List = []
     invalid_categories: List = []
+    index = get_biolink_index()
     sc: List = sort_categories(categories)
     for c in sc:
         if previous:
-            vbc, ibc, ic = check_categories([c], get_biolink_ancestors(previous[0]), None)
+            vbc, ibc, ic = check_categories([c], index.get_ancestors(previous[0]), None)
         else:
-            vbc, ibc, ic = check_categories([c], get_biolink_ancestors(c), None)
+            vbc, ibc, ic = check_categories([c], index.get_ancestors(c), None)
         if vbc:
             valid_biolink_categories.extend(vbc)
         if ic:
@@ -575,9 +1470,10 @@ def sort_categories(categories: Union[List, Set, OrderedSet]) -> List:
         has the most number of parents in the class hierarchy.
 
     """
+    index = get_biolink_index()
     weighted_categories = []
     for c in categories:
-        weighted_categories.append((len(get_biolink_ancestors(c)), c))
+        weighted_categories.append((len(index.get_ancestors(c)), c))
     sorted_categories = sorted(weighted_categories, key=lambda x: x[0], reverse=True)
     return [x[1] for x in sorted_categories]
 
@@ -0,0 +1,329 @@
+"""
+Streaming removal of singleton nodes, of nodes outside of degree thresholds,
+and of dangling edges.
+
+``kgx.graph_operations.remove_singleton_nodes`` needs the whole graph to compute
+node degrees. The stream equivalent makes two passes over the input instead: the
+first pass only accumulates the ids and degrees of nodes, the second pass writes
+the nodes and edges that are kept to the output.
+"""
+import copy
+import os
+import sqlite3
+import tempfile
+from typing import Dict, List, Optional, Set, Tuple
+
+from kgx.config import get_logger
+from kgx.graph_operations.stream_operations import RecordOperation
+from kgx.sink import NullSink
+from kgx.transformer import Transformer
+from kgx.utils.kgx_utils import GraphEntityType, current_time_in_millis
+
+log = get_logger()
+
+DEFAULT_MAX_IN_MEMORY = 10000000
+
+
+class NodeDegrees(object):
+    """
+    The ids and degrees of the nodes of a streamed graph.
+
+    Node ids and degrees are kept in memory until more than ``max_in_memory``
+    entries have been accumulated, at which point they are spilled to an
+    SQLite database in ``directory``.
+
+    The degree of a node counts every edge that has the node as its subject
+    or object, like ``BaseGraph.degree``. When ``count_dangling_edges`` is
+    False, edges whose subject or object is not a node of the graph are not
+    counted. Such edges that are seen before both of their nodes are kept
+    aside until all the nodes have been seen.
+
+    Parameters
+    ----------
+    directory: str
+        The directory where the database is created when spilling
+    max_in_memory: int
+        The maximum number of entries to keep in memory
+    count_dangling_edges: bool
+        Whether or not to count edges whose subject or object is not a node
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+        count_dangling_edges: bool = True,
+    ):
+        self.directory = directory
+        self.max_in_memory = max_in_memory
+        self.count_dangling_edges = count_dangling_edges
+        self.nodes: Set[str] = set()
+        self.degrees: Dict[str, int] = {}
+        self.pending: List[Tuple[str, str]] = []
+        self.db: Optional[sqlite3.Connection] = None
+
+    def add_node(self, n: str) -> None:
+        """
+        Add a node.
+
+        Parameters
+        ----------
+        n: str
+            The node id
+
+        """
+        self.nodes.add(n)
+        self._check_memory()
+
+    def add_edge(self, u: str, v: str) -> None:
+        """
+        Add an edge.
+
+        Parameters
+        ----------
+        u: str
+            The subject node id
+        v: str
+            The object node id
+
+        """
+        if self.count_dangling_edges or (self._has_node(u) and self._has_node(v)):
+            self.degrees[u] = self.degrees.get(u, 0) + 1
+            self.degrees[v] = self.degrees.get(v, 0) + 1
+        else:
+            self.pending.append((u, v))
+        self._check_memory()
+
+    def finalize(self) -> None:
+        """
+        Resolve the edges kept aside and compute the final degrees.
+        Must be called once, after all nodes and edges have been added.
+        """
+        if self.db is None:
+            for u, v in self.pending:
+                if u in self.nodes and v in self.nodes:
+                    self.degrees[u] = self.degrees.get(u, 0) + 1
+                    self.degrees[v] = self.degrees.get(v, 0) + 1
+            self.degrees = {n: self.degrees.get(n, 0) for n in self.nodes}
+        else:
+            self._spill()
+            self.db.executescript(
+                """
+                INSERT INTO degrees SELECT u, 1 FROM pending
+                    WHERE u IN (SELECT id FROM nodes) AND v IN (SELECT id FROM nodes);
+                INSERT INTO degrees SELECT v, 1 FROM pending
+                    WHERE u IN (SELECT id FROM nodes) AND v IN (SELECT id FROM nodes);
+                CREATE TABLE node_degree (id TEXT PRIMARY KEY, degree INTEGER);
+                INSERT INTO node_degree
+                    SELECT nodes.id, COALESCE(d.degree, 0) FROM nodes LEFT JOIN (
+                        SELECT id, SUM(count) AS degree FROM degrees GROUP BY id
+                    ) AS d ON nodes.id = d.id;
+                DROP TABLE degrees;
+                DROP TABLE pending;
+                DROP TABLE nodes;
+                """
+            )
+            self.degrees = {}
+        self.nodes = set()
+        self.pending = []
+
+    def get_degree(self, n: str) -> Optional[int]:
+        """
+        Get the degree of a node, once finalized.
+
+        Parameters
+        ----------
+        n: str
+            The node id
+
+        Returns
+        -------
+        Optional[int]
+            The degree of the node, or None if the graph has no such node
+
+        """
+        if self.db is None:
+            return self.degrees.get(n)
+        row = self.db.execute("SELECT degree FROM node_degree WHERE id = ?", (n,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """
+        Close the database, if any.
+        """
+        if self.db is not None:
+            self.db.close()
+
+    def _has_node(self, n: str) -> bool:
+        if n in self.nodes:
+            return True
+        if self.db is not None:
+            return self.db.execute("SELECT 1 FROM nodes WHERE id = ?", (n,)).fetchone() is not None
+        return False
+
+    def _check_memory(self) -> None:
+        if len(self.nodes) + len(self.degrees) + len(self.pending) > self.max_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self.db is None:
+            log.info(f"Spilling node degrees to {self.directory}")
+            self.db = sqlite3.connect(os.path.join(self.directory, 'degrees.db'))
+            self.db.executescript(
+                """
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE nodes (id TEXT PRIMARY KEY);
+                CREATE TABLE degrees (id TEXT, count INTEGER);
+                CREATE TABLE pending (u TEXT, v TEXT);
+                """
+            )
+        self.db.executemany("INSERT OR IGNORE INTO nodes VALUES (?)", ((n,) for n in self.nodes))
+        self.db.executemany("INSERT INTO degrees VALUES (?, ?)", self.degrees.items())
+        self.db.executemany("INSERT INTO pending VALUES (?, ?)", self.pending)
+        self.db.commit()
+        self.nodes = set()
+        self.degrees = {}
+        self.pending = []
+
+
+def degree_filter(
+    degrees: NodeDegrees,
+    min_degree: int = 1,
+    max_degree: Optional[int] = None,
+    remove_dangling_edges: bool = False,
+    removed: Optional[Dict[str, int]] = None,
+) -> RecordOperation:
+    """
+    Get a record operation that drops nodes whose degree is outside of
+    ``[min_degree, max_degree]``, along with their edges, and optionally
+    edges whose subject or object is not a node of the graph.
+
+    Parameters
+    ----------
+    degrees: kgx.graph_operations.degree_filter.NodeDegrees
+        The finalized node degrees
+    min_degree: int
+        The minimum degree of a node to keep
+    max_degree: Optional[int]
+        The maximum degree of a node to keep (no maximum, by default)
+    remove_dangling_edges: bool
+        Whether or not to drop edges whose subject or object is not a node
+    removed: Optional[Dict[str, int]]
+        A dictionary where the number of dropped ``nodes`` and ``edges`` are counted
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    if removed is None:
+        removed = {}
+    removed.setdefault('nodes', 0)
+    removed.setdefault('edges', 0)
+
+    def keep(degree: int) -> bool:
+        return degree >= min_degree and (max_degree is None or degree <= max_degree)
+
+    def operation(rec: Tuple) -> List[Tuple]:
+        if len(rec) == 4:
+            for n in (rec[0], rec[1]):
+                degree = degrees.get_degree(n)
+                if (degree is None and remove_dangling_edges) or (degree is not None and not keep(degree)):
+                    removed['edges'] += 1
+                    return []
+            return [rec]
+        degree = degrees.get_degree(rec[0])
+        if degree is None or keep(degree):
+            return [rec]
+        removed['nodes'] += 1
+        return []
+
+    return operation
+
+
+def stream_remove_singleton_nodes(
+    input_args: Dict,
+    output_args: Dict,
+    min_degree: int = 1,
+    max_degree: Optional[int] = None,
+    remove_dangling_edges: bool = False,
+    spill_directory: Optional[str] = None,
+    max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+) -> Dict[str, int]:
+    """
+    Remove singleton nodes (nodes that have a degree of 0) while streaming
+    from an input to an output, in two passes over the input.
+
+    More generally, nodes whose degree is outside of ``[min_degree, max_degree]``
+    are removed, along with their edges. Degrees are computed on the input graph,
+    once: removing a node does not change the degree of its neighbours.
+
+    Parameters
+    ----------
+    input_args: Dict
+        Arguments relevant to your input source, as for ``Transformer.transform``
+    output_args: Dict
+        Arguments relevant to your output sink, as for ``Transformer.transform``
+    min_degree: int
+        The minimum degree of a node to keep (``1``, by default)
+    max_degree: Optional[int]
+        The maximum degree of a node to keep (no maximum, by default)
+    remove_dangling_edges: bool
+        Whether or not to also remove edges whose subject or object is not
+        a node of the input. Such edges do not count towards node degrees.
+    spill_directory: Optional[str]
+        The directory where node degrees are spilled, if needed (system temporary directory, by default)
+    max_in_memory: int
+        The maximum number of node ids and degrees to keep in memory before spilling
+
+    Returns
+    -------
+    Dict[str, int]
+        The number of removed ``nodes`` and ``edges``
+
+    """
+    if input_args.get('operations'):
+        raise ValueError("Graph operations cannot be applied while streaming a singleton node removal")
+
+    with tempfile.TemporaryDirectory(dir=spill_directory) as directory:
+        start = current_time_in_millis()
+        degrees = NodeDegrees(directory, max_in_memory, count_dangling_edges=not remove_dangling_edges)
+
+        def count(entity_type: GraphEntityType, rec: List) -> None:
+            if entity_type == GraphEntityType.EDGE:
+                degrees.add_edge(rec[0], rec[1])
+            else:
+                degrees.add_node(rec[0])
+
+        transformer = Transformer(stream=True)
+        sources, source_generator = transformer.get_source_generator(copy.deepcopy(input_args))
+        transformer.inspector = count
+        transformer.process(source_generator, NullSink())
+        degrees.finalize()
+        end = current_time_in_millis()
+        log.info(f"Time taken to compute node degrees: {end - start} ms")
+
+        start = current_time_in_millis()
+        node_properties: Set[str] = set()
+        edge_properties: Set[str] = set()
+        for s in sources:
+            node_properties.update(s.node_properties)
+            edge_properties.update(s.edge_properties)
+        removed: Dict[str, int] = {}
+        transformer = Transformer(stream=True)
+        sink = transformer.get_stream_sink(output_args, node_properties, edge_properties)
+        _, source_generator = transformer.get_source_generator(copy.deepcopy(input_args))
+        record_operation = degree_filter(degrees, min_degree, max_degree, remove_dangling_edges, removed)
+        try:
+            transformer.process(source_generator, sink, record_operation)
+        finally:
+            degrees.close()
+        sink.finalize()
+        end = current_time_in_millis()
+        log.info(
+            f"Removed {removed['nodes']} nodes and {removed['edges']} edges; time taken: {end - start} ms"
+        )
+    return removed
@@ -1,9 +1,10 @@
-import copy
-from typing import List
+import heapq
+import zlib
+from typing import List, Iterable, Callable, Any, Dict, Generator, Tuple, Union
 
 from kgx.config import get_logger
 from kgx.graph.base_graph import BaseGraph
-from kgx.utils.kgx_utils import prepare_data_dict
+from kgx.utils.kgx_utils import merge_data_dict, generate_edge_key
 
 
 log = get_logger()
@@ -135,7 +136,7 @@ def merge_node(g: BaseGraph, n: str, data: dict, preserve: bool = True) -> dict:
 
     """
     existing_node = g.nodes()[n]
-    new_data = prepare_data_dict(copy.deepcopy(existing_node), copy.deepcopy(data), preserve)
+    new_data = merge_data_dict(existing_node, data, preserve)
     g.add_node(n, **new_data)
     return existing_node
 
@@ -196,6 +197,121 @@ def merge_edge(g: BaseGraph, u: str, v: str, key: str, data: dict, preserve: boo
 
     """
     existing_edge = g.get_edge(u, v, key)
-    new_data = prepare_data_dict(copy.deepcopy(existing_edge), copy.deepcopy(data), preserve)
+    new_data = merge_data_dict(existing_edge, data, preserve)
     g.add_edge(u, v, edge_key=key, **new_data)
     return existing_edge
+
+
+def node_sort_key(record: Dict) -> str:
+    """
+    The key by which node records are sorted and identified during a streaming merge.
+
+    Parameters
+    ----------
+    record: Dict
+        A node record
+
+    Returns
+    -------
+    str
+        The node id
+
+    """
+    return record['id']
+
+
+def edge_sort_key(record: Dict) -> Tuple[str, str, str]:
+    """
+    The key by which edge records are sorted and identified during a streaming merge.
+
+    This is consistent with how ``kgx.sink.GraphSink`` keys edges in a graph.
+
+    Parameters
+    ----------
+    record: Dict
+        An edge record
+
+    Returns
+    -------
+    Tuple[str, str, str]
+        The subject, object and edge key
+
+    """
+    key = (
+        record['key']
+        if 'key' in record
+        else generate_edge_key(record['subject'], record['predicate'], record['object'])
+    )
+    return record['subject'], record['object'], key
+
+
+def get_partition(key: Union[str, Tuple[str, ...]], partitions: int) -> int:
+    """
+    Get the partition for a node or edge, given its sort key.
+
+    The partition is derived from a stable hash of the key, such that
+    a given node or edge is always routed to the same partition,
+    irrespective of the process it was read in.
+
+    Parameters
+    ----------
+    key: Union[str, Tuple[str, ...]]
+        The sort key of a node (``node_sort_key``) or an edge (``edge_sort_key``)
+    partitions: int
+        The total number of partitions
+
+    Returns
+    -------
+    int
+        The partition, between ``0`` and ``partitions - 1``
+
+    """
+    if isinstance(key, tuple):
+        key = '\t'.join(key)
+    return zlib.crc32(key.encode('utf-8')) % partitions
+
+
+def merge_sorted_records(
+    records: List[Iterable[Dict]], key: Callable[[Dict], Any], preserve: bool = True
+) -> Generator:
+    """
+    Merge one or more streams of records, each sorted by ``key``, into a
+    single stream of records sorted by ``key``, where all the records that
+    share the same key are merged into one.
+
+    Records that share a key are folded in stream order, in the same way as
+    ``merge_node`` and ``merge_edge`` fold a record into an existing one.
+    The first record for each key is updated in place. Only one record
+    per stream is held in memory at any given time.
+
+    Parameters
+    ----------
+    records: List[Iterable[Dict]]
+        A list of record streams, each sorted by ``key``
+    key: Callable[[Dict], Any]
+        The function that returns the sort key for a record
+        (``node_sort_key`` or ``edge_sort_key``)
+    preserve: bool
+        Whether or not to preserve conflicting properties
+
+    Returns
+    -------
+    Generator
+        A generator for merged records
+
+    """
+    current = None
+    current_key = None
+    seen: Dict[str, set] = {}
+    for record in heapq.merge(*records, key=key):
+        k = key(record)
+        if current is not None and k == current_key:
+            merge_data_dict(current, record, preserve, seen)
+        else:
+            if current is not None:
+                yield current
+            current = record
+            current_key = k
+            seen = {}
+    if current is not None:
+        yield current
@@ -8,9 +8,11 @@ import yaml
 from json import dump
 from json.encoder import JSONEncoder
 
-from kgx.utils.kgx_utils import GraphEntityType
+from kgx.utils.kgx_utils import GraphEntityType, merge_counts
 from kgx.prefix_manager import PrefixManager
 from kgx.graph.base_graph import BaseGraph
+from kgx.graph_operations.node_catalog import NodeCatalog
+from kgx.utils.snapshot_utils import write_summary_state, read_summary_state
 
 """
 Generate a knowledge map that corresponds to TRAPI KnowledgeMap.
@@ -69,6 +71,12 @@ class MetaKnowledgeGraph:
     provide a suitable (quick!) report of that count back to the KGX application. The
     Callable (function/callable class) should not modify the record and should be of low
     complexity, so as not to introduce a large computational overhead to validation!
+
+    As with the GraphSummary, a 'partial' MetaKnowledgeGraph summarizes one shard of a graph
+    and is merged with the summaries of the other shards, with ``merge()``. Its edges whose
+    subject or object node is not (yet) in the node catalog are kept aside until the summary
+    of the shard with their nodes has been merged, so that the edge counts of a partial
+    summary are only complete once its edge statistics have been compiled (``get_edge_stats()``).
     """
     error_log = stderr
 
@@ -79,6 +87,8 @@ class MetaKnowledgeGraph:
             edge_facet_properties: Optional[List] = None,
             progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = None,
             error_log=None,
+            partial: bool = False,
+            spill_directory: Optional[str] = None,
             **kwargs
     ):
         """
@@ -97,10 +107,15 @@ class MetaKnowledgeGraph:
             Function given a peek at the current record being stream processed by the class wrapped Callable.
         error_log:
             Where to write any graph processing error message (stderr, by default).
+        partial: bool
+            Whether the summary is one of several partial summaries to be merged
+        spill_directory: Optional[str]
+            The directory where the node catalog is spilled, if needed (no spilling, by default)
         """
         # formal args
 
         self.name = name
+        self.partial = partial
 
         # these facet properties are used mainly for knowledge_source counting
         # using Biolink 2.0 'knowledge_source' slot values
@@ -123,7 +138,7 @@ class MetaKnowledgeGraph:
 
         # internal attributes
         # For Nodes...
-        self.node_catalog: Dict[str, List[int]] = dict()
+        self.node_catalog: NodeCatalog = NodeCatalog(spill_directory)
         self.node_stats: Dict[str, MetaKnowledgeGraph.Category] = dict()
 
         # We no longer track 'unknown' categories in meta-knowledge-graph
@@ -136,6 +151,10 @@ class MetaKnowledgeGraph:
         self.association_map: Dict = dict()
         self.edge_stats = []
 
+        # number of edges of a partial summary whose nodes were not found, by
+        # subject, object, predicate and the relation and facet values of the edge
+        self.pending_edges: Dict[Tuple, int] = dict()
+
         # Overall graph statistics
         self.graph_stats: Dict[str, Dict] = dict()
 
@@ -173,7 +192,8 @@ class MetaKnowledgeGraph:
     def get_facet_counts(
             facets: Optional[List],
             counts_by_source: Dict,
-            data: Dict
+            data: Dict,
+            count: int = 1
     ):
         unknown: bool = True
         for facet in facets:
@@ -188,22 +208,21 @@ class MetaKnowledgeGraph:
                     if facet not in counts_by_source:
                         counts_by_source[facet] = dict()
                     if s in counts_by_source[facet]:
-                        counts_by_source[facet][s] += 1
+                        counts_by_source[facet][s] += count
                     else:
-                        counts_by_source[facet][s] = 1
+                        counts_by_source[facet][s] = count
         if unknown:
             if 'unknown' in counts_by_source:
-                counts_by_source['unknown'] += 1
+                counts_by_source['unknown'] += count
             else:
-                counts_by_source['unknown'] = 1
+                counts_by_source['unknown'] = count
 
     class Category:
         """
         Internal class for compiling statistics about a distinct category.
         """
         # The 'category map' just associates a unique int catalog
-        # index ('cid') value as a proxy for the full curie string,
-        # to reduce storage in the main node catalog
+        # index ('cid') value as a proxy for the full curie string
         _category_curie_map: List[str] = list()
 
         def __init__(self, category_curie: str, mkg):
@@ -221,6 +240,9 @@ class MetaKnowledgeGraph:
             
             if self.category_curie not in self._category_curie_map:
                 self._category_curie_map.append(self.category_curie)
+            # the index of a category never changes once it has
+            # been mapped, so it is looked up only once here
+            self._cid = self._category_curie_map.index(self.category_curie)
             self.category_stats: Dict[str, Any] = dict()
             self.category_stats['id_prefixes'] = set()
             self.category_stats['count'] = 0
@@ -242,7 +264,7 @@ class MetaKnowledgeGraph:
             int
                 Internal MetaKnowledgeGraph index id for tracking a Category.
             """
-            return self._category_curie_map.index(self.category_curie)
+            return self._cid
 
         @classmethod
         def get_category_curie_from_index(cls, cid: int) -> str:
@@ -310,14 +332,15 @@ class MetaKnowledgeGraph:
                 if prefix not in self.category_stats['id_prefixes']:
                     self.category_stats['id_prefixes'].add(prefix)
 
-        def _compile_category_source_stats(self, data: Dict):
+        def _compile_category_source_stats(self, data: Dict, count: int = 1):
             self.mkg.get_facet_counts(
                 self.mkg.node_facet_properties,
                 self.category_stats['count_by_source'],
-                data
+                data,
+                count
             )
 
-        def analyse_node_category(self, n, data) -> None:
+        def analyse_node_category(self, n, data, count: int = 1) -> None:
             """
             Analyse metadata of a given graph node record of this category.
 
@@ -327,11 +350,13 @@ class MetaKnowledgeGraph:
                 Curie identifier of the node record (not used here).
             data: Dict
                 Complete data dictionary of node record fields.
+            count: int
+                Number of node records with the same prefix and data (other than their identifier)
 
             """
-            self.category_stats['count'] += 1
+            self.category_stats['count'] += count
             self._compile_prefix_stats(n)
-            self._compile_category_source_stats(data)
+            self._compile_category_source_stats(data, count)
 
         def json_object(self):
             """
@@ -363,7 +388,9 @@ class MetaKnowledgeGraph:
         """
         return self.node_stats[category_curie]
 
-    def _process_category_field(self, category_field: str, n: str, data: Dict):
+    def _process_category_field(
+            self, category_field: str, n: str, data: Dict, node_categories: List[str], count: int = 1
+    ):
         # we note here that category_curie *may be*
         # a piped '|' set of Biolink category CURIE values
         category_list = category_field.split("|")
@@ -379,12 +406,11 @@ class MetaKnowledgeGraph:
                     continue
         
             category_record = self.node_stats[category_curie]
-            
-            category_idx: int = category_record.get_cid()
-            if category_idx not in self.node_catalog[n]:
-                self.node_catalog[n].append(category_idx)
-                
-            category_record.analyse_node_category(n, data)
+
+            if category_curie not in node_categories:
+                node_categories.append(category_curie)
+
+            category_record.analyse_node_category(n, data, count)
     
     def analyse_node(self, n: str, data: Dict) -> None:
         """
@@ -397,67 +423,104 @@ class MetaKnowledgeGraph:
         data: Dict
             Complete data dictionary of node record fields.
 
+        """
+        self.analyse_nodes([n], data)
+
+    def analyse_nodes(self, nodes: List[str], data: Dict) -> None:
+        """
+        Analyse metadata of graph node records which only differ by their identifier,
+        as if each of them had been analysed with ``analyse_node``.
+
+        Parameters
+        ----------
+        nodes: List[str]
+            Curie identifiers of the node records, which must all have the same prefix.
+        data: Dict
+            Complete data dictionary of node record fields (other than the identifier).
+
         """
         # The TRAPI release 1.1 meta_knowledge_graph format indexes nodes by biolink:Category
         # the node 'category' field is a list of assigned categories (usually just one...).
         # However, this may perhaps sometimes result in duplicate counting and conflation of prefixes(?).
-        if n in self.node_catalog:
-            # Report duplications of node records, as discerned from node id.
-            _parse_warning("Duplicate node identifier", n, "encountered in input node data?")
-            return
-        else:
-            self.node_catalog[n] = list()
-            
+        new_nodes: List[str] = list()
+        seen: Set[str] = set()
+        for n in nodes:
+            if n in self.node_catalog or n in seen:
+                # Report duplications of node records, as discerned from node id.
+                _parse_warning("Duplicate node identifier", n, "encountered in input node data?")
+            else:
+                new_nodes.append(n)
+                seen.add(n)
+
+        if len(new_nodes) > 1 and not PrefixManager.get_prefix(new_nodes[0]):
+            # nodes without a prefix are reported one by one
+            for n in new_nodes:
+                self._analyse_new_nodes([n], data)
+        elif new_nodes:
+            self._analyse_new_nodes(new_nodes, data)
+
+    def _analyse_new_nodes(self, nodes: List[str], data: Dict) -> None:
         if 'category' not in data or not data['category']:
             # we now simply exclude nodes with missing categories from the count, since a category
             # of 'unknown' in the  meta_knowledge_graph output  is considered invalid.
             # category = self.node_stats['unknown']
             # category.analyse_node_category(n, data)
-            print(
-                "Node with identifier '" + n + "' is missing its 'category' value? Ignoring in the analysis...",
-                file=MetaKnowledgeGraph.error_log
-            )
+            for n in nodes:
+                print(
+                    "Node with identifier '" + n + "' is missing its 'category' value? Ignoring in the analysis...",
+                    file=MetaKnowledgeGraph.error_log
+                )
+                self.node_catalog.add(n, ())
             return
 
         categories = data['category']
 
         # analyse them each independently...
+        node_categories: List[str] = list()
         for category_field in categories:
-            self._process_category_field(category_field, n, data)
+            self._process_category_field(category_field, nodes[0], data, node_categories, len(nodes))
+        for n in nodes:
+            self.node_catalog.add(n, node_categories)
 
-    def _capture_predicate(self, data: Dict) -> Optional[str]:
+    def _capture_predicate(self, data: Dict, count: int = 1) -> Optional[str]:
         if 'predicate' not in data:
             # We no longer track edges with 'unknown' predicates,
             # since those would not be TRAPI 1.1 JSON compliant...
             # self.predicates['unknown'] += 1
             # predicate = "unknown"
-            _parse_warning("Empty predicate CURIE in edge data", str(data))
-            self.edge_record_count -= 1
+            for _ in range(count):
+                _parse_warning("Empty predicate CURIE in edge data", str(data))
+            self.edge_record_count -= count
             return None
         else:
             predicate = data['predicate']
-        
-            if not _predicate_curie_regexp.fullmatch(predicate):
-                _parse_warning("Invalid predicate CURIE", predicate)
-                self.edge_record_count -= 1
+
+            # predicates already counted have been checked before
+            if predicate not in self.predicates and not _predicate_curie_regexp.fullmatch(predicate):
+                for _ in range(count):
+                    _parse_warning("Invalid predicate CURIE", predicate)
+                self.edge_record_count -= count
                 return None
         
             if predicate not in self.predicates:
                 # just need to track the number
                 # of edge records using this predicate
                 self.predicates[predicate] = 0
-            self.predicates[predicate] += 1
+            self.predicates[predicate] += count
             
         return predicate
 
-    def _compile_triple_source_stats(self, triple: Tuple[str, str, str], data: Dict):
+    def _compile_triple_source_stats(self, triple: Tuple[str, str, str], data: Dict, count: int = 1):
         self.get_facet_counts(
             self.edge_facet_properties,
             self.association_map[triple]['count_by_source'],
-            data
+            data,
+            count
         )
 
-    def _process_triple(self, subject_category: str, predicate: str, object_category: str, data: Dict):
+    def _process_triple(
+            self, subject_category: str, predicate: str, object_category: str, data: Dict, count: int = 1
+    ):
         # Process the 'valid' S-P-O triple here...
         triple = (subject_category, predicate, object_category)
         if triple not in self.association_map:
@@ -473,9 +536,9 @@ class MetaKnowledgeGraph:
         if 'relation' in data and data['relation'] not in self.association_map[triple]['relations']:
             self.association_map[triple]['relations'].add(data['relation'])
     
-        self.association_map[triple]['count'] += 1
+        self.association_map[triple]['count'] += count
 
-        self._compile_triple_source_stats(triple, data)
+        self._compile_triple_source_stats(triple, data, count)
 
     def analyse_edge(self, u, v, k, data) -> None:
         """
@@ -491,6 +554,21 @@ class MetaKnowledgeGraph:
         data: Dict
             Complete data dictionary of edge record fields.
         """
+        self.analyse_edges([(u, v)], data)
+
+    def analyse_edges(self, edges: List[Tuple[str, str]], data: Dict) -> None:
+        """
+        Analyse metadata of graph edge records which only differ by their subject and object,
+        as if each of them had been analysed with ``analyse_edge``.
+
+        Parameters
+        ----------
+        edges: List[Tuple[str, str]]
+            Subject and object node curie identifiers of the edges. The subject nodes
+            must all have the same categories (or all be missing), as must the object nodes.
+        data: Dict
+            Complete data dictionary of edge record fields (other than the subject and object).
+        """
         # we blissfully assume that all the nodes of a
         # graph stream were analysed first by the MetaKnowledgeGraph
         # before the edges are analysed, thus we can test for
@@ -501,35 +579,76 @@ class MetaKnowledgeGraph:
         # or by conflation (i.e. gene == protein id?), then the Cartesian product of
         # subject/object edges mappings need to be captured here.
         #
-        self.edge_record_count += 1
+        self.edge_record_count += len(edges)
 
-        predicate: str = self._capture_predicate(data)
+        predicate: str = self._capture_predicate(data, len(edges))
         if not predicate:
             # relationship needs a predicate to process?
             return
 
-        if u not in self.node_catalog:
+        if self.partial:
+            resolved_edges: List[Tuple[str, str]] = list()
+            for u, v in edges:
+                if u in self.node_catalog and v in self.node_catalog:
+                    resolved_edges.append((u, v))
+                else:
+                    # the nodes may be in the summary of another shard
+                    key = (u, v, predicate, self._get_edge_values(data))
+                    self.pending_edges[key] = self.pending_edges.get(key, 0) + 1
+            edges = resolved_edges
+
+        if len(edges) > 1 and not (edges[0][0] in self.node_catalog and edges[0][1] in self.node_catalog):
+            # edges with missing nodes are reported one by one
+            for u, v in edges:
+                self._process_edge_categories(u, v, predicate, data)
+        elif edges:
+            self._process_edge_categories(edges[0][0], edges[0][1], predicate, data, len(edges))
+
+    def _get_edge_values(self, data: Dict) -> Tuple:
+        values = []
+        for p in ['relation'] + self.edge_facet_properties:
+            if p in data:
+                value = data[p]
+                values.append((p, tuple(value) if isinstance(value, (list, set)) else value))
+        return tuple(values)
+
+    def _resolve_pending_edges(self, final: bool = False):
+        # edges are resolved once both of their nodes are known or,
+        # when the summary is finalized, discarded as before
+        for key, count in list(self.pending_edges.items()):
+            u, v, predicate, values = key
+            if not final and not (u in self.node_catalog and v in self.node_catalog):
+                continue
+            data = {p: list(value) if isinstance(value, tuple) else value for p, value in values}
+            if u in self.node_catalog and v in self.node_catalog:
+                self._process_edge_categories(u, v, predicate, data, count)
+            else:
+                for _ in range(count):
+                    self._process_edge_categories(u, v, predicate, data)
+            del self.pending_edges[key]
+
+    def _process_edge_categories(self, u: str, v: str, predicate: str, data: Dict, count: int = 1):
+        subject_categories = self.node_catalog.get(u)
+        if subject_categories is None:
             _parse_warning("Edge 'subject' node ID", u, "not found in node catalog")
             # removing from edge count
             self.edge_record_count -= 1
             self.predicates[predicate] -= 1
             return
 
-        for subj_cat_idx in self.node_catalog[u]:
+        object_categories = self.node_catalog.get(v)
 
-            subject_category: str = self.Category.get_category_curie_from_index(subj_cat_idx)
+        for subject_category in subject_categories:
 
-            if v not in self.node_catalog:
+            if object_categories is None:
                 _parse_warning("Edge 'object' node ID", v, "not found in node catalog")
                 self.edge_record_count -= 1
                 self.predicates[predicate] -= 1
                 return
 
-            for obj_cat_idx in self.node_catalog[v]:
-
-                object_category: str = self.Category.get_category_curie_from_index(obj_cat_idx)
+            for object_category in object_categories:
 
-                self._process_triple(subject_category, predicate, object_category, data)
+                self._process_triple(subject_category, predicate, object_category, data, count)
                 
     def get_number_of_categories(self) -> int:
         """
@@ -567,6 +686,7 @@ class MetaKnowledgeGraph:
         # Not sure if this is "safe" but assume
         # that edge_stats may be cached once computed?
         if not self.edge_stats:
+            self._resolve_pending_edges(final=True)
             for k, v in self.association_map.items():
                 kedge = v
                 relations = list(v['relations'])
@@ -744,6 +864,161 @@ class MetaKnowledgeGraph:
             )
             return dict()
     
+    def merge(self, other: 'MetaKnowledgeGraph') -> 'MetaKnowledgeGraph':
+        """
+        Merge the statistics of another (partial) MetaKnowledgeGraph into this one.
+
+        Merging is associative, so that the summaries of the shards of a
+        graph can be merged in any grouping, but the node statistics of the
+        shards should be merged in the order of the shards, for the categories
+        of a node found in more than one shard to be those of the first one.
+        Such a node is no longer counted by category in the summary merged
+        later, as with a duplicate node in a single summary, but its sources
+        and identifier prefix are still counted there.
+
+        Parameters
+        ----------
+        other: MetaKnowledgeGraph
+            The MetaKnowledgeGraph to merge, which is left unchanged.
+
+        Returns
+        -------
+        MetaKnowledgeGraph
+            This MetaKnowledgeGraph
+
+        Raises
+        ------
+        RuntimeError
+            Error if the statistics of either summary were already compiled,
+            or if the summaries do not facet on the same properties.
+
+        """
+        if self.edge_stats or self.graph_stats or other.edge_stats or other.graph_stats:
+            raise RuntimeError("Cannot merge MetaKnowledgeGraph statistics which were already compiled")
+        if (
+            self.node_facet_properties != other.node_facet_properties
+            or self.edge_facet_properties != other.edge_facet_properties
+        ):
+            raise RuntimeError("Cannot merge MetaKnowledgeGraph statistics with different facet properties")
+
+        for category_curie, category in other.node_stats.items():
+            if category_curie not in self.node_stats:
+                self.node_stats[category_curie] = self.Category(category_curie, self)
+            merge_counts(self.node_stats[category_curie].category_stats, category.category_stats)
+
+        for n, node_categories in other.node_catalog.items():
+            if n in self.node_catalog:
+                print(
+                    f"Node identifier '{n}' found in more than one merged summary?"
+                    " Keeping the categories of the first...",
+                    file=MetaKnowledgeGraph.error_log
+                )
+                for category_curie in node_categories:
+                    self.node_stats[category_curie].category_stats['count'] -= 1
+            else:
+                self.node_catalog.add(n, node_categories)
+
+        self.edge_record_count += other.edge_record_count
+        merge_counts(self.predicates, other.predicates)
+        merge_counts(self.association_map, other.association_map)
+
+        merge_counts(self.pending_edges, other.pending_edges)
+        self._resolve_pending_edges()
+        return self
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        # the progress monitor is not sent to other processes
+        state['progress_monitor'] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        # categories are indexed by the process where they are first seen
+        curie_map = self.Category._category_curie_map
+        for category in self.node_stats.values():
+            if category.category_curie not in curie_map:
+                curie_map.append(category.category_curie)
+            category._cid = curie_map.index(category.category_curie)
+
+
+    def save_state(self, filename: str) -> None:
+        """
+        Save the full state of the MetaKnowledgeGraph (not just its statistics), to
+        be loaded with ``load_state`` and updated or merged with others later.
+
+        The state is written as tagged JSON (see ``kgx.utils.snapshot_utils.tag_dict``),
+        and the nodes of the node catalog are written to an SQLite database next to
+        the file, with a ``.nodes.db`` suffix.
+
+        Parameters
+        ----------
+        filename: str
+            The file to save the state to
+
+        Raises
+        ------
+        RuntimeError
+            Error if the statistics of the MetaKnowledgeGraph were already compiled.
+
+        """
+        if self.edge_stats or self.graph_stats:
+            raise RuntimeError("Cannot save the state of a MetaKnowledgeGraph whose statistics were already compiled")
+        self.node_catalog.persist(filename + '.nodes.db')
+        state = {
+            'name': self.name,
+            'node_facet_properties': self.node_facet_properties,
+            'edge_facet_properties': self.edge_facet_properties,
+            'partial': self.partial,
+            'node_stats': {k: x.category_stats for k, x in self.node_stats.items()},
+            'edge_record_count': self.edge_record_count,
+            'predicates': self.predicates,
+            'association_map': self.association_map,
+            'pending_edges': self.pending_edges,
+            'node_catalog': self.node_catalog.to_dict(),
+        }
+        write_summary_state(filename, type(self).__name__, state)
+
+    @classmethod
+    def load_state(cls, filename: str) -> 'MetaKnowledgeGraph':
+        """
+        Load the state of a MetaKnowledgeGraph, as saved with ``save_state``.
+
+        Parameters
+        ----------
+        filename: str
+            The file to load the state from
+
+        Returns
+        -------
+        MetaKnowledgeGraph
+            The MetaKnowledgeGraph
+
+        Raises
+        ------
+        ValueError
+            Error if the file is not the state of a graph summary in the current format.
+        TypeError
+            Error if the file is the state of another type of summary.
+
+        """
+        state = read_summary_state(filename, cls.__name__)
+        mkg = cls(
+            name=state['name'],
+            node_facet_properties=state['node_facet_properties'],
+            edge_facet_properties=state['edge_facet_properties'],
+            partial=state['partial'],
+        )
+        for category_curie, category_stats in state['node_stats'].items():
+            mkg.node_stats[category_curie] = cls.Category(category_curie, mkg)
+            mkg.node_stats[category_curie].category_stats = category_stats
+        mkg.edge_record_count = state['edge_record_count']
+        mkg.predicates = state['predicates']
+        mkg.association_map = state['association_map']
+        mkg.pending_edges = state['pending_edges']
+        mkg.node_catalog = NodeCatalog.from_dict(state['node_catalog'], filename + '.nodes.db')
+        return mkg
+
     def summarize_graph_nodes(self, graph: BaseGraph) -> Dict:
         """
         Summarize the nodes in a graph.
@@ -0,0 +1,249 @@
+"""
+A compact catalog of the categories of the nodes of a streamed graph,
+for graph summaries to join edges with the categories of their nodes.
+"""
+import os
+import sqlite3
+import tempfile
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+from kgx.config import get_logger
+
+log = get_logger()
+
+DEFAULT_MAX_IN_MEMORY = 10000000
+
+# the lowest limit on the number of parameters of an SQLite statement
+SQLITE_MAX_VARIABLES = 999
+
+_SCHEMA = """
+PRAGMA journal_mode = OFF;
+PRAGMA synchronous = OFF;
+CREATE TABLE nodes (id TEXT PRIMARY KEY, categories INTEGER) WITHOUT ROWID;
+"""
+
+
+class NodeCatalog(object):
+    """
+    The categories of the nodes of a streamed graph.
+
+    Each distinct combination of categories is stored once and every node
+    is mapped to the index of its combination, rather than to its own list
+    of categories. Nodes are kept in memory until more than ``max_in_memory``
+    of them have been added, at which point they are spilled to an SQLite
+    database in ``directory``, if one is given.
+
+    A catalog can be pickled, to be sent to another process. The database of
+    a spilled catalog is then shared with its copy, which should only be read.
+
+    Parameters
+    ----------
+    directory: Optional[str]
+        The directory where the database is created when spilling (no spilling, by default)
+    max_in_memory: int
+        The maximum number of nodes to keep in memory
+
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_in_memory: int = DEFAULT_MAX_IN_MEMORY):
+        self.directory = directory
+        self.max_in_memory = max_in_memory
+        self.categories: List[Tuple[str, ...]] = []
+        self.category_index: Dict[Tuple[str, ...], int] = {}
+        self.nodes: Dict[str, int] = {}
+        self.filename: Optional[str] = None
+        self.spilled: int = 0
+        self.db: Optional[sqlite3.Connection] = None
+
+    def add(self, n: str, categories: Iterable[str]) -> None:
+        """
+        Add a node, which must not already be in the catalog.
+
+        Parameters
+        ----------
+        n: str
+            The node id
+        categories: Iterable[str]
+            The categories of the node
+
+        """
+        categories = tuple(categories)
+        index = self.category_index.get(categories)
+        if index is None:
+            index = len(self.categories)
+            self.category_index[categories] = index
+            self.categories.append(categories)
+        self.nodes[n] = index
+        if self.directory and len(self.nodes) > self.max_in_memory:
+            self._spill()
+
+    def get(self, n: str) -> Optional[Tuple[str, ...]]:
+        """
+        Get the categories of a node.
+
+        Parameters
+        ----------
+        n: str
+            The node id
+
+        Returns
+        -------
+        Optional[Tuple[str, ...]]
+            The categories of the node, or None if the node is not in the catalog
+
+        """
+        index = self.nodes.get(n)
+        if index is None and self.db is not None:
+            row = self.db.execute("SELECT categories FROM nodes WHERE id = ?", (n,)).fetchone()
+            if row:
+                index = row[0]
+        return None if index is None else self.categories[index]
+
+    def get_indices(self, nodes: List[str]) -> List[int]:
+        """
+        Get the indices of the category combinations of several nodes at once.
+
+        Parameters
+        ----------
+        nodes: List[str]
+            The node ids
+
+        Returns
+        -------
+        List[int]
+            The index in ``categories`` of the categories of each node, or -1 if the node is not in the catalog
+
+        """
+        indices = [self.nodes.get(n, -1) for n in nodes]
+        if self.db is not None:
+            missing = list({n for n, index in zip(nodes, indices) if index < 0})
+            spilled: Dict[str, int] = {}
+            for i in range(0, len(missing), SQLITE_MAX_VARIABLES):
+                batch = missing[i:i + SQLITE_MAX_VARIABLES]
+                query = f"SELECT id, categories FROM nodes WHERE id IN ({', '.join('?' * len(batch))})"
+                spilled.update(self.db.execute(query, batch))
+            indices = [spilled.get(n, -1) if index < 0 else index for n, index in zip(nodes, indices)]
+        return indices
+
+    def items(self) -> Generator[Tuple[str, Tuple[str, ...]], None, None]:
+        """
+        Get all the nodes of the catalog, with their categories.
+
+        Returns
+        -------
+        Generator[Tuple[str, Tuple[str, ...]], None, None]
+            The node ids and their categories
+
+        """
+        if self.db is not None:
+            for n, index in self.db.execute("SELECT id, categories FROM nodes"):
+                yield n, self.categories[index]
+        for n, index in self.nodes.items():
+            yield n, self.categories[index]
+
+    def persist(self, filename: str) -> None:
+        """
+        Write all the nodes, spilled or not, to a database which
+        outlives the spill directory, and use that database from now on.
+
+        Parameters
+        ----------
+        filename: str
+            The filename of the database
+
+        """
+        if self.filename != filename:
+            if os.path.exists(filename):
+                os.remove(filename)
+            db = sqlite3.connect(filename)
+            if self.db is not None:
+                self.db.backup(db)
+                self.db.close()
+            else:
+                db.executescript(_SCHEMA)
+            self.db = db
+            self.filename = filename
+        self._write_nodes()
+
+    def to_dict(self) -> Dict:
+        """
+        Get the state of a persisted catalog (see ``persist``), all of whose nodes are in its
+        database, as JSON compatible data. The database itself is not part of the state.
+
+        Returns
+        -------
+        Dict
+            The category combinations of the catalog and its number of nodes
+
+        """
+        if self.nodes or self.db is None:
+            raise RuntimeError("Only the state of a persisted node catalog can be saved")
+        return {'categories': [list(x) for x in self.categories], 'count': self.spilled}
+
+    @classmethod
+    def from_dict(cls, data: Dict, filename: str) -> 'NodeCatalog':
+        """
+        Open a persisted catalog.
+
+        Parameters
+        ----------
+        data: Dict
+            The state of the catalog, as returned by ``to_dict``
+        filename: str
+            The filename of the database of the catalog
+
+        Returns
+        -------
+        NodeCatalog
+            The catalog
+
+        """
+        if not os.path.exists(filename):
+            raise ValueError(f"No node catalog database {filename}")
+        catalog = cls()
+        catalog.categories = [tuple(x) for x in data['categories']]
+        catalog.category_index = {x: i for i, x in enumerate(catalog.categories)}
+        catalog.spilled = data['count']
+        catalog.filename = filename
+        catalog.db = sqlite3.connect(filename)
+        return catalog
+
+    def close(self) -> None:
+        """
+        Close the database, if any.
+        """
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def __contains__(self, n: str) -> bool:
+        return self.get(n) is not None
+
+    def __len__(self) -> int:
+        return len(self.nodes) + self.spilled
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['db'] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        if self.filename:
+            self.db = sqlite3.connect(self.filename)
+
+    def _spill(self) -> None:
+        if self.db is None:
+            fd, self.filename = tempfile.mkstemp(suffix='.db', dir=self.directory)
+            os.close(fd)
+            log.info(f"Spilling node catalog to {self.filename}")
+            self.db = sqlite3.connect(self.filename)
+            self.db.executescript(_SCHEMA)
+        self._write_nodes()
+
+    def _write_nodes(self) -> None:
+        # move the nodes kept in memory to the database
+        self.db.executemany("INSERT INTO nodes VALUES (?, ?)", self.nodes.items())
+        self.db.commit()
+        self.spilled += len(self.nodes)
+        self.nodes = {}
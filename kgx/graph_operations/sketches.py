@@ -0,0 +1,543 @@
+"""
+Mergeable sketches for approximate graph summaries, whose memory does not
+grow with the number of distinct values that they summarize.
+"""
+import base64
+import hashlib
+import heapq
+import math
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+DEFAULT_PRECISION = 14
+DEFAULT_MAX_EXACT = 1000
+DEFAULT_MAX_EXAMPLES = 10
+
+
+def _hash64(value: Any) -> int:
+    # a hash that is the same in every process, unlike the built-in hash of strings
+    return int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog(object):
+    """
+    A HyperLogLog sketch, estimating the number of distinct values added to it.
+
+    The values are kept, and counted exactly, until there are more than
+    ``max_exact`` of them. Only then are they hashed into the registers.
+
+    Parameters
+    ----------
+    precision: int
+        The sketch has ``2 ** precision`` registers, of one byte each,
+        for a relative standard error of ``1.04 / sqrt(2 ** precision)``
+    max_exact: int
+        The maximum number of distinct values to count exactly
+
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, max_exact: int = DEFAULT_MAX_EXACT):
+        self.precision = precision
+        self.max_exact = max_exact
+        self.values: Optional[Set[Any]] = set()
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """
+        Add a value.
+
+        Parameters
+        ----------
+        value: Any
+            The value
+
+        """
+        if self.values is not None:
+            self.values.add(value)
+            if len(self.values) > self.max_exact:
+                self._spill_values()
+            return
+        self._add_hash(value)
+
+    def _add_hash(self, value: Any) -> None:
+        h = _hash64(value)
+        width = 64 - self.precision
+        index = h >> width
+        rank = width - (h & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def _spill_values(self) -> None:
+        values, self.values = self.values, None
+        for value in values or ():
+            self._add_hash(value)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Merge another sketch, with the same precision, into this one.
+
+        Parameters
+        ----------
+        other: kgx.graph_operations.sketches.HyperLogLog
+            The sketch to merge
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.HyperLogLog
+            This sketch
+
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precisions")
+        if self.values is not None and other.values is not None:
+            self.values.update(other.values)
+            if len(self.values) > self.max_exact:
+                self._spill_values()
+            return self
+        self._spill_values()
+        for value in other.values or ():
+            self._add_hash(value)
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """
+        Returns
+        -------
+        int
+            The estimated number of distinct values
+        """
+        if self.values is not None:
+            return len(self.values)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # linear counting, for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def relative_error(self) -> float:
+        """
+        Returns
+        -------
+        float
+            The relative standard error of the estimated number of distinct values
+        """
+        if self.values is not None:
+            return 0.0
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            The state of the sketch, as JSON compatible data
+        """
+        return {
+            'precision': self.precision,
+            'max_exact': self.max_exact,
+            'values': None if self.values is None else sorted(self.values, key=str),
+            'registers': base64.b64encode(self.registers).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        """
+        Create a sketch from its state.
+
+        Parameters
+        ----------
+        data: Dict[str, Any]
+            The state of the sketch, as returned by ``to_dict``
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.HyperLogLog
+            The sketch
+
+        """
+        sketch = cls(data['precision'], data['max_exact'])
+        sketch.values = None if data['values'] is None else set(data['values'])
+        sketch.registers = bytearray(base64.b64decode(data['registers']))
+        return sketch
+
+
+class TopKCounter(object):
+    """
+    A Space-Saving sketch, counting the most frequent values added to it.
+
+    At most ``capacity`` values are counted. When a new value is added to a
+    full sketch, it replaces the least counted value and inherits its count,
+    which is then the maximum error of the count of the new value. Any value
+    which occurs more than ``total / capacity`` times is counted.
+
+    Parameters
+    ----------
+    capacity: int
+        The number of values that are counted
+
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        # a heap of the counted values, by count, whose counts are only updated when popped
+        self.heap: List[Tuple[int, int, Any]] = []
+        self.pushed = 0
+
+    def add(self, value: Any, count: int = 1) -> None:
+        """
+        Count a value.
+
+        Parameters
+        ----------
+        value: Any
+            The value
+        count: int
+            The number of occurrences of the value
+
+        """
+        self.total += count
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = count
+            self.errors[value] = 0
+            self._push(value)
+        else:
+            evicted = self._pop_least_counted()
+            floor = self.counts.pop(evicted)
+            del self.errors[evicted]
+            self.counts[value] = floor + count
+            self.errors[value] = floor
+            self._push(value)
+
+    def _push(self, value: Any) -> None:
+        self.pushed += 1
+        heapq.heappush(self.heap, (self.counts[value], self.pushed, value))
+
+    def _pop_least_counted(self) -> Any:
+        while True:
+            count, _, value = heapq.heappop(self.heap)
+            if count == self.counts[value]:
+                return value
+            # the value was counted again since it was pushed
+            self._push(value)
+
+    def _floor(self) -> int:
+        # the maximum count of any value which is not counted
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other: 'TopKCounter') -> 'TopKCounter':
+        """
+        Merge another sketch into this one.
+
+        Parameters
+        ----------
+        other: kgx.graph_operations.sketches.TopKCounter
+            The sketch to merge
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.TopKCounter
+            This sketch
+
+        """
+        floors = (self._floor(), other._floor())
+        counts: Dict[Any, int] = {}
+        errors: Dict[Any, int] = {}
+        for value in list(self.counts) + [x for x in other.counts if x not in self.counts]:
+            counts[value] = 0
+            errors[value] = 0
+            for sketch, floor in zip((self, other), floors):
+                if value in sketch.counts:
+                    counts[value] += sketch.counts[value]
+                    errors[value] += sketch.errors[value]
+                else:
+                    counts[value] += floor
+                    errors[value] += floor
+        kept = sorted(counts, key=lambda x: (-counts[x], str(x)))[:self.capacity]
+        self.counts = {x: counts[x] for x in kept}
+        self.errors = {x: errors[x] for x in kept}
+        self.total += other.total
+        self.heap = []
+        for value in kept:
+            self._push(value)
+        return self
+
+    def json_object(self) -> Dict[Any, Dict[str, int]]:
+        """
+        Returns
+        -------
+        Dict[Any, Dict[str, int]]
+            The counts of the values, from the most to the least counted, with their maximum error
+        """
+        values = sorted(self.counts, key=lambda x: (-self.counts[x], str(x)))
+        return {x: {'count': self.counts[x], 'error': self.errors[x]} for x in values}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            The state of the sketch, as JSON compatible data
+        """
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'counts': [[x, count, self.errors[x]] for x, count in self.counts.items()],
+            'heap': [list(x) for x in self.heap],
+            'pushed': self.pushed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TopKCounter':
+        """
+        Create a sketch from its state.
+
+        Parameters
+        ----------
+        data: Dict[str, Any]
+            The state of the sketch, as returned by ``to_dict``
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.TopKCounter
+            The sketch
+
+        """
+        sketch = cls(data['capacity'])
+        sketch.total = data['total']
+        for x, count, error in data['counts']:
+            sketch.counts[x] = count
+            sketch.errors[x] = error
+        sketch.heap = [tuple(x) for x in data['heap']]
+        sketch.pushed = data['pushed']
+        return sketch
+
+
+class ReservoirSample(object):
+    """
+    A sample of the values added to it, chosen at random
+    in proportion to the number of their occurrences.
+
+    Parameters
+    ----------
+    size: int
+        The size of the sample
+    seed: int
+        The seed of the random choices, for samples to be reproducible
+
+    """
+
+    def __init__(self, size: int = DEFAULT_MAX_EXAMPLES, seed: int = 0):
+        self.size = size
+        self.random = random.Random(seed)
+        self.items: List[Tuple[float, Any]] = []
+        # the number of occurrences to skip before the next value enters the sample
+        self.skip: float = 0.0
+
+    def add(self, value: Any, count: int = 1) -> None:
+        """
+        Add a value.
+
+        Parameters
+        ----------
+        value: Any
+            The value
+        count: int
+            The number of occurrences of the value
+
+        """
+        # weighted reservoir sampling with exponential jumps (A-ExpJ), keeping the
+        # values with the largest random keys, without drawing a key for every value
+        if len(self.items) < self.size:
+            self._push(self._random() ** (1.0 / count), value)
+            return
+        self.skip -= count
+        if self.skip <= 0:
+            threshold = self.items[0][0] ** count
+            key = (threshold + (1.0 - threshold) * self._random()) ** (1.0 / count)
+            self._push(key, value)
+
+    def _random(self) -> float:
+        # a random number in ]0, 1]
+        return 1.0 - self.random.random()
+
+    def _push(self, key: float, value: Any) -> None:
+        if len(self.items) < self.size:
+            heapq.heappush(self.items, (key, value))
+        elif key > self.items[0][0]:
+            heapq.heapreplace(self.items, (key, value))
+        else:
+            return
+        if len(self.items) == self.size:
+            threshold = self.items[0][0]
+            self.skip = math.log(self._random()) / math.log(threshold) if 0.0 < threshold < 1.0 else math.inf
+
+    def merge(self, other: 'ReservoirSample') -> 'ReservoirSample':
+        """
+        Merge another sample into this one.
+
+        Parameters
+        ----------
+        other: kgx.graph_operations.sketches.ReservoirSample
+            The sample to merge
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.ReservoirSample
+            This sample
+
+        """
+        for key, value in other.items:
+            self._push(key, value)
+        return self
+
+    def values(self) -> List[Any]:
+        """
+        Returns
+        -------
+        List[Any]
+            The distinct values of the sample
+        """
+        return sorted({value for _, value in self.items}, key=str)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            The state of the sample, as JSON compatible data
+        """
+        version, internal_state, gauss_next = self.random.getstate()
+        return {
+            'size': self.size,
+            'items': [list(x) for x in self.items],
+            'skip': self.skip,
+            'random': [version, list(internal_state), gauss_next],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReservoirSample':
+        """
+        Create a sample from its state.
+
+        Parameters
+        ----------
+        data: Dict[str, Any]
+            The state of the sample, as returned by ``to_dict``
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.ReservoirSample
+            The sample
+
+        """
+        sample = cls(data['size'])
+        sample.items = [tuple(x) for x in data['items']]
+        sample.skip = data['skip']
+        version, internal_state, gauss_next = data['random']
+        sample.random.setstate((version, tuple(internal_state), gauss_next))
+        return sample
+
+
+class DistinctValues(object):
+    """
+    The approximate number of distinct values of a property,
+    with a few examples of the values.
+
+    Parameters
+    ----------
+    precision: int
+        The precision of the HyperLogLog sketch counting the distinct values
+    max_examples: int
+        The number of examples of values to keep
+
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, max_examples: int = DEFAULT_MAX_EXAMPLES):
+        self.distinct = HyperLogLog(precision)
+        self.examples = ReservoirSample(max_examples)
+
+    def add(self, value: Any, count: int = 1) -> None:
+        """
+        Add a value.
+
+        Parameters
+        ----------
+        value: Any
+            The value
+        count: int
+            The number of occurrences of the value
+
+        """
+        self.distinct.add(value)
+        self.examples.add(value, count)
+
+    def merge(self, other: 'DistinctValues') -> 'DistinctValues':
+        """
+        Merge the values of another property into this one.
+
+        Parameters
+        ----------
+        other: kgx.graph_operations.sketches.DistinctValues
+            The values to merge
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.DistinctValues
+            This object
+
+        """
+        self.distinct.merge(other.distinct)
+        self.examples.merge(other.examples)
+        return self
+
+    def json_object(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            The estimated number of distinct values, its relative standard error, and examples of values
+        """
+        return {
+            'distinct_count': self.distinct.count(),
+            'relative_error': round(self.distinct.relative_error(), 4),
+            'examples': self.examples.values(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns
+        -------
+        Dict[str, Any]
+            The state of the sketches, as JSON compatible data
+        """
+        return {'distinct': self.distinct.to_dict(), 'examples': self.examples.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DistinctValues':
+        """
+        Create the sketches of a property from their state.
+
+        Parameters
+        ----------
+        data: Dict[str, Any]
+            The state of the sketches, as returned by ``to_dict``
+
+        Returns
+        -------
+        kgx.graph_operations.sketches.DistinctValues
+            The sketches
+
+        """
+        values = cls()
+        values.distinct = HyperLogLog.from_dict(data['distinct'])
+        values.examples = ReservoirSample.from_dict(data['examples'])
+        return values
@@ -0,0 +1,265 @@
+"""
+Record-level counterparts of graph operations.
+
+A stream operation transforms one node record ``(n, data)`` or one edge record
+``(u, v, k, data)`` at a time into zero or more records, so that it can be
+applied by ``Transformer.process`` while records are streamed from a source
+to a sink, without first loading the whole graph into memory.
+
+Graph operations that need to see the whole graph (like ``fold_predicate``,
+which updates a node from its edges, or ``remove_singleton_nodes``) have no
+stream counterpart and can only be applied without streaming.
+"""
+import importlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from kgx.config import get_logger
+from kgx.graph_operations import (
+    remap_node_identifier,
+    remap_node_property,
+    remap_edge_property,
+    unfold_node_property,
+    get_alternative_identifier,
+)
+from kgx.utils.kgx_utils import CORE_NODE_PROPERTIES, CORE_EDGE_PROPERTIES, generate_edge_key
+
+log = get_logger()
+
+RecordOperation = Callable[[Tuple], List[Tuple]]
+
+
+def stream_remap_node_identifier(
+    category: str, alternative_property: str, prefix=None
+) -> RecordOperation:
+    """
+    Stream counterpart of ``kgx.graph_operations.remap_node_identifier``.
+
+    The identifiers of remapped nodes are kept so that the 'subject' and 'object'
+    of the edges that follow can be remapped too. This assumes that nodes are
+    streamed before the edges that refer to them, as all KGX sources do when
+    node files are listed before edge files.
+
+    Parameters
+    ----------
+    category: string
+        category referring to nodes whose 'id' needs to be remapped
+    alternative_property: string
+        property name from which the new value is pulled from
+    prefix: string
+        signifies that the value for ``alternative_property`` is a list
+        and the ``prefix`` indicates which value to pick from the list
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    mapping: Dict[str, str] = {}
+
+    def operation(rec: Tuple) -> List[Tuple]:
+        if len(rec) == 4:
+            u, v, k, data = rec
+            if u not in mapping and v not in mapping:
+                return [rec]
+            u = mapping.get(u, u)
+            v = mapping.get(v, v)
+            data = {
+                **data,
+                'subject': u,
+                'object': v,
+                'edge_key': generate_edge_key(u, data['predicate'], v),
+            }
+            return [(u, v, k, data)]
+        n, data = rec
+        alternative_id = get_alternative_identifier(data, category, alternative_property, prefix)
+        if not alternative_id:
+            return [rec]
+        mapping[n] = alternative_id
+        return [(alternative_id, {**data, 'id': alternative_id})]
+
+    return operation
+
+
+def stream_remap_node_property(
+    category: str, old_property: str, new_property: str
+) -> RecordOperation:
+    """
+    Stream counterpart of ``kgx.graph_operations.remap_node_property``.
+
+    Parameters
+    ----------
+    category: string
+        Category referring to nodes whose property needs to be remapped
+    old_property: string
+        old property name whose value needs to be replaced
+    new_property: string
+        new property name from which the value is pulled from
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    if old_property in CORE_NODE_PROPERTIES:
+        raise AttributeError(
+            f"node property {old_property} cannot be modified as it is a core property."
+        )
+
+    def operation(rec: Tuple) -> List[Tuple]:
+        if len(rec) == 4:
+            return [rec]
+        n, data = rec
+        if 'category' in data and category not in data['category']:
+            return [rec]
+        if new_property in data:
+            return [(n, {**data, old_property: data[new_property]})]
+        return [rec]
+
+    return operation
+
+
+def stream_remap_edge_property(
+    edge_predicate: str, old_property: str, new_property: str
+) -> RecordOperation:
+    """
+    Stream counterpart of ``kgx.graph_operations.remap_edge_property``.
+
+    Parameters
+    ----------
+    edge_predicate: string
+        edge_predicate referring to edges whose property needs to be remapped
+    old_property: string
+        Old property name whose value needs to be replaced
+    new_property: string
+        New property name from which the value is pulled from
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    if old_property in CORE_EDGE_PROPERTIES:
+        raise AttributeError(
+            f"edge property {old_property} cannot be modified as it is a core property."
+        )
+
+    def operation(rec: Tuple) -> List[Tuple]:
+        if len(rec) != 4:
+            return [rec]
+        u, v, k, data = rec
+        if edge_predicate != data['predicate']:
+            return [rec]
+        if new_property in data:
+            return [(u, v, k, {**data, old_property: data[new_property]})]
+        return [rec]
+
+    return operation
+
+
+def stream_unfold_node_property(node_property: str, prefix: Optional[str] = None) -> RecordOperation:
+    """
+    Stream counterpart of ``kgx.graph_operations.unfold_node_property``.
+
+    Every node with ``node_property`` is followed by the edge it is unfolded into.
+    Unlike in a graph, no node record is added for the object of that edge.
+
+    Parameters
+    ----------
+    node_property: str
+        The node property to unfold
+    prefix: Optional[str]
+        The prefix to use
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    p = f"{prefix}:{node_property}" if prefix else node_property
+
+    def operation(rec: Tuple) -> List[Tuple]:
+        if len(rec) == 4:
+            return [rec]
+        n, data = rec
+        if node_property not in data:
+            return [rec]
+        obj = data[node_property]
+        node_data = {k: v for k, v in data.items() if k != node_property}
+        edge_data = {'subject': n, 'object': obj, 'predicate': p, 'relation': p}
+        return [(n, node_data), (n, obj, p, edge_data)]
+
+    return operation
+
+
+STREAM_OPERATIONS: Dict[Callable, Callable[..., RecordOperation]] = {
+    remap_node_identifier: stream_remap_node_identifier,
+    remap_node_property: stream_remap_node_property,
+    remap_edge_property: stream_remap_edge_property,
+    unfold_node_property: stream_unfold_node_property,
+}
+
+
+def get_stream_operation(operation: Dict) -> RecordOperation:
+    """
+    Get the record operation for a graph operation, as defined in the YAML.
+
+    Parameters
+    ----------
+    operation: Dict
+        A graph operation with configuration
+
+    Returns
+    -------
+    Callable[[Tuple], List[Tuple]]
+        The record operation
+
+    """
+    op_name = operation['name']
+    op_args = operation.get('args', {})
+    module_name = '.'.join(op_name.split('.')[0:-1])
+    function_name = op_name.split('.')[-1]
+    f = getattr(importlib.import_module(module_name), function_name)
+    if f not in STREAM_OPERATIONS:
+        raise ValueError(
+            f"Graph operation {op_name} needs the whole graph and cannot be applied while streaming"
+        )
+    return STREAM_OPERATIONS[f](**op_args)
+
+
+def compile_stream_operations(operations: List[Dict]) -> Optional[RecordOperation]:
+    """
+    Compile a list of graph operations into a single record operation
+    that applies all of them, in order, to each record.
+
+    Parameters
+    ----------
+    operations: List[Dict]
+        A list of graph operations with configuration
+
+    Returns
+    -------
+    Optional[Callable[[Tuple], List[Tuple]]]
+        The record operation, or None if there are no operations
+
+    """
+    stages = [get_stream_operation(x) for x in operations]
+    if not stages:
+        return None
+    log.info(f"Applying {len(stages)} graph operation(s) to each streamed record")
+    if len(stages) == 1:
+        return stages[0]
+
+    def fused(rec: Tuple) -> List[Tuple]:
+        records = [rec]
+        for stage in stages:
+            if len(records) == 1:
+                records = stage(records[0])
+            else:
+                records = [r for x in records for r in stage(x)]
+        return records
+
+    return fused
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from sys import stderr
 
 import re
@@ -7,9 +7,12 @@ import yaml
 from json import dump
 from json.encoder import JSONEncoder
 
-from kgx.utils.kgx_utils import GraphEntityType
+from kgx.utils.kgx_utils import GraphEntityType, merge_counts
 from kgx.graph.base_graph import BaseGraph
+from kgx.graph_operations.node_catalog import NodeCatalog
+from kgx.graph_operations.sketches import DistinctValues, TopKCounter
 from kgx.prefix_manager import PrefixManager
+from kgx.utils.snapshot_utils import write_summary_state, read_summary_state
 
 TOTAL_NODES = 'total_nodes'
 NODE_CATEGORIES = 'node_categories'
@@ -27,6 +30,8 @@ EDGE_PREDICATES = 'predicates'
 COUNT_BY_EDGE_PREDICATES = 'count_by_predicates'
 COUNT_BY_SPO = 'count_by_spo'
 
+DEFAULT_MAX_FACET_VALUES = 100
+
 
 # Note: the format of the stats generated might change in the future
 
@@ -80,6 +85,23 @@ class GraphSummary:
     provide a suitable (quick!) report of that count back to the KGX application. The
     Callable (function/callable class) should not modify the record and should be of low
     complexity, so as not to introduce a large computational overhead to validation!
+
+    A 'partial' GraphSummary summarizes one shard of a graph (for example, one of its
+    files) and is meant to be merged with the summaries of the other shards, with ``merge()``.
+    Partial summaries can be pickled, to be computed in different processes. Their edges
+    whose subject or object node is not (yet) in the node catalog are kept aside, instead
+    of being discarded, until the summary of the shard with their nodes has been merged.
+    The nodes are expected to be partitioned across the shards: a node found in more than
+    one shard keeps the categories of the first shard and, once merged, is only counted once
+    by category and by identifier prefix, but its sources and facet values are counted for
+    each shard, since the records of the nodes are not kept.
+
+    An 'approximate' GraphSummary uses a constant amount of memory per facet property, however
+    many distinct values the facet has. The values of a facet property are reported with an
+    estimate of their number (from a HyperLogLog sketch) and its relative standard error, along
+    with a few examples of values. The counts of facet values are only kept for the (up to)
+    ``max_facet_values`` most frequent values, each with an ``error`` such that the actual
+    count is between ``count - error`` and ``count``.
     """
 
     error_log = stderr
@@ -91,6 +113,10 @@ class GraphSummary:
             edge_facet_properties: Optional[List] = None,
             progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = None,
             error_log: str = None,
+            partial: bool = False,
+            spill_directory: Optional[str] = None,
+            approximate: bool = False,
+            max_facet_values: int = DEFAULT_MAX_FACET_VALUES,
             **kwargs
     ):
         """
@@ -108,10 +134,21 @@ class GraphSummary:
             Function given a peek at the current record being stream processed by the class wrapped Callable.
         error_log: str
             Where to write any graph processing error message (stderr, by default)
+        partial: bool
+            Whether the summary is one of several partial summaries to be merged
+        spill_directory: Optional[str]
+            The directory where the node catalog is spilled, if needed (no spilling, by default)
+        approximate: bool
+            Whether to summarize facet properties approximately, with sketches
+        max_facet_values: int
+            The number of most frequent values of a facet property to count, in approximate summaries
 
         """
         # formal arguments
         self.name = name
+        self.partial = partial
+        self.approximate = approximate
+        self.max_facet_values = max_facet_values
 
         self.nodes_processed = False
 
@@ -137,12 +174,12 @@ class GraphSummary:
         self.node_facet_properties: Optional[List] = node_facet_properties
         if self.node_facet_properties:
             for facet_property in self.node_facet_properties:
-                self.add_node_stat(facet_property, set())
+                self.add_node_stat(facet_property, DistinctValues() if approximate else set())
                 
         self.edge_facet_properties: Optional[List] = edge_facet_properties
         if self.edge_facet_properties:
             for facet_property in self.edge_facet_properties:
-                self.edge_stats[facet_property] = set()
+                self.edge_stats[facet_property] = DistinctValues() if approximate else set()
 
         self.progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = progress_monitor
 
@@ -150,13 +187,17 @@ class GraphSummary:
             GraphSummary.error_log = open(error_log, mode='w')
 
         # internal attributes
-        self.node_catalog: Dict[str, List[int]] = dict()
+        self.node_catalog: NodeCatalog = NodeCatalog(spill_directory)
 
         self.node_categories: Dict[str, GraphSummary.Category] = dict()
 
         # indexed internally with category index id '0'
         self.node_categories['unknown'] = GraphSummary.Category('unknown', self)
 
+        # number of edges of a partial summary whose nodes were not found,
+        # by subject, object, predicate and the facet values of the edge
+        self.pending_edges: Dict[Tuple, int] = dict()
+
         self.graph_stats: Dict[str, Dict] = dict()
 
     def get_name(self):
@@ -194,8 +235,7 @@ class GraphSummary:
         Internal class for compiling statistics about a distinct category.
         """
         # The 'category map' just associates a unique int catalog
-        # index ('cid') value as a proxy for the full curie string,
-        # to reduce storage in the main node catalog
+        # index ('cid') value as a proxy for the full curie string
         _category_curie_map: List[str] = list()
 
         def __init__(self, category_curie: str, summary):
@@ -292,7 +332,7 @@ class GraphSummary:
             """
             return self.category_stats['count']
 
-        def _capture_prefix(self, n: str):
+        def _capture_prefix(self, n: str, count: int = 1):
             prefix = PrefixManager.get_prefix(n)
             if not prefix:
                 print(
@@ -301,21 +341,21 @@ class GraphSummary:
                 )
             else:
                 if prefix in self.category_stats['count_by_id_prefix']:
-                    self.category_stats['count_by_id_prefix'][prefix] += 1
+                    self.category_stats['count_by_id_prefix'][prefix] += count
                 else:
-                    self.category_stats['count_by_id_prefix'][prefix] = 1
+                    self.category_stats['count_by_id_prefix'][prefix] = count
         
-        def _capture_knowledge_source(self, data: Dict):
+        def _capture_knowledge_source(self, data: Dict, count: int = 1):
             if 'provided_by' in data:
                 for s in data['provided_by']:
                     if s in self.category_stats['count_by_source']:
-                        self.category_stats['count_by_source'][s] += 1
+                        self.category_stats['count_by_source'][s] += count
                     else:
-                        self.category_stats['count_by_source'][s] = 1
+                        self.category_stats['count_by_source'][s] = count
             else:
-                self.category_stats['count_by_source']['unknown'] += 1
+                self.category_stats['count_by_source']['unknown'] += count
         
-        def analyse_node_category(self, summary, n, data):
+        def analyse_node_category(self, summary, n, data, count: int = 1):
             """
             Analyse metadata of a given graph node record of this category.
 
@@ -327,18 +367,20 @@ class GraphSummary:
                 Curie identifier of the node record (not used here).
             data: Dict
                 Complete data dictionary of node record fields.
+            count: int
+                Number of node records with the same prefix and data (other than their identifier)
 
             """
-            self.category_stats['count'] += 1
+            self.category_stats['count'] += count
 
-            self._capture_prefix(n)
+            self._capture_prefix(n, count)
 
-            self._capture_knowledge_source(data)
+            self._capture_knowledge_source(data, count)
             
             if summary.node_facet_properties:
                 for facet_property in summary.node_facet_properties:
                     summary.node_stats = summary.get_facet_counts(
-                        data, summary.node_stats, COUNT_BY_CATEGORY, self.category_curie, facet_property
+                        data, summary.node_stats, COUNT_BY_CATEGORY, self.category_curie, facet_property, count
                     )
 
         def json_object(self):
@@ -372,7 +414,9 @@ class GraphSummary:
         """
         return self.node_stats[category_curie]
 
-    def _process_category_field(self, category_field: str, n: str, data: Dict):
+    def _process_category_field(
+            self, category_field: str, n: str, data: Dict, node_categories: List[str], count: int = 1
+    ):
     
         # we note here that category_curie *may be*
         # a piped '|' set of Biolink category CURIE values
@@ -389,10 +433,9 @@ class GraphSummary:
                     continue
         
             category_record = self.node_categories[category_curie]
-            category_idx: int = category_record.get_cid()
-            if category_idx not in self.node_catalog[n]:
-                self.node_catalog[n].append(category_idx)
-            category_record.analyse_node_category(self, n, data)
+            if category_curie not in node_categories:
+                node_categories.append(category_curie)
+            category_record.analyse_node_category(self, n, data, count)
     
         #
         # Moved this computation from the 'analyse_node_category() method above
@@ -415,64 +458,97 @@ class GraphSummary:
             Complete data dictionary of node record fields.
 
         """
-        if n in self.node_catalog:
-            # Report duplications of node records, as discerned from node id.
-            _parse_warning("Duplicate node identifier", n, "encountered in input node data")
-            return
-        else:
-            self.node_catalog[n] = list()
-        
+        self.analyse_nodes([n], data)
+
+    def analyse_nodes(self, nodes: List[str], data: Dict):
+        """
+        Analyse metadata of graph node records which only differ by their identifier,
+        as if each of them had been analysed with ``analyse_node``.
+
+        Parameters
+        ----------
+        nodes: List[str]
+            Curie identifiers of the node records, which must all have the same prefix.
+        data: Dict
+            Complete data dictionary of node record fields (other than the identifier).
+
+        """
+        new_nodes: List[str] = list()
+        seen: Set[str] = set()
+        for n in nodes:
+            if n in self.node_catalog or n in seen:
+                # Report duplications of node records, as discerned from node id.
+                _parse_warning("Duplicate node identifier", n, "encountered in input node data")
+            else:
+                new_nodes.append(n)
+                seen.add(n)
+
+        if len(new_nodes) > 1 and not PrefixManager.get_prefix(new_nodes[0]):
+            # nodes without a prefix are reported one by one
+            for n in new_nodes:
+                self._analyse_new_nodes([n], data)
+        elif new_nodes:
+            self._analyse_new_nodes(new_nodes, data)
+
+    def _analyse_new_nodes(self, nodes: List[str], data: Dict):
         if 'category' in data and data['category']:
             categories = data['category']
 
         else:
             categories = ['unknown']
-            print(
-                "Node with identifier '" + n + "' is missing its 'category' value? Tagging it as 'unknown'",
-                file=GraphSummary.error_log
-            )
+            for n in nodes:
+                print(
+                    "Node with identifier '" + n + "' is missing its 'category' value? Tagging it as 'unknown'",
+                    file=GraphSummary.error_log
+                )
 
         # analyse them each independently...
+        node_categories: List[str] = list()
         for category_field in categories:
-            self._process_category_field(category_field, n, data)
-    
-    def _capture_predicate(self, data: Dict) -> Optional[str]:
+            self._process_category_field(category_field, nodes[0], data, node_categories, len(nodes))
+        for n in nodes:
+            self.node_catalog.add(n, node_categories)
+
+    def _capture_predicate(self, data: Dict, count: int = 1) -> Optional[str]:
         if 'predicate' not in data:
-            self.edge_stats[COUNT_BY_EDGE_PREDICATES]['unknown']['count'] += 1
+            self.edge_stats[COUNT_BY_EDGE_PREDICATES]['unknown']['count'] += count
             predicate = "unknown"
         else:
             predicate = data['predicate']
         
             if not _predicate_curie_regexp.fullmatch(predicate):
-                _parse_warning("Invalid  predicate CURIE", predicate)
+                for _ in range(count):
+                    _parse_warning("Invalid  predicate CURIE", predicate)
                 return None
         
             self.edge_stats[EDGE_PREDICATES].add(predicate)
             if predicate in self.edge_stats[COUNT_BY_EDGE_PREDICATES]:
-                self.edge_stats[COUNT_BY_EDGE_PREDICATES][predicate]['count'] += 1
+                self.edge_stats[COUNT_BY_EDGE_PREDICATES][predicate]['count'] += count
             else:
-                self.edge_stats[COUNT_BY_EDGE_PREDICATES][predicate] = {'count': 1}
+                self.edge_stats[COUNT_BY_EDGE_PREDICATES][predicate] = {'count': count}
         
             if self.edge_facet_properties:
                 for facet_property in self.edge_facet_properties:
                     self.edge_stats = self.get_facet_counts(
-                        data, self.edge_stats, COUNT_BY_EDGE_PREDICATES, predicate, facet_property
+                        data, self.edge_stats, COUNT_BY_EDGE_PREDICATES, predicate, facet_property, count
                     )
                     
         return predicate
 
-    def _process_triple(self, subject_category: str, predicate: str, object_category: str, data: Dict):
+    def _process_triple(
+            self, subject_category: str, predicate: str, object_category: str, data: Dict, count: int = 1
+    ):
         # Process the 'valid' S-P-O triple here...
         key = f"{subject_category}-{predicate}-{object_category}"
         if key in self.edge_stats[COUNT_BY_SPO]:
-            self.edge_stats[COUNT_BY_SPO][key]['count'] += 1
+            self.edge_stats[COUNT_BY_SPO][key]['count'] += count
         else:
-            self.edge_stats[COUNT_BY_SPO][key] = {'count': 1}
+            self.edge_stats[COUNT_BY_SPO][key] = {'count': count}
     
         if self.edge_facet_properties:
             for facet_property in self.edge_facet_properties:
                 self.edge_stats = \
-                    self.get_facet_counts(data, self.edge_stats, COUNT_BY_SPO, key, facet_property)
+                    self.get_facet_counts(data, self.edge_stats, COUNT_BY_SPO, key, facet_property, count)
     
     def analyse_edge(self, u: str, v: str, k: str, data: Dict):
         """
@@ -489,38 +565,96 @@ class GraphSummary:
         data: Dict
             Complete data dictionary of edge record fields.
 
+        """
+        self.analyse_edges([(u, v)], data)
+
+    def analyse_edges(self, edges: List[Tuple[str, str]], data: Dict):
+        """
+        Analyse metadata of graph edge records which only differ by their subject and object,
+        as if each of them had been analysed with ``analyse_edge``.
+
+        Parameters
+        ----------
+        edges: List[Tuple[str, str]]
+            Subject and object node curie identifiers of the edges. The subject nodes
+            must all have the same categories (or all be missing), as must the object nodes.
+        data: Dict
+            Complete data dictionary of edge record fields (other than the subject and object).
+
         """
         # we blissfully now assume that all the nodes of a
         # graph stream were analysed first by the GraphSummary
         # before the edges are analysed, thus we can test for
         # node 'n' existence internally, by identifier.
 
-        self.edge_stats[TOTAL_EDGES] += 1
+        self.edge_stats[TOTAL_EDGES] += len(edges)
 
-        predicate: str = self._capture_predicate(data)
-        
-        if u not in self.node_catalog:
+        predicate: str = self._capture_predicate(data, len(edges))
+
+        if self.partial:
+            resolved_edges: List[Tuple[str, str]] = list()
+            for u, v in edges:
+                if u in self.node_catalog and v in self.node_catalog:
+                    resolved_edges.append((u, v))
+                else:
+                    # the nodes may be in the summary of another shard
+                    key = (u, v, predicate, self._get_facet_values(data))
+                    self.pending_edges[key] = self.pending_edges.get(key, 0) + 1
+            edges = resolved_edges
+
+        if len(edges) > 1 and not (edges[0][0] in self.node_catalog and edges[0][1] in self.node_catalog):
+            # edges with missing nodes are reported one by one
+            for u, v in edges:
+                self._process_edge_categories(u, v, predicate, data)
+        elif edges:
+            self._process_edge_categories(edges[0][0], edges[0][1], predicate, data, len(edges))
+
+    def _get_facet_values(self, data: Dict) -> Tuple:
+        facet_values = []
+        if self.edge_facet_properties:
+            for facet_property in self.edge_facet_properties:
+                if facet_property in data:
+                    value = data[facet_property]
+                    facet_values.append((facet_property, tuple(value) if isinstance(value, list) else value))
+        return tuple(facet_values)
+
+    def _resolve_pending_edges(self, final: bool = False):
+        # edges are resolved once both of their nodes are known or,
+        # when the summary is finalized, discarded as before
+        for key, count in list(self.pending_edges.items()):
+            u, v, predicate, facet_values = key
+            if not final and not (u in self.node_catalog and v in self.node_catalog):
+                continue
+            data = {p: list(x) if isinstance(x, tuple) else x for p, x in facet_values}
+            if u in self.node_catalog and v in self.node_catalog:
+                self._process_edge_categories(u, v, predicate, data, count)
+            else:
+                for _ in range(count):
+                    self._process_edge_categories(u, v, predicate, data)
+            del self.pending_edges[key]
+
+    def _process_edge_categories(self, u: str, v: str, predicate: Optional[str], data: Dict, count: int = 1):
+        subject_categories = self.node_catalog.get(u)
+        if subject_categories is None:
             _parse_warning("Edge 'subject' node ID", u, "not found in node catalog")
             # removing from edge count
             self.edge_stats[TOTAL_EDGES] -= 1
             self.edge_stats[COUNT_BY_EDGE_PREDICATES]['unknown']['count'] -= 1
             return
 
-        for subj_cat_idx in self.node_catalog[u]:
+        object_categories = self.node_catalog.get(v)
 
-            subject_category = self.Category._get_category_curie_by_index(subj_cat_idx)
+        for subject_category in subject_categories:
 
-            if v not in self.node_catalog:
+            if object_categories is None:
                 _parse_warning("Edge 'object' node ID", v, "not found in node catalog")
                 self.edge_stats[TOTAL_EDGES] -= 1
                 self.edge_stats[COUNT_BY_EDGE_PREDICATES]['unknown']['count'] -= 1
                 return
 
-            for obj_cat_idx in self.node_catalog[v]:
+            for object_category in object_categories:
 
-                object_category = self.Category._get_category_curie_by_index(obj_cat_idx)
-
-                self._process_triple(subject_category, predicate, object_category, data)
+                self._process_triple(subject_category, predicate, object_category, data, count)
     
     def _compile_prefix_stats_by_category(self, category_curie: str):
         for prefix in self.node_stats[COUNT_BY_ID_PREFIXES_BY_CATEGORY][category_curie]:
@@ -560,7 +694,10 @@ class GraphSummary:
 
             if self.node_facet_properties:
                 for facet_property in self.node_facet_properties:
-                    self.node_stats[facet_property] = sorted(list(self.node_stats[facet_property]))
+                    if self.approximate:
+                        self._compile_facet_sketches(self.node_stats, COUNT_BY_CATEGORY, facet_property)
+                    else:
+                        self.node_stats[facet_property] = sorted(list(self.node_stats[facet_property]))
 
             if not self.node_stats[TOTAL_NODES]:
                 self.node_stats[TOTAL_NODES] = len(self.node_catalog)
@@ -589,16 +726,201 @@ class GraphSummary:
         # Not sure if this is "safe" but assume that edge_stats may be finalized
         # and cached once after the first time the edge stats are accessed
         if not self.edges_processed:
+            self._resolve_pending_edges(final=True)
+
             self.edges_processed = True
 
             self.edge_stats[EDGE_PREDICATES] = sorted(list(self.edge_stats[EDGE_PREDICATES]))
 
             if self.edge_facet_properties:
                 for facet_property in self.edge_facet_properties:
-                    self.edge_stats[facet_property] = sorted(list(self.edge_stats[facet_property]))
+                    if self.approximate:
+                        self._compile_facet_sketches(self.edge_stats, COUNT_BY_EDGE_PREDICATES, facet_property)
+                        self._compile_facet_sketches(self.edge_stats, COUNT_BY_SPO, facet_property)
+                    else:
+                        self.edge_stats[facet_property] = sorted(list(self.edge_stats[facet_property]))
         
         return self.edge_stats
 
+    @staticmethod
+    def _compile_facet_sketches(stats: Dict, x: str, facet_property: str):
+        if not isinstance(stats[facet_property], dict):
+            stats[facet_property] = stats[facet_property].json_object()
+        for y in stats[x].values():
+            if facet_property in y:
+                y[facet_property] = y[facet_property].json_object()
+
+    def merge(self, other: 'GraphSummary') -> 'GraphSummary':
+        """
+        Merge the statistics of another (partial) GraphSummary into this one.
+
+        Merging is associative, so that the summaries of the shards of a
+        graph can be merged in any grouping, but the node statistics of the
+        shards should be merged in the order of the shards, for the categories
+        of a node found in more than one shard to be those of the first one.
+        Such a node is no longer counted by category and by identifier prefix
+        in the summary merged later, as with a duplicate node in a single summary,
+        but its sources and facet values are still counted there.
+
+        Parameters
+        ----------
+        other: GraphSummary
+            The GraphSummary to merge, which is left unchanged.
+
+        Returns
+        -------
+        GraphSummary
+            This GraphSummary
+
+        Raises
+        ------
+        RuntimeError
+            Error if the statistics of either summary were already compiled,
+            or if the summaries do not facet on the same properties, in the same way.
+
+        """
+        if self.nodes_processed or self.edges_processed or other.nodes_processed or other.edges_processed:
+            raise RuntimeError("Cannot merge GraphSummary statistics which were already compiled")
+        if (
+            self.node_facet_properties != other.node_facet_properties
+            or self.edge_facet_properties != other.edge_facet_properties
+            or (self.approximate, self.max_facet_values) != (other.approximate, other.max_facet_values)
+        ):
+            raise RuntimeError("Cannot merge GraphSummary statistics with different facet properties")
+
+        # categories are created first, since creating a category
+        # initializes its entries in the node statistics
+        for category_curie, node_category in other.node_categories.items():
+            if category_curie not in self.node_categories:
+                self.node_categories[category_curie] = self.Category(category_curie, self)
+            merge_counts(self.node_categories[category_curie].category_stats, node_category.category_stats)
+        merge_counts(self.node_stats, other.node_stats)
+        merge_counts(self.edge_stats, other.edge_stats)
+
+        for n, node_categories in other.node_catalog.items():
+            if n in self.node_catalog:
+                print(
+                    f"Node identifier '{n}' found in more than one merged summary?"
+                    " Keeping the categories of the first...",
+                    file=GraphSummary.error_log
+                )
+                self._discount_node(n, node_categories)
+            else:
+                self.node_catalog.add(n, node_categories)
+
+        merge_counts(self.pending_edges, other.pending_edges)
+        self._resolve_pending_edges()
+        return self
+
+    def _discount_node(self, n: str, node_categories: Tuple[str, ...]):
+        # remove a duplicate node from the counts by category and by identifier prefix
+        prefix = PrefixManager.get_prefix(n)
+        for category_curie in node_categories:
+            category_stats = self.node_categories[category_curie].category_stats
+            category_stats['count'] -= 1
+            if prefix in category_stats['count_by_id_prefix']:
+                category_stats['count_by_id_prefix'][prefix] -= 1
+                if not category_stats['count_by_id_prefix'][prefix]:
+                    del category_stats['count_by_id_prefix'][prefix]
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        # the progress monitor is not sent to other processes
+        state['progress_monitor'] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        # categories are indexed by the process where they are first seen
+        for category_curie in self.node_categories:
+            if category_curie not in self.Category._category_curie_map:
+                self.Category._category_curie_map.append(category_curie)
+
+
+    def save_state(self, filename: str) -> None:
+        """
+        Save the full state of the GraphSummary (not just its statistics), to
+        be loaded with ``load_state`` and updated or merged with others later.
+
+        The state is written as tagged JSON (see ``kgx.utils.snapshot_utils.tag_dict``),
+        and the nodes of the node catalog are written to an SQLite database next to
+        the file, with a ``.nodes.db`` suffix.
+
+        Parameters
+        ----------
+        filename: str
+            The file to save the state to
+
+        Raises
+        ------
+        RuntimeError
+            Error if the statistics of the GraphSummary were already compiled.
+
+        """
+        if self.nodes_processed or self.edges_processed:
+            raise RuntimeError("Cannot save the state of a GraphSummary whose statistics were already compiled")
+        self.node_catalog.persist(filename + '.nodes.db')
+        state = {
+            'name': self.name,
+            'node_facet_properties': self.node_facet_properties,
+            'edge_facet_properties': self.edge_facet_properties,
+            'partial': self.partial,
+            'approximate': self.approximate,
+            'max_facet_values': self.max_facet_values,
+            'node_stats': self.node_stats,
+            'edge_stats': self.edge_stats,
+            'node_categories': {k: x.category_stats for k, x in self.node_categories.items()},
+            'pending_edges': self.pending_edges,
+            'node_catalog': self.node_catalog.to_dict(),
+        }
+        write_summary_state(filename, type(self).__name__, state)
+
+    @classmethod
+    def load_state(cls, filename: str) -> 'GraphSummary':
+        """
+        Load the state of a GraphSummary, as saved with ``save_state``.
+
+        Parameters
+        ----------
+        filename: str
+            The file to load the state from
+
+        Returns
+        -------
+        GraphSummary
+            The GraphSummary
+
+        Raises
+        ------
+        ValueError
+            Error if the file is not the state of a graph summary in the current format.
+        TypeError
+            Error if the file is the state of another type of summary.
+
+        """
+        state = read_summary_state(
+            filename, cls.__name__, {'DistinctValues': DistinctValues, 'TopKCounter': TopKCounter}
+        )
+        summary = cls(
+            name=state['name'],
+            node_facet_properties=state['node_facet_properties'],
+            edge_facet_properties=state['edge_facet_properties'],
+            partial=state['partial'],
+            approximate=state['approximate'],
+            max_facet_values=state['max_facet_values'],
+        )
+        # categories are created before the node statistics are set,
+        # since creating a category initializes its entries in them
+        for category_curie, category_stats in state['node_categories'].items():
+            if category_curie not in summary.node_categories:
+                summary.node_categories[category_curie] = cls.Category(category_curie, summary)
+            summary.node_categories[category_curie].category_stats = category_stats
+        summary.node_stats = state['node_stats']
+        summary.edge_stats = state['edge_stats']
+        summary.pending_edges = state['pending_edges']
+        summary.node_catalog = NodeCatalog.from_dict(state['node_catalog'], filename + '.nodes.db')
+        return summary
+
     def _wrap_graph_stats(
             self,
             graph_name: str,
@@ -701,18 +1023,27 @@ class GraphSummary:
         
         return self.get_edge_stats()
     
-    def _compile_facet_stats(self, stats: Dict, x: str, y: str, facet_property: str, value: str):
+    def _compile_facet_stats(self, stats: Dict, x: str, y: str, facet_property: str, value: str, count: int = 1):
+
+        if self.approximate:
+            if facet_property not in stats[x][y]:
+                stats[x][y][facet_property] = TopKCounter(self.max_facet_values)
+            stats[x][y][facet_property].add(value, count)
+            stats[facet_property].add(value, count)
+            return
     
         if facet_property not in stats[x][y]:
             stats[x][y][facet_property] = {}
     
         if value in stats[x][y][facet_property]:
-            stats[x][y][facet_property][value]['count'] += 1
+            stats[x][y][facet_property][value]['count'] += count
         else:
-            stats[x][y][facet_property][value] = {'count': 1}
+            stats[x][y][facet_property][value] = {'count': count}
             stats[facet_property].update([value])
     
-    def get_facet_counts(self, data: Dict, stats: Dict, x: str, y: str, facet_property: str) -> Dict:
+    def get_facet_counts(
+            self, data: Dict, stats: Dict, x: str, y: str, facet_property: str, count: int = 1
+    ) -> Dict:
         """
         Facet on ``facet_property`` and record the count for ``stats[x][y][facet_property]``.
 
@@ -728,6 +1059,8 @@ class GraphSummary:
             second key
         facet_property: str
             The property to facet on
+        count: int
+            The number of records with the same data
 
         Returns
         -------
@@ -738,12 +1071,12 @@ class GraphSummary:
         if facet_property in data:
             if isinstance(data[facet_property], list):
                 for k in data[facet_property]:
-                    self._compile_facet_stats(stats, x, y, facet_property, k)
+                    self._compile_facet_stats(stats, x, y, facet_property, k, count)
             else:
                 k = data[facet_property]
-                self._compile_facet_stats(stats, x, y, facet_property, k)
+                self._compile_facet_stats(stats, x, y, facet_property, k, count)
         else:
-            self._compile_facet_stats(stats, x, y, facet_property, 'unknown')
+            self._compile_facet_stats(stats, x, y, facet_property, 'unknown', count)
         return stats
     
     def save(self, file, name: str = None, file_format: str = 'yaml'):
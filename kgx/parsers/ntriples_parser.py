@@ -1,14 +1,281 @@
 import codecs
-from typing import Generator
+import io
+import re
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Generator, Dict, IO, Iterable, List, Optional, Tuple, Union
 
+import rdflib
+from rdflib import URIRef, BNode, Literal
+from rdflib.term import _castLexicalToPython, _castPythonToLiteral, _is_valid_unicode
 from rdflib.plugins.parsers.ntriples import NTriplesParser, ParseError
 from rdflib.plugins.parsers.ntriples import r_wspace, r_wspaces, r_tail
 
+# A term of a tokenized triple: an IRI, a blank node label (with its '_:' prefix)
+# or a literal, as a tuple of its lexical form, language tag and datatype IRI
+Term = Union[str, Tuple[str, Optional[str], Optional[str]]]
+
+_IRI = r'<([^\s"<>]+)>'
+_BNODE = r'(_:[^\s"<>]*[^\s"<>.])'
+_LITERAL = r'"([^"\\]*(?:\\.[^"\\]*)*)"(?:@([a-zA-Z]+(?:-[a-zA-Z0-9]+)*)|\^\^' + _IRI + r')?'
+_TRIPLE = re.compile(
+    r'[ \t]*(?:' + _IRI + '|' + _BNODE + r')'
+    r'[ \t]+' + _IRI +
+    r'[ \t]+(?:' + _IRI + '|' + _BNODE + '|' + _LITERAL + r')'
+    r'[ \t]*\.(?:[ \t]*#.*)?\s*'
+)
+_ESCAPE = re.compile(r'\\(?:([tbnrf"\'\\])|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8}))')
+_ECHAR = {'t': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f', '"': '"', "'": "'", '\\': '\\'}
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def _unescape_match(m: 're.Match') -> str:
+    echar, u, U = m.groups()
+    return _ECHAR[echar] if echar else chr(int(u or U, 16))
+
+
+def unescape(s: str) -> str:
+    """
+    Replace the escape sequences of an N-Triples string or IRI
+    (like ``\\n``, ``\\"`` or ``\\u00E9``) with the characters they stand for.
+
+    Parameters
+    ----------
+    s: str
+        The string
+
+    Returns
+    -------
+    str
+        The unescaped string
+
+    """
+    return _ESCAPE.sub(_unescape_match, s) if '\\' in s else s
+
+
+def tokenize_ntriples(lines: Iterable[str]) -> List[Tuple[str, str, Term]]:
+    """
+    Tokenize lines of N-Triples, skipping empty lines and comments.
+
+    The terms of the triples are plain strings and tuples (see ``Term``),
+    which are cheap to create and to send to another process.
+
+    Parameters
+    ----------
+    lines: Iterable[str]
+        The lines
+
+    Returns
+    -------
+    List[Tuple[str, str, Term]]
+        The triples
+
+    Raises
+    ------
+    rdflib.plugins.parsers.ntriples.ParseError
+        Error if a line is neither a triple, a comment or empty
+
+    """
+    triples = []
+    match = _TRIPLE.fullmatch
+    for line in lines:
+        m = match(line)
+        if m is None:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            raise ParseError(f"Invalid line: {line!r}")
+        s, s_bnode, p, o, o_bnode, lexical, language, datatype = m.groups()
+        if s is None:
+            s = s_bnode
+        elif '\\' in s:
+            s = unescape(s)
+        if '\\' in p:
+            p = unescape(p)
+        if o is not None:
+            if '\\' in o:
+                o = unescape(o)
+        elif o_bnode is not None:
+            o = o_bnode
+        else:
+            if '\\' in lexical:
+                lexical = unescape(lexical)
+            if datatype is not None and '\\' in datatype:
+                datatype = unescape(datatype)
+            o = (lexical, language, datatype)
+        triples.append((s, p, o))
+    return triples
+
+
+def _tokenize_batch(lines: List[str]) -> List[Tuple[str, str, Term]]:
+    # tokenize lines in a worker process, sharing the strings of repeated subjects and
+    # predicates, for them to be pickled once when the triples are sent back
+    strings: Dict[str, str] = {}
+    return [(strings.setdefault(s, s), strings.setdefault(p, p), o) for s, p, o in tokenize_ntriples(lines)]
+
+
+class NTriplesTokenizer(object):
+    """
+    A line-oriented N-Triples tokenizer, yielding triples of ``rdflib`` terms.
+
+    Lines are read and tokenized in batches, optionally by a pool of worker
+    processes. The ``rdflib`` terms are created without the checks that their
+    constructors make on IRIs and without converting untyped literals, which
+    the tokenizer made unnecessary, and the terms of predicates and datatypes
+    are shared between triples.
+
+    Blank node labels are mapped to new blank nodes, the same ones in all
+    the files tokenized by a tokenizer.
+
+    Parameters
+    ----------
+    batch_size: int
+        The number of lines to tokenize at once
+    processes: int
+        The number of worker processes tokenizing batches of lines (none, by default)
+
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, processes: int = 1):
+        self.batch_size = batch_size
+        self.processes = processes
+        # the terms of predicates and datatypes
+        self.iris: Dict[str, URIRef] = {}
+        self.bnodes: Dict[str, BNode] = {}
+
+    def tokenize(self, file: IO) -> Generator[Tuple, None, None]:
+        """
+        Tokenize an N-Triples file and yield triples.
+
+        Parameters
+        ----------
+        file: IO
+            The N-Triples file, opened in binary mode
+
+        Returns
+        -------
+        Generator[Tuple, None, None]
+            A generator for triples of ``rdflib`` terms
+
+        """
+        lines = io.TextIOWrapper(file, encoding='utf-8')
+        batches = iter(lambda: list(islice(lines, self.batch_size)), [])
+        if self.processes > 1:
+            pool = Pool(processes=self.processes)
+            try:
+                # keep a bounded number of batches in flight, rather than reading the whole file ahead
+                pending = deque()
+                for batch in batches:
+                    pending.append(pool.apply_async(_tokenize_batch, (batch,)))
+                    if len(pending) > 2 * self.processes:
+                        yield from self.terms(pending.popleft().get())
+                while pending:
+                    yield from self.terms(pending.popleft().get())
+            finally:
+                pool.terminate()
+        else:
+            for batch in batches:
+                yield from self.terms(tokenize_ntriples(batch))
+
+    def terms(self, triples: List[Tuple[str, str, Term]]) -> Generator[Tuple, None, None]:
+        """
+        Create the ``rdflib`` terms of tokenized triples.
+
+        Parameters
+        ----------
+        triples: List[Tuple[str, str, Term]]
+            The tokenized triples (see ``tokenize_ntriples``)
+
+        Returns
+        -------
+        Generator[Tuple, None, None]
+            A generator for triples of ``rdflib`` terms
+
+        """
+        new_iri = str.__new__
+        iris = self.iris
+        for s, p, o in triples:
+            predicate = iris.get(p)
+            if predicate is None:
+                predicate = iris[p] = new_iri(URIRef, p)
+            if isinstance(o, tuple):
+                o = self.literal(*o)
+            elif o.startswith('_:'):
+                o = self.bnode(o)
+            else:
+                o = new_iri(URIRef, o)
+            s = self.bnode(s) if s.startswith('_:') else new_iri(URIRef, s)
+            yield s, predicate, o
+
+    def bnode(self, label: str) -> BNode:
+        """
+        Get the blank node of a label.
+
+        Parameters
+        ----------
+        label: str
+            The blank node label, with its '_:' prefix
+
+        Returns
+        -------
+        rdflib.BNode
+            The blank node
+
+        """
+        bnode = self.bnodes.get(label)
+        if bnode is None:
+            bnode = self.bnodes[label] = BNode()
+        return bnode
+
+    def literal(self, lexical: str, language: Optional[str], datatype: Optional[str]) -> Literal:
+        """
+        Create a literal.
+
+        Parameters
+        ----------
+        lexical: str
+            The lexical form of the literal
+        language: Optional[str]
+            The language tag of the literal, if any
+        datatype: Optional[str]
+            The datatype IRI of the literal, if any
+
+        Returns
+        -------
+        rdflib.Literal
+            The literal
+
+        """
+        if datatype is None:
+            iri = None
+            value = lexical
+        else:
+            iri = self.iris.get(datatype)
+            if iri is None:
+                iri = self.iris[datatype] = str.__new__(URIRef, datatype)
+            # as in the constructor of rdflib.Literal, which checks the datatype IRI again
+            value = _castLexicalToPython(lexical, iri)
+            if value is not None and rdflib.NORMALIZE_LITERALS:
+                normalized, _ = _castPythonToLiteral(value, iri)
+                if normalized is not None and _is_valid_unicode(normalized):
+                    lexical = normalized
+        literal = str.__new__(Literal, lexical)
+        literal._language = language
+        literal._datatype = iri
+        literal._value = value
+        return literal
+
 
 class CustomNTriplesParser(NTriplesParser):
     """
     This class is an extension to ``rdflib.plugins.parsers.ntriples.NTriplesParser``
     that parses N-Triples and yields triples.
+
+    .. note::
+        ``NTriplesTokenizer`` is much faster, for large N-Triples files.
+
     """
 
     def parse(self, filename: str) -> Generator:
@@ -55,18 +322,20 @@ class CustomNTriplesParser(NTriplesParser):
             A generator
 
         """
-        print(self.line)
         self.eat(r_wspace)
-        if self.line or not self.line.startswith('#'):
-            subject = self.subject()
-            self.eat(r_wspaces)
+        if not self.line or self.line.startswith('#'):
+            # the line is empty or a comment
+            return ()
+
+        subject = self.subject()
+        self.eat(r_wspaces)
 
-            predicate = self.predicate()
-            self.eat(r_wspaces)
+        predicate = self.predicate()
+        self.eat(r_wspaces)
 
-            object = self.object()
-            self.eat(r_tail)
+        object = self.object()
+        self.eat(r_tail)
 
-            if self.line:
-                raise ParseError("Trailing garbage")
-            return self.sink.triple(subject, predicate, object)
+        if self.line:
+            raise ParseError("Trailing garbage")
+        return self.sink.triple(subject, predicate, object)
@@ -6,3 +6,4 @@ from .neo_sink import NeoSink
 from .rdf_sink import RdfSink
 from .graph_sink import GraphSink
 from .null_sink import NullSink
+from .snapshot_sink import SnapshotSink
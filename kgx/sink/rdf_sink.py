@@ -1,11 +1,12 @@
 import gzip
+import re
 from collections import OrderedDict
-from typing import Optional, Union, Tuple, Any, Dict
+from typing import Optional, Union, Tuple, Any, Dict, List
 
 import rdflib
 from linkml_runtime.linkml_model.meta import Element, ClassDefinition, SlotDefinition
 from rdflib import URIRef, Literal, Namespace, RDF
-from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.plugins.serializers.nt import _nt_row, _quoteLiteral
 from rdflib.term import _is_valid_uri
 
 from kgx.prefix_manager import PrefixManager
@@ -26,6 +27,65 @@ log = get_logger()
 property_mapping: OrderedDict = OrderedDict()
 reverse_property_mapping: OrderedDict = OrderedDict()
 
+# the characters that rdflib does not serialize in an IRI
+_INVALID_IRI_CHARS = re.compile(r'[<>" {}|\\^`]')
+_XSD_STRING = 'http://www.w3.org/2001/XMLSchema#string'
+_URI_TYPES = {'uriorcurie', 'xsd:anyURI'}
+
+# the number of triples written to the file at once
+WRITE_BATCH_SIZE = 10000
+# the maximum number of serialized predicates, and of serialized values, kept in memory
+TERM_CACHE_SIZE = 100000
+
+
+def nt_iri(iri: str) -> str:
+    """
+    Serialize an IRI as an N-Triples term, as ``rdflib.URIRef.n3`` does.
+
+    Parameters
+    ----------
+    iri: str
+        The IRI
+
+    Returns
+    -------
+    str
+        The N-Triples term
+
+    """
+    if _INVALID_IRI_CHARS.search(iri):
+        raise Exception(
+            f'"{iri}" does not look like a valid URI, I cannot serialize this as N3/Turtle. '
+            'Perhaps you wanted to urlencode it?'
+        )
+    return f"<{iri}>"
+
+
+def nt_literal(lexical: str, datatype: Optional[str] = None) -> str:
+    """
+    Serialize a literal as an N-Triples term, as ``rdflib``'s N-Triples serializer does.
+
+    Characters which are not ASCII are escaped when the triples are encoded.
+
+    Parameters
+    ----------
+    lexical: str
+        The lexical form of the literal
+    datatype: Optional[str]
+        The datatype IRI of the literal, if any
+
+    Returns
+    -------
+    str
+        The N-Triples term
+
+    """
+    if '\\' in lexical or '\n' in lexical or '"' in lexical or '\r' in lexical:
+        lexical = (
+            lexical.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"').replace('\r', '\\r')
+        )
+    return f'"{lexical}"^^<{datatype}>' if datatype else f'"{lexical}"'
+
 
 class RdfSink(Sink):
     """
@@ -72,6 +132,14 @@ class RdfSink(Sink):
         self.cache = {}
         self.reify_all_edges = reify_all_edges
         self.reification_types = {RDF.Statement, self.BIOLINK.Association, self.OBAN.association}
+        self.associations: Optional[set] = None
+        # the serialized IRI, type and datatype of each property of nodes and edges, resolved once
+        self.resolved_node_properties: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        self.resolved_edge_properties: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        # the serialized IRIs of edge predicates and the serialized values of properties whose type is an IRI
+        self.predicates: Dict[str, str] = {}
+        self.terms: Dict[str, str] = {}
+        self.lines: List[str] = []
         if compression == 'gz':
             f = gzip.open(filename, 'wb')
         else:
@@ -95,6 +163,8 @@ class RdfSink(Sink):
         """
         for k, v in m.items():
             self.reverse_predicate_mapping[v] = URIRef(k)
+        self.resolved_node_properties.clear()
+        self.resolved_edge_properties.clear()
 
     def set_property_types(self, m: Dict) -> None:
         """
@@ -119,6 +189,8 @@ class RdfSink(Sink):
             else:
                 key = property_name
             self.property_types[key] = v
+        self.resolved_node_properties.clear()
+        self.resolved_edge_properties.clear()
 
     def write_node(self, record: Dict) -> None:
         """
@@ -130,9 +202,36 @@ class RdfSink(Sink):
             A node record
 
         """
+        s = None
         for k, v in record.items():
             if k in {'id', 'iri'}:
                 continue
+            prop_uri, prop_type, datatype = self._resolve_node_property(k)
+            if s is None:
+                s = nt_iri(self._expand(record['id']))
+            if isinstance(v, (list, set, tuple)):
+                for x in v:
+                    self._write(s, prop_uri, self._serialize_object(k, prop_type, datatype, x))
+            else:
+                self._write(s, prop_uri, self._serialize_object(k, prop_type, datatype, v))
+
+    def _resolve_node_property(self, k: str) -> Tuple[str, str, Optional[str]]:
+        """
+        Resolve a property of nodes, once for all the nodes.
+
+        Parameters
+        ----------
+        k: str
+            The property name
+
+        Returns
+        -------
+        Tuple[str, str, Optional[str]]
+            The serialized property IRI, the property type and the datatype IRI of its values, if any
+
+        """
+        resolved = self.resolved_node_properties.get(k)
+        if resolved is None:
             (element_uri, canonical_uri, predicate, property_name) = self.process_predicate(k)
             if element_uri is None:
                 # not a biolink predicate
@@ -145,14 +244,124 @@ class RdfSink(Sink):
                 prop_uri = canonical_uri if canonical_uri else element_uri
             prop_type = self._get_property_type(prop_uri)
             log.debug(f"prop {k} has prop_uri {prop_uri} and prop_type {prop_type}")
-            prop_uri = self.uriref(prop_uri)
-            if isinstance(v, (list, set, tuple)):
-                for x in v:
-                    value_uri = self._prepare_object(k, prop_type, x)
-                    self._write_triple(self.uriref(record['id']), prop_uri, value_uri)
+            resolved = self.resolved_node_properties[k] = (
+                nt_iri(self._expand(prop_uri)),
+                prop_type,
+                self._get_datatype(prop_type),
+            )
+        return resolved
+
+    def _resolve_edge_property(self, prop: str) -> Tuple[str, str, Optional[str]]:
+        """
+        Resolve a property of reified edges, once for all the edges.
+
+        Parameters
+        ----------
+        prop: str
+            The property name
+
+        Returns
+        -------
+        Tuple[str, str, Optional[str]]
+            The serialized property IRI, the property type and the datatype IRI of its values, if any
+
+        """
+        resolved = self.resolved_edge_properties.get(prop)
+        if resolved is None:
+            (element_uri, canonical_uri, predicate, property_name) = self.process_predicate(prop)
+            if element_uri:
+                prop_uri = canonical_uri if canonical_uri else element_uri
             else:
-                value_uri = self._prepare_object(k, prop_type, v)
-                self._write_triple(self.uriref(record['id']), prop_uri, value_uri)
+                if prop in self.reverse_predicate_mapping:
+                    prop_uri = self.reverse_predicate_mapping[prop]
+                    # prop_uri = self.prefix_manager.contract(prop_uri)
+                else:
+                    prop_uri = predicate
+            prop_type = self._get_property_type(prop)
+            log.debug(f"prop {prop} has prop_uri {prop_uri} and prop_type {prop_type}")
+            resolved = self.resolved_edge_properties[prop] = (
+                nt_iri(self._expand(prop_uri)),
+                prop_type,
+                self._get_datatype(prop_type),
+            )
+        return resolved
+
+    def _get_datatype(self, prop_type: str) -> Optional[str]:
+        # the datatype IRI of the literal values of a property, as in _prepare_object
+        if prop_type in _URI_TYPES:
+            return None
+        if prop_type.startswith('xsd'):
+            return self.prefix_manager.expand(prop_type)
+        return self.prefix_manager.expand('xsd:string')
+
+    def _serialize_object(self, prop: str, prop_type: str, datatype: Optional[str], value: Any) -> str:
+        """
+        Serialize the object of a triple, as ``_prepare_object`` prepares it.
+
+        Parameters
+        ----------
+        prop: str
+            property name
+        prop_type: str
+            property type
+        datatype: Optional[str]
+            The datatype IRI of literal values of the property
+        value: Any
+            property value
+
+        Returns
+        -------
+        str
+            The N-Triples term
+
+        """
+        if isinstance(value, str):
+            if prop_type in _URI_TYPES:
+                term = self.terms.get(value)
+                if term is None:
+                    term = self._n3(self._prepare_object(prop, prop_type, value))
+                    self._cache(self.terms, value, term)
+                return term
+            if datatype == _XSD_STRING:
+                return nt_literal(value, datatype)
+        # literals of other datatypes may have to be normalized by rdflib
+        return self._n3(self._prepare_object(prop, prop_type, value))
+
+    @staticmethod
+    def _cache(cache: Dict[str, str], key: str, term: str) -> None:
+        if len(cache) >= TERM_CACHE_SIZE:
+            cache.clear()
+        cache[key] = term
+
+    @staticmethod
+    def _n3(term: rdflib.term.Identifier) -> str:
+        # as in rdflib's N-Triples serializer
+        if isinstance(term, Literal):
+            return _quoteLiteral(term)
+        return term.n3()
+
+    def _write(self, s: str, p: str, o: str) -> None:
+        """
+        Write a triple of serialized terms, in batches.
+
+        Parameters
+        ----------
+        s: str
+            The subject
+        p: str
+            The predicate
+        o: str
+            The object
+
+        """
+        self.lines.append(f"{s} {p} {o} .\n")
+        if len(self.lines) >= WRITE_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.lines:
+            self.FH.write(''.join(self.lines).encode(self.encoding, "_rdflib_nt_escape"))
+            self.lines = []
 
     def _write_triple(self, s: URIRef, p: URIRef, o: Union[URIRef, Literal]) -> None:
         """
@@ -168,7 +377,9 @@ class RdfSink(Sink):
             The object
 
         """
-        self.FH.write(_nt_row((s, p, o)).encode(self.encoding, "_rdflib_nt_escape"))
+        self.lines.append(_nt_row((s, p, o)))
+        if len(self.lines) >= WRITE_BATCH_SIZE:
+            self._flush()
 
     def write_edge(self, record: Dict) -> None:
         """
@@ -180,84 +391,42 @@ class RdfSink(Sink):
             An edge record
 
         """
-        ecache = []
-        associations = set([self.prefix_manager.contract(x) for x in self.reification_types])
-        associations.update(
-            [str(x) for x in set(self.toolkit.get_all_associations(formatted=True))]
-        )
-        if self.reify_all_edges:
+        if self.associations is None:
+            self.associations = set([self.prefix_manager.contract(x) for x in self.reification_types])
+            self.associations.update(
+                [str(x) for x in set(self.toolkit.get_all_associations(formatted=True))]
+            )
+        associations = self.associations
+        if (
+            self.reify_all_edges
+            or ('type' in record and record['type'] in associations)
+            or ('association_type' in record and record['association_type'] in associations)
+            or ('category' in record and any(record['category']) in associations)
+        ):
             reified_node = self.reify(record['subject'], record['object'], record)
-            s = reified_node['subject']
-            p = reified_node['predicate']
-            o = reified_node['object']
-            ecache.append((s, p, o))
-            n = reified_node['id']
+            n = nt_iri(reified_node['id'])
             for prop, value in reified_node.items():
                 if prop in {'id', 'association_id', 'edge_key'}:
                     continue
-                (element_uri, canonical_uri, predicate, property_name) = self.process_predicate(
-                    prop
-                )
-                if element_uri:
-                    prop_uri = canonical_uri if canonical_uri else element_uri
-                else:
-                    if prop in self.reverse_predicate_mapping:
-                        prop_uri = self.reverse_predicate_mapping[prop]
-                        # prop_uri = self.prefix_manager.contract(prop_uri)
-                    else:
-                        prop_uri = predicate
-                prop_type = self._get_property_type(prop)
-                log.debug(f"prop {prop} has prop_uri {prop_uri} and prop_type {prop_type}")
-                prop_uri = self.uriref(prop_uri)
+                prop_uri, prop_type, datatype = self._resolve_edge_property(prop)
                 if isinstance(value, list):
                     for x in value:
-                        value_uri = self._prepare_object(prop, prop_type, x)
-                        self._write_triple(URIRef(n), prop_uri, value_uri)
+                        self._write(n, prop_uri, self._serialize_object(prop, prop_type, datatype, x))
                 else:
-                    value_uri = self._prepare_object(prop, prop_type, value)
-                    self._write_triple(URIRef(n), prop_uri, value_uri)
+                    self._write(n, prop_uri, self._serialize_object(prop, prop_type, datatype, value))
+            self._write(
+                nt_iri(reified_node['subject']),
+                nt_iri(reified_node['predicate']),
+                nt_iri(reified_node['object']),
+            )
         else:
-            if (
-                ('type' in record and record['type'] in associations)
-                or ('association_type' in record and record['association_type'] in associations)
-                or ('category' in record and any(record['category']) in associations)
-            ):
-                reified_node = self.reify(record['subject'], record['object'], record)
-                s = reified_node['subject']
-                p = reified_node['predicate']
-                o = reified_node['object']
-                ecache.append((s, p, o))
-                n = reified_node['id']
-                for prop, value in reified_node.items():
-                    if prop in {'id', 'association_id', 'edge_key'}:
-                        continue
-                    (element_uri, canonical_uri, predicate, property_name) = self.process_predicate(
-                        prop
-                    )
-                    if element_uri:
-                        prop_uri = canonical_uri if canonical_uri else element_uri
-                    else:
-                        if prop in self.reverse_predicate_mapping:
-                            prop_uri = self.reverse_predicate_mapping[prop]
-                            # prop_uri = self.prefix_manager.contract(prop_uri)
-                        else:
-                            prop_uri = predicate
-                    prop_type = self._get_property_type(prop)
-                    prop_uri = self.uriref(prop_uri)
-                    if isinstance(value, list):
-                        for x in value:
-                            value_uri = self._prepare_object(prop, prop_type, x)
-                            self._write_triple(URIRef(n), prop_uri, value_uri)
-                    else:
-                        value_uri = self._prepare_object(prop, prop_type, value)
-                        self._write_triple(URIRef(n), prop_uri, value_uri)
-            else:
-                s = self.uriref(record['subject'])
-                p = self.uriref(record['predicate'])
-                o = self.uriref(record['object'])
-                self._write_triple(s, p, o)
-        for t in ecache:
-            self._write_triple(t[0], t[1], t[2])
+            s = nt_iri(self._expand(record['subject']))
+            p = self.predicates.get(record['predicate'])
+            if p is None:
+                p = nt_iri(self._expand(record['predicate']))
+                self._cache(self.predicates, record['predicate'], p)
+            o = nt_iri(self._expand(record['object']))
+            self._write(s, p, o)
 
     def uriref(self, identifier: str) -> URIRef:
         """
@@ -273,6 +442,23 @@ class RdfSink(Sink):
         rdflib.URIRef
             URIRef form of the input ``identifier``
 
+        """
+        return URIRef(self._expand(identifier))
+
+    def _expand(self, identifier: str) -> str:
+        """
+        Expand an identifier to an IRI, without checking it as ``rdflib.URIRef`` does.
+
+        Parameters
+        ----------
+        identifier: str
+            Identifier as string.
+
+        Returns
+        -------
+        str
+            The IRI of the input ``identifier``
+
         """
         if identifier.startswith('urn:uuid:'):
             uri = identifier
@@ -299,7 +485,7 @@ class RdfSink(Sink):
             # if identifier == uri:
             #     if PrefixManager.is_curie(identifier):
             #         identifier = identifier.replace(':', '_')
-        return URIRef(uri)
+        return uri
 
     def _prepare_object(self, prop: str, prop_type: str, value: Any) -> rdflib.term.Identifier:
         """
@@ -540,4 +726,5 @@ class RdfSink(Sink):
         """
         Perform any operations after writing the file.
         """
+        self._flush()
         self.FH.close()
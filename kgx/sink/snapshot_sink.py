@@ -0,0 +1,106 @@
+import os
+from typing import Optional, Dict, Any, List
+
+from kgx.sink.sink import Sink
+from kgx.utils.snapshot_utils import (
+    write_header,
+    write_frame,
+    NODE_FRAME,
+    EDGE_FRAME,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_COMPRESSION_LEVEL,
+)
+
+
+class SnapshotSink(Sink):
+    """
+    SnapshotSink is responsible for writing data as records
+    to a KGX snapshot, a chunked and compressed binary dump
+    that can be reloaded without reparsing the original data.
+
+    See ``kgx.utils.snapshot_utils`` for a description of the format.
+
+    Parameters
+    ----------
+    filename: str
+        The filename to write to
+    format: str
+        The file format (``snapshot``)
+    compression: Optional[str]
+        Ignored, since every chunk of a snapshot is compressed
+    kwargs: Any
+        Any additional arguments. ``chunk_size`` sets the number of records
+        per chunk and ``compression_level`` sets the zlib compression level.
+
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        format: str = 'snapshot',
+        compression: Optional[str] = None,
+        **kwargs: Any,
+    ):
+        super().__init__()
+        dirname = os.path.abspath(os.path.dirname(filename))
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.filename = filename
+        self.chunk_size = kwargs.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        self.compression_level = kwargs.get('compression_level', DEFAULT_COMPRESSION_LEVEL)
+        self.node_cache: List[Dict] = []
+        self.edge_cache: List[Dict] = []
+        self.FH = open(filename, 'wb')
+        write_header(self.FH)
+
+    def write_node(self, record: Dict) -> None:
+        """
+        Write a node record to the snapshot.
+
+        Parameters
+        ----------
+        record: Dict
+            A node record
+
+        """
+        self.node_cache.append(record)
+        if len(self.node_cache) >= self.chunk_size:
+            self._flush_nodes()
+
+    def write_edge(self, record: Dict) -> None:
+        """
+        Write an edge record to the snapshot.
+
+        Parameters
+        ----------
+        record: Dict
+            An edge record
+
+        """
+        self.edge_cache.append(record)
+        if len(self.edge_cache) >= self.chunk_size:
+            self._flush_edges()
+
+    def _flush_nodes(self) -> None:
+        """
+        Write all cached node records as a single chunk.
+        """
+        if self.node_cache:
+            write_frame(self.FH, NODE_FRAME, self.node_cache, self.compression_level)
+            self.node_cache = []
+
+    def _flush_edges(self) -> None:
+        """
+        Write all cached edge records as a single chunk.
+        """
+        if self.edge_cache:
+            write_frame(self.FH, EDGE_FRAME, self.edge_cache, self.compression_level)
+            self.edge_cache = []
+
+    def finalize(self) -> None:
+        """
+        Write any cached records and close the snapshot.
+        """
+        self._flush_nodes()
+        self._flush_edges()
+        self.FH.close()
@@ -9,3 +9,4 @@ from .rdf_source import RdfSource
 from .graph_source import GraphSource
 from .owl_source import OwlSource
 from .sssom_source import SssomSource
+from .snapshot_source import SnapshotSource
@@ -7,9 +7,10 @@ from rdflib import URIRef, RDF, Namespace
 
 from kgx.prefix_manager import PrefixManager
 from kgx.config import get_logger
-from kgx.parsers.ntriples_parser import CustomNTriplesParser
+from kgx.parsers.ntriples_parser import NTriplesTokenizer
 from kgx.source.source import Source
 from kgx.utils.graph_utils import curie_lookup
+from kgx.utils.spilling_cache import SpillingDict, SpillingSet
 from kgx.utils.kgx_utils import (
     get_toolkit,
     get_biolink_property_types,
@@ -32,6 +33,9 @@ log = get_logger()
 
 NAMED_THING = 'biolink:NamedThing'
 
+# the properties of reified edge nodes
+REIFICATION_PROPERTIES = {'subject', 'predicate', 'object', 'relation'}
+
 
 class RdfSource(Source):
     """
@@ -88,6 +92,7 @@ class RdfSource(Source):
         self.start: int = 0
         self.count: int = 0
         self.CACHE_SIZE = 10000
+        self.max_in_memory: Optional[int] = None
         self.node_record = {}
         self.edge_record = {}
         self.node_cache = {}
@@ -138,7 +143,12 @@ class RdfSource(Source):
             To ensure proper parsing of N-Triples and a relatively low memory footprint,
             it is recommended that the N-Triples be sorted based on the subject IRIs.
 
-            ```sort -k 1,2 -t ' ' data.nt > data_sorted.nt```
+            ```kgx sort --input-format nt --key subject --output data_sorted.nt data.nt```
+
+            Alternatively, with ``max_in_memory``, at most that many nodes, edges and reified
+            nodes are kept in memory, the others being spilled to disk, and all the records are
+            yielded once the whole file is parsed. The reified nodes are found by a first pass
+            over the file. N-Triples need not be sorted then.
 
         Parameters
         ----------
@@ -149,7 +159,9 @@ class RdfSource(Source):
         compression: Optional[str]
             The compression type (``gz``)
         kwargs: Any
-            Any additional arguments
+            Any additional arguments, like the number of ``processes`` tokenizing the N-Triples,
+            the ``max_in_memory`` number of cached nodes and edges, or the ``spill_directory``
+            where caches are spilled (the default temporary directory, by default)
 
         Returns
         -------
@@ -157,22 +169,31 @@ class RdfSource(Source):
             A generator for records
 
         """
-        p = CustomNTriplesParser(self)
+        tokenizer = NTriplesTokenizer(processes=kwargs.get('processes', 1))
 
         self.set_provenance_map(kwargs)
 
-        if compression == 'gz':
-            yield from p.parse(gzip.open(filename, 'rb'))
-        else:
-            yield from p.parse(open(filename, 'rb'))
+        self.max_in_memory = kwargs.get('max_in_memory')
+        if self.max_in_memory:
+            spill_directory = kwargs.get('spill_directory')
+            self.node_cache = SpillingDict(self.max_in_memory, spill_directory)
+            self.edge_cache = SpillingDict(self.max_in_memory, spill_directory)
+            self.reified_nodes = SpillingSet(self.max_in_memory, spill_directory)
+            # the triples about a reified node may come before those which tell that it is one
+            with self._open(filename, compression) as f:
+                for s, p, o in tokenizer.tokenize(f):
+                    self.find_reified_node(s, p, o)
+
+        with self._open(filename, compression) as f:
+            for s, p, o in tokenizer.tokenize(f):
+                yield from self.triple(s, p, o)
         log.info(f"Done parsing {filename}")
 
         for n in self.reified_nodes:
             data = self.node_cache.pop(n)
             self.dereify(n, data)
 
-        for k in self.node_cache.keys():
-            node_data = self.node_cache[k]
+        for k, node_data in self.node_cache.items():
             if 'category' in node_data:
                 if NAMED_THING not in set(node_data['category']):
                     node_data['category'].append(NAMED_THING)
@@ -189,8 +210,7 @@ class RdfSource(Source):
 
         self.node_cache.clear()
 
-        for k in self.edge_cache.keys():
-            edge_data = self.edge_cache[k]
+        for k, edge_data in self.edge_cache.items():
             edge_data = validate_edge(edge_data)
             edge_data = sanitize_import(edge_data)
 
@@ -202,6 +222,39 @@ class RdfSource(Source):
 
         self.edge_cache.clear()
 
+        if self.max_in_memory:
+            for cache in [self.node_cache, self.edge_cache, self.reified_nodes]:
+                cache.close()
+            self.node_cache = {}
+            self.edge_cache = {}
+            self.reified_nodes = set()
+
+    @staticmethod
+    def _open(filename: str, compression: Optional[str]):
+        if compression == 'gz':
+            return gzip.open(filename, 'rb')
+        return open(filename, 'rb')
+
+    def find_reified_node(self, s: URIRef, p: URIRef, o: URIRef) -> None:
+        """
+        Add the subject of a triple to the reified nodes, if the triple tells that it is one.
+
+        Parameters
+        ----------
+        s: URIRef
+            Subject
+        p: URIRef
+            Predicate
+        o: URIRef
+            Object
+
+        """
+        property_name = self.process_predicate(p)[3]
+        if p in self.reification_predicates or property_name in REIFICATION_PROPERTIES or o in self.reification_types:
+            s_curie = self.prefix_manager.contract(s)
+            if not s_curie.startswith('biolink') and not s_curie.startswith('OBAN'):
+                self.reified_nodes.add(s_curie)
+
     def triple(self, s: URIRef, p: URIRef, o: URIRef) -> None:
         """
         Parse a triple.
@@ -235,7 +288,7 @@ class RdfSource(Source):
             # subject is a reified node
             self.reified_nodes.add(s_curie)
             self.add_node_attribute(s, key=prop_uri, value=o)
-        elif property_name in {'subject', 'predicate', 'object', 'predicate', 'relation'}:
+        elif property_name in REIFICATION_PROPERTIES:
             # subject is a reified node
             self.reified_nodes.add(s_curie)
             self.add_node_attribute(s, key=prop_uri, value=o)
@@ -259,7 +312,9 @@ class RdfSource(Source):
             # treating predicate as an edge
             self.add_edge(s, o, p)
 
-        if len(self.edge_cache) >= self.CACHE_SIZE:
+        if not self.max_in_memory and len(self.edge_cache) >= self.CACHE_SIZE:
+            # with max_in_memory, reified nodes are only dereified once they are complete,
+            # at the end of the parse, and the edges are yielded then
             while self.reified_nodes:
                 n = self.reified_nodes.pop()
                 data = self.node_cache.pop(n)
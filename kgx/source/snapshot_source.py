@@ -0,0 +1,97 @@
+from typing import Optional, Generator, Any, Dict, Tuple
+
+from kgx.source.source import Source
+from kgx.utils.kgx_utils import generate_edge_key
+from kgx.utils.snapshot_utils import read_header, read_frames, NODE_FRAME, EDGE_FRAME
+
+
+class SnapshotSource(Source):
+    """
+    SnapshotSource is responsible for reading data as records
+    from a KGX snapshot written by ``kgx.sink.SnapshotSink``.
+
+    The records in a snapshot have already been validated and sanitized
+    when they were written, so they are yielded as-is. Only node and edge
+    filters are applied.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def parse(
+        self,
+        filename: str,
+        format: str = 'snapshot',
+        compression: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator:
+        """
+        This method reads from a KGX snapshot and yields records.
+
+        Parameters
+        ----------
+        filename: str
+            The filename to parse
+        format: str
+            The format (``snapshot``)
+        compression: Optional[str]
+            Ignored, since every chunk of a snapshot is compressed
+        kwargs: Any
+            Any additional arguments
+
+        Returns
+        -------
+        Generator
+            A generator for node and edge records
+
+        """
+        with open(filename, 'rb') as FH:
+            read_header(FH)
+            for frame_type, records in read_frames(FH):
+                if frame_type == NODE_FRAME:
+                    for record in records:
+                        yield self.read_node(record)
+                elif frame_type == EDGE_FRAME:
+                    for record in records:
+                        yield self.read_edge(record)
+
+    def read_node(self, node: Dict) -> Optional[Tuple[str, Dict]]:
+        """
+        Prepare a node.
+
+        Parameters
+        ----------
+        node: Dict
+            A node
+
+        Returns
+        -------
+        Optional[Tuple[str, Dict]]
+            A tuple that contains node id and node data
+
+        """
+        if self.check_node_filter(node):
+            self.node_properties.update(node.keys())
+            return node['id'], node
+
+    def read_edge(self, edge: Dict) -> Optional[Tuple]:
+        """
+        Prepare an edge.
+
+        Parameters
+        ----------
+        edge: Dict
+            An edge
+
+        Returns
+        -------
+        Optional[Tuple]
+            A tuple that contains subject id, object id, edge key, and edge data
+
+        """
+        if self.check_edge_filter(edge):
+            self.edge_properties.update(edge.keys())
+            s = edge['subject']
+            o = edge['object']
+            key = edge['key'] if 'key' in edge else generate_edge_key(s, edge['predicate'], o)
+            return s, o, key, edge
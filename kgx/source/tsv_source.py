@@ -13,6 +13,7 @@ from kgx.utils.kgx_utils import (
     sanitize_import,
     validate_edge,
     validate_node,
+    GraphEntityType,
 )
 
 log = get_logger()
@@ -77,6 +78,40 @@ class TsvSource(Source):
         Generator
             A generator for node and edge records
 
+        """
+        for entity_type, chunk in self.read_frames(filename, format, compression, **kwargs):
+            if entity_type == GraphEntityType.NODE:
+                yield from self.read_nodes(chunk)
+            else:
+                yield from self.read_edges(chunk)
+
+    def read_frames(
+        self,
+        filename: str,
+        format: str,
+        compression: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator:
+        """
+        This method reads from a TSV/CSV and yields chunks of rows,
+        as they are before being turned into records.
+
+        Parameters
+        ----------
+        filename: str
+            The filename to parse
+        format: str
+            The format (``tsv``, ``csv``)
+        compression: Optional[str]
+            The compression type (``tar``, ``tar.gz``)
+        kwargs: Any
+            Any additional arguments
+
+        Returns
+        -------
+        Generator
+            A generator for tuples of GraphEntityType and pandas.DataFrame
+
         """
         if 'delimiter' not in kwargs:
             # infer delimiter from file format
@@ -130,7 +165,7 @@ class TsvSource(Source):
                     )
                     for chunk in file_iter:
                         self.node_properties.update(chunk.columns)
-                        yield from self.read_nodes(chunk)
+                        yield GraphEntityType.NODE, chunk
 
                 # Next, extract and capture contents of the edges files...
                 for name in edge_files:
@@ -152,7 +187,7 @@ class TsvSource(Source):
                     )
                     for chunk in file_iter:
                         self.edge_properties.update(chunk.columns)
-                        yield from self.read_edges(chunk)
+                        yield GraphEntityType.EDGE, chunk
         else:
             file_iter = pd.read_csv(
                 filename,
@@ -165,11 +200,11 @@ class TsvSource(Source):
             if re.search(f'nodes.{format}', filename):
                 for chunk in file_iter:
                     self.node_properties.update(chunk.columns)
-                    yield from self.read_nodes(chunk)
+                    yield GraphEntityType.NODE, chunk
             elif re.search(f'edges.{format}', filename):
                 for chunk in file_iter:
                     self.edge_properties.update(chunk.columns)
-                    yield from self.read_edges(chunk)
+                    yield GraphEntityType.EDGE, chunk
             else:
                 # This used to throw an exception but perhaps we should simply ignore it.
                 log.warning(f'Parse function cannot resolve the KGX file type in name {filename}. Skipped...')
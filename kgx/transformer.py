@@ -1,8 +1,9 @@
+import copy
 import itertools
 import os
 from os.path import exists
 from sys import stderr
-from typing import Dict, Generator, List, Optional, Callable, Set
+from typing import Dict, Generator, List, Optional, Callable, Set, Tuple
 
 from kgx.config import get_logger
 from kgx.source import (
@@ -16,7 +17,8 @@ from kgx.source import (
     NeoSource,
     RdfSource,
     OwlSource,
-    SssomSource
+    SssomSource,
+    SnapshotSource
 )
 from kgx.sink import (
     Sink,
@@ -26,9 +28,11 @@ from kgx.sink import (
     JsonlSink,
     NeoSink,
     RdfSink,
-    NullSink
+    NullSink,
+    SnapshotSink
 )
 
+from kgx.graph_operations.stream_operations import RecordOperation, compile_stream_operations
 from kgx.utils.kgx_utils import apply_graph_operations, GraphEntityType, knowledge_provenance_properties
 
 SOURCE_MAP = {
@@ -44,6 +48,7 @@ SOURCE_MAP = {
     'nt': RdfSource,
     'owl': OwlSource,
     'sssom': SssomSource,
+    'snapshot': SnapshotSource,
 }
 
 SINK_MAP = {
@@ -54,7 +59,8 @@ SINK_MAP = {
     'jsonl': JsonlSink,
     'neo4j': NeoSink,
     'nt': RdfSink,
-    'null': NullSink
+    'null': NullSink,
+    'snapshot': SnapshotSink,
 }
 
 
@@ -116,6 +122,11 @@ class Transformer(object):
         itself. This Callable is strictly meant to be procedural and should
         *not* mutate the record.
 
+        In stream mode, the graph operations in ``input_args['operations']``
+        are compiled into a single record operation that is applied to each
+        record as it is written to the sink. A ``ValueError`` is raised if
+        any of them needs the whole graph.
+
         Parameters
         ----------
         input_args: Dict
@@ -125,64 +136,16 @@ class Transformer(object):
         inspector: Optional[Callable[[GraphEntityType, List], None]]
             Optional Callable to 'inspect' source records during processing.
         """
-        sources = []
-        generators = []
-        input_format = input_args['format']
-        prefix_map = input_args.pop('prefix_map', {})
-        predicate_mappings = input_args.pop('predicate_mappings', {})
-        node_property_predicates = input_args.pop('node_property_predicates', {})
-        node_filters = input_args.pop('node_filters', {})
-        edge_filters = input_args.pop('edge_filters', {})
         operations = input_args.pop('operations', [])
 
         # Optional process() data stream inspector
         self.inspector = inspector
 
-        if input_format in {'neo4j', 'graph'}:
-            source = self.get_source(input_format)
-            source.set_prefix_map(prefix_map)
-            source.set_node_filters(node_filters)
-            self.node_filters = source.node_filters
-            self.edge_filters = source.edge_filters
-            source.set_edge_filters(edge_filters)
-            self.node_filters = source.node_filters
-            self.edge_filters = source.edge_filters
-
-            if 'uri' in input_args:
-                default_provenance = input_args['uri']
-            else:
-                default_provenance = None
-
-            g = source.parse(default_provenance=default_provenance, **input_args)
-
-            sources.append(source)
-            generators.append(g)
-        else:
-            filename = input_args.pop('filename', {})
-            for f in filename:
-                source = self.get_source(input_format)
-                source.set_prefix_map(prefix_map)
-                if isinstance(source, RdfSource):
-                    source.set_predicate_mapping(predicate_mappings)
-                    source.set_node_property_predicates(node_property_predicates)
-                source.set_node_filters(node_filters)
-                self.node_filters = source.node_filters
-                self.edge_filters = source.edge_filters
-                source.set_edge_filters(edge_filters)
-                self.node_filters = source.node_filters
-                self.edge_filters = source.edge_filters
-
-                default_provenance = os.path.basename(f)
-
-                g = source.parse(f, default_provenance=default_provenance, **input_args)
-
-                sources.append(source)
-                generators.append(g)
-
-        source_generator = itertools.chain(*generators)
+        sources, source_generator = self.get_source_generator(input_args)
 
         if output_args:
             if self.stream:
+                record_operation = compile_stream_operations(operations)
                 if output_args['format'] in {'tsv', 'csv'}:
                     if 'node_properties' not in output_args:
                         log.warning(
@@ -203,7 +166,7 @@ class Transformer(object):
                     if 'property_types' in output_args:
                         sink.set_property_types(output_args['property_types'])
                 # stream from source to sink
-                self.process(source_generator, sink)
+                self.process(source_generator, sink, record_operation)
                 sink.finalize()
             else:
                 # stream from source to intermediate
@@ -272,6 +235,73 @@ class Transformer(object):
             for k, v in s.get_infores_catalog().items():
                 self._infores_catalog[k] = v
 
+    def get_source_generator(self, input_args: Dict) -> Tuple[List[Source], Generator]:
+        """
+        Get the sources for an input and a single generator
+        for the records from all of them.
+
+        Parameters
+        ----------
+        input_args: Dict
+            Arguments relevant to your input source
+
+        Returns
+        -------
+        Tuple[List[kgx.source.source.Source], Generator]
+            A tuple containing the sources and a generator for records
+
+        """
+        sources = []
+        generators = []
+        input_format = input_args['format']
+        prefix_map = input_args.pop('prefix_map', {})
+        predicate_mappings = input_args.pop('predicate_mappings', {})
+        node_property_predicates = input_args.pop('node_property_predicates', {})
+        node_filters = input_args.pop('node_filters', {})
+        edge_filters = input_args.pop('edge_filters', {})
+        if input_format in {'neo4j', 'graph'}:
+            source = self.get_source(input_format)
+            source.set_prefix_map(prefix_map)
+            source.set_node_filters(node_filters)
+            self.node_filters = source.node_filters
+            self.edge_filters = source.edge_filters
+            source.set_edge_filters(edge_filters)
+            self.node_filters = source.node_filters
+            self.edge_filters = source.edge_filters
+
+            if 'uri' in input_args:
+                default_provenance = input_args['uri']
+            else:
+                default_provenance = None
+
+            g = source.parse(default_provenance=default_provenance, **input_args)
+
+            sources.append(source)
+            generators.append(g)
+        else:
+            filename = input_args.pop('filename', {})
+            for f in filename:
+                source = self.get_source(input_format)
+                source.set_prefix_map(prefix_map)
+                if isinstance(source, RdfSource):
+                    source.set_predicate_mapping(predicate_mappings)
+                    source.set_node_property_predicates(node_property_predicates)
+                source.set_node_filters(node_filters)
+                self.node_filters = source.node_filters
+                self.edge_filters = source.edge_filters
+                source.set_edge_filters(edge_filters)
+                self.node_filters = source.node_filters
+                self.edge_filters = source.edge_filters
+
+                default_provenance = os.path.basename(f)
+
+                g = source.parse(f, default_provenance=default_provenance, **input_args)
+
+                sources.append(source)
+                generators.append(g)
+
+        return sources, itertools.chain(*generators)
+
     def get_infores_catalog(self):
         """
         Return catalog of Information Resource mappings
@@ -282,7 +312,8 @@ class Transformer(object):
     def process(
             self,
             source: Generator,
-            sink: Sink
+            sink: Sink,
+            record_operation: Optional[RecordOperation] = None
     ) -> None:
         """
         This method is responsible for reading from ``source``
@@ -298,6 +329,9 @@ class Transformer(object):
             A generator from a Source
         sink: kgx.sink.sink.Sink
             An instance of Sink
+        record_operation: Optional[Callable[[Tuple], List[Tuple]]]
+            Optional record operation, applied to each record after it
+            has been inspected and before it is written to the sink
 
         """
         for rec in source:
@@ -321,13 +355,30 @@ class Transformer(object):
                     if write_edge:
                         if self.inspector:
                             self.inspector(GraphEntityType.EDGE, rec)
-                        sink.write_edge(rec[-1])
+                        if record_operation:
+                            self._write_records(sink, record_operation(rec))
+                        else:
+                            sink.write_edge(rec[-1])
                 else:  # infer a node record
                     if 'category' in self.node_filters:
                         self._seen_nodes.add(rec[0])
                     if self.inspector:
                         self.inspector(GraphEntityType.NODE, rec)
-                    sink.write_node(rec[-1])
+                    if record_operation:
+                        self._write_records(sink, record_operation(rec))
+                    else:
+                        sink.write_node(rec[-1])
+
+    @staticmethod
+    def _write_records(sink: Sink, records: List[Tuple]) -> None:
+        """
+        Write the node and edge records returned by a record operation to ``sink``.
+        """
+        for rec in records:
+            if len(rec) == 4:
+                sink.write_edge(rec[-1])
+            else:
+                sink.write_node(rec[-1])
 
     # TODO: review whether or not the 'save()' method need to be 'knowledge_source' aware?
     def save(self, output_args: Dict) -> None:
@@ -404,3 +455,47 @@ class Transformer(object):
             return s(**kwargs)
         else:
             raise TypeError(f"{kwargs['format']} in an unrecognized format")
+
+    def get_stream_sink(
+            self,
+            output_args: Dict,
+            node_properties: Set[str],
+            edge_properties: Set[str]
+    ) -> Sink:
+        """
+        Get a Sink for an output that is written to while streaming,
+        when the node and edge properties of the input are already known
+        (e.g. from a previous pass over the input).
+
+        Parameters
+        ----------
+        output_args: Dict
+            Arguments relevant to your output sink
+        node_properties: Set[str]
+            The node properties of the records to write
+        edge_properties: Set[str]
+            The edge properties of the records to write
+
+        Returns
+        -------
+        Sink:
+            An instance of kgx.sink.Sink
+
+        """
+        output_args = copy.deepcopy(output_args)
+        if output_args['format'] in {'tsv', 'csv'}:
+            if 'node_properties' not in output_args:
+                output_args['node_properties'] = node_properties
+            if 'edge_properties' not in output_args:
+                output_args['edge_properties'] = edge_properties
+        sink = self.get_sink(**output_args)
+        sink.node_properties.update(node_properties)
+        sink.edge_properties.update(edge_properties)
+        if 'reverse_prefix_map' in output_args:
+            sink.set_reverse_prefix_map(output_args['reverse_prefix_map'])
+        if isinstance(sink, RdfSink):
+            if 'reverse_predicate_mapping' in output_args:
+                sink.set_reverse_predicate_mapping(output_args['reverse_predicate_mapping'])
+            if 'property_types' in output_args:
+                sink.set_property_types(output_args['property_types'])
+        return sink
@@ -1,3 +1,4 @@
+import copy
 import importlib
 import re
 import time
@@ -325,6 +326,249 @@ def get_toolkit(biolink_release: Optional[str] = None) -> Toolkit:
     return toolkit
 
 
+class BiolinkIndex(object):
+    """
+    A lookup index over a Biolink Model, built once per model version.
+
+    The prefix prioritization map and the ancestor closures of all the
+    categories that descend from 'named thing' are precomputed when the index
+    is built. Elements, ancestors, mixin/category/alias/deprecated flags of
+    any other name (including predicates) are computed on first use and
+    memoized, so that every distinct name hits the toolkit at most once.
+
+    Ancestor closures are also held as bitsets, where each distinct ancestor
+    is assigned a bit, which makes ancestry checks a single integer operation.
+
+    Parameters
+    ----------
+    toolkit: bmt.Toolkit
+        The toolkit for the Biolink Model to index
+
+    """
+
+    def __init__(self, toolkit: Toolkit):
+        self.toolkit = toolkit
+        self.model_version = toolkit.get_model_version()
+        self._elements: Dict[str, Optional[Element]] = {}
+        self._ancestors: Dict[str, List[str]] = {}
+        self._closures: Dict[str, int] = {}
+        self._bits: Dict[str, int] = {}
+        self._is_mixin: Dict[str, bool] = {}
+        self._is_category: Dict[str, bool] = {}
+        self._prefix_prioritization_map: Dict[str, List] = {}
+
+        # TODO: Lookup via Biolink CURIE should be supported in bmt
+        descendants = toolkit.get_descendants('named thing')
+        descendants.append('named thing')
+        for d in descendants:
+            element = self.get_element(d)
+            if element and 'id_prefixes' in element:
+                key = format_biolink_category(element.name)
+                self._prefix_prioritization_map[key] = element.id_prefixes
+                self.get_ancestor_closure(key)
+
+    def get_element(self, name: str) -> Optional[Element]:
+        """
+        Get Biolink element for a given name, where name can be a class, slot, or relation.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        Optional[linkml_model.meta.Element]
+            An instance of linkml_model.meta.Element
+
+        """
+        if name not in self._elements:
+            self._elements[name] = self.toolkit.get_element(name)
+        return self._elements[name]
+
+    def get_ancestors(self, name: str) -> List[str]:
+        """
+        Get the formatted ancestors, including mixins, for a given
+        Biolink class or predicate.
+
+        The returned list is shared by all callers and must not be modified.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        List[str]
+            A list of ancestors
+
+        """
+        if name not in self._ancestors:
+            self._ancestors[name] = self.toolkit.get_ancestors(name, formatted=True, mixin=True)
+        return self._ancestors[name]
+
+    def get_ancestor_closure(self, name: str) -> int:
+        """
+        Get the ancestors of a given Biolink class or predicate as a bitset.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        int
+            A bitset with one bit set for each ancestor
+
+        """
+        if name not in self._closures:
+            closure = 0
+            for ancestor in self.get_ancestors(name):
+                if ancestor not in self._bits:
+                    self._bits[ancestor] = 1 << len(self._bits)
+                closure |= self._bits[ancestor]
+            self._closures[name] = closure
+        return self._closures[name]
+
+    def is_ancestor(self, ancestor: str, name: str) -> bool:
+        """
+        Check whether ``ancestor`` is one of the formatted ancestors of ``name``.
+
+        Parameters
+        ----------
+        ancestor: str
+            The formatted ancestor, like ``biolink:NamedThing``
+        name: str
+            The name
+
+        Returns
+        -------
+        bool
+            Whether or not ``ancestor`` is an ancestor of ``name``
+
+        """
+        closure = self.get_ancestor_closure(name)
+        return bool(closure & self._bits.get(ancestor, 0))
+
+    def is_mixin(self, name: str) -> bool:
+        """
+        Check whether a given name is a mixin in the Biolink Model.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        bool
+            Whether or not the name is a mixin
+
+        """
+        if name not in self._is_mixin:
+            self._is_mixin[name] = bool(self.toolkit.is_mixin(name))
+        return self._is_mixin[name]
+
+    def is_category(self, name: str) -> bool:
+        """
+        Check whether a given name is a category in the Biolink Model.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        bool
+            Whether or not the name is a category
+
+        """
+        if name not in self._is_category:
+            self._is_category[name] = bool(self.toolkit.is_category(name))
+        return self._is_category[name]
+
+    def get_aliases(self, name: str) -> List[str]:
+        """
+        Get the aliases of a given Biolink element.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        List[str]
+            A list of aliases
+
+        """
+        element = self.get_element(name)
+        aliases = getattr(element, 'aliases', None) if element else None
+        return aliases if aliases else []
+
+    def is_deprecated(self, name: str) -> bool:
+        """
+        Check whether a given Biolink element is deprecated.
+
+        Parameters
+        ----------
+        name: str
+            The name
+
+        Returns
+        -------
+        bool
+            Whether or not the element is deprecated
+
+        """
+        element = self.get_element(name)
+        return element is not None and getattr(element, 'deprecated', None) is not None
+
+    def get_prefix_prioritization_map(self) -> Dict[str, List]:
+        """
+        Get prefix prioritization map as defined in Biolink Model.
+
+        Returns
+        -------
+        Dict[str, List]
+            A copy of the prefix prioritization map, safe to update
+
+        """
+        return {k: list(v) for k, v in self._prefix_prioritization_map.items()}
+
+
+_biolink_indexes: Dict[str, BiolinkIndex] = dict()
+
+
+def get_biolink_index(toolkit: Optional[Toolkit] = None) -> BiolinkIndex:
+    """
+    Get the Biolink lookup index for a toolkit.
+    The index is built on first use and cached by model version.
+
+    Parameters
+    ----------
+    toolkit: Optional[Toolkit]
+        The toolkit to index (default: the default toolkit)
+
+    Returns
+    -------
+    kgx.utils.kgx_utils.BiolinkIndex
+        The Biolink lookup index
+
+    """
+    if toolkit is None:
+        toolkit = get_toolkit()
+    version = toolkit.get_model_version()
+    index = _biolink_indexes.get(version)
+    if index is None or index.toolkit is not toolkit:
+        index = BiolinkIndex(toolkit)
+        _biolink_indexes[version] = index
+    return index
+
+
 def generate_edge_key(s: str, edge_predicate: str, o: str) -> str:
     """
     Generates an edge key based on a given subject, predicate, and object.
@@ -408,18 +652,7 @@ def get_prefix_prioritization_map() -> Dict[str, List]:
     Dict[str, List]
 
     """
-    toolkit = get_toolkit()
-    prefix_prioritization_map = {}
-    # TODO: Lookup via Biolink CURIE should be supported in bmt
-    descendants = toolkit.get_descendants('named thing')
-    descendants.append('named thing')
-    for d in descendants:
-        element = toolkit.get_element(d)
-        if element and 'id_prefixes' in element:
-            prefixes = element.id_prefixes
-            key = format_biolink_category(element.name)
-            prefix_prioritization_map[key] = prefixes
-    return prefix_prioritization_map
+    return get_biolink_index().get_prefix_prioritization_map()
 
 
 def get_biolink_element(name) -> Optional[Element]:
@@ -437,9 +670,7 @@ def get_biolink_element(name) -> Optional[Element]:
         An instance of linkml_model.meta.Element
 
     """
-    toolkit = get_toolkit()
-    element = toolkit.get_element(name)
-    return element
+    return get_biolink_index().get_element(name)
 
 
 def get_biolink_ancestors(name: str):
@@ -456,9 +687,7 @@ def get_biolink_ancestors(name: str):
         A list of ancestors
 
     """
-    toolkit = get_toolkit()
-    ancestors_mixins = toolkit.get_ancestors(name, formatted=True, mixin=True)
-    return ancestors_mixins
+    return list(get_biolink_index().get_ancestors(name))
 
 
 def get_biolink_property_types() -> Dict:
@@ -652,6 +881,172 @@ def prepare_data_dict(d1: Dict, d2: Dict, preserve: bool = True) -> Dict:
     return new_data
 
 
+def _extend_unique(values: List, new_values: List, seen: Optional[Set] = None) -> Optional[Set]:
+    """
+    Extend ``values`` with all of ``new_values`` that are not already in ``values``.
+
+    Membership is checked against a set, rather than the list, where the
+    values are hashable. As with ``prepare_data_dict``, duplicates within
+    ``new_values`` are not removed.
+
+    Parameters
+    ----------
+    values: List
+        The list to extend
+    new_values: List
+        The values to add
+    seen: Optional[Set]
+        The set of values in ``values``, if already known
+
+    Returns
+    -------
+    Optional[Set]
+        The set of values in ``values``, or ``None`` if the values are not hashable
+
+    """
+    try:
+        if seen is None:
+            seen = set(values)
+        additions = [x for x in new_values if x not in seen]
+        seen.update(additions)
+    except TypeError:
+        seen = None
+        additions = [x for x in new_values if x not in values]
+    values.extend(additions)
+    return seen
+
+
+def merge_data_dict(
+    d1: Dict, d2: Dict, preserve: bool = True, seen: Optional[Dict[str, Set]] = None
+) -> Dict:
+    """
+    Merge ``d2`` into ``d1``, in place.
+
+    The result is identical to
+    ``prepare_data_dict(copy.deepcopy(d1), copy.deepcopy(d2), preserve)``
+    but without copying either of the dictionaries. Any list in ``d1`` that
+    has to change is replaced by a new list, so lists that are shared with
+    other records are never modified.
+
+    When folding many records into the same ``d1``, pass the same ``seen``
+    dictionary on every call. The lists in ``d1`` are then treated as owned
+    by the caller and are extended in place, and the set of values in each
+    multivalued property is kept in ``seen`` between calls, instead of being
+    rebuilt each time.
+
+    Parameters
+    ----------
+    d1: Dict
+        The dict object to merge into
+    d2: Dict
+        The dict object to merge
+    preserve: bool
+        Whether or not to preserve values for conflicting keys
+    seen: Optional[Dict[str, Set]]
+        The values already seen for each multivalued property in ``d1``
+
+    Returns
+    -------
+    Dict
+        ``d1``, updated with the properties of ``d2``
+
+    """
+    owned = seen is not None
+    for key, value in d2.items():
+        multivalued = is_property_multivalued.get(key)
+        core = key in CORE_NODE_PROPERTIES or key in CORE_EDGE_PROPERTIES
+        is_list = isinstance(value, (list, set, tuple))
+        if key not in d1:
+            if multivalued and not is_list:
+                d1[key] = [value]
+            else:
+                d1[key] = [x for x in value] if is_list else value
+            if owned:
+                seen.pop(key, None)
+            continue
+
+        existing = d1[key]
+        if isinstance(existing, (list, set, tuple)):
+            if multivalued is None and core:
+                log.debug(f"cannot modify core property '{key}': {value} vs {existing}")
+                continue
+            dedup = multivalued or (multivalued is None and is_list)
+            if owned and isinstance(existing, list):
+                target = existing
+                key_seen = seen.get(key)
+            else:
+                target = [x for x in existing]
+                key_seen = None
+        else:
+            if core:
+                log.debug(f"cannot modify core property '{key}': {value} vs {existing}")
+                continue
+            if not multivalued and not preserve:
+                d1[key] = [x for x in value] if is_list else value
+                if owned:
+                    seen.pop(key, None)
+                continue
+            dedup = multivalued or is_list
+            target = [existing]
+            key_seen = None
+
+        new_values = value if is_list else [value]
+        if dedup:
+            key_seen = _extend_unique(target, new_values, key_seen)
+        else:
+            target.extend(new_values)
+            if key_seen is not None:
+                try:
+                    key_seen.update(new_values)
+                except TypeError:
+                    key_seen = None
+        d1[key] = target
+        if owned:
+            if key_seen is None:
+                seen.pop(key, None)
+            else:
+                seen[key] = key_seen
+    return d1
+
+
+def merge_counts(d1: Dict, d2: Dict) -> Dict:
+    """
+    Merge the nested counts of ``d2`` into ``d1``, in place.
+
+    Numbers are added, sets are united and dictionaries are merged
+    recursively. Objects with a ``merge`` method, such as the sketches of
+    ``kgx.graph_operations.sketches``, are merged with it. Any other value
+    of ``d1`` is kept as is. Values of ``d2``
+    whose key is not in ``d1`` are copied, so ``d2`` is never modified
+    by subsequent merges into ``d1``.
+
+    Parameters
+    ----------
+    d1: Dict
+        The dict object to merge into
+    d2: Dict
+        The dict object to merge
+
+    Returns
+    -------
+    Dict
+        ``d1``, updated with the counts of ``d2``
+
+    """
+    for key, value in d2.items():
+        if key not in d1:
+            d1[key] = copy.deepcopy(value)
+        elif isinstance(value, dict):
+            merge_counts(d1[key], value)
+        elif isinstance(value, set):
+            d1[key].update(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            d1[key] += value
+        elif hasattr(value, 'merge'):
+            d1[key].merge(value)
+    return d1
+
+
 def apply_filters(
     graph: BaseGraph,
     node_filters: Dict[str, Union[str, Set]],
@@ -0,0 +1,409 @@
+"""
+KGX native snapshot format.
+
+A snapshot is a binary dump of the nodes and edges of a graph that can
+be written and read back at close to disk speed. The layout is:
+
+- an 8 byte magic string (``KGXSNAP\\0``) followed by a 2 byte format version
+- a sequence of frames, where each frame is a 1 byte frame type (``N`` for nodes,
+  ``E`` for edges), an 8 byte payload length and a zlib compressed payload
+
+Each payload is a chunk of records encoded as JSON, where the properties whose
+values are sets or tuples are tagged, for records to be read back with the same
+types as they were written (nested sets and tuples are read back as lists). The
+strings repeated in a chunk are left to the compression. Unlike pickle, decoding
+a snapshot cannot run code, so that snapshots from anywhere can be read.
+
+Records in a snapshot are stored exactly as they were written to the sink, i.e.
+already validated and sanitized, so reading a snapshot does not parse or
+sanitize the data again.
+
+The same tagging, extended to nested dicts, to dicts whose keys are not strings
+and to objects, encodes the states of graph summaries (see ``tag_dict``).
+"""
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Generator
+
+SNAPSHOT_MAGIC = b'KGXSNAP\x00'
+SNAPSHOT_VERSION = 2
+# the first version whose chunks are not pickled
+MIN_SNAPSHOT_VERSION = 2
+SNAPSHOT_EXTENSION = 'snapshot'
+
+NODE_FRAME = b'N'
+EDGE_FRAME = b'E'
+
+# the version of the format of the states of graph summaries (see
+# kgx.graph_operations.summarize_graph.GraphSummary.save_state), which were pickled in version 1
+SUMMARY_STATE_VERSION = 2
+
+DEFAULT_CHUNK_SIZE = 100000
+DEFAULT_COMPRESSION_LEVEL = 1
+
+_HEADER = struct.Struct('<8sH')
+_FRAME = struct.Struct('<cQ')
+
+
+def write_header(fh: BinaryIO) -> None:
+    """
+    Write the snapshot header to a file handle.
+
+    Parameters
+    ----------
+    fh: BinaryIO
+        A file handle opened for writing in binary mode
+
+    """
+    fh.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+
+
+def read_header(fh: BinaryIO) -> int:
+    """
+    Read and check the snapshot header from a file handle.
+
+    Parameters
+    ----------
+    fh: BinaryIO
+        A file handle opened for reading in binary mode
+
+    Returns
+    -------
+    int
+        The snapshot format version
+
+    """
+    header = fh.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Not a KGX snapshot: file is too short")
+    magic, version = _HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a KGX snapshot: unexpected file signature")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(
+            f"KGX snapshot version {version} is not supported (supported up to {SNAPSHOT_VERSION})"
+        )
+    if version < MIN_SNAPSHOT_VERSION:
+        raise ValueError(
+            f"KGX snapshot version {version} is not supported anymore, as its chunks are pickled: "
+            "the snapshot should be written again"
+        )
+    return version
+
+
+# the tags of the property values which are read back as sets and tuples
+_SET = 's'
+_TUPLE = 't'
+# the tags of the nested values of tagged dicts: dicts with tagged values,
+# dicts whose keys are not all strings, and objects with a to_dict method
+_DICT = 'd'
+_PAIRS = 'p'
+_OBJECT = 'o'
+
+
+def _default(value: Any) -> Any:
+    """
+    Encode a value that JSON does not support: a nested set or a numpy scalar.
+    """
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Cannot write a value of type {type(value).__name__} to a KGX snapshot")
+
+
+def encode_chunk(records: List[Dict], compression_level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """
+    Encode a chunk of records as a compressed frame payload.
+
+    Parameters
+    ----------
+    records: List[Dict]
+        A list of node or edge records
+    compression_level: int
+        The zlib compression level
+
+    Returns
+    -------
+    bytes
+        The encoded payload
+
+    """
+    encoded: List[Any] = []
+    for record in records:
+        types = {
+            k: _TUPLE if isinstance(v, tuple) else _SET
+            for k, v in record.items()
+            if isinstance(v, (set, frozenset, tuple))
+        }
+        encoded.append([record, types] if types else record)
+    payload = json.dumps(encoded, ensure_ascii=False, separators=(',', ':'), default=_default)
+    return zlib.compress(payload.encode('utf-8'), compression_level)
+
+
+def tag_dict(d: Dict) -> Any:
+    """
+    Encode a dict as JSON compatible data, tagging its values which JSON does
+    not support, for the dict to be read back with ``untag_dict``.
+
+    A dict with tagged values is encoded as a list of the dict and of the tags of its
+    values, as the records of a snapshot. The values may be sets, tuples, dicts (whose
+    keys are not necessarily strings, and whose values are tagged in turn) and objects
+    with a ``to_dict`` method and a ``from_dict`` class method. The elements of sets and
+    the keys of dicts which are tuples, nested or not, are read back as tuples.
+
+    Parameters
+    ----------
+    d: Dict
+        The dict, whose keys are strings
+
+    Returns
+    -------
+    Any
+        The encoded dict
+
+    """
+    values: Dict[str, Any] = {}
+    types: Dict[str, str] = {}
+    for k, v in d.items():
+        values[k], tag = _tag_value(v)
+        if tag:
+            types[k] = tag
+    return [values, types] if types else values
+
+
+def untag_dict(encoded: Any, classes: Optional[Dict[str, type]] = None) -> Dict:
+    """
+    Decode a dict encoded with ``tag_dict``.
+
+    Parameters
+    ----------
+    encoded: Any
+        The encoded dict
+    classes: Optional[Dict[str, type]]
+        The classes of the objects that may be found in the dict, by name
+
+    Returns
+    -------
+    Dict
+        The dict
+
+    """
+    if not isinstance(encoded, list):
+        return encoded
+    d, types = encoded
+    for k, tag in types.items():
+        d[k] = _untag_value(d[k], tag, classes or {})
+    return d
+
+
+def _tag_value(value: Any) -> Tuple[Any, Optional[str]]:
+    if isinstance(value, (set, frozenset)):
+        return list(value), _SET
+    if isinstance(value, tuple):
+        return list(value), _TUPLE
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            encoded = tag_dict(value)
+            return encoded, _DICT if isinstance(encoded, list) else None
+        return [[k, *_tag_value(v)] for k, v in value.items()], _PAIRS
+    if hasattr(value, 'to_dict'):
+        return [type(value).__name__, value.to_dict()], _OBJECT
+    return value, None
+
+
+def _untag_value(value: Any, tag: Optional[str], classes: Dict[str, type]) -> Any:
+    if tag == _SET:
+        return {_hashable(x) for x in value}
+    if tag == _TUPLE:
+        return tuple(value)
+    if tag == _DICT:
+        return untag_dict(value, classes)
+    if tag == _PAIRS:
+        return {_hashable(k): _untag_value(v, t, classes) for k, v, t in value}
+    if tag == _OBJECT:
+        name, data = value
+        if name not in classes:
+            raise ValueError(f"Unexpected object of type {name}")
+        return classes[name].from_dict(data)
+    return value
+
+
+def _hashable(value: Any) -> Any:
+    # a set element or a dict key read back as a list was a tuple
+    return tuple(_hashable(x) for x in value) if isinstance(value, list) else value
+
+
+def decode_chunk(payload: bytes) -> List[Dict]:
+    """
+    Decode a compressed frame payload into a chunk of records.
+
+    Parameters
+    ----------
+    payload: bytes
+        The encoded payload
+
+    Returns
+    -------
+    List[Dict]
+        A list of node or edge records
+
+    """
+    records = json.loads(zlib.decompress(payload).decode('utf-8'))
+    for i, record in enumerate(records):
+        if isinstance(record, list):
+            records[i] = untag_dict(record)
+    return records
+
+
+def write_frame(
+    fh: BinaryIO,
+    frame_type: bytes,
+    records: List[Dict],
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> None:
+    """
+    Write a chunk of records as a single frame.
+
+    Parameters
+    ----------
+    fh: BinaryIO
+        A file handle opened for writing in binary mode
+    frame_type: bytes
+        The frame type (``NODE_FRAME`` or ``EDGE_FRAME``)
+    records: List[Dict]
+        A list of node or edge records
+    compression_level: int
+        The zlib compression level
+
+    """
+    payload = encode_chunk(records, compression_level)
+    fh.write(_FRAME.pack(frame_type, len(payload)))
+    fh.write(payload)
+
+
+def read_frames(
+    fh: BinaryIO, frame_types: Optional[Tuple[bytes, ...]] = None
+) -> Iterator[Tuple[bytes, List[Dict]]]:
+    """
+    Read all the frames from a snapshot, after the header.
+
+    Frames whose type is not in ``frame_types`` are skipped
+    without being decompressed.
+
+    Parameters
+    ----------
+    fh: BinaryIO
+        A file handle opened for reading in binary mode, positioned after the header
+    frame_types: Optional[Tuple[bytes, ...]]
+        The frame types to decode (all frames, by default)
+
+    Returns
+    -------
+    Iterator[Tuple[bytes, List[Dict]]]
+        An iterator over frame type and records
+
+    """
+    while True:
+        frame = fh.read(_FRAME.size)
+        if not frame:
+            break
+        if len(frame) < _FRAME.size:
+            raise ValueError("Truncated KGX snapshot: incomplete frame header")
+        frame_type, size = _FRAME.unpack(frame)
+        if frame_types and frame_type not in frame_types:
+            fh.seek(size, 1)
+            continue
+        payload = fh.read(size)
+        if len(payload) < size:
+            raise ValueError("Truncated KGX snapshot: incomplete frame payload")
+        yield frame_type, decode_chunk(payload)
+
+
+def read_records(filename: str, frame_type: bytes) -> Generator:
+    """
+    Read all the node or edge records from a snapshot, in the order they were written.
+
+    Parameters
+    ----------
+    filename: str
+        The snapshot filename
+    frame_type: bytes
+        The frame type (``NODE_FRAME`` or ``EDGE_FRAME``)
+
+    Returns
+    -------
+    Generator
+        A generator for records
+
+    """
+    with open(filename, 'rb') as FH:
+        read_header(FH)
+        for _, records in read_frames(FH, (frame_type,)):
+            yield from records
+
+
+def write_summary_state(filename: str, summary: str, state: Dict) -> None:
+    """
+    Write the state of a graph summary to a file, as tagged JSON (see ``tag_dict``).
+
+    Parameters
+    ----------
+    filename: str
+        The file to write the state to
+    summary: str
+        The name of the class of the summary
+    state: Dict
+        The state of the summary
+
+    """
+    data = {'version': SUMMARY_STATE_VERSION, 'summary': summary, 'state': tag_dict(state)}
+    with open(filename, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh, ensure_ascii=False, separators=(',', ':'), default=_default)
+
+
+def read_summary_state(filename: str, summary: str, classes: Optional[Dict[str, type]] = None) -> Dict:
+    """
+    Read the state of a graph summary from a file, as written by ``write_summary_state``.
+
+    Parameters
+    ----------
+    filename: str
+        The file to read the state from
+    summary: str
+        The name of the class of the summary
+    classes: Optional[Dict[str, type]]
+        The classes of the objects that may be found in the state, by name
+
+    Returns
+    -------
+    Dict
+        The state of the summary
+
+    Raises
+    ------
+    ValueError
+        Error if the file is not the state of a graph summary in the current format
+    TypeError
+        Error if the file is the state of another type of summary
+
+    """
+    try:
+        with open(filename, encoding='utf-8') as fh:
+            data = json.load(fh)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or 'version' not in data:
+        raise ValueError(
+            f"{filename} is not the state of a graph summary, or was written by an older version "
+            "of KGX, whose states were pickled: the summary should be computed again"
+        )
+    if data['version'] != SUMMARY_STATE_VERSION:
+        raise ValueError(
+            f"Graph summary state version {data['version']} in {filename} is not supported "
+            f"(only version {SUMMARY_STATE_VERSION}): the summary should be computed again"
+        )
+    if data['summary'] != summary:
+        raise TypeError(f"{filename} is not the state of a {summary}")
+    return untag_dict(data['state'], classes)
@@ -0,0 +1,421 @@
+"""
+An external merge sort of N-Triples, TSV/CSV and JSON lines files,
+for files that do not fit in memory, and of streams of records (see ``SortedRuns``).
+"""
+import csv
+import gzip
+import heapq
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from collections import deque
+from multiprocessing import Pool
+from operator import itemgetter
+from typing import Any, Callable, Dict, Generator, IO, Iterable, List, Optional, Tuple
+
+from kgx.config import get_logger
+from kgx.graph_operations.graph_merge import edge_sort_key
+
+log = get_logger()
+
+SORT_FORMATS = ('nt', 'tsv', 'csv', 'jsonl')
+SORT_KEYS = ('subject', 'id', 'edge')
+# the memory budget, in megabytes
+DEFAULT_MAX_MEMORY = 256
+# a rough estimate of the memory used by a record besides its text (the string, its key and the list slot)
+RECORD_OVERHEAD = 200
+# the maximum number of runs merged at once, for the number of open files to be bounded
+MAX_RUNS_PER_MERGE = 64
+# the number of records pickled at once in a run
+RUN_BATCH_SIZE = 1000
+
+
+class RecordKey(object):
+    """
+    The sort key of the records of a file.
+
+    Parameters
+    ----------
+    format: str
+        The format of the file (``nt``, ``tsv``, ``csv`` or ``jsonl``)
+    key: str
+        The key to sort by: ``subject``, ``id`` or ``edge``, the key of
+        an edge as in ``kgx.graph_operations.graph_merge.edge_sort_key``
+    header: Optional[List[str]]
+        The column names, for a TSV or CSV file
+
+    """
+
+    def __init__(self, format: str, key: str, header: Optional[List[str]] = None):
+        if format not in SORT_FORMATS:
+            raise ValueError(f"Cannot sort {format} files, only {', '.join(SORT_FORMATS)} files")
+        if key not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by {key}, only by {', '.join(SORT_KEYS)}")
+        if format == 'nt' and key != 'subject':
+            raise ValueError("N-Triples can only be sorted by subject")
+        self.format = format
+        self.key = key
+        self.columns: Dict[str, int] = {}
+        if header is not None:
+            if key == 'edge':
+                names = ['subject', 'object'] + (['key'] if 'key' in header else ['predicate'])
+            else:
+                names = [key]
+            for name in names:
+                if name not in header:
+                    raise ValueError(f"Cannot sort by {key}, as there is no '{name}' column")
+                self.columns[name] = header.index(name)
+
+    def __call__(self, record: str) -> Any:
+        if self.format == 'nt':
+            # the subject, an IRI or a blank node label, has no whitespace
+            return record.split(None, 1)[0]
+        if self.format == 'jsonl':
+            data = json.loads(record)
+        else:
+            row = next(_reader([record], self.format))
+            data = {name: row[i] if i < len(row) else '' for name, i in self.columns.items()}
+        if self.key == 'edge':
+            return edge_sort_key(data)
+        return data.get(self.key, '')
+
+
+def _reader(lines: Iterable[str], format: str) -> Iterable[List[str]]:
+    # TSV fields are not quoted, as in kgx.source.TsvSource, while CSV fields may be
+    if format == 'tsv':
+        return csv.reader(lines, delimiter='\t', quoting=csv.QUOTE_NONE)
+    return csv.reader(lines)
+
+
+def split_records(lines: Iterable[str], format: str) -> Generator[str, None, None]:
+    """
+    Split the lines of a file into records.
+
+    N-Triples, JSON lines and TSV records are single lines, empty lines and
+    N-Triples comments being skipped. TSV fields are not quoted, as
+    ``kgx.source.TsvSource`` reads them. A CSV record continues over the
+    next lines as long as it has a quoted field which is not closed.
+
+    Parameters
+    ----------
+    lines: Iterable[str]
+        The lines of the file
+    format: str
+        The format of the file (``nt``, ``tsv``, ``csv`` or ``jsonl``)
+
+    Returns
+    -------
+    Generator[str, None, None]
+        A generator for records, each ending with a newline
+
+    """
+    pending: List[str] = []
+    quotes = 0
+    for line in lines:
+        if not line.endswith('\n'):
+            line += '\n'
+        if format == 'csv':
+            # quotes within a quoted field are doubled, so that a record ends
+            # with the first line where the number of quotes is even
+            pending.append(line)
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                yield ''.join(pending)
+                pending = []
+                quotes = 0
+            continue
+        if format == 'tsv':
+            yield line
+            continue
+        stripped = line.strip()
+        if not stripped or (format == 'nt' and stripped.startswith('#')):
+            continue
+        yield line
+    if pending:
+        yield ''.join(pending)
+
+
+def sort_file(
+    filename: str,
+    output: str,
+    format: str,
+    key: str = 'subject',
+    max_memory: float = DEFAULT_MAX_MEMORY,
+    processes: int = 1,
+    compression: Optional[str] = None,
+    output_compression: Optional[str] = None,
+    compress_runs: bool = False,
+    temporary_directory: Optional[str] = None,
+) -> int:
+    """
+    Sort the records of a file by a key, with an external merge sort.
+
+    Records are read in runs of at most ``max_memory`` megabytes, each
+    run is sorted and written to a temporary file, and the runs are then
+    merged into the output. The sort is stable: records with the same key
+    keep their order from the file. The header of a TSV or CSV file is
+    kept as the first line of the output.
+
+    Parameters
+    ----------
+    filename: str
+        The file to sort
+    output: str
+        The file to write the sorted records to
+    format: str
+        The format of the file (``nt``, ``tsv``, ``csv`` or ``jsonl``)
+    key: str
+        The key to sort by (``subject``, ``id`` or ``edge``)
+    max_memory: float
+        The memory budget of each run, in megabytes
+    processes: int
+        The number of worker processes sorting runs and merging them
+    compression: Optional[str]
+        The compression type of the file (``gz``)
+    output_compression: Optional[str]
+        The compression type of the output (``gz``)
+    compress_runs: bool
+        Whether to compress the runs written to temporary files
+    temporary_directory: Optional[str]
+        The directory where the runs are written (the default temporary directory, by default)
+
+    Returns
+    -------
+    int
+        The number of records sorted
+
+    """
+    run_directory = tempfile.mkdtemp(prefix='kgx-sort-', dir=temporary_directory)
+    pool = Pool(processes=processes) if processes > 1 else None
+    try:
+        with _open(filename, 'r', compression) as fh:
+            header = None
+            if format in {'tsv', 'csv'}:
+                header = fh.readline()
+                columns = next(_reader([header], format), [])
+                record_key = RecordKey(format, key, columns)
+            else:
+                record_key = RecordKey(format, key)
+            runs = SortedRuns(record_key, max_memory, run_directory, compress_runs, pool, processes)
+            for record in split_records(fh, format):
+                runs.add(record)
+            runs.close()
+        log.info(f"Merging {len(runs.runs)} sorted run(s) of {runs.count} records from {filename}")
+        with _open(output, 'w', output_compression) as out:
+            if header:
+                out.write(header if header.endswith('\n') else header + '\n')
+            out.writelines(record for _, record in runs.merge())
+    finally:
+        if pool:
+            pool.terminate()
+        shutil.rmtree(run_directory, ignore_errors=True)
+    return runs.count
+
+
+class SortedRuns(object):
+    """
+    Records sorted by a key in runs, for an external merge sort.
+
+    Records are added one at a time and kept in memory until they reach the
+    memory budget, at which point they are sorted and written to a temporary
+    file as a run. Once all the records are added, ``merge`` reads them back
+    in key order. The sort is stable: records with the same key keep the
+    order in which they were added.
+
+    Parameters
+    ----------
+    record_key: Callable[[Any], Any]
+        The function that returns the sort key of a record, which is
+        pickled along with the runs sorted by worker processes
+    max_memory: float
+        The memory budget of each run, in megabytes
+    directory: str
+        The directory where the runs are written
+    compress: bool
+        Whether to compress the runs
+    pool: Optional[multiprocessing.Pool]
+        A pool of worker processes sorting runs and merging them
+    processes: int
+        The number of worker processes in the pool
+    record_size: Optional[Callable[[Any], int]]
+        The function that estimates the memory used by a record, in bytes
+        (by default, for a record of text, its length and ``RECORD_OVERHEAD``)
+
+    """
+
+    def __init__(
+        self,
+        record_key: Callable[[Any], Any],
+        max_memory: float,
+        directory: str,
+        compress: bool = False,
+        pool: Optional[Pool] = None,
+        processes: int = 1,
+        record_size: Optional[Callable[[Any], int]] = None,
+    ):
+        self.record_key = record_key
+        self.budget = int(max_memory * 1024 * 1024)
+        self.directory = directory
+        self.compress = compress
+        self.pool = pool
+        self.processes = processes
+        self.record_size = record_size or _text_size
+        self.runs: List[str] = []
+        self.count = 0
+        # runs being sorted by worker processes, a bounded number of which are in flight
+        self.pending: deque = deque()
+        self.chunk: List[Any] = []
+        self.size = 0
+
+    def add(self, record: Any) -> None:
+        """
+        Add a record.
+
+        Parameters
+        ----------
+        record: Any
+            The record
+
+        """
+        self.chunk.append(record)
+        self.size += self.record_size(record)
+        self.count += 1
+        if self.size >= self.budget:
+            self._submit()
+
+    def close(self) -> List[str]:
+        """
+        Write the records that are still in memory to a last run.
+
+        Returns
+        -------
+        List[str]
+            The filenames of the runs
+
+        """
+        if self.chunk or not (self.runs or self.pending):
+            self._submit()
+        self.runs.extend(x.get() for x in self.pending)
+        self.pending.clear()
+        return self.runs
+
+    def merge(self) -> Iterable[Tuple[Any, Any]]:
+        """
+        Merge the runs, at most ``MAX_RUNS_PER_MERGE`` at once for the number of open files to
+        be bounded, and read them back.
+
+        Returns
+        -------
+        Iterable[Tuple[Any, Any]]
+            The key and the record of each record, in key order
+
+        """
+        runs = self.close()
+        while len(runs) > MAX_RUNS_PER_MERGE:
+            groups = [
+                (runs[i:i + MAX_RUNS_PER_MERGE], _run_filename(self.directory, self.compress), self.compress)
+                for i in range(0, len(runs), MAX_RUNS_PER_MERGE)
+            ]
+            runs = self.pool.map(_merge_runs, groups) if self.pool else [_merge_runs(x) for x in groups]
+        self.runs = runs
+        return _merge(runs, self.compress)
+
+    def _submit(self) -> None:
+        args = (self.chunk, self.record_key, _run_filename(self.directory, self.compress), self.compress)
+        self.chunk = []
+        self.size = 0
+        if self.pool is None:
+            self.runs.append(_sort_run(args))
+            return
+        self.pending.append(self.pool.apply_async(_sort_run, (args,)))
+        if len(self.pending) > self.processes:
+            self.runs.append(self.pending.popleft().get())
+
+
+def record_size(record: Any) -> int:
+    """
+    Estimate the memory used by a node or edge record,
+    including the values of its properties.
+
+    Parameters
+    ----------
+    record: Any
+        The record
+
+    Returns
+    -------
+    int
+        The estimated size, in bytes
+
+    """
+    size = sys.getsizeof(record)
+    if isinstance(record, dict):
+        size += sum(record_size(k) + record_size(v) for k, v in record.items())
+    elif isinstance(record, (list, tuple, set)):
+        size += sum(record_size(x) for x in record)
+    return size
+
+
+def _text_size(record: str) -> int:
+    return len(record) + RECORD_OVERHEAD
+
+
+def _run_filename(directory: str, compress: bool) -> str:
+    fd, filename = tempfile.mkstemp(suffix='.gz' if compress else '.run', dir=directory)
+    os.close(fd)
+    return filename
+
+
+def _sort_run(args: Tuple[List[Any], Callable[[Any], Any], str, bool]) -> str:
+    # sort a run of records by their key and write it to a temporary file
+    records, record_key, filename, compress = args
+    run = sorted(((record_key(x), x) for x in records), key=itemgetter(0))
+    _write_run(run, filename, compress)
+    return filename
+
+
+def _merge_runs(args: Tuple[List[str], str, bool]) -> str:
+    # merge sorted runs into a single run, removing them
+    runs, filename, compress = args
+    _write_run(_merge(runs, compress), filename, compress)
+    for run in runs:
+        os.remove(run)
+    return filename
+
+
+def _write_run(run: Iterable[Tuple[Any, Any]], filename: str, compress: bool) -> None:
+    with (gzip.open(filename, 'wb', compresslevel=1) if compress else open(filename, 'wb')) as fh:
+        batch = []
+        for item in run:
+            batch.append(item)
+            if len(batch) == RUN_BATCH_SIZE:
+                pickle.dump(batch, fh, pickle.HIGHEST_PROTOCOL)
+                batch = []
+        if batch:
+            pickle.dump(batch, fh, pickle.HIGHEST_PROTOCOL)
+
+
+def _read_run(filename: str, compress: bool) -> Generator[Tuple[Any, Any], None, None]:
+    with (gzip.open(filename, 'rb') if compress else open(filename, 'rb')) as fh:
+        while True:
+            try:
+                batch = pickle.load(fh)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _merge(runs: List[str], compress: bool) -> Iterable[Tuple[Any, Any]]:
+    # merging is stable, records with the same key coming from the runs in their order
+    return heapq.merge(*[_read_run(x, compress) for x in runs], key=itemgetter(0))
+
+
+def _open(filename: str, mode: str, compression: Optional[str] = None) -> IO:
+    # text files are read and written as they are, without translating their newlines
+    if compression == 'gz':
+        return io.TextIOWrapper(gzip.open(filename, f"{mode}b"), encoding='utf-8', newline='')
+    return open(filename, mode, encoding='utf-8', newline='')
@@ -0,0 +1,254 @@
+"""
+Mappings and sets that keep their most recently used items in memory
+and spill the others to an SQLite database, for caches to be bounded in memory.
+"""
+import os
+import pickle
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from typing import Any, Generator, Hashable, Iterator, MutableMapping, Optional, Tuple
+
+from kgx.config import get_logger
+
+log = get_logger()
+
+DEFAULT_MAX_IN_MEMORY = 1000000
+
+
+class SpillingDict(MutableMapping):
+    """
+    A mapping which keeps at most ``max_in_memory`` items in memory.
+
+    When there are more, the least recently used half of them is spilled to
+    an SQLite database in ``directory``. A spilled item is loaded back into
+    memory when its key is looked up, so that the value returned for a key
+    may be updated in place, as long as no more than ``max_in_memory / 2``
+    other items are added or looked up in between.
+
+    The mapping must not be updated while iterating over it.
+
+    Parameters
+    ----------
+    max_in_memory: int
+        The maximum number of items to keep in memory
+    directory: Optional[str]
+        The directory where the database is created (the default temporary directory, by default)
+
+    """
+
+    def __init__(self, max_in_memory: int = DEFAULT_MAX_IN_MEMORY, directory: Optional[str] = None):
+        self.max_in_memory = max(max_in_memory, 2)
+        self.directory = directory
+        self.items_in_memory: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.filename: Optional[str] = None
+        self.db: Optional[sqlite3.Connection] = None
+        self.spilled: int = 0
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        # the representation of a key tells apart keys of different types, like str and rdflib terms
+        return repr(key)
+
+    def _load(self, key: Hashable) -> bool:
+        # move a spilled item back into memory
+        if not self.spilled:
+            return False
+        k = self._key(key)
+        row = self.db.execute("SELECT item FROM items WHERE key = ?", (k,)).fetchone()
+        if row is None:
+            return False
+        self.db.execute("DELETE FROM items WHERE key = ?", (k,))
+        self.spilled -= 1
+        self._set(*pickle.loads(row[0]))
+        return True
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        self.items_in_memory[key] = value
+        self.items_in_memory.move_to_end(key)
+        if len(self.items_in_memory) > self.max_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self.db is None:
+            fd, self.filename = tempfile.mkstemp(suffix='.db', dir=self.directory)
+            os.close(fd)
+            log.info(f"Spilling cache to {self.filename}")
+            self.db = sqlite3.connect(self.filename)
+            self.db.executescript(
+                """
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE items (key TEXT PRIMARY KEY, item BLOB) WITHOUT ROWID;
+                """
+            )
+        items = []
+        for _ in range(len(self.items_in_memory) - self.max_in_memory // 2):
+            key, value = self.items_in_memory.popitem(last=False)
+            items.append((self._key(key), pickle.dumps((key, value), pickle.HIGHEST_PROTOCOL)))
+        self.db.executemany("INSERT INTO items VALUES (?, ?)", items)
+        self.spilled += len(items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.items_in_memory or self._load(key)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if key in self.items_in_memory or self._load(key):
+            self.items_in_memory.move_to_end(key)
+            return self.items_in_memory[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if key not in self.items_in_memory and self.spilled:
+            self.spilled -= self.db.execute("DELETE FROM items WHERE key = ?", (self._key(key),)).rowcount
+        self._set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key in self.items_in_memory:
+            del self.items_in_memory[key]
+        elif self.spilled and self.db.execute(
+            "DELETE FROM items WHERE key = ?", (self._key(key),)
+        ).rowcount:
+            self.spilled -= 1
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self) -> int:
+        return len(self.items_in_memory) + self.spilled
+
+    def items(self) -> Generator[Tuple[Hashable, Any], None, None]:  # type: ignore
+        """
+        Get all the items, the spilled ones first, without loading them back into memory.
+
+        Returns
+        -------
+        Generator[Tuple[Hashable, Any], None, None]
+            The keys and their values
+
+        """
+        if self.spilled:
+            for row in self.db.execute("SELECT item FROM items"):
+                yield pickle.loads(row[0])
+        yield from self.items_in_memory.items()
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        """
+        Remove an item, the most recently used in memory or else a spilled one.
+
+        Returns
+        -------
+        Tuple[Hashable, Any]
+            The key and its value
+
+        """
+        if self.items_in_memory:
+            return self.items_in_memory.popitem()
+        if self.spilled:
+            k, item = self.db.execute("SELECT key, item FROM items LIMIT 1").fetchone()
+            self.db.execute("DELETE FROM items WHERE key = ?", (k,))
+            self.spilled -= 1
+            return pickle.loads(item)
+        raise KeyError('popitem(): dictionary is empty')
+
+    def clear(self) -> None:
+        """
+        Remove all the items.
+        """
+        self.items_in_memory.clear()
+        if self.spilled:
+            self.db.execute("DELETE FROM items")
+            self.spilled = 0
+
+    def close(self) -> None:
+        """
+        Remove all the items and delete the database, if any.
+        """
+        self.items_in_memory.clear()
+        if self.db is not None:
+            self.db.close()
+            os.remove(self.filename)
+            self.db = None
+            self.filename = None
+            self.spilled = 0
+
+
+class SpillingSet(object):
+    """
+    A set which keeps at most ``max_in_memory`` elements in
+    memory, and spills the others to an SQLite database.
+
+    Parameters
+    ----------
+    max_in_memory: int
+        The maximum number of elements to keep in memory
+    directory: Optional[str]
+        The directory where the database is created (the default temporary directory, by default)
+
+    """
+
+    def __init__(self, max_in_memory: int = DEFAULT_MAX_IN_MEMORY, directory: Optional[str] = None):
+        self.elements = SpillingDict(max_in_memory, directory)
+
+    def add(self, element: Hashable) -> None:
+        """
+        Add an element.
+
+        Parameters
+        ----------
+        element: Hashable
+            The element
+
+        """
+        self.elements[element] = None
+
+    def discard(self, element: Hashable) -> None:
+        """
+        Remove an element, if it is in the set.
+
+        Parameters
+        ----------
+        element: Hashable
+            The element
+
+        """
+        self.elements.pop(element, None)
+
+    def pop(self) -> Hashable:
+        """
+        Remove an element.
+
+        Returns
+        -------
+        Hashable
+            The element
+
+        """
+        return self.elements.popitem()[0]
+
+    def clear(self) -> None:
+        """
+        Remove all the elements.
+        """
+        self.elements.clear()
+
+    def close(self) -> None:
+        """
+        Remove all the elements and delete the database, if any.
+        """
+        self.elements.close()
+
+    def __contains__(self, element: Hashable) -> bool:
+        return element in self.elements
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.elements)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __bool__(self) -> bool:
+        return len(self.elements) > 0
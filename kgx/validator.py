@@ -1,8 +1,11 @@
+import json
 import re
 from enum import Enum
-from typing import List, TextIO, Optional, Dict, Set, Callable
+from typing import List, TextIO, Optional, Dict, Set, Callable, FrozenSet, AbstractSet, Tuple
 
 import click
+import numpy as np
+import pandas as pd
 import validators
 from bmt import Toolkit
 
@@ -10,14 +13,21 @@ from kgx.config import get_jsonld_context, get_logger
 from kgx.graph.base_graph import BaseGraph
 from kgx.utils.kgx_utils import (
     get_toolkit,
+    get_biolink_index,
+    BiolinkIndex,
     snakecase_to_sentencecase,
     sentencecase_to_snakecase,
     camelcase_to_sentencecase, GraphEntityType,
+    sanitize_import,
+    validate_node,
 )
 from kgx.prefix_manager import PrefixManager
 
 logger = get_logger()
 
+CURIE_PATTERN = re.compile(r"^[^ <()>:]*:[^/ :]+$")
+VALUE_PATTERN = re.compile(r"value '.*?'(?= with | which )")
+
 
 class ErrorType(Enum):
     """
@@ -86,6 +96,154 @@ class ValidationError(object):
         }
 
 
+class ErrorCollector(object):
+    """
+    ErrorCollector class that aggregates errors in bounded memory.
+
+    Errors are counted by error type, message template and message level,
+    where the message template is the message with the record-specific values
+    (like identifiers) masked. Only the first ``max_examples`` entities of
+    each bucket are kept. Full errors can also be streamed as JSON lines to
+    ``error_stream`` as they are added.
+
+    Parameters
+    ----------
+    max_examples: int
+        The maximum number of example entities to keep per bucket
+    error_stream: Optional[TextIO]
+        A stream to write each error to, as a JSON line
+
+    """
+
+    def __init__(self, max_examples: int = 10, error_stream: Optional[TextIO] = None):
+        self.max_examples = max_examples
+        self.error_stream = error_stream
+        self.counts: Dict[Tuple[ErrorType, str, MessageLevel], int] = {}
+        self.examples: Dict[Tuple[ErrorType, str, MessageLevel], List[str]] = {}
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['error_stream'] = None
+        return state
+
+    @staticmethod
+    def get_message_template(message: str) -> str:
+        """
+        Get the template of a message, with its record-specific values masked.
+
+        Parameters
+        ----------
+        message: str
+            The error message
+
+        Returns
+        -------
+        str
+            The message template
+
+        """
+        return VALUE_PATTERN.sub("value '{}'", message)
+
+    def add(self, error: ValidationError) -> None:
+        """
+        Add an error.
+
+        Parameters
+        ----------
+        error: kgx.validator.ValidationError
+            The error
+
+        """
+        key = (error.error_type, self.get_message_template(error.message), error.message_level)
+        if key in self.counts:
+            self.counts[key] += 1
+            examples = self.examples[key]
+            if len(examples) < self.max_examples:
+                examples.append(error.entity)
+        else:
+            self.counts[key] = 1
+            self.examples[key] = [error.entity][:self.max_examples]
+        if self.error_stream:
+            self.error_stream.write(f"{json.dumps(error.as_dict())}\n")
+
+    def add_all(self, errors: List[ValidationError]) -> None:
+        """
+        Add a list of errors.
+
+        Parameters
+        ----------
+        errors: List[kgx.validator.ValidationError]
+            The errors
+
+        """
+        for e in errors:
+            self.add(e)
+
+    def merge(self, other: 'ErrorCollector') -> None:
+        """
+        Merge the counts and examples of another collector into this one.
+
+        Examples of this collector come first, so that merging collectors in
+        the order of the records gives the same examples as one collector.
+        Errors of the other collector are not written to ``error_stream``.
+
+        Parameters
+        ----------
+        other: kgx.validator.ErrorCollector
+            The collector to merge
+
+        """
+        for key, count in other.counts.items():
+            examples = self.examples.setdefault(key, [])
+            examples.extend(other.examples[key][:self.max_examples - len(examples)])
+            self.counts[key] = self.counts.get(key, 0) + count
+
+    def get_summary(self) -> List[Dict]:
+        """
+        Get the aggregated errors, in decreasing order of count.
+
+        Returns
+        -------
+        List[Dict]
+            A list of error buckets with their count and example entities
+
+        """
+        summary = []
+        for key, count in sorted(
+            self.counts.items(), key=lambda x: (-x[1], x[0][0].value, x[0][1], x[0][2].value)
+        ):
+            error_type, template, message_level = key
+            summary.append(
+                {
+                    'error_type': error_type.name,
+                    'message': template,
+                    'message_level': message_level.name,
+                    'count': count,
+                    'examples': list(self.examples[key]),
+                }
+            )
+        return summary
+
+    def write_report(self, outstream: TextIO) -> None:
+        """
+        Write the aggregated error report to a file.
+
+        Parameters
+        ----------
+        outstream: TextIO
+            The stream to write to
+
+        """
+        for x in self.get_summary():
+            outstream.write(
+                f"[{x['message_level']}][{x['error_type']}] {x['message']} ({x['count']} times)"
+                f" - e.g. {', '.join(x['examples'])}\n"
+            )
+
+
 class Validator(object):
     """
     Class for validating a property graph.
@@ -111,24 +269,28 @@ class Validator(object):
         Function given a peek at the current record being processed by the class wrapped Callable.
     schema: Optional[str]
         URL to (Biolink) Model Schema to be used for validated (default: None, use default Biolink Model Toolkit schema)
+    error_collector: Optional[kgx.validator.ErrorCollector]
+        Collector to aggregate errors into, instead of keeping every error in ``errors`` (default: None)
     """
     
     def __init__(
             self,
             verbose: bool = False,
             progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = None,
-            schema: Optional[str] = None
+            schema: Optional[str] = None,
+            error_collector: Optional[ErrorCollector] = None,
     ):
         # formal arguments
         self.verbose: bool = verbose
         self.progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = progress_monitor
+        self.error_collector: Optional[ErrorCollector] = error_collector
 
         # internal attributes
         # associated currently active _currently_active_toolkit with this Validator instance
         self.validating_toolkit = self.get_toolkit()
         self.prefix_manager = PrefixManager()
         self.jsonld = get_jsonld_context()
-        self.prefixes = Validator.get_all_prefixes(self.jsonld)
+        self.prefixes = Validator.get_all_prefixes()
         self.required_node_properties = Validator.get_required_node_properties()
         self.required_edge_properties = Validator.get_required_edge_properties()
         self.errors: List[ValidationError] = list()
@@ -140,12 +302,27 @@ class Validator(object):
         if self.progress_monitor:
             self.progress_monitor(entity_type, rec)
         if entity_type == GraphEntityType.EDGE:
-            self.errors += self.analyse_edge(*rec)
+            self.add_errors(self.analyse_edge(*rec))
         elif entity_type == GraphEntityType.NODE:
-            self.errors += self.analyse_node(*rec)
+            self.add_errors(self.analyse_node(*rec))
         else:
             raise RuntimeError("Unexpected GraphEntityType: " + str(entity_type))
 
+    def add_errors(self, errors: List[ValidationError]) -> None:
+        """
+        Add errors to the error collector, if any, or to ``errors``.
+
+        Parameters
+        ----------
+        errors: List[kgx.validator.ValidationError]
+            The errors
+
+        """
+        if self.error_collector is not None:
+            self.error_collector.add_all(errors)
+        else:
+            self.errors += errors
+
     def get_validating_toolkit(self):
         return self.validating_toolkit
 
@@ -157,9 +334,16 @@ class Validator(object):
 
     _currently_active_toolkit: Optional[Toolkit] = None
 
+    # Memoized per model version: the prefixes of the JSON-LD context, and the
+    # error messages for each distinct category and predicate value
+    _all_prefixes: Optional[FrozenSet[str]] = None
+    _category_messages: Dict[Tuple[BiolinkIndex, str], List[str]] = {}
+    _predicate_messages: Dict[Tuple[BiolinkIndex, str], List[str]] = {}
+
     @classmethod
     def set_biolink_model(cls, version: Optional[str]):
         cls._currently_active_toolkit = get_toolkit(biolink_release=version)
+        cls._all_prefixes = None
 
     @classmethod
     def get_toolkit(cls) -> Toolkit:
@@ -179,37 +363,155 @@ class Validator(object):
     def analyse_node(self, n, data):
         e1 = Validator.validate_node_properties(n, data, self.required_node_properties)
         e2 = Validator.validate_node_property_types(n, data, toolkit=self.validating_toolkit)
-        e3 = Validator.validate_node_property_values(n, data)
+        e3 = Validator.validate_node_property_values(n, data, self.prefixes)
         e4 = Validator.validate_categories(n, data, toolkit=self.validating_toolkit)
         return e1 + e2 + e3 + e4
 
     def analyse_edge(self, u, v, k, data):
         e1 = Validator.validate_edge_properties(u, v, data, self.required_edge_properties)
         e2 = Validator.validate_edge_property_types(u, v, data, toolkit=self.validating_toolkit)
-        e3 = Validator.validate_edge_property_values(u, v, data)
+        e3 = Validator.validate_edge_property_values(u, v, data, self.prefixes)
         e4 = Validator.validate_edge_predicate(u, v, data, toolkit=self.validating_toolkit)
         return e1 + e2 + e3 + e4
 
+    def analyse_node_frame(self, df: pd.DataFrame, records: List[Optional[Tuple]]) -> list:
+        """
+        Validate the nodes read from the rows of a tabular KGX file.
+
+        Node property values and categories only depend on their own column.
+        They are checked over whole columns, and categories once per distinct
+        value, to find the rows that may fail them; only those rows are then
+        validated like in ``analyse_node``. Other checks need the node records
+        and are done one record at a time. Errors are in the same order as with
+        ``analyse_node`` on each record.
+
+        Parameters
+        ----------
+        df: pandas.DataFrame
+            The rows of a KGX nodes file
+        records: List[Optional[Tuple]]
+            The node record read from each row, or None if the row was skipped
+
+        Returns
+        -------
+        list
+            A list of errors for the nodes
+
+        """
+        value_mask = Validator._get_curie_mask(df['id'], self.prefixes)
+        category_mask = Validator._get_value_mask(
+            df,
+            'category',
+            lambda data: Validator.validate_categories(
+                '', sanitize_import(validate_node({'id': '', **data})), toolkit=self.validating_toolkit
+            ),
+        )
+        errors = []
+        for i, rec in enumerate(records):
+            if rec is None:
+                continue
+            n, data = rec
+            errors += Validator.validate_node_properties(n, data, self.required_node_properties)
+            errors += Validator.validate_node_property_types(n, data, toolkit=self.validating_toolkit)
+            if value_mask[i]:
+                errors += Validator.validate_node_property_values(n, data, self.prefixes)
+            if category_mask[i]:
+                errors += Validator.validate_categories(n, data, toolkit=self.validating_toolkit)
+        return errors
+
+    def analyse_edge_frame(self, df: pd.DataFrame, records: List[Optional[Tuple]]) -> list:
+        """
+        Validate the edges read from the rows of a tabular KGX file.
+
+        Like ``analyse_node_frame``, the 'subject', 'object' and 'relation'
+        values and the predicates are checked over whole columns, while other
+        checks are done one record at a time. Errors are in the same order as
+        with ``analyse_edge`` on each record.
+
+        Parameters
+        ----------
+        df: pandas.DataFrame
+            The rows of a KGX edges file
+        records: List[Optional[Tuple]]
+            The edge record read from each row, or None if the row was skipped
+
+        Returns
+        -------
+        list
+            A list of errors for the edges
+
+        """
+        value_mask = Validator._get_curie_mask(df['subject'], self.prefixes)
+        value_mask |= Validator._get_curie_mask(df['object'], self.prefixes)
+        if 'relation' in df:
+            value_mask |= Validator._get_curie_mask(df['relation'], self.prefixes)
+        predicate_mask = Validator._get_value_mask(
+            df,
+            'predicate',
+            lambda data: Validator.validate_edge_predicate(
+                '', '', sanitize_import(data), toolkit=self.validating_toolkit
+            ),
+        )
+        errors = []
+        for i, rec in enumerate(records):
+            if rec is None:
+                continue
+            u, v, k, data = rec
+            errors += Validator.validate_edge_properties(u, v, data, self.required_edge_properties)
+            errors += Validator.validate_edge_property_types(u, v, data, toolkit=self.validating_toolkit)
+            if value_mask[i]:
+                errors += Validator.validate_edge_property_values(u, v, data, self.prefixes)
+            if predicate_mask[i]:
+                errors += Validator.validate_edge_predicate(u, v, data, toolkit=self.validating_toolkit)
+        return errors
+
     @staticmethod
-    def get_all_prefixes(jsonld: Optional[Dict] = None) -> set:
+    def _get_curie_mask(column: pd.Series, prefixes: AbstractSet[str]) -> np.ndarray:
+        """
+        Get the rows of a column whose value is not a CURIE with a known prefix.
+        """
+        is_curie = column.str.match(CURIE_PATTERN.pattern).astype(bool)
+        is_known = column.str.split(':', n=1).str[0].isin(prefixes)
+        return (~(is_curie & is_known)).to_numpy()
+
+    @staticmethod
+    def _get_value_mask(
+        df: pd.DataFrame, column: str, check: Callable[[Dict], list]
+    ) -> np.ndarray:
+        """
+        Get the rows whose value in a column fails a check, checking each distinct value once.
+        """
+        if column not in df:
+            return np.full(len(df), bool(check({})))
+        values = df[column]
+        invalid = [x for x in values.unique() if check({column: x})]
+        return values.isin(invalid).to_numpy()
+
+    @staticmethod
+    def get_all_prefixes(jsonld: Optional[Dict] = None) -> AbstractSet[str]:
         """
         Get all prefixes from Biolink Model JSON-LD context.
 
-        It also sets ``self.prefixes`` for subsequent access.
+        The prefixes of the default JSON-LD context are computed once
+        and shared as a frozen set, until the Biolink Model is changed.
 
         Parameters
         ---------
         jsonld: Optional[Dict]
-            The JSON-LD context
+            The JSON-LD context (default: the Biolink Model JSON-LD context)
 
         Returns
         -------
-        Optional[Dict]
+        AbstractSet[str]
             A set of prefixes
 
         """
         if not jsonld:
-            jsonld = get_jsonld_context()
+            if Validator._all_prefixes is None:
+                Validator._all_prefixes = frozenset(
+                    Validator.get_all_prefixes(get_jsonld_context())
+                )
+            return Validator._all_prefixes
         prefixes: Set = set(
                 k for k, v in jsonld.items()
                 if isinstance(v, str) or
@@ -237,11 +539,12 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         node_properties = toolkit.get_all_node_properties()
         required_properties = []
         for p in node_properties:
-            element = toolkit.get_element(p)
-            if element and element.deprecated is None:
+            element = index.get_element(p)
+            if element and not index.is_deprecated(p):
                 if hasattr(element, 'required') and element.required:
                     formatted_name = sentencecase_to_snakecase(element.name)
                     required_properties.append(formatted_name)
@@ -268,11 +571,12 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         edge_properties = toolkit.get_all_edge_properties()
         required_properties = []
         for p in edge_properties:
-            element = toolkit.get_element(p)
-            if element and element.deprecated is None:
+            element = index.get_element(p)
+            if element and not index.is_deprecated(p):
                 if hasattr(element, 'required') and element.required:
                     formatted_name = sentencecase_to_snakecase(element.name)
                     required_properties.append(formatted_name)
@@ -291,13 +595,16 @@ class Validator(object):
         Returns
         -------
         list
-            A list of errors for a given graph
+            A list of errors for a given graph, empty when
+            the errors are added to the error collector
 
         """
         node_errors = self.validate_nodes(graph)
         edge_errors = self.validate_edges(graph)
-        self.errors = node_errors + edge_errors
-        return self.errors
+        errors = node_errors + edge_errors
+        if self.error_collector is None:
+            self.errors = errors
+        return errors
 
     def validate_nodes(self, graph: BaseGraph) -> list:
         """
@@ -317,13 +624,14 @@ class Validator(object):
         Returns
         -------
         list
-            A list of errors for a given graph
+            A list of errors for a given graph, empty when
+            the errors are added to the error collector
 
         """
         errors = []
         with click.progressbar(graph.nodes(data=True), label='Validating nodes in graph') as bar:
             for n, data in bar:
-                errors += self.analyse_node(n, data)
+                self._collect(errors, self.analyse_node(n, data))
         return errors
     
     def validate_edges(self, graph: BaseGraph) -> list:
@@ -344,14 +652,23 @@ class Validator(object):
         Returns
         -------
         list
-            A list of errors for a given graph
+            A list of errors for a given graph, empty when
+            the errors are added to the error collector
 
         """
         errors = []
         with click.progressbar(graph.edges(data=True), label='Validate edges in graph') as bar:
             for u, v, data in bar:
-                errors += self.analyse_edge(u, v, None, data)
+                self._collect(errors, self.analyse_edge(u, v, None, data))
         return errors
+
+    def _collect(self, errors: list, record_errors: List[ValidationError]) -> None:
+        # the errors of each record go straight to the error collector, when
+        # there is one, so that the errors of a large graph are not all kept
+        if self.error_collector is not None:
+            self.error_collector.add_all(record_errors)
+        else:
+            errors += record_errors
     
     @staticmethod
     def validate_node_properties(node: str, data: dict, required_properties: list) -> list:
@@ -450,6 +767,7 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         errors = []
         error_type = ErrorType.INVALID_NODE_PROPERTY_VALUE_TYPE
         if not isinstance(node, str):
@@ -457,7 +775,7 @@ class Validator(object):
             errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
         
         for key, value in data.items():
-            element = toolkit.get_element(key)
+            element = index.get_element(key)
             if element:
                 if hasattr(element, 'typeof'):
                     if element.typeof == 'string' and not isinstance(value, str):
@@ -524,6 +842,7 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         errors = []
         error_type = ErrorType.INVALID_EDGE_PROPERTY_VALUE_TYPE
         if not isinstance(subject, str):
@@ -538,7 +857,7 @@ class Validator(object):
             )
         
         for key, value in data.items():
-            element = toolkit.get_element(key)
+            element = index.get_element(key)
             if element:
                 if hasattr(element, 'typeof'):
                     if element.typeof == 'string' and not isinstance(value, str):
@@ -596,7 +915,9 @@ class Validator(object):
         return errors
     
     @staticmethod
-    def validate_node_property_values(node: str, data: dict) -> list:
+    def validate_node_property_values(
+        node: str, data: dict, prefixes: Optional[AbstractSet[str]] = None
+    ) -> list:
         """
         Validate a node property's value.
 
@@ -606,6 +927,8 @@ class Validator(object):
             Node identifier
         data: dict
             Node properties
+        prefixes: Optional[AbstractSet[str]]
+            The prefixes of the JSON-LD context (default: ``Validator.get_all_prefixes()``)
 
         Returns
         -------
@@ -615,18 +938,22 @@ class Validator(object):
         """
         errors = []
         error_type = ErrorType.INVALID_NODE_PROPERTY_VALUE
-        if not PrefixManager.is_curie(node):
+        if prefixes is None:
+            prefixes = Validator.get_all_prefixes()
+        prefix = Validator._get_curie_prefix(node)
+        if prefix is None:
             message = f"Node property 'id' expected to be of type 'CURIE'"
             errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
         else:
-            prefix = PrefixManager.get_prefix(node)
-            if prefix and prefix not in Validator.get_all_prefixes():
+            if prefix and prefix not in prefixes:
                 message = f"Node property 'id' has a value '{node}' with a CURIE prefix '{prefix}' is not represented in Biolink Model JSON-LD context"
                 errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
         return errors
     
     @staticmethod
-    def validate_edge_property_values(subject: str, object: str, data: dict) -> list:
+    def validate_edge_property_values(
+        subject: str, object: str, data: dict, prefixes: Optional[AbstractSet[str]] = None
+    ) -> list:
         """
         Validate an edge property's value.
 
@@ -638,6 +965,8 @@ class Validator(object):
             Object identifier
         data: dict
             Edge properties
+        prefixes: Optional[AbstractSet[str]]
+            The prefixes of the JSON-LD context (default: ``Validator.get_all_prefixes()``)
 
         Returns
         -------
@@ -647,10 +976,11 @@ class Validator(object):
         """
         errors = []
         error_type = ErrorType.INVALID_EDGE_PROPERTY_VALUE
-        prefixes = Validator.get_all_prefixes()
-        
-        if PrefixManager.is_curie(subject):
-            prefix = PrefixManager.get_prefix(subject)
+        if prefixes is None:
+            prefixes = Validator.get_all_prefixes()
+
+        prefix = Validator._get_curie_prefix(subject)
+        if prefix is not None:
             if prefix and prefix not in prefixes:
                 message = f"Edge property 'subject' has a value '{subject}' with a CURIE prefix '{prefix}' that is not represented in Biolink Model JSON-LD context"
                 errors.append(
@@ -662,8 +992,8 @@ class Validator(object):
                 ValidationError(f"{subject}-{object}", error_type, message, MessageLevel.ERROR)
             )
         
-        if PrefixManager.is_curie(object):
-            prefix = PrefixManager.get_prefix(object)
+        prefix = Validator._get_curie_prefix(object)
+        if prefix is not None:
             if prefix not in prefixes:
                 message = f"Edge property 'object' has a value '{object}' with a CURIE prefix '{prefix}' that is not represented in Biolink Model JSON-LD context"
                 errors.append(
@@ -675,8 +1005,8 @@ class Validator(object):
                 ValidationError(f"{subject}-{object}", error_type, message, MessageLevel.ERROR)
             )
         if 'relation' in data:
-            if PrefixManager.is_curie(data['relation']):
-                prefix = PrefixManager.get_prefix(data['relation'])
+            prefix = Validator._get_curie_prefix(data['relation'])
+            if prefix is not None:
                 if prefix not in prefixes:
                     message = f"Edge property 'relation' has a value '{data['relation']}' with a CURIE prefix '{prefix}' that is not represented in Biolink Model JSON-LD context"
                     errors.append(
@@ -713,6 +1043,7 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         error_type = ErrorType.INVALID_CATEGORY
         errors = []
         categories = data.get('category')
@@ -724,29 +1055,11 @@ class Validator(object):
             errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
         else:
             for category in categories:
-                if PrefixManager.is_curie(category):
-                    category = PrefixManager.get_reference(category)
-                m = re.match(r"^([A-Z][a-z\d]+)+$", category)
-                if not m:
-                    # category is not CamelCase
-                    error_type = ErrorType.INVALID_CATEGORY
-                    message = f"Category '{category}' is not in CamelCase form"
-                    errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
-                formatted_category = camelcase_to_sentencecase(category)
-                if toolkit.is_mixin(formatted_category):
-                    message = f"Category '{category}' is a mixin in the Biolink Model"
+                key = (index, category)
+                if key not in Validator._category_messages:
+                    Validator._category_messages[key] = Validator._get_category_messages(category, index)
+                for message in Validator._category_messages[key]:
                     errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
-                elif not toolkit.is_category(formatted_category):
-                    message = f"Category '{category}' unknown in the current Biolink Model"
-                    errors.append(ValidationError(node, error_type, message, MessageLevel.ERROR))
-                else:
-                    c = toolkit.get_element(formatted_category.lower())
-                    if c:
-                        if category != c.name and category in c.aliases:
-                            message = f"Category {category} is actually an alias for {c.name}; Should replace '{category}' with '{c.name}'"
-                            errors.append(
-                                ValidationError(node, error_type, message, MessageLevel.ERROR)
-                            )
         return errors
     
     @staticmethod
@@ -773,6 +1086,7 @@ class Validator(object):
         """
         if not toolkit:
             toolkit = Validator.get_toolkit()
+        index = get_biolink_index(toolkit)
         error_type = ErrorType.INVALID_EDGE_PREDICATE
         errors = []
         edge_predicate = data.get('predicate')
@@ -787,32 +1101,73 @@ class Validator(object):
                 ValidationError(f"{subject}-{object}", error_type, message, MessageLevel.ERROR)
             )
         else:
-            if PrefixManager.is_curie(edge_predicate):
-                edge_predicate = PrefixManager.get_reference(edge_predicate)
-            m = re.match(r"^([a-z_][^A-Z\s]+_?[a-z_][^A-Z\s]+)+$", edge_predicate)
-            if m:
-                p = toolkit.get_element(snakecase_to_sentencecase(edge_predicate))
-                if p is None:
-                    message = f"Edge predicate '{edge_predicate}' not in Biolink Model"
-                    errors.append(
-                        ValidationError(
-                            f"{subject}-{object}", error_type, message, MessageLevel.ERROR
-                        )
-                    )
-                elif edge_predicate != p.name and edge_predicate in p.aliases:
-                    message = f"Edge predicate '{edge_predicate}' is actually an alias for {p.name}; Should replace {edge_predicate} with {p.name}"
-                    errors.append(
-                        ValidationError(
-                            f"{subject}-{object}", error_type, message, MessageLevel.ERROR
-                        )
-                    )
-            else:
-                message = f"Edge predicate '{edge_predicate}' is not in snake_case form"
+            key = (index, edge_predicate)
+            if key not in Validator._predicate_messages:
+                Validator._predicate_messages[key] = Validator._get_predicate_messages(edge_predicate, index)
+            for message in Validator._predicate_messages[key]:
                 errors.append(
                     ValidationError(f"{subject}-{object}", error_type, message, MessageLevel.ERROR)
                 )
         return errors
     
+    @staticmethod
+    def _get_curie_prefix(value: str) -> Optional[str]:
+        """
+        Get the prefix of a value if it is a CURIE, like ``PrefixManager.get_prefix``
+        but without the overhead of its cache for values that are seen only once.
+        """
+        if isinstance(value, str) and CURIE_PATTERN.match(value):
+            return value.split(':', 1)[0]
+        return None
+
+    @staticmethod
+    def _get_category_messages(category: str, index: BiolinkIndex) -> List[str]:
+        """
+        Get the error messages for a category value, which only depend on the value itself.
+        """
+        messages = []
+        if PrefixManager.is_curie(category):
+            category = PrefixManager.get_reference(category)
+        m = re.match(r"^([A-Z][a-z\d]+)+$", category)
+        if not m:
+            # category is not CamelCase
+            messages.append(f"Category '{category}' is not in CamelCase form")
+        formatted_category = camelcase_to_sentencecase(category)
+        if index.is_mixin(formatted_category):
+            messages.append(f"Category '{category}' is a mixin in the Biolink Model")
+        elif not index.is_category(formatted_category):
+            messages.append(f"Category '{category}' unknown in the current Biolink Model")
+        else:
+            c = index.get_element(formatted_category.lower())
+            if c:
+                if category != c.name and category in index.get_aliases(formatted_category.lower()):
+                    messages.append(
+                        f"Category {category} is actually an alias for {c.name}; Should replace '{category}' with '{c.name}'"
+                    )
+        return messages
+
+    @staticmethod
+    def _get_predicate_messages(edge_predicate: str, index: BiolinkIndex) -> List[str]:
+        """
+        Get the error messages for a predicate value, which only depend on the value itself.
+        """
+        messages = []
+        if PrefixManager.is_curie(edge_predicate):
+            edge_predicate = PrefixManager.get_reference(edge_predicate)
+        m = re.match(r"^([a-z_][^A-Z\s]+_?[a-z_][^A-Z\s]+)+$", edge_predicate)
+        if m:
+            predicate_name = snakecase_to_sentencecase(edge_predicate)
+            p = index.get_element(predicate_name)
+            if p is None:
+                messages.append(f"Edge predicate '{edge_predicate}' not in Biolink Model")
+            elif edge_predicate != p.name and edge_predicate in index.get_aliases(predicate_name):
+                messages.append(
+                    f"Edge predicate '{edge_predicate}' is actually an alias for {p.name}; Should replace {edge_predicate} with {p.name}"
+                )
+        else:
+            messages.append(f"Edge predicate '{edge_predicate}' is not in snake_case form")
+        return messages
+    
     @staticmethod
     def report(errors: List[ValidationError]) -> List:
         """
@@ -846,7 +1201,9 @@ class Validator(object):
 
     def write_report(self, outstream: TextIO) -> None:
         """
-        Write error report to a file
+        Write error report to a file.
+
+        The report is aggregated if this Validator has an error collector.
 
         Parameters
         ----------
@@ -854,5 +1211,8 @@ class Validator(object):
             The stream to write to
 
         """
+        if self.error_collector is not None:
+            self.error_collector.write_report(outstream)
+            return
         for x in Validator.report(self.errors):
             outstream.write(f"{x}\n")
@@ -2,7 +2,7 @@ import os
 
 import networkx as nx
 from kgx.graph.nx_graph import NxGraph
-from kgx.graph_operations.clique_merge import clique_merge
+from kgx.graph_operations.clique_merge import clique_merge, stream_clique_merge
 from kgx.transformer import Transformer
 from tests import TARGET_DIR, RESOURCE_DIR
 
@@ -97,3 +97,55 @@ def test_clique_merge_edge_consolidation():
 
     e1_outgoing = updated_graph.out_edges('HGNC:7670', data=True)
     assert len(e1_outgoing) == 6
+
+
+def test_stream_clique_merge():
+    """
+    Test for clique merge in two streaming passes, which should
+    give the same graph as clique merge on an in-memory graph.
+    """
+    input_args = {
+        'filename': [
+            os.path.join(RESOURCE_DIR, 'cm_test2_nodes.tsv'),
+            os.path.join(RESOURCE_DIR, 'cm_test2_edges.tsv'),
+        ],
+        'format': 'tsv',
+    }
+    output_args = {
+        'filename': os.path.join(TARGET_DIR, 'cm_test2_stream'),
+        'format': 'tsv',
+    }
+    stream_clique_merge(
+        input_args, output_args, prefix_prioritization_map=prefix_prioritization_map
+    )
+
+    t1 = Transformer()
+    t1.transform(
+        {
+            'filename': [
+                os.path.join(TARGET_DIR, 'cm_test2_stream_nodes.tsv'),
+                os.path.join(TARGET_DIR, 'cm_test2_stream_edges.tsv'),
+            ],
+            'format': 'tsv',
+        }
+    )
+    t2 = Transformer()
+    t2.transform(input_args)
+    updated_graph, cliques = clique_merge(
+        target_graph=t2.store.graph, prefix_prioritization_map=prefix_prioritization_map
+    )
+
+    streamed_graph = t1.store.graph
+    assert sorted(streamed_graph.nodes(data=False)) == sorted(updated_graph.nodes(data=False))
+    assert sorted(streamed_graph.edges(keys=True, data=False)) == sorted(
+        updated_graph.edges(keys=True, data=False)
+    )
+    leaders = NxGraph.get_node_attributes(streamed_graph, 'clique_leader')
+    assert len(leaders) == 2
+    for leader in leaders:
+        n1 = streamed_graph.nodes()[leader]
+        n2 = updated_graph.nodes()[leader]
+        assert n1['election_strategy'] == n2['election_strategy'] == 'LEADER_ANNOTATION'
+        assert sorted(n1['same_as']) == sorted(n2['same_as'])
+    assert len(streamed_graph.in_edges('HGNC:7670', data=True)) == 3
+    assert len(streamed_graph.out_edges('HGNC:7670', data=True)) == 6
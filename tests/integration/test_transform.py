@@ -763,3 +763,67 @@ def test_transformer_infores_simple_prefix_rewrite():
     assert len(irc) == 2
     assert "Gene Ontology (Monarch version 202012)" in irc
     assert "infores:fixed-gene-ontology-monarch-version-202012" in irc["Gene Ontology (Monarch version 202012)"]
+
+
+def test_transform_stream_operations():
+    """
+    Test that graph operations applied while streaming give
+    the same result as when applied to the whole graph.
+    """
+    operations = [
+        {
+            'name': 'kgx.graph_operations.remap_node_property',
+            'args': {'category': 'biolink:Gene', 'old_property': 'taxon_label', 'new_property': 'taxon'},
+        },
+        {
+            'name': 'kgx.graph_operations.remap_edge_property',
+            'args': {
+                'edge_predicate': 'biolink:interacts_with',
+                'old_property': 'relation_label',
+                'new_property': 'relation',
+            },
+        },
+    ]
+    input_args = {
+        'filename': [
+            os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+            os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+        ],
+        'format': 'tsv',
+        'operations': operations,
+    }
+    t1 = Transformer()
+    t1.transform(dict(input_args))
+
+    output_args = {'filename': os.path.join(TARGET_DIR, 'graph_stream_operations'), 'format': 'jsonl'}
+    t2 = Transformer(stream=True)
+    t2.transform(dict(input_args), output_args)
+
+    t3 = Transformer()
+    t3.transform(
+        {
+            'filename': [
+                f"{output_args['filename']}_nodes.jsonl",
+                f"{output_args['filename']}_edges.jsonl",
+            ],
+            'format': 'jsonl',
+        }
+    )
+    g1 = t1.store.graph
+    g3 = t3.store.graph
+    assert g1.number_of_nodes() == g3.number_of_nodes()
+    assert g1.number_of_edges() == g3.number_of_edges()
+    for n, data in g1.nodes(data=True):
+        if 'biolink:Gene' in data['category'] and 'taxon' in data:
+            assert data['taxon_label'] == data['taxon']
+        assert g3.nodes()[n].get('taxon_label') == data.get('taxon_label')
+    for u, v, k, data in g1.edges(keys=True, data=True):
+        if data['predicate'] == 'biolink:interacts_with':
+            assert data['relation_label'] == data['relation']
+            assert g3.get_edge(u, v, k)['relation_label'] == data['relation']
+
+    input_args['operations'] = [
+        {'name': 'kgx.graph_operations.fold_predicate', 'args': {'predicate': 'biolink:interacts_with'}}
+    ]
+    with pytest.raises(ValueError):
+        Transformer(stream=True).transform(dict(input_args), output_args)
@@ -1,13 +1,31 @@
+import copy
 import json
 import os
-import pytest
+import shutil
 
-from kgx.cli.cli_utils import validate, neo4j_upload, neo4j_download, transform, merge
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from kgx.cli.cli_utils import (
+    validate,
+    neo4j_upload,
+    neo4j_download,
+    transform,
+    merge,
+    parse_source,
+    parse_source_to_shard,
+    _group_rows,
+)
+from kgx.graph_operations.graph_merge import edge_sort_key
+from kgx.transformer import Transformer
 from kgx.cli import (
     get_input_file_types,
     graph_summary,
     get_report_format_types
 )
+from kgx.utils.snapshot_utils import read_records, NODE_FRAME, EDGE_FRAME
 from tests import RESOURCE_DIR, TARGET_DIR
 from tests.unit import (
     clean_slate,
@@ -39,7 +57,8 @@ def test_get_report_format_types():
     assert 'json' in format_types
 
 
-def test_graph_summary1():
+@pytest.mark.parametrize('processes', [1, 2])
+def test_graph_summary1(processes):
     """
     Test graph summary, where the output report type is kgx-map.
     """
@@ -48,7 +67,7 @@ def test_graph_summary1():
         os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
     ]
     output = os.path.join(TARGET_DIR, 'graph_stats1.yaml')
-    summary_stats = graph_summary(inputs, 'tsv', None, output, report_type='kgx-map')
+    summary_stats = graph_summary(inputs, 'tsv', None, output, report_type='kgx-map', processes=processes)
 
     assert os.path.exists(output)
     assert summary_stats
@@ -139,6 +158,171 @@ def test_graph_summary2c():
     assert 'edges' in summary_stats
 
 
+@pytest.mark.parametrize('report_type', ['kgx-map', 'meta-knowledge-graph'])
+def test_graph_summary_columnar(report_type):
+    """
+    Test that a columnar graph summary gives the same report as a streaming graph summary.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    reports = []
+    for columnar in [False, True]:
+        output = os.path.join(TARGET_DIR, f'graph_stats_columnar_{columnar}.txt')
+        graph_summary(
+            inputs=inputs,
+            input_format='tsv',
+            input_compression=None,
+            output=output,
+            report_type=report_type,
+            stream=True,
+            node_facet_properties=['provided_by'],
+            edge_facet_properties=['knowledge_source'],
+            columnar=columnar,
+        )
+        with open(output) as fh:
+            reports.append(fh.read())
+    assert reports[0] == reports[1]
+
+
+@pytest.mark.parametrize('report_type', ['kgx-map', 'meta-knowledge-graph'])
+def test_graph_summary_columnar_empty_columns(report_type, tmp_path):
+    """
+    Test that a columnar graph summary of records with empty optional
+    columns gives the same report as a streaming graph summary.
+    """
+    nodes = str(tmp_path / 'test_nodes.tsv')
+    with open(nodes, 'w') as fh:
+        fh.write('id\tcategory\tname\tprovided_by\n')
+        fh.write('HGNC:1\tbiolink:Gene\ta\tinfores:a\n')
+        fh.write('HGNC:2\tbiolink:Gene\tb\t\n')
+        fh.write('MONDO:1\tbiolink:Disease\n')
+        fh.write('HGNC:3\tbiolink:Gene\t\t\n')
+        fh.write('MONDO:2\tbiolink:Disease\tc\tinfores:a|infores:b\n')
+    edges = str(tmp_path / 'test_edges.tsv')
+    with open(edges, 'w') as fh:
+        fh.write('subject\tpredicate\tobject\trelation\tknowledge_source\n')
+        fh.write('HGNC:1\tbiolink:related_to\tMONDO:1\tRO:1\tinfores:a\n')
+        fh.write('HGNC:2\tbiolink:related_to\tMONDO:2\t\t\n')
+        fh.write('HGNC:3\tbiolink:related_to\tMONDO:2\n')
+        fh.write('MONDO:1\tbiolink:related_to\tHGNC:4\tRO:1\n')
+    reports = []
+    for columnar in [False, True]:
+        output = str(tmp_path / f'graph_stats_columnar_{columnar}.txt')
+        graph_summary(
+            inputs=[nodes, edges],
+            input_format='tsv',
+            input_compression=None,
+            output=output,
+            report_type=report_type,
+            stream=True,
+            node_facet_properties=['provided_by'],
+            edge_facet_properties=['knowledge_source'],
+            columnar=columnar,
+        )
+        with open(output) as fh:
+            reports.append(fh.read())
+    assert reports[0] == reports[1]
+
+
+def test_group_rows():
+    """
+    Test that rows with null keys are grouped like rows with any other keys.
+    """
+    keys = [
+        pd.Series(['a', 'a', 'b', 'a', 'a']),
+        pd.Series([None, 'x', None, np.nan, 'x']),
+    ]
+    assert [list(x) for x in _group_rows(keys)] == [[0, 3], [1, 4], [2]]
+
+
+def sort_lists(value):
+    # merged meta knowledge graphs list the values of sets in another order
+    if isinstance(value, dict):
+        return {k: sort_lists(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted((sort_lists(v) for v in value), key=json.dumps)
+    return value
+
+
+@pytest.mark.parametrize('report_type', ['kgx-map', 'meta-knowledge-graph'])
+@pytest.mark.parametrize('columnar', [False, True])
+def test_graph_summary_parallel(report_type, columnar, tmp_path):
+    """
+    Test that summarizing the node and edge files of a graph in worker processes, with the
+    edges first, gives the same report as summarizing them in a single process.
+    """
+    with open(os.path.join(RESOURCE_DIR, 'graph_nodes.tsv')) as fh:
+        header, *lines = fh.readlines()
+    inputs = []
+    for i, part in enumerate([lines[:200], lines[200:]]):
+        inputs.append(str(tmp_path / f'part{i}_nodes.tsv'))
+        with open(inputs[-1], 'w') as fh:
+            fh.writelines([header] + part)
+    inputs.append(os.path.join(RESOURCE_DIR, 'graph_edges.tsv'))
+    reports = []
+    for processes in [1, 2]:
+        output = str(tmp_path / f'graph_stats_{processes}.txt')
+        graph_summary(
+            inputs=inputs if processes == 1 else inputs[-1:] + inputs[:-1],
+            input_format='tsv',
+            input_compression=None,
+            output=output,
+            report_type=report_type,
+            stream=True,
+            node_facet_properties=['provided_by'],
+            edge_facet_properties=['knowledge_source'],
+            processes=processes,
+            columnar=columnar,
+        )
+        with open(output) as fh:
+            reports.append(sort_lists(yaml.safe_load(fh)))
+    assert reports[0] == reports[1]
+
+
+@pytest.mark.parametrize('report_type', ['kgx-map', 'meta-knowledge-graph'])
+def test_graph_summary_state(report_type, tmp_path):
+    """
+    Test updating a graph summary from the summaries of its sources, kept in a state directory.
+    """
+    nodes = os.path.join(RESOURCE_DIR, 'graph_nodes.tsv')
+    edges = os.path.join(RESOURCE_DIR, 'graph_edges.tsv')
+    state_directory = str(tmp_path / 'state')
+    args = {'input_format': 'tsv', 'input_compression': None, 'report_type': report_type, 'stream': True}
+
+    def summarize(inputs, **kwargs):
+        output = str(tmp_path / 'graph_stats.txt')
+        graph_summary(inputs, output=output, **args, **kwargs)
+        with open(output) as fh:
+            return sort_lists(yaml.safe_load(fh))
+
+    full_report = summarize([nodes, edges])
+    nodes_report = summarize([nodes])
+
+    # the edges are summarized before their nodes
+    summarize([edges], state_directory=state_directory, source_name='edges')
+    assert summarize([nodes], state_directory=state_directory, source_name='nodes') == full_report
+    assert summarize([], state_directory=state_directory) == full_report
+    assert summarize([], state_directory=state_directory, retract=['edges']) == nodes_report
+    assert summarize([edges], state_directory=state_directory, source_name='edges') == full_report
+
+    with pytest.raises(ValueError):
+        summarize([edges], state_directory=state_directory)
+    with pytest.raises(ValueError):
+        summarize([], state_directory=state_directory, node_facet_properties=['name'])
+
+    # a state directory written by another version of KGX is refused
+    manifest_filename = os.path.join(state_directory, 'manifest.yaml')
+    with open(manifest_filename) as fh:
+        manifest = yaml.safe_load(fh)
+    del manifest['version']
+    with open(manifest_filename, 'w') as fh:
+        yaml.safe_dump(manifest, fh)
+    with pytest.raises(ValueError):
+        summarize([], state_directory=state_directory)
+
+
 def test_validate_non_streaming():
     """
     Test graph validation.
@@ -179,6 +363,102 @@ def test_validate_streaming():
     assert len(errors) == 0
 
 
+@pytest.mark.parametrize(
+    'query',
+    [
+        (['graph_nodes.tsv', 'graph_edges.tsv'], 'tsv'),
+        (['valid.json'], 'json'),
+    ],
+)
+def test_validate_parallel(query):
+    """
+    Test that parallel graph validation gives the same errors as streaming validation.
+    """
+    inputs = [os.path.join(RESOURCE_DIR, x) for x in query[0]]
+    output = os.path.join(TARGET_DIR, 'validation.log')
+    errors = validate(
+        inputs=inputs,
+        input_format=query[1],
+        input_compression=None,
+        output=output,
+        stream=True,
+        biolink_release="2.1.0",
+    )
+    parallel_errors = validate(
+        inputs=inputs,
+        input_format=query[1],
+        input_compression=None,
+        output=output,
+        stream=True,
+        biolink_release="2.1.0",
+        processes=2,
+    )
+    assert [str(x) for x in parallel_errors] == [str(x) for x in errors]
+
+
+def test_validate_aggregated():
+    """
+    Test that aggregated graph validation gives the same report in parallel.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    output = os.path.join(TARGET_DIR, 'validation.log')
+    summaries = []
+    for processes in (1, 2):
+        error_jsonl = os.path.join(TARGET_DIR, f"validation-{processes}.jsonl")
+        summary = validate(
+            inputs=inputs,
+            input_format='tsv',
+            input_compression=None,
+            output=output,
+            stream=True,
+            biolink_release="2.1.0",
+            processes=processes,
+            max_examples=3,
+            error_jsonl=error_jsonl,
+        )
+        assert all(len(x['examples']) <= 3 for x in summary)
+        with open(error_jsonl) as fh:
+            assert sum(1 for _ in fh) == sum(x['count'] for x in summary)
+        summaries.append(summary)
+    assert summaries[0] == summaries[1]
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        ['graph_nodes.tsv', 'graph_edges.tsv'],
+        ['test_nodes.tsv', 'test_edges.tsv'],
+    ],
+)
+def test_validate_columnar(query):
+    """
+    Test that columnar graph validation gives the same errors as streaming validation.
+    """
+    inputs = [os.path.join(RESOURCE_DIR, x) for x in query]
+    output = os.path.join(TARGET_DIR, 'validation.log')
+    errors = validate(
+        inputs=inputs,
+        input_format='tsv',
+        input_compression=None,
+        output=output,
+        stream=True,
+        biolink_release="2.1.0",
+    )
+    columnar_errors = validate(
+        inputs=inputs,
+        input_format='tsv',
+        input_compression=None,
+        output=output,
+        stream=False,
+        biolink_release="2.1.0",
+        columnar=True,
+    )
+    assert [str(x) for x in columnar_errors] == [str(x) for x in errors]
+
+
 @pytest.mark.skipif(not check_container(), reason=f'Container {CONTAINER_NAME} is not running')
 def test_neo4j_upload(clean_slate):
     """
@@ -411,3 +691,203 @@ def test_merge2():
     merge_config = os.path.join(RESOURCE_DIR, 'test-merge.yaml')
     merge(merge_config=merge_config, destination=['merged-graph-json'])
     assert os.path.join(TARGET_DIR, 'merged-graph.json')
+
+
+def test_merge_stream():
+    """
+    Merge sources from test merge YAML as a stream and check that
+    the result is the same as merging the sources in memory.
+    """
+    merge_config = os.path.join(RESOURCE_DIR, 'test-merge-stream.yaml')
+    merged_graph = merge(merge_config=merge_config, destination=['merged-graph-stream-tsv'])
+    assert merge(merge_config=merge_config, stream=True) is None
+    assert not [x for x in os.listdir(TARGET_DIR) if x.startswith('shards-')]
+
+    t = Transformer()
+    t.transform(
+        {
+            'filename': [
+                os.path.join(TARGET_DIR, 'merged-graph-stream_nodes.tsv'),
+                os.path.join(TARGET_DIR, 'merged-graph-stream_edges.tsv'),
+            ],
+            'format': 'tsv',
+        }
+    )
+    assert t.store.graph.number_of_nodes() == merged_graph.number_of_nodes()
+    assert t.store.graph.number_of_edges() == merged_graph.number_of_edges()
+    for n, data in merged_graph.nodes(data=True):
+        assert t.store.graph.nodes()[n]['category'] == data['category']
+    assert os.path.exists(os.path.join(TARGET_DIR, 'merged-graph-stream.json'))
+
+
+def test_parse_source_to_shard(tmp_path):
+    """
+    Test that parsing a source as a stream to sorted shards gives
+    the same nodes and edges as parsing it to a graph.
+    """
+    source = {
+        'input': {
+            'format': 'tsv',
+            'filename': [
+                os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+                os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+                os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+            ],
+        },
+    }
+    graph = parse_source('test_graph', copy.deepcopy(source), str(tmp_path)).graph
+    shards, node_properties, edge_properties = parse_source_to_shard(
+        'test_graph',
+        copy.deepcopy(source),
+        str(tmp_path),
+        str(tmp_path),
+        checkpoint=True,
+        partitions=2,
+    )
+    assert sorted(os.listdir(tmp_path)) == [
+        'test_graph-0.snapshot', 'test_graph-1.snapshot', 'test_graph_edges.tsv', 'test_graph_nodes.tsv'
+    ]
+    assert 'category' in node_properties and 'predicate' in edge_properties
+    nodes = {}
+    edges = {}
+    for shard in shards:
+        ids = [x['id'] for x in read_records(shard, NODE_FRAME)]
+        assert ids == sorted(ids)
+        nodes.update((x['id'], x) for x in read_records(shard, NODE_FRAME))
+        edges.update((edge_sort_key(x), x) for x in read_records(shard, EDGE_FRAME))
+    assert nodes == {n: data for n, data in graph.nodes(data=True) if 'id' in data}
+    # edges without an id are given a new one each time they are parsed
+    assert {k: {**x, 'id': None} for k, x in edges.items()} == {
+        edge_sort_key(data): {**data, 'id': None} for _, _, data in graph.edges(data=True)
+    }
+
+
+def test_merge_stream_partitioned():
+    """
+    Merge sources from test merge YAML as a stream, with the records
+    partitioned across processes.
+    """
+    merge_config = os.path.join(RESOURCE_DIR, 'test-merge-stream.yaml')
+    merged_graph = merge(merge_config=merge_config, destination=['merged-graph-stream-tsv'])
+    merge(merge_config=merge_config, destination=['merged-graph-stream-tsv'], processes=2, stream=True)
+
+    t = Transformer()
+    t.transform(
+        {
+            'filename': [
+                os.path.join(TARGET_DIR, 'merged-graph-stream_nodes.tsv'),
+                os.path.join(TARGET_DIR, 'merged-graph-stream_edges.tsv'),
+            ],
+            'format': 'tsv',
+        }
+    )
+    assert t.store.graph.number_of_nodes() == merged_graph.number_of_nodes()
+    assert t.store.graph.number_of_edges() == merged_graph.number_of_edges()
+    for n, data in merged_graph.nodes(data=True):
+        assert t.store.graph.nodes()[n]['category'] == data['category']
+
+
+def test_merge_incremental():
+    """
+    Merge sources incrementally, only parsing the sources that have changed.
+    """
+    input_directory = os.path.join(TARGET_DIR, 'incremental')
+    os.makedirs(input_directory, exist_ok=True)
+    for f in ['graph_nodes.tsv', 'graph_edges.tsv', 'valid.json']:
+        shutil.copy(os.path.join(RESOURCE_DIR, f), input_directory)
+    with open(os.path.join(RESOURCE_DIR, 'test-merge-stream.yaml')) as fh:
+        cfg = yaml.safe_load(fh)
+    cfg['configuration']['output_directory'] = 'output'
+    merge_config = os.path.join(input_directory, 'merge.yaml')
+    with open(merge_config, 'w') as fh:
+        yaml.dump(cfg, fh)
+
+    merge(merge_config=merge_config, incremental=True)
+    cache_directory = os.path.join(input_directory, 'output', 'merge_cache')
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest1 = json.load(fh)
+    assert set(manifest1.keys()) == {'test_graph', 'valid_graph'}
+    shard = manifest1['test_graph']['shards'][0]
+    mtime = os.stat(shard).st_mtime_ns
+
+    # only the modified source is parsed again
+    valid_json = os.path.join(input_directory, 'valid.json')
+    stat = os.stat(valid_json)
+    os.utime(valid_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    merge(merge_config=merge_config, incremental=True)
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest2 = json.load(fh)
+    assert manifest2['test_graph'] == manifest1['test_graph']
+    assert manifest2['valid_graph']['fingerprint'] != manifest1['valid_graph']['fingerprint']
+    assert os.stat(shard).st_mtime_ns == mtime
+
+    # the contribution of a removed source is retracted
+    del cfg['merged_graph']['source']['valid_graph']
+    with open(merge_config, 'w') as fh:
+        yaml.dump(cfg, fh)
+    merge(merge_config=merge_config, incremental=True)
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest3 = json.load(fh)
+    assert set(manifest3.keys()) == {'test_graph'}
+    for x in manifest2['valid_graph']['shards']:
+        assert not os.path.exists(x)
+
+    t = Transformer()
+    t.transform(
+        {
+            'filename': [
+                os.path.join(input_directory, 'output', 'merged-graph-stream_nodes.tsv'),
+                os.path.join(input_directory, 'output', 'merged-graph-stream_edges.tsv'),
+            ],
+            'format': 'tsv',
+        }
+    )
+    assert 'HGNC:10848' in t.store.graph.nodes()
+    assert 'MONDO:0005002' not in t.store.graph.nodes()
+
+
+def test_merge_incremental_subset():
+    """
+    Merge a subset of the sources incrementally, keeping the shards of the other sources.
+    """
+    input_directory = os.path.join(TARGET_DIR, 'incremental_subset')
+    os.makedirs(input_directory, exist_ok=True)
+    for f in ['graph_nodes.tsv', 'graph_edges.tsv', 'valid.json']:
+        shutil.copy(os.path.join(RESOURCE_DIR, f), input_directory)
+    with open(os.path.join(RESOURCE_DIR, 'test-merge-stream.yaml')) as fh:
+        cfg = yaml.safe_load(fh)
+    cfg['configuration']['output_directory'] = 'output'
+    merge_config = os.path.join(input_directory, 'merge.yaml')
+    with open(merge_config, 'w') as fh:
+        yaml.dump(cfg, fh)
+
+    merge(merge_config=merge_config, incremental=True)
+    cache_directory = os.path.join(input_directory, 'output', 'merge_cache')
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest1 = json.load(fh)
+    mtimes = {x: os.stat(x).st_mtime_ns for x in manifest1['valid_graph']['shards']}
+
+    # the shards of the source that is not selected are kept
+    merge(merge_config=merge_config, source=['test_graph'], incremental=True)
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest2 = json.load(fh)
+    assert manifest2 == manifest1
+    for x, mtime in mtimes.items():
+        assert os.stat(x).st_mtime_ns == mtime
+
+    # and are reused by the next merge of all the sources
+    merge(merge_config=merge_config, incremental=True)
+    with open(os.path.join(cache_directory, 'manifest.json')) as fh:
+        manifest3 = json.load(fh)
+    assert manifest3 == manifest1
+    for x, mtime in mtimes.items():
+        assert os.stat(x).st_mtime_ns == mtime
+
+
+def test_merge_stream_operations():
+    """
+    Graph operations cannot be applied when merging as a stream.
+    """
+    merge_config = os.path.join(RESOURCE_DIR, 'test-merge.yaml')
+    with pytest.raises(ValueError):
+        merge(merge_config=merge_config, stream=True)
@@ -4,6 +4,9 @@ from kgx.graph_operations.clique_merge import (
     sort_categories,
     check_all_categories,
     clique_merge,
+    find_cliques,
+    merge_cliques,
+    remap_edge,
 )
 from kgx.utils.kgx_utils import get_biolink_ancestors, generate_edge_key, get_toolkit
 from tests import print_graph
@@ -94,6 +97,41 @@ def test_sort_categories():
     assert sorted_categories.index('biolink:NamedThing') == 2
 
 
+def test_find_cliques():
+    """
+    Test finding cliques from same_as node properties and same_as edges.
+    """
+    g1 = NxGraph()
+    g1.add_node('HGNC:1', **{'category': ['biolink:Gene']})
+    g1.add_node('NCBIGene:2', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:1']})
+    g1.add_node('ENSEMBL:3', **{'category': ['biolink:Gene']})
+    g1.add_node('HGNC:4', **{'category': ['biolink:Gene'], 'same_as': ['OMIM:5']})
+    g1.add_node('HGNC:6', **{'category': ['biolink:Gene']})
+    g1.add_edge(
+        'ENSEMBL:3',
+        'HGNC:1',
+        edge_key=generate_edge_key('ENSEMBL:3', 'biolink:same_as', 'HGNC:1'),
+        **{'predicate': 'biolink:same_as', 'relation': 'owl:equivalentClass'}
+    )
+
+    cliques = find_cliques(g1)
+    assert sorted(sorted(c) for c in cliques.get_cliques()) == [
+        ['ENSEMBL:3', 'HGNC:1', 'NCBIGene:2'],
+        ['HGNC:4', 'OMIM:5'],
+    ]
+    assert cliques.find('ENSEMBL:3') == cliques.find('NCBIGene:2')
+    assert cliques.find('HGNC:4') != cliques.find('HGNC:1')
+
+    # node data is referenced, not copied
+    assert cliques.node_data['HGNC:1'] is g1.nodes()['HGNC:1']
+    assert cliques.node_data['OMIM:5'] is None
+
+    clique_graph = cliques.to_networkx()
+    assert clique_graph.number_of_nodes() == 5
+    assert clique_graph.number_of_edges() == 6
+    assert 'same_as' not in clique_graph.nodes()['NCBIGene:2']
+
+
 def test_clique_merge1():
     """
     Test to perform a clique merge where all nodes in a clique are valid.
@@ -706,3 +744,152 @@ def test_clique_merge9():
     assert 'NCBIGene:8' in n2['same_as']
 
     assert updated_graph.has_node('OMIM:2')
+
+
+def test_clique_merge_processes():
+    """
+    Test for clique merge where leaders are elected across a pool of worker processes.
+    """
+    ppm = {'biolink:Gene': ['HGNC', 'NCBIGene', 'ENSEMBL', 'OMIM']}
+    graphs = []
+    for processes in [1, 2]:
+        g1 = NxGraph()
+        g1.add_node('HGNC:1', **{'category': ['biolink:Gene']})
+        g1.add_node('OMIM:2', **{'category': ['biolink:Disease'], 'same_as': ['HGNC:1']})
+        g1.add_node('ENSEMBL:4', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:1']})
+        g1.add_node('ENSEMBL:6', **{'category': ['biolink:Gene'], 'same_as': ['NCBIGene:8']})
+        g1.add_node('HGNC:7', **{'category': ['biolink:Gene']})
+        g1.add_node('NCBIGene:8', **{'category': ['biolink:Gene']})
+        g1.add_edge(
+            'HGNC:7',
+            'NCBIGene:8',
+            edge_key=generate_edge_key('HGNC:7', 'biolink:same_as', 'NCBIGene:8'),
+            **{'predicate': 'biolink:same_as', 'relation': 'owl:equivalentClass'}
+        )
+        updated_graph, cliques = clique_merge(
+            target_graph=g1, prefix_prioritization_map=ppm, processes=processes
+        )
+        graphs.append(updated_graph)
+
+    assert sorted(graphs[0].nodes(data=False)) == sorted(graphs[1].nodes(data=False))
+    for n in graphs[0].nodes(data=False):
+        assert graphs[0].nodes()[n] == graphs[1].nodes()[n]
+    assert sorted(graphs[0].edges(keys=True, data=False)) == sorted(
+        graphs[1].edges(keys=True, data=False)
+    )
+    n1 = graphs[1].nodes()['HGNC:7']
+    assert n1['clique_leader']
+    assert n1['election_strategy'] == 'PREFIX_PRIORITIZATION'
+    assert 'NCBIGene:8' in n1['same_as']
+    assert not graphs[1].has_node('NCBIGene:8')
+
+
+def test_merge_cliques():
+    """
+    Test that a clique merge with cliques found by union-find gives
+    the same graph as a clique merge with a clique graph.
+    """
+    ppm = {'biolink:Gene': ['HGNC', 'NCBIGene', 'ENSEMBL', 'OMIM']}
+    graphs = []
+    for merge in [clique_merge, merge_cliques]:
+        g1 = NxGraph()
+        g1.add_node('HGNC:1', **{'category': ['biolink:Gene']})
+        g1.add_node('OMIM:2', **{'category': ['biolink:Disease'], 'same_as': ['HGNC:1']})
+        g1.add_node('ENSEMBL:4', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:1']})
+        g1.add_node('ENSEMBL:6', **{'category': ['biolink:Gene'], 'same_as': ['NCBIGene:8']})
+        g1.add_node('HGNC:7', **{'category': ['biolink:Gene']})
+        g1.add_node('NCBIGene:8', **{'category': ['biolink:Gene']})
+        g1.add_edge(
+            'HGNC:7',
+            'NCBIGene:8',
+            edge_key=generate_edge_key('HGNC:7', 'biolink:same_as', 'NCBIGene:8'),
+            **{'predicate': 'biolink:same_as', 'relation': 'owl:equivalentClass'}
+        )
+        g1.add_edge(
+            'ENSEMBL:4',
+            'OMIM:2',
+            edge_key=generate_edge_key('ENSEMBL:4', 'biolink:related_to', 'OMIM:2'),
+            **{'subject': 'ENSEMBL:4', 'predicate': 'biolink:related_to', 'object': 'OMIM:2'}
+        )
+        updated_graph, cliques = merge(target_graph=g1, prefix_prioritization_map=ppm)
+        graphs.append(updated_graph)
+        if merge is clique_merge:
+            clique_graph = cliques
+
+    assert not clique_graph.has_node('OMIM:2')
+    assert clique_graph.nodes()['HGNC:7']['clique_leader']
+    assert sorted(graphs[0].nodes(data=False)) == sorted(graphs[1].nodes(data=False))
+    for n in graphs[0].nodes(data=False):
+        assert graphs[0].nodes()[n] == graphs[1].nodes()[n]
+    assert sorted(graphs[0].edges(keys=True, data=True)) == sorted(
+        graphs[1].edges(keys=True, data=True)
+    )
+    assert 'NCBIGene:8' in graphs[1].nodes()['HGNC:7']['same_as']
+
+
+def test_remap_edge():
+    """
+    Test moving an edge to the clique leaders of its subject and object.
+    """
+    leader_map = {'ENSEMBL:2': 'HGNC:1', 'NCBIGene:4': 'HGNC:3'}
+    e = remap_edge(
+        {'subject': 'ENSEMBL:2', 'predicate': 'biolink:interacts_with', 'object': 'NCBIGene:4'},
+        leader_map,
+    )
+    assert e['subject'] == 'HGNC:1' and e['object'] == 'HGNC:3'
+    assert e['_original_subject'] == 'ENSEMBL:2'
+    assert e['_original_object'] == 'NCBIGene:4'
+
+    e = remap_edge(
+        {'subject': 'ENSEMBL:2', 'predicate': 'biolink:subclass_of', 'object': 'HGNC:1'},
+        leader_map,
+    )
+    assert e is None
+
+
+def test_clique_merge_edge_remap():
+    """
+    Test for clique merge where edges between nodes in two cliques are moved to both leaders.
+    """
+    ppm = {'biolink:Gene': ['HGNC', 'NCBIGene', 'ENSEMBL', 'OMIM']}
+    g1 = NxGraph()
+    g1.add_node('HGNC:1', **{'category': ['biolink:Gene']})
+    g1.add_node('ENSEMBL:2', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:1']})
+    g1.add_node('HGNC:3', **{'category': ['biolink:Gene']})
+    g1.add_node('NCBIGene:4', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:3']})
+    g1.add_node('ENSEMBL:5', **{'category': ['biolink:Gene'], 'same_as': ['HGNC:3']})
+    for s, p, o in [
+        ('ENSEMBL:2', 'biolink:interacts_with', 'NCBIGene:4'),
+        ('NCBIGene:4', 'biolink:interacts_with', 'HGNC:1'),
+        ('NCBIGene:4', 'biolink:subclass_of', 'ENSEMBL:5'),
+        ('NCBIGene:4', 'biolink:related_to', 'HGNC:3'),
+        ('ENSEMBL:5', 'biolink:related_to', 'HGNC:3'),
+    ]:
+        g1.add_edge(
+            s,
+            o,
+            edge_key=generate_edge_key(s, p, o),
+            **{'subject': s, 'predicate': p, 'object': o, 'relation': 'RO:0000000'}
+        )
+
+    updated_graph, cliques = merge_cliques(target_graph=g1, prefix_prioritization_map=ppm)
+    assert cliques.get_leader_map() == {
+        'ENSEMBL:2': 'HGNC:1',
+        'NCBIGene:4': 'HGNC:3',
+        'ENSEMBL:5': 'HGNC:3',
+    }
+    assert sorted(updated_graph.nodes(data=False)) == ['HGNC:1', 'HGNC:3']
+    assert updated_graph.number_of_edges() == 3
+
+    e = updated_graph.get_edge(
+        'HGNC:1', 'HGNC:3', generate_edge_key('HGNC:1', 'biolink:interacts_with', 'HGNC:3')
+    )
+    assert e['_original_subject'] == 'ENSEMBL:2'
+    assert e['_original_object'] == 'NCBIGene:4'
+    assert updated_graph.has_edge(
+        'HGNC:3', 'HGNC:1', generate_edge_key('HGNC:3', 'biolink:interacts_with', 'HGNC:1')
+    )
+    # edges that collide once moved to the leader are folded into one
+    assert updated_graph.has_edge(
+        'HGNC:3', 'HGNC:3', generate_edge_key('HGNC:3', 'biolink:related_to', 'HGNC:3')
+    )
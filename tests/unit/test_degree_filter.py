@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from kgx.graph_operations.degree_filter import NodeDegrees, degree_filter, stream_remove_singleton_nodes
+from kgx.transformer import Transformer
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+def get_degrees(directory, max_in_memory, count_dangling_edges):
+    """
+    Returns node degrees for a small graph with a dangling edge and a singleton.
+    """
+    degrees = NodeDegrees(directory, max_in_memory, count_dangling_edges)
+    degrees.add_edge('A', 'B')
+    degrees.add_node('A')
+    degrees.add_node('B')
+    degrees.add_node('C')
+    degrees.add_node('D')
+    degrees.add_edge('B', 'C')
+    degrees.add_edge('C', 'C')
+    degrees.add_edge('C', 'X')
+    degrees.finalize()
+    return degrees
+
+
+@pytest.mark.parametrize('max_in_memory', [100, 2])
+@pytest.mark.parametrize(
+    'query',
+    [
+        (True, {'A': 1, 'B': 2, 'C': 4, 'D': 0, 'X': None}),
+        (False, {'A': 1, 'B': 2, 'C': 3, 'D': 0, 'X': None}),
+    ],
+)
+def test_node_degrees(tmp_path, max_in_memory, query):
+    """
+    Test computing node degrees, in memory and spilled to disk.
+    """
+    degrees = get_degrees(str(tmp_path), max_in_memory, query[0])
+    assert (degrees.db is not None) == (max_in_memory == 2)
+    for n, degree in query[1].items():
+        assert degrees.get_degree(n) == degree
+    degrees.close()
+
+
+def test_degree_filter(tmp_path):
+    """
+    Test the degree filter record operation.
+    """
+    degrees = get_degrees(str(tmp_path), 100, False)
+    removed = {}
+    operation = degree_filter(degrees, 2, 3, True, removed)
+    assert operation(('A', {})) == []
+    assert operation(('B', {})) == [('B', {})]
+    assert operation(('D', {})) == []
+    assert operation(('A', 'B', 'k', {})) == []
+    assert operation(('B', 'C', 'k', {})) == [('B', 'C', 'k', {})]
+    assert operation(('C', 'X', 'k', {})) == []
+    assert removed == {'nodes': 2, 'edges': 2}
+
+
+@pytest.mark.parametrize('max_in_memory', [10000, 100])
+def test_stream_remove_singleton_nodes(max_in_memory):
+    """
+    Test removing singleton nodes and dangling edges while streaming.
+    """
+    input_args = {
+        'filename': [
+            os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+            os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+            os.path.join(RESOURCE_DIR, 'test_edges.tsv'),
+        ],
+        'format': 'tsv',
+    }
+    t = Transformer()
+    t.transform(dict(input_args))
+    g = t.store.graph
+    nodes = {n for n, data in g.nodes(data=True) if data}
+    edges = [(u, v) for u, v in g.edges(data=False) if u in nodes and v in nodes]
+    connected = {x for e in edges for x in e}
+
+    output_args = {'filename': os.path.join(TARGET_DIR, 'graph_degree_filter'), 'format': 'jsonl'}
+    removed = stream_remove_singleton_nodes(
+        input_args, output_args, remove_dangling_edges=True, max_in_memory=max_in_memory
+    )
+    assert removed['edges'] > 0
+    assert removed['nodes'] == len(nodes - connected)
+    assert removed['edges'] == g.number_of_edges() - len(edges)
+
+    t = Transformer()
+    t.transform(
+        {
+            'filename': [
+                f"{output_args['filename']}_nodes.jsonl",
+                f"{output_args['filename']}_edges.jsonl",
+            ],
+            'format': 'jsonl',
+        }
+    )
+    assert set(t.store.graph.nodes(data=False)) == connected
+    assert t.store.graph.number_of_edges() == len(edges)
@@ -5,6 +5,10 @@ from kgx.graph_operations.graph_merge import (
     add_all_nodes,
     merge_node,
     merge_edge,
+    merge_sorted_records,
+    node_sort_key,
+    edge_sort_key,
+    get_partition,
 )
 
 
@@ -185,3 +189,48 @@ def test_merge_edge():
     assert edge['relation'] == 'biolink:related_to'
     assert 'KGX' in edge['provided_by']
     assert edge['evidence'] == 'PMID:123456'
+
+
+def test_merge_sorted_records():
+    """
+    Test merging of sorted streams of node and edge records.
+    """
+    nodes1 = [
+        {'id': 'A', 'name': 'Node A', 'category': ['biolink:NamedThing'], 'provided_by': ['s1']},
+        {'id': 'C', 'name': 'Node C', 'category': ['biolink:NamedThing']},
+    ]
+    nodes2 = [
+        {'id': 'A', 'name': 'Node A1', 'category': ['biolink:Gene'], 'provided_by': ['s2']},
+        {'id': 'B', 'name': 'Node B', 'category': ['biolink:NamedThing']},
+    ]
+    nodes = list(merge_sorted_records([nodes1, nodes2], node_sort_key))
+    assert [x['id'] for x in nodes] == ['A', 'B', 'C']
+    assert nodes[0]['name'] == 'Node A'
+    assert nodes[0]['category'] == ['biolink:NamedThing', 'biolink:Gene']
+    assert nodes[0]['provided_by'] == ['s1', 's2']
+
+    edges1 = [
+        {'subject': 'A', 'predicate': 'biolink:related_to', 'object': 'B', 'provided_by': ['s1']},
+        {'subject': 'B', 'predicate': 'biolink:related_to', 'object': 'C'},
+    ]
+    edges2 = [
+        {'subject': 'A', 'predicate': 'biolink:related_to', 'object': 'B', 'provided_by': ['s2']},
+        {'subject': 'A', 'predicate': 'biolink:interacts_with', 'object': 'B'},
+    ]
+    edges2 = sorted(edges2, key=edge_sort_key)
+    edges = list(merge_sorted_records([edges1, edges2], edge_sort_key))
+    assert len(edges) == 3
+    assert edges[0]['predicate'] == 'biolink:interacts_with'
+    assert edges[1]['provided_by'] == ['s1', 's2']
+
+
+def test_get_partition():
+    """
+    Test stable partitioning of node and edge keys.
+    """
+    assert get_partition('HGNC:11603', 1) == 0
+    partitions = {get_partition(f"HGNC:{x}", 4) for x in range(100)}
+    assert partitions == {0, 1, 2, 3}
+    key = ('A', 'B', 'A-biolink:related_to-B')
+    assert get_partition(key, 4) == get_partition(key, 4)
+    assert 0 <= get_partition(key, 4) < 4
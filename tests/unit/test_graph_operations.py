@@ -9,6 +9,7 @@ from kgx.graph_operations import (
     remap_node_property,
     remap_node_identifier,
 )
+from kgx.graph_operations.stream_operations import compile_stream_operations
 
 
 def get_graphs1():
@@ -355,7 +356,6 @@ def test_remap_node_property_fail():
         )
 
 
-@pytest.mark.skip()
 def test_remap_edge_property():
     """
     Test remap edge property operation.
@@ -400,3 +400,103 @@ def test_remap_edge_property_fail():
             old_property='predicate',
             new_property='pubs',
         )
+
+
+def stream_graph(g, operations):
+    """
+    Stream the nodes and then the edges of a graph through compiled stream operations.
+    """
+    record_operation = compile_stream_operations(operations)
+    records = [(n, data) for n, data in g.nodes(data=True)]
+    records += [(u, v, k, data) for u, v, k, data in g.edges(keys=True, data=True)]
+    output = NxGraph()
+    for rec in records:
+        for r in record_operation(rec):
+            if len(r) == 4:
+                output.add_edge(r[0], r[1], r[2], data=r[3])
+            else:
+                output.add_node(r[0], **r[1])
+    return output
+
+
+def test_stream_operations():
+    """
+    Test streaming node and edge records through fused graph operations.
+    """
+    operations = [
+        {
+            'name': 'kgx.graph_operations.remap_node_identifier',
+            'args': {
+                'category': 'biolink:Gene',
+                'alternative_property': 'xref',
+                'prefix': 'NCBIGene',
+            },
+        },
+        {
+            'name': 'kgx.graph_operations.remap_node_property',
+            'args': {'category': 'biolink:Gene', 'old_property': 'name', 'new_property': 'id'},
+        },
+    ]
+    with pytest.raises(AttributeError):
+        compile_stream_operations(operations)
+
+    operations[1]['args'] = {
+        'category': 'biolink:Gene',
+        'old_property': 'description',
+        'new_property': 'name',
+    }
+    g = stream_graph(get_graphs2()[1], operations)
+    assert g.has_node('NCBIGene:12345')
+    assert not g.has_node('A')
+    assert g.nodes()['NCBIGene:12345']['id'] == 'NCBIGene:12345'
+    assert g.nodes()['NCBIGene:12345']['description'] == 'Node A'
+    assert g.nodes()['D']['description'] == 'Node D'
+    assert g.nodes()['E']['description'] == 'Node E in Graph 2'
+
+    e1 = list(g.get_edge('NCBIGene:56463', 'NCBIGene:12345').values())[0]
+    assert e1['subject'] == 'NCBIGene:56463' and e1['object'] == 'NCBIGene:12345'
+    assert e1['edge_key'] == 'NCBIGene:56463-biolink:subclass_of-NCBIGene:12345'
+
+    expected = remap_node_identifier(
+        get_graphs2()[1], 'biolink:Gene', alternative_property='xref', prefix='NCBIGene'
+    )
+    assert sorted(g.nodes(data=False)) == sorted(expected.nodes(data=False))
+    assert sorted(g.edges(data=False)) == sorted(expected.edges(data=False))
+
+
+def test_stream_unfold_node_property():
+    """
+    Test streaming the unfold node property operation.
+    """
+    operations = [
+        {
+            'name': 'kgx.graph_operations.unfold_node_property',
+            'args': {'node_property': 'same_as', 'prefix': 'biolink'},
+        },
+        {
+            'name': 'kgx.graph_operations.remap_edge_property',
+            'args': {
+                'edge_predicate': 'biolink:same_as',
+                'old_property': 'relation',
+                'new_property': 'predicate',
+            },
+        },
+    ]
+    g = stream_graph(get_graphs1()[1], operations)
+    assert 'same_as' not in g.nodes()['HGNC:12345']
+    e = list(dict(g.get_edge('HGNC:12345', 'UniProtKB:54321')).values())[0]
+    assert e['subject'] == 'HGNC:12345'
+    assert e['predicate'] == 'biolink:same_as'
+    assert e['object'] == 'UniProtKB:54321'
+    assert e['relation'] == 'biolink:same_as'
+
+
+def test_stream_operations_whole_graph():
+    """
+    Test that graph operations which need the whole graph cannot be streamed.
+    """
+    with pytest.raises(ValueError):
+        compile_stream_operations(
+            [{'name': 'kgx.graph_operations.fold_predicate', 'args': {'predicate': 'biolink:same_as'}}]
+        )
+    assert compile_stream_operations([]) is None
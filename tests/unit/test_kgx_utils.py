@@ -1,3 +1,4 @@
+import copy
 import pytest
 import pandas as pd
 import numpy as np
@@ -10,6 +11,7 @@ from kgx.utils.kgx_utils import (
     get_prefix_prioritization_map,
     get_biolink_element,
     get_biolink_ancestors,
+    get_biolink_index,
     generate_edge_key,
     contract,
     expand,
@@ -19,6 +21,7 @@ from kgx.utils.kgx_utils import (
     sentencecase_to_camelcase,
     generate_uuid,
     prepare_data_dict,
+    merge_data_dict,
     sanitize_import,
     _build_export_row,
     _sanitize_import,
@@ -87,6 +90,32 @@ def test_get_biolink_ancestors():
     assert len(ancestors1) == 6
 
 
+def test_get_biolink_index():
+    """
+    Test the memoized Biolink lookup index.
+    """
+    index = get_biolink_index()
+    assert index is get_biolink_index()
+    assert index.model_version == get_toolkit().get_model_version()
+
+    ancestors = index.get_ancestors('biolink:Gene')
+    assert ancestors == get_biolink_ancestors('biolink:Gene')
+    assert index.get_ancestors('biolink:Gene') is ancestors
+    assert index.is_ancestor('biolink:NamedThing', 'biolink:Gene')
+    assert index.is_ancestor('biolink:GeneOrGeneProduct', 'biolink:Gene')
+    assert not index.is_ancestor('biolink:Disease', 'biolink:Gene')
+    assert not index.is_ancestor('biolink:Unknown', 'biolink:Gene')
+
+    assert index.is_mixin('gene or gene product')
+    assert not index.is_mixin('gene')
+    assert index.get_element('gene') is index.get_element('gene')
+    assert index.get_element('biolink:Unknown') is None
+
+    ppm = index.get_prefix_prioritization_map()
+    ppm['biolink:Gene'] = ['XYZ']
+    assert index.get_prefix_prioritization_map()['biolink:Gene'] != ['XYZ']
+
+
 def test_generate_edge_key():
     """
     Test generation of edge key via generate_edge_key method.
@@ -231,6 +260,50 @@ def test_prepare_data_dict(query):
     assert res is not None
 
 
+@pytest.mark.parametrize(
+    "query",
+    [
+        (
+            {'id': 'A', 'name': 'Node A', 'provided_by': ['Dataset A'], 'xref': ['X:1']},
+            {'id': 'A', 'name': 'Node A1', 'provided_by': 'Dataset B', 'xref': ['X:1', 'X:2', 'X:2']},
+            {'id': 'A', 'provided_by': ['Dataset A', 'Dataset C'], 'xref': 'X:3'},
+        ),
+        (
+            {'id': 'A', 'category': ['biolink:Gene'], 'description': 'A gene'},
+            {'id': 'A', 'category': 'biolink:Gene', 'description': 'A gene'},
+            {'id': 'A', 'category': ('biolink:Protein',), 'in_taxon': 'NCBITaxon:9606'},
+        ),
+        (
+            {'subject': 'A', 'predicate': 'biolink:related_to', 'object': 'B', 'publications': 'PMID:1'},
+            {'subject': 'A', 'predicate': 'biolink:interacts_with', 'object': 'B', 'has_evidence': 'ECO:1'},
+            {'subject': 'A', 'object': 'B', 'publications': ['PMID:1', 'PMID:2'], 'has_evidence': 'ECO:2'},
+        ),
+    ],
+)
+@pytest.mark.parametrize("preserve", [True, False])
+def test_merge_data_dict(query, preserve):
+    """
+    Test that merge_data_dict gives the same result as prepare_data_dict
+    and does not modify the merged records.
+    """
+    expected = copy.deepcopy(query[0])
+    for d in query[1:]:
+        expected = prepare_data_dict(copy.deepcopy(expected), copy.deepcopy(d), preserve)
+
+    records = copy.deepcopy(query)
+    res = copy.deepcopy(records[0])
+    for d in records[1:]:
+        res = merge_data_dict(res, d, preserve)
+    assert res == expected
+    assert records == query
+
+    res = copy.deepcopy(records[0])
+    seen = {}
+    for d in records[1:]:
+        merge_data_dict(res, d, preserve, seen)
+    assert res == expected
+
+
 @pytest.mark.parametrize(
     'query',
     [
@@ -1,5 +1,6 @@
 import json
 import os
+import pickle
 from sys import stderr
 from typing import List, Dict
 
@@ -208,3 +209,50 @@ def test_meta_knowledge_graph_multiple_category_and_predicate_parsing():
     assert mkg.get_edge_mapping_count() == 25
 
     assert mkg.get_total_edge_counts_across_mappings() == 100
+
+
+def test_meta_knowledge_graph_merge():
+    """
+    Test merging the partial meta knowledge graphs of
+    the node and edge files of a graph, in reverse order
+    """
+    filenames = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    facets = {'edge_facet_properties': ['aggregator_knowledge_source']}
+
+    mkg = MetaKnowledgeGraph('Test Graph', **facets)
+    Transformer(stream=True).transform(
+        input_args={'filename': filenames, 'format': 'tsv'}, inspector=mkg
+    )
+    stats = mkg.get_graph_summary()
+
+    partials = []
+    for filename in reversed(filenames):
+        partial = MetaKnowledgeGraph(partial=True, **facets)
+        Transformer(stream=True).transform(
+            input_args={'filename': [filename], 'format': 'tsv'}, inspector=partial
+        )
+        partials.append(pickle.loads(pickle.dumps(partial)))
+    merged = MetaKnowledgeGraph('Test Graph', **facets)
+    for partial in partials:
+        merged.merge(partial)
+    merged_stats = merged.get_graph_summary()
+
+    assert merged.get_total_nodes_count() == 512
+    assert merged.get_total_edges_count() == 539
+    assert merged.get_edge_mapping_count() == 13
+    assert {
+        c: (x.get_count(), x.get_count_by_source(), x.get_id_prefixes())
+        for c, x in merged_stats['nodes'].items()
+    } == {
+        c: (x.get_count(), x.get_count_by_source(), x.get_id_prefixes())
+        for c, x in stats['nodes'].items()
+    }
+    edges = {(e['subject'], e['predicate'], e['object']): e for e in stats['edges']}
+    for e in merged_stats['edges']:
+        expected = edges[(e['subject'], e['predicate'], e['object'])]
+        assert e['count'] == expected['count']
+        assert e['count_by_source'] == expected['count_by_source']
+        assert set(e['relations']) == set(expected['relations'])
@@ -0,0 +1,64 @@
+import pickle
+
+import pytest
+
+from kgx.graph_operations.node_catalog import NodeCatalog
+
+
+@pytest.mark.parametrize('spill', [False, True])
+def test_node_catalog(tmp_path, spill):
+    """
+    Test adding nodes to and getting nodes from a node catalog,
+    with and without spilling nodes to disk.
+    """
+    catalog = NodeCatalog(str(tmp_path) if spill else None, max_in_memory=2)
+    catalog.add('HGNC:1', ['biolink:Gene'])
+    catalog.add('HGNC:2', ['biolink:Gene'])
+    catalog.add('MONDO:1', ['biolink:Disease', 'biolink:NamedThing'])
+    catalog.add('X:1', [])
+    catalog.add('HGNC:3', ('biolink:Gene',))
+
+    assert len(catalog) == 5
+    assert len(catalog.categories) == 3
+    assert (catalog.db is not None) == spill
+    assert 'HGNC:1' in catalog
+    assert 'HGNC:4' not in catalog
+    assert catalog.get('HGNC:1') == ('biolink:Gene',)
+    assert catalog.get('MONDO:1') == ('biolink:Disease', 'biolink:NamedThing')
+    assert catalog.get('X:1') == ()
+    assert catalog.get('HGNC:4') is None
+    assert catalog.get_indices(['HGNC:3', 'MONDO:1', 'HGNC:4', 'HGNC:1', 'X:1']) == [0, 1, -1, 0, 2]
+
+    copy = pickle.loads(pickle.dumps(catalog))
+    assert len(copy) == 5
+    assert dict(copy.items()) == dict(catalog.items())
+    assert copy.get('HGNC:2') == ('biolink:Gene',)
+    copy.close()
+    catalog.close()
+
+
+def test_node_catalog_persist(tmp_path):
+    """
+    Test writing all the nodes of a node catalog, spilled or not, to a database, and opening it again.
+    """
+    catalog = NodeCatalog(str(tmp_path), max_in_memory=3)
+    for i in range(5):
+        catalog.add(f"HGNC:{i}", ['biolink:Gene'])
+    catalog.add('MONDO:1', ['biolink:Disease'])
+    assert catalog.nodes
+    filename = str(tmp_path / 'catalog.db')
+    catalog.persist(filename)
+    assert not catalog.nodes
+    state = catalog.to_dict()
+    catalog.close()
+
+    copy = NodeCatalog.from_dict(state, filename)
+    assert len(copy) == 6
+    assert copy.get('HGNC:4') == ('biolink:Gene',)
+    assert copy.get('MONDO:1') == ('biolink:Disease',)
+    copy.add('MONDO:2', ['biolink:Disease'])
+    assert copy.get_indices(['MONDO:2', 'HGNC:0', 'X:1']) == [1, 0, -1]
+    copy.close()
+
+    with pytest.raises(RuntimeError):
+        NodeCatalog().to_dict()
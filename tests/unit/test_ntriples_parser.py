@@ -0,0 +1,83 @@
+import io
+import os
+
+import pytest
+from rdflib import URIRef, BNode, Literal, XSD
+from rdflib.plugins.parsers.ntriples import NTriplesParser, ParseError
+
+from kgx.parsers.ntriples_parser import tokenize_ntriples, NTriplesTokenizer
+from tests import RESOURCE_DIR
+
+
+class TripleSink(object):
+    def __init__(self):
+        self.triples = []
+
+    def triple(self, s, p, o):
+        self.triples.append((s, p, o))
+
+
+def test_tokenize_ntriples():
+    """
+    Test tokenizing IRIs, blank nodes, literals, escapes, comments and empty lines.
+    """
+    lines = [
+        '# a comment\n',
+        '<http://a.org/1> <http://a.org/p> <http://a.org/2> .\n',
+        '\n',
+        '_:b1 <http://a.org/p> _:b2.\n',
+        '<http://a.org/1> <http://a.org/name> "a \\"quoted\\"\\tname caf\\u00E9" . # a comment\r\n',
+        '<http://a.org/1> <http://a.org/label> "label"@en-US .',
+        '<http://a.org/1> <http://a.org/score> "1"^^<http://www.w3.org/2001/XMLSchema#integer> .\n',
+        '<http://a.org/1> <http://a.org/empty> "" .\n',
+    ]
+    assert tokenize_ntriples(lines) == [
+        ('http://a.org/1', 'http://a.org/p', 'http://a.org/2'),
+        ('_:b1', 'http://a.org/p', '_:b2'),
+        ('http://a.org/1', 'http://a.org/name', ('a "quoted"\tname café', None, None)),
+        ('http://a.org/1', 'http://a.org/label', ('label', 'en-US', None)),
+        ('http://a.org/1', 'http://a.org/score', ('1', None, 'http://www.w3.org/2001/XMLSchema#integer')),
+        ('http://a.org/1', 'http://a.org/empty', ('', None, None)),
+    ]
+
+    with pytest.raises(ParseError):
+        tokenize_ntriples(['<http://a.org/1> <http://a.org/p> .\n'])
+
+
+def test_ntriples_tokenizer_terms():
+    """
+    Test the rdflib terms of tokenized triples.
+    """
+    data = (
+        '_:b1 <http://a.org/p> _:b2 .\n'
+        '_:b2 <http://a.org/p> _:b1 .\n'
+        '<http://a.org/1> <http://a.org/label> "label"@en .\n'
+        '<http://a.org/1> <http://a.org/score> "01"^^<http://www.w3.org/2001/XMLSchema#integer> .\n'
+    )
+    triples = list(NTriplesTokenizer().tokenize(io.BytesIO(data.encode('utf-8'))))
+    assert isinstance(triples[0][0], BNode)
+    assert triples[0][0] == triples[1][2]
+    assert triples[0][2] == triples[1][0]
+    assert triples[2] == (URIRef('http://a.org/1'), URIRef('http://a.org/label'), Literal('label', lang='en'))
+    assert triples[2][2].language == 'en'
+    assert triples[3][2] == Literal('01', datatype=XSD.integer)
+    assert triples[3][2].toPython() == 1
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+@pytest.mark.parametrize('filename', ['test1.nt', 'test2.nt', 'test3.nt', 'oban-test.nt'])
+def test_ntriples_tokenizer(filename, processes):
+    """
+    Test that the tokenizer yields the same triples as the N-Triples parser of rdflib.
+    """
+    sink = TripleSink()
+    with open(os.path.join(RESOURCE_DIR, 'rdf', filename), 'rb') as fh:
+        NTriplesParser(sink).parse(fh)
+    tokenizer = NTriplesTokenizer(batch_size=5, processes=processes)
+    with open(os.path.join(RESOURCE_DIR, 'rdf', filename), 'rb') as fh:
+        triples = list(tokenizer.tokenize(fh))
+    assert triples == sink.triples
+    for (s1, p1, o1), (s2, p2, o2) in zip(triples, sink.triples):
+        assert type(s1) == type(s2) and type(o1) == type(o2)
+        if isinstance(o1, Literal):
+            assert (o1.language, o1.datatype, o1.value) == (o2.language, o2.datatype, o2.value)
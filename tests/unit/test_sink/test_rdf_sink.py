@@ -2,8 +2,11 @@ import os
 
 import pytest
 import rdflib
+from rdflib.plugins.serializers.nt import _quoteLiteral
 
 from kgx.sink import RdfSink
+from kgx.sink import rdf_sink
+from kgx.sink.rdf_sink import nt_iri, nt_literal
 from tests import TARGET_DIR
 from tests.unit.test_sink import get_graph
 
@@ -130,3 +133,49 @@ def test_uriref(query):
     x = sink.uriref(query[0])
     assert type(x).__name__ == query[1]
     assert str(x) == query[2]
+
+
+def test_write_rdf_batches(monkeypatch):
+    """
+    Write triples in small batches, with literals that have to be escaped.
+    """
+    monkeypatch.setattr(rdf_sink, 'WRITE_BATCH_SIZE', 2)
+    filename = os.path.join(TARGET_DIR, 'test_graph4.nt')
+    name = 'caf\u00e9 "quoted"\nline \\ \U0001F600'
+    s = RdfSink(filename=filename)
+    s.write_node({'id': 'HGNC:1', 'name': name, 'category': ['biolink:Gene'], 'synonym': ['a', 'b']})
+    s.write_edge({'subject': 'HGNC:1', 'predicate': 'biolink:related_to', 'object': 'HGNC:2'})
+    s.write_node({'id': 'HGNC:2', 'name': 'B', 'category': ['biolink:Gene']})
+    s.finalize()
+
+    g = rdflib.Graph()
+    g.parse(filename, format='nt')
+    assert len(g) == 7
+    names = list(g.objects(rdflib.URIRef('http://identifiers.org/hgnc/1'), None))
+    assert rdflib.Literal(name, datatype=rdflib.XSD.string) in names
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        ('Test concept name', None),
+        ('caf\u00e9 "quoted"\r\nline \\', None),
+        ('480.213', 'http://www.w3.org/2001/XMLSchema#string'),
+        ('a "b"', 'http://www.w3.org/2001/XMLSchema#string'),
+    ],
+)
+def test_nt_literal(query):
+    """
+    Test that literals are serialized as rdflib serializes them.
+    """
+    assert nt_literal(query[0], query[1]) == _quoteLiteral(rdflib.Literal(query[0], datatype=query[1]))
+
+
+def test_nt_iri():
+    """
+    Test that IRIs are serialized as rdflib serializes them.
+    """
+    iri = 'http://purl.obolibrary.org/obo/MONDO_000001'
+    assert nt_iri(iri) == rdflib.URIRef(iri).n3()
+    with pytest.raises(Exception):
+        nt_iri('http://example.org/not an iri')
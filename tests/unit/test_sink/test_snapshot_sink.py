@@ -0,0 +1,32 @@
+import os
+
+from kgx.sink import SnapshotSink
+from kgx.utils.snapshot_utils import read_header, read_frames, NODE_FRAME, EDGE_FRAME, SNAPSHOT_VERSION
+from tests import TARGET_DIR
+from tests.unit.test_sink import get_graph
+
+
+def test_write_snapshot():
+    """
+    Write a graph as a KGX snapshot using SnapshotSink.
+    """
+    graph = get_graph()
+    filename = os.path.join(TARGET_DIR, 'test_graph.snapshot')
+    s = SnapshotSink(filename=filename, chunk_size=4)
+    for n, data in graph.nodes(data=True):
+        s.write_node(data)
+    for u, v, k, data in graph.edges(data=True, keys=True):
+        s.write_edge(data)
+    s.finalize()
+    assert os.path.exists(filename)
+
+    frames = {NODE_FRAME: [], EDGE_FRAME: []}
+    with open(filename, 'rb') as FH:
+        assert read_header(FH) == SNAPSHOT_VERSION
+        for frame_type, records in read_frames(FH):
+            frames[frame_type].append(records)
+
+    # 6 nodes and 6 edges, in chunks of 4
+    assert [len(x) for x in frames[NODE_FRAME]] == [4, 2]
+    assert [len(x) for x in frames[EDGE_FRAME]] == [4, 2]
+    assert frames[NODE_FRAME][0][0] == {'id': 'A', 'name': 'Node A', 'category': ['biolink:NamedThing']}
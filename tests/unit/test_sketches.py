@@ -0,0 +1,85 @@
+import json
+import pickle
+
+import pytest
+
+from kgx.graph_operations.sketches import DistinctValues, HyperLogLog, ReservoirSample, TopKCounter
+
+
+@pytest.mark.parametrize('n', [10, 100000])
+def test_hyperloglog(n):
+    """
+    Test estimating the number of distinct values of a stream with
+    a HyperLogLog sketch, and merging sketches of parts of the stream.
+    """
+    sketch = HyperLogLog(max_exact=100)
+    parts = [HyperLogLog(max_exact=100), HyperLogLog(max_exact=100)]
+    for i in range(n):
+        sketch.add(f"HGNC:{i}")
+        sketch.add(f"HGNC:{i // 2}")
+        parts[i % 2].add(f"HGNC:{i}")
+    merged = parts[0].merge(pickle.loads(pickle.dumps(parts[1])))
+    for s in [sketch, merged]:
+        if n <= 100:
+            assert s.count() == n
+            assert s.relative_error() == 0.0
+        else:
+            assert abs(s.count() - n) <= 4 * s.relative_error() * n
+
+
+def test_top_k_counter():
+    """
+    Test counting the most frequent values of a stream,
+    and merging the counters of parts of the stream.
+    """
+    values = [f"infores:{i % 5}" for i in range(1000)] + [f"infores:x{i}" for i in range(200)]
+    counter = TopKCounter(10)
+    parts = [TopKCounter(10), TopKCounter(10)]
+    for i, value in enumerate(values):
+        counter.add(value)
+        parts[i % 2].add(value)
+    merged = parts[0].merge(parts[1])
+    for c in [counter, merged]:
+        counts = c.json_object()
+        assert c.total == 1200
+        assert len(counts) == 10
+        for i in range(5):
+            # frequent values are counted, within the stated error
+            count = counts[f"infores:{i}"]
+            assert count['count'] - count['error'] <= 200 <= count['count']
+            assert count['error'] <= 1200 / 10
+
+
+def test_distinct_values():
+    """
+    Test examples of values being sampled from the values of a stream.
+    """
+    values = DistinctValues(max_examples=3)
+    for i in range(1000):
+        values.add(f"name {i}", 2)
+    values.merge(DistinctValues(max_examples=3))
+    report = values.json_object()
+    assert report['distinct_count'] == 1000
+    assert len(report['examples']) == 3
+    assert all(x.startswith('name ') for x in report['examples'])
+
+    sample = ReservoirSample(5)
+    for i in range(10):
+        sample.add(i, 1000 if i == 3 else 1)
+    assert 3 in sample.values()
+
+
+@pytest.mark.parametrize('n', [10, 5000])
+def test_sketch_to_dict(n):
+    """
+    Test that sketches read back from their state as JSON go on as the sketches themselves.
+    """
+    sketches = [HyperLogLog(max_exact=100), TopKCounter(10), ReservoirSample(5), DistinctValues(max_examples=3)]
+    for sketch in sketches:
+        for i in range(n):
+            sketch.add(f"infores:{i % 7 if i % 2 else i}")
+        copy = type(sketch).from_dict(json.loads(json.dumps(sketch.to_dict())))
+        for s in [sketch, copy]:
+            for i in range(n):
+                s.add(f"HGNC:{i}")
+        assert copy.to_dict() == sketch.to_dict()
@@ -0,0 +1,137 @@
+import gzip
+import json
+import os
+import random
+
+import pytest
+
+from kgx.graph_operations.graph_merge import edge_sort_key
+from kgx.utils import sort_utils
+from kgx.utils.sort_utils import sort_file, split_records
+from tests import RESOURCE_DIR
+
+
+@pytest.mark.parametrize(
+    'processes,compress_runs,max_runs_per_merge',
+    [(1, False, 64), (1, True, 2), (2, False, 2), (2, True, 64)],
+)
+def test_sort_nt(tmp_path, monkeypatch, processes, compress_runs, max_runs_per_merge):
+    """
+    Test sorting N-Triples by subject, in many small runs.
+    """
+    monkeypatch.setattr(sort_utils, 'MAX_RUNS_PER_MERGE', max_runs_per_merge)
+    with open(os.path.join(RESOURCE_DIR, 'rdf', 'test3.nt')) as fh:
+        lines = [x for x in fh if x.strip()]
+    shuffled = list(lines)
+    random.Random(0).shuffle(shuffled)
+    filename = str(tmp_path / 'shuffled.nt.gz')
+    with gzip.open(filename, 'wt') as fh:
+        fh.write('# a comment\n')
+        fh.writelines(shuffled)
+    output = str(tmp_path / 'sorted.nt')
+    count = sort_file(
+        filename,
+        output,
+        'nt',
+        max_memory=0.002,
+        processes=processes,
+        compression='gz',
+        compress_runs=compress_runs,
+        temporary_directory=str(tmp_path),
+    )
+    assert count == len(lines)
+    with open(output) as fh:
+        sorted_lines = fh.readlines()
+    assert sorted_lines == sorted(shuffled, key=lambda x: x.split(' ', 1)[0])
+    assert sorted(os.listdir(tmp_path)) == ['shuffled.nt.gz', 'sorted.nt']
+
+
+def test_sort_tsv(tmp_path):
+    """
+    Test sorting TSV nodes by id, where quotes are not special.
+    """
+    filename = str(tmp_path / 'nodes.tsv')
+    with open(filename, 'w') as fh:
+        fh.write('id\tname\tdescription\n')
+        fh.write('HGNC:3\tc\t5" long\n')
+        fh.write('HGNC:1\ta\tplain\n')
+        fh.write('HGNC:2\tb\t\n')
+        fh.write('HGNC:1\ta2\tsame id\n')
+    output = str(tmp_path / 'sorted.tsv')
+    assert sort_file(filename, output, 'tsv', key='id', max_memory=0.0001) == 4
+    with open(output) as fh:
+        assert fh.read() == (
+            'id\tname\tdescription\n'
+            'HGNC:1\ta\tplain\n'
+            'HGNC:1\ta2\tsame id\n'
+            'HGNC:2\tb\t\n'
+            'HGNC:3\tc\t5" long\n'
+        )
+    with pytest.raises(ValueError):
+        sort_file(filename, output, 'tsv', key='subject')
+
+
+def test_sort_csv(tmp_path):
+    """
+    Test sorting CSV nodes by id, with quoted fields over several lines.
+    """
+    filename = str(tmp_path / 'nodes.csv')
+    with open(filename, 'w') as fh:
+        fh.write('id,name,description\n')
+        fh.write('HGNC:3,c,"a ""quoted"", comma"\n')
+        fh.write('HGNC:1,a,"two\nlines"\n')
+        fh.write('"HGNC:2",b,\n')
+    output = str(tmp_path / 'sorted.csv')
+    assert sort_file(filename, output, 'csv', key='id', max_memory=0.0001) == 3
+    with open(output) as fh:
+        assert fh.read() == (
+            'id,name,description\n'
+            'HGNC:1,a,"two\nlines"\n'
+            '"HGNC:2",b,\n'
+            'HGNC:3,c,"a ""quoted"", comma"\n'
+        )
+
+
+def test_sort_jsonl_edges(tmp_path):
+    """
+    Test sorting JSON lines edges by edge key.
+    """
+    filename = os.path.join(RESOURCE_DIR, 'valid_edges.jsonl')
+    output = str(tmp_path / 'sorted.jsonl.gz')
+    sort_file(filename, output, 'jsonl', key='edge', max_memory=0.001, output_compression='gz')
+    with open(filename) as fh:
+        edges = [json.loads(x) for x in fh if x.strip()]
+    with gzip.open(output, 'rt') as fh:
+        sorted_edges = [json.loads(x) for x in fh]
+    assert sorted_edges == sorted(edges, key=edge_sort_key)
+
+
+def test_split_records():
+    """
+    Test splitting the lines of a file into records.
+    """
+    lines = ['a,"b\n', 'c"\n', 'd,e']
+    assert list(split_records(lines, 'csv')) == ['a,"b\nc"\n', 'd,e\n']
+    lines = ['B:2\tfoo 5" bar\n', 'A:1\tplain\n']
+    assert list(split_records(lines, 'tsv')) == lines
+    lines = ['# comment\n', '\n', '<a> <b> "c\\nd" .\n']
+    assert list(split_records(lines, 'nt')) == ['<a> <b> "c\\nd" .\n']
+
+
+def test_sorted_runs(tmp_path, monkeypatch):
+    """
+    Test sorting edge records in many small runs, where records with the same key keep their order.
+    """
+    monkeypatch.setattr(sort_utils, 'MAX_RUNS_PER_MERGE', 2)
+    records = [
+        {'subject': f"HGNC:{i % 7}", 'predicate': 'biolink:related_to', 'object': f"HGNC:{i % 3}", 'n': i}
+        for i in range(100)
+    ]
+    runs = sort_utils.SortedRuns(
+        edge_sort_key, 0.002, str(tmp_path), record_size=sort_utils.record_size
+    )
+    for record in records:
+        runs.add(record)
+    assert len(runs.close()) > 2
+    assert [record for _, record in runs.merge()] == sorted(records, key=edge_sort_key)
+    assert runs.count == 100
@@ -137,6 +137,37 @@ def test_read_nt3():
     assert e1['cooccurence'] == '332'
 
 
+def test_read_nt_unsorted(tmp_path):
+    """
+    Read from an unsorted RDF N-Triple file using RdfSource, with bounded memory.
+    """
+    node_property_predicates = {
+        f"https://www.example.org/UNKNOWN/{x}"
+        for x in ['fusion', 'homology', 'combined_score', 'cooccurence']
+    }
+    filename = os.path.join(RESOURCE_DIR, 'rdf', 'test3.nt')
+    source = RdfSource()
+    source.set_node_property_predicates(node_property_predicates)
+    nodes, edges = process_stream(source.parse(filename=filename, format='nt'))
+
+    # the triples about the reified edges come before those which tell that they are reified
+    unsorted_filename = str(tmp_path / 'test3_unsorted.nt')
+    with open(filename) as fh, open(unsorted_filename, 'w') as out:
+        out.writelines(reversed([line.rstrip('\n') + '\n' for line in fh if line.strip()]))
+    source = RdfSource()
+    source.set_node_property_predicates(node_property_predicates)
+    g = source.parse(filename=unsorted_filename, format='nt', max_in_memory=2, spill_directory=str(tmp_path))
+    unsorted_nodes, unsorted_edges = process_stream(g)
+
+    assert unsorted_nodes.keys() == nodes.keys()
+    assert unsorted_edges.keys() == edges.keys()
+    e1 = unsorted_edges['ENSEMBL:ENSP0000000000001', 'ENSEMBL:ENSP0000000000002'][0]
+    assert e1['id'] == 'urn:uuid:fcf76807-f909-4ccb-b40a-3b79b49aa518'
+    assert e1['predicate'] == 'biolink:interacts_with'
+    assert e1['fusion'] == '0'
+    assert os.listdir(tmp_path) == ['test3_unsorted.nt']
+
+
 def test_read_nt4():
     """
     Read from an RDF N-Triple file using RdfSource, with user defined
@@ -0,0 +1,134 @@
+import json
+import os
+import struct
+
+import pytest
+
+from kgx.sink import SnapshotSink
+from kgx.source import SnapshotSource
+from kgx.transformer import Transformer
+from kgx.graph_operations.sketches import HyperLogLog
+from kgx.utils.snapshot_utils import SNAPSHOT_MAGIC, tag_dict, untag_dict
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+def test_read_snapshot1():
+    """
+    Round-trip a TSV through a KGX snapshot and read it using SnapshotSource.
+    """
+    filename = os.path.join(TARGET_DIR, 'test_read_snapshot1.snapshot')
+    t = Transformer()
+    t.transform(
+        input_args={
+            'filename': [
+                os.path.join(RESOURCE_DIR, 'test_nodes.tsv'),
+                os.path.join(RESOURCE_DIR, 'test_edges.tsv'),
+            ],
+            'format': 'tsv',
+        },
+        output_args={'filename': filename, 'format': 'snapshot'},
+    )
+
+    s = SnapshotSource()
+    nodes = {}
+    edges = {}
+    for rec in s.parse(filename):
+        if rec:
+            if len(rec) == 4:
+                edges[(rec[0], rec[1])] = rec[3]
+            else:
+                nodes[rec[0]] = rec[1]
+
+    assert len(nodes) == t.store.graph.number_of_nodes()
+    assert len(edges) == t.store.graph.number_of_edges()
+    for n, data in t.store.graph.nodes(data=True):
+        assert nodes[n]['category'] == data['category']
+    assert 'category' in s.node_properties
+    assert 'predicate' in s.edge_properties
+
+
+def test_read_snapshot2():
+    """
+    Read a KGX snapshot using SnapshotSource, with a node filter.
+    """
+    filename = os.path.join(TARGET_DIR, 'test_read_snapshot2.snapshot')
+    sink = SnapshotSink(filename=filename)
+    sink.write_node({'id': 'A', 'category': ['biolink:Gene']})
+    sink.write_node({'id': 'B', 'category': ['biolink:Disease']})
+    sink.write_edge({'subject': 'A', 'predicate': 'biolink:related_to', 'object': 'B'})
+    sink.finalize()
+
+    s = SnapshotSource()
+    s.set_node_filter('category', {'biolink:Gene'})
+    nodes = [x for x in s.parse(filename) if x and len(x) == 2]
+    assert len(nodes) == 1
+    assert nodes[0][0] == 'A'
+
+
+def test_read_snapshot_invalid():
+    """
+    Reading a file that is not a KGX snapshot should raise an error.
+    """
+    s = SnapshotSource()
+    with pytest.raises(ValueError):
+        list(s.parse(os.path.join(RESOURCE_DIR, 'test_nodes.tsv')))
+
+
+def test_read_snapshot_types():
+    """
+    Read back records with values of all the types that a snapshot keeps.
+    """
+    filename = os.path.join(TARGET_DIR, 'test_read_snapshot_types.snapshot')
+    record = {
+        'id': 'A',
+        'category': ['biolink:Gene'],
+        'synonym': {'a', 'b'},
+        'pair': ('x', 1),
+        'score': 1.5,
+        'count': 3,
+        'flag': True,
+        'description': None,
+        'nested': {'k': ['v']},
+    }
+    sink = SnapshotSink(filename=filename)
+    sink.write_node(record)
+    sink.finalize()
+
+    nodes = [x for x in SnapshotSource().parse(filename) if x and len(x) == 2]
+    assert nodes[0][1] == record
+    assert isinstance(nodes[0][1]['synonym'], set)
+    assert isinstance(nodes[0][1]['pair'], tuple)
+
+
+def test_read_snapshot_pickled():
+    """
+    Reading a snapshot whose chunks are pickled (version 1) should raise an error.
+    """
+    filename = os.path.join(TARGET_DIR, 'test_read_snapshot_pickled.snapshot')
+    with open(filename, 'wb') as fh:
+        fh.write(SNAPSHOT_MAGIC + struct.pack('<H', 1))
+    s = SnapshotSource()
+    with pytest.raises(ValueError):
+        list(s.parse(filename))
+
+
+def test_tag_dict():
+    """
+    Test that nested dicts are read back with the types of their values and keys.
+    """
+    d = {
+        'count': 3,
+        'names': {'a', 'b'},
+        'nested': {'prefixes': {'HGNC'}, 'plain': {'x': [1, 2]}},
+        'pairs': {('A', 'B', (('relation', ('RO:1', 'RO:2')),)): 2, 1: {'count': 1}},
+        'sketch': HyperLogLog(max_exact=10),
+        'empty': {},
+    }
+    d['sketch'].add('HGNC:1')
+    encoded = json.dumps(tag_dict(d))
+    decoded = untag_dict(json.loads(encoded), {'HyperLogLog': HyperLogLog})
+    assert decoded['sketch'].to_dict() == d['sketch'].to_dict()
+    del d['sketch'], decoded['sketch']
+    assert decoded == d
+    with pytest.raises(ValueError):
+        untag_dict(json.loads(encoded))
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from kgx.utils.spilling_cache import SpillingDict, SpillingSet
+
+
+def test_spilling_dict(tmp_path):
+    """
+    Test a mapping spilling its least recently used items.
+    """
+    d = SpillingDict(max_in_memory=4, directory=str(tmp_path))
+    for i in range(10):
+        d[f"n{i}"] = {'id': f"n{i}", 'values': [i]}
+    assert len(d) == 10
+    assert d.spilled
+    assert len(d.items_in_memory) <= 4
+    assert os.path.exists(d.filename)
+
+    # a spilled item is loaded back into memory, to be updated in place
+    assert 'n0' in d
+    d['n0']['values'].append(10)
+    d['n1'] = {'id': 'n1', 'values': [11]}
+    for i in range(10, 20):
+        d[f"n{i}"] = {'id': f"n{i}"}
+    assert d['n0'] == {'id': 'n0', 'values': [0, 10]}
+    assert d['n1'] == {'id': 'n1', 'values': [11]}
+    assert len(d) == 20
+
+    # keys of other types are kept apart
+    d[('n2', 'n3')] = 'edge'
+    assert d[('n2', 'n3')] == 'edge'
+    assert 'missing' not in d
+    with pytest.raises(KeyError):
+        d['missing']
+
+    assert d.pop('n2') == {'id': 'n2', 'values': [2]}
+    assert 'n2' not in d
+    del d['n3']
+    assert len(d) == 19
+    assert dict(d.items()) == {k: d[k] for k in list(d)}
+    assert set(d) == {f"n{i}" for i in range(20) if i not in {2, 3}} | {('n2', 'n3')}
+
+    filename = d.filename
+    d.clear()
+    assert len(d) == 0
+    d.close()
+    assert not os.path.exists(filename)
+
+
+def test_spilling_set(tmp_path):
+    """
+    Test a set spilling its least recently used elements.
+    """
+    s = SpillingSet(max_in_memory=2, directory=str(tmp_path))
+    for i in range(5):
+        s.add(i)
+    assert len(s) == 5
+    assert 0 in s and 4 in s and 5 not in s
+    s.discard(0)
+    s.discard(5)
+    assert set(s) == {1, 2, 3, 4}
+    popped = {s.pop() for _ in range(4)}
+    assert popped == {1, 2, 3, 4}
+    assert not s
+    s.close()
+    assert os.listdir(tmp_path) == []
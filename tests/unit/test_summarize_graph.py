@@ -1,4 +1,6 @@
 import os
+import pickle
+import tempfile
 
 import pytest
 
@@ -291,3 +293,166 @@ def test_summarize_graph_stream_inspector():
     assert 'biolink:Gene-biolink:related_to-biolink:Pathway' in edge_stats[COUNT_BY_SPO]
     assert 'count' in edge_stats[COUNT_BY_SPO]['biolink:Gene-biolink:related_to-biolink:Pathway']
     assert edge_stats[COUNT_BY_SPO]['biolink:Gene-biolink:related_to-biolink:Pathway']['count'] == 16
+
+
+def test_summarize_graph_merge():
+    """
+    Test merging the partial graph summaries of the node and
+    edge files of a graph, summarized in reverse order
+    """
+    filenames = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    facets = {'node_facet_properties': ['provided_by'], 'edge_facet_properties': ['provided_by']}
+
+    inspector = GraphSummary('Test Graph Summary', **facets)
+    Transformer(stream=True).transform(
+        input_args={'filename': filenames, 'format': 'tsv'}, inspector=inspector
+    )
+    stats = inspector.get_graph_summary()
+
+    partials = []
+    for filename in reversed(filenames):
+        partial = GraphSummary(partial=True, **facets)
+        Transformer(stream=True).transform(
+            input_args={'filename': [filename], 'format': 'tsv'}, inspector=partial
+        )
+        partials.append(pickle.loads(pickle.dumps(partial)))
+    assert sum(partials[0].pending_edges.values()) == 539
+    merged = GraphSummary('Test Graph Summary', **facets)
+    for partial in partials:
+        merged.merge(partial)
+    assert not merged.pending_edges
+    merged_stats = merged.get_graph_summary()
+
+    assert merged_stats['node_stats'][TOTAL_NODES] == 512
+    assert merged_stats['edge_stats'][TOTAL_EDGES] == 539
+    assert merged_stats['node_stats'] == stats['node_stats']
+    assert merged_stats['edge_stats'] == stats['edge_stats']
+
+    with pytest.raises(RuntimeError):
+        merged.merge(GraphSummary(partial=True, **facets))
+
+
+def test_summarize_graph_approximate():
+    """
+    Test an approximate graph summary, from the partial
+    summaries of the node and edge files of a graph
+    """
+    filenames = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    facets = {'node_facet_properties': ['name'], 'edge_facet_properties': ['provided_by', 'relation']}
+
+    inspector = GraphSummary('Test Graph Summary', **facets)
+    Transformer(stream=True).transform(
+        input_args={'filename': filenames, 'format': 'tsv'}, inspector=inspector
+    )
+    stats = inspector.get_graph_summary()
+
+    approximate = GraphSummary('Test Graph Summary', approximate=True, max_facet_values=3, **facets)
+    for filename in filenames:
+        partial = GraphSummary(partial=True, approximate=True, max_facet_values=3, **facets)
+        Transformer(stream=True).transform(
+            input_args={'filename': [filename], 'format': 'tsv'}, inspector=partial
+        )
+        approximate.merge(partial)
+    approximate_stats = approximate.get_graph_summary()
+
+    assert approximate_stats['node_stats'][TOTAL_NODES] == 512
+    assert approximate_stats['edge_stats'][TOTAL_EDGES] == 539
+    assert approximate_stats['node_stats']['name']['distinct_count'] == len(stats['node_stats']['name'])
+    assert approximate_stats['edge_stats']['relation']['distinct_count'] == len(stats['edge_stats']['relation'])
+    assert set(approximate_stats['edge_stats']['relation']['examples']) <= set(stats['edge_stats']['relation'])
+    for predicate, predicate_stats in approximate_stats['edge_stats'][COUNT_BY_EDGE_PREDICATES].items():
+        if 'relation' not in predicate_stats:
+            continue
+        assert len(predicate_stats['relation']) <= 3
+        for value, count in predicate_stats['relation'].items():
+            exact_count = stats['edge_stats'][COUNT_BY_EDGE_PREDICATES][predicate]['relation'][value]['count']
+            assert count['count'] - count['error'] <= exact_count <= count['count']
+
+
+@pytest.mark.parametrize('approximate', [False, True])
+def test_summarize_graph_state(tmp_path, approximate):
+    """
+    Test saving the state of a partial graph summary, whose node catalog
+    was spilled, and updating it with more records once loaded
+    """
+    filenames = [
+        os.path.join(RESOURCE_DIR, 'graph_nodes.tsv'),
+        os.path.join(RESOURCE_DIR, 'graph_edges.tsv'),
+    ]
+    facets = {
+        'node_facet_properties': ['provided_by'],
+        'edge_facet_properties': ['provided_by'],
+        'approximate': approximate,
+    }
+
+    inspector = GraphSummary('Test Graph Summary', **facets)
+    Transformer(stream=True).transform(
+        input_args={'filename': filenames, 'format': 'tsv'}, inspector=inspector
+    )
+    stats = inspector.get_graph_summary()
+
+    state_file = str(tmp_path / 'graph.state')
+    with tempfile.TemporaryDirectory() as spill_directory:
+        partial = GraphSummary('Test Graph Summary', spill_directory=spill_directory, **facets)
+        partial.node_catalog.max_in_memory = 100
+        Transformer(stream=True).transform(
+            input_args={'filename': filenames[:1], 'format': 'tsv'}, inspector=partial
+        )
+        assert partial.node_catalog.spilled
+        partial.save_state(state_file)
+        partial.node_catalog.close()
+    assert os.path.exists(state_file + '.nodes.db')
+
+    loaded = GraphSummary.load_state(state_file)
+    Transformer(stream=True).transform(
+        input_args={'filename': filenames[1:], 'format': 'tsv'}, inspector=loaded
+    )
+    loaded_stats = loaded.get_graph_summary()
+    loaded.node_catalog.close()
+    assert loaded_stats['node_stats'] == stats['node_stats']
+    assert loaded_stats['edge_stats'] == stats['edge_stats']
+
+    with pytest.raises(RuntimeError):
+        loaded.save_state(state_file)
+
+    # states are not pickled anymore
+    with open(state_file, 'wb') as fh:
+        pickle.dump(GraphSummary(), fh)
+    with pytest.raises(ValueError):
+        GraphSummary.load_state(state_file)
+
+
+def test_summarize_graph_merge_duplicate_nodes():
+    """
+    Test that a node found in the partial summaries of two shards
+    is only counted once by category and by identifier prefix
+    """
+    nodes = [
+        ('HGNC:1', {'category': ['biolink:Gene']}),
+        ('HGNC:2', {'category': ['biolink:Gene']}),
+        ('HGNC:2', {'category': ['biolink:Gene', 'biolink:NamedThing']}),
+        ('MONDO:1', {'category': ['biolink:Disease']}),
+    ]
+    inspector = GraphSummary('Test Graph Summary')
+    for n, data in nodes:
+        inspector.analyse_node(n, data)
+
+    merged = GraphSummary('Test Graph Summary')
+    for shard in [nodes[:2], nodes[2:]]:
+        partial = GraphSummary(partial=True)
+        for n, data in shard:
+            partial.analyse_node(n, data)
+        merged.merge(partial)
+
+    stats = inspector.get_node_stats()
+    merged_stats = merged.get_node_stats()
+    assert merged_stats[TOTAL_NODES] == stats[TOTAL_NODES] == 3
+    for category_curie in ['biolink:Gene', 'biolink:Disease']:
+        assert merged_stats[COUNT_BY_CATEGORY][category_curie] == stats[COUNT_BY_CATEGORY][category_curie]
+    assert merged_stats[COUNT_BY_ID_PREFIXES] == stats[COUNT_BY_ID_PREFIXES]
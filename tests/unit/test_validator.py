@@ -1,6 +1,12 @@
+import io
+import json
+
+import pandas as pd
 import pytest
 
-from kgx.validator import Validator
+from kgx.graph.nx_graph import NxGraph
+from kgx.source import TsvSource
+from kgx.validator import Validator, ValidationError, ErrorCollector, ErrorType, MessageLevel
 
 
 @pytest.mark.parametrize('prefix', ['GO', 'HP', 'MONDO', 'HGNC', 'UniProtKB'])
@@ -12,6 +18,16 @@ def test_get_all_prefixes(prefix):
     assert prefix in prefixes
 
 
+def test_get_all_prefixes_cached():
+    """
+    Test that get_all_prefixes computes the default prefixes once.
+    """
+    prefixes = Validator.get_all_prefixes()
+    assert isinstance(prefixes, frozenset)
+    assert Validator.get_all_prefixes() is prefixes
+    assert Validator.get_all_prefixes({'X': 'http://example.org/X_'}) == {'X', 'biolink'}
+
+
 @pytest.mark.parametrize('property', ['id', 'category'])
 def test_get_required_node_properties(property):
     """
@@ -205,6 +221,8 @@ def test_validate_node_property_values(query):
     """
     e = Validator.validate_node_property_values(query[0], query[1])
     assert (len(e) == 0) == query[2]
+    e = Validator.validate_node_property_values(query[0], query[1], {'A', 'HGNC'})
+    assert len(e) == (0 if ':' in query[0] else 1)
 
 
 @pytest.mark.parametrize(
@@ -357,3 +375,113 @@ def test_validate_edge_label(query):
     """
     e = Validator.validate_edge_predicate(query[0], query[1], dict(query[2]))
     assert (len(e) == 0) == query[3]
+
+
+def test_validate_memoized_messages():
+    """
+    Test that repeated category and predicate values give the same errors.
+    """
+    for _ in range(2):
+        e = Validator.validate_categories('A:123', {'category': ['GENE', 'biolink:Gene']})
+        assert [x.message for x in e] == [
+            "Category 'GENE' is not in CamelCase form",
+            "Category 'GENE' unknown in the current Biolink Model",
+        ]
+        assert e[0].entity == 'A:123'
+        e = Validator.validate_edge_predicate('A:1', 'B:2', {'predicate': 'related to'})
+        assert [x.message for x in e] == ["Edge predicate 'related to' is not in snake_case form"]
+        assert e[0].entity == 'A:1-B:2'
+
+
+def test_error_collector():
+    """
+    Test that ErrorCollector aggregates errors and keeps a bounded number of examples.
+    """
+    errors = [
+        ValidationError(
+            f"X:{i}",
+            ErrorType.INVALID_NODE_PROPERTY_VALUE,
+            f"Node property 'id' has a value 'X:{i}' with a CURIE prefix 'X' is not represented in Biolink Model JSON-LD context",
+            MessageLevel.ERROR,
+        )
+        for i in range(5)
+    ]
+    errors.append(
+        ValidationError('A:1', ErrorType.INVALID_CATEGORY, "Category 'GENE' is not in CamelCase form", MessageLevel.ERROR)
+    )
+    stream = io.StringIO()
+    collector = ErrorCollector(max_examples=2, error_stream=stream)
+    collector.add_all(errors)
+    assert len(collector) == 6
+    summary = collector.get_summary()
+    assert summary[0] == {
+        'error_type': 'INVALID_NODE_PROPERTY_VALUE',
+        'message': "Node property 'id' has a value '{}' with a CURIE prefix 'X' is not represented in Biolink Model JSON-LD context",
+        'message_level': 'ERROR',
+        'count': 5,
+        'examples': ['X:0', 'X:1'],
+    }
+    assert summary[1]['message'] == "Category 'GENE' is not in CamelCase form"
+    assert [json.loads(x) for x in stream.getvalue().splitlines()] == [x.as_dict() for x in errors]
+
+    # merging the collectors of consecutive errors is the same as collecting all the errors
+    c1 = ErrorCollector(max_examples=2)
+    c1.add_all(errors[:1])
+    c2 = ErrorCollector(max_examples=2)
+    c2.add_all(errors[1:])
+    c1.merge(c2)
+    assert c1.get_summary() == summary
+
+
+def test_validate_error_collector():
+    """
+    Test that validating a graph adds the errors to the error collector without keeping them.
+    """
+    graph = NxGraph()
+    graph.add_node('HGNC:1', id='HGNC:1', name='a', category=['biolink:Gene'])
+    graph.add_node('HGNC_2', id='HGNC_2', name='b', category=['GENE'])
+    graph.add_edge('HGNC:1', 'HGNC_2', subject='HGNC:1', predicate='related to', object='HGNC_2')
+    errors = Validator().validate(graph)
+    assert errors
+
+    collector = ErrorCollector()
+    validator = Validator(error_collector=collector)
+    assert validator.validate(graph) == []
+    assert validator.errors == []
+    assert len(collector) == len(errors)
+    summary = collector.get_summary()
+    assert sum(x['count'] for x in summary) == len(errors)
+    assert {x['error_type'] for x in summary} == {x.error_type.name for x in errors}
+
+
+def test_analyse_frame():
+    """
+    Test that validating the rows of a DataFrame gives the same errors as validating records.
+    """
+    nodes = pd.DataFrame(
+        {
+            'id': ['HGNC:1', 'HGNC_2', 'XYZ:3', 'HGNC:4'],
+            'name': ['a', 'b', 'c', 'd'],
+            'category': ['biolink:Gene', 'biolink:Gene', 'GENE', ''],
+        }
+    )
+    edges = pd.DataFrame(
+        {
+            'subject': ['HGNC:1', 'HGNC_2', 'HGNC:1'],
+            'predicate': ['biolink:related_to', 'related to', 'biolink:related_to'],
+            'object': ['HGNC:4', 'XYZ:3', 'HGNC:4'],
+            'relation': ['RO:1', '', 'bad relation'],
+        }
+    )
+    validator = Validator()
+    source = TsvSource()
+    source.set_provenance_map({})
+    node_records = [source.read_node(x) for x in nodes.to_dict('records')]
+    edge_records = [source.read_edge(x) for x in edges.to_dict('records')]
+    node_errors = [e for r in node_records for e in validator.analyse_node(*r)]
+    edge_errors = [e for r in edge_records for e in validator.analyse_edge(*r)]
+    assert node_errors and edge_errors
+    e = validator.analyse_node_frame(nodes, node_records)
+    assert [str(x) for x in e] == [str(x) for x in node_errors]
+    e = validator.analyse_edge_frame(edges, edge_records)
+    assert [str(x) for x in e] == [str(x) for x in edge_errors]